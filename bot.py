@@ -23,6 +23,9 @@ if sys.platform == "win32":
 
 from src.config import Config, LOCAL_TZ, TIMEZONE_NAME
 from src.core.polymarket import PolymarketClient
+from src.core.outcomes import OutcomeTracker
+from src.core.settlement import SettlementScheduler
+from src.core.windows import WindowSubscriptionManager
 from src.strategies.streak import evaluate, kelly_size
 from src.core.trader import LiveTrader, PaperTrader, TradingState
 
@@ -140,6 +143,8 @@ Related Commands:
 
     # Init
     client = PolymarketClient()
+    # Keeps the client's market cache to a rolling band of windows
+    windows = WindowSubscriptionManager(client=client, ahead=1)
     state = TradingState.load()
     if args.bankroll:
         state.bankroll = args.bankroll
@@ -168,6 +173,19 @@ Related Commands:
     bet_timestamps: set[int] = {t.timestamp for t in state.trades}
     # Track pending trades (bet placed, waiting for resolution)
     pending: list = []
+    # Windows are checked from ~30s after they close, off the main loop
+    settlements = SettlementScheduler(client, poll_interval=1.0)
+    settlements.start()
+    # Resolved outcomes live in a local store: startup fetches only missing
+    # windows and new ones are recorded in the background, so the streak
+    # check at entry time reads memory
+    outcome_history = OutcomeTracker(client)
+    backfilled = outcome_history.backfill()
+    outcome_history.start()
+    log(
+        f"📚 Outcome history: {len(outcome_history.store)} windows "
+        f"({backfilled} backfilled)"
+    )
 
     while running:
         try:
@@ -175,12 +193,13 @@ Related Commands:
             current_window = (now // 300) * 300
             seconds_into_window = now - current_window
             next_window = current_window + 300
+            windows.tick(now)
 
             # === SETTLE PENDING TRADES ===
-            for trade in list(pending):
-                market = client.get_market(trade.timestamp)
-                if market and market.closed and market.outcome:
-                    state.settle_trade(trade, market.outcome)
+            for trade, market in settlements.drain():
+                saved = settlements.checkpoint(state)
+                try:
+                    state.settle_trade(trade, market.outcome, market=market)
                     emoji = "✓" if trade.pnl > 0 else "✗"
                     won = trade.direction == market.outcome
                     fee_info = (
@@ -195,6 +214,10 @@ Related Commands:
                     )
                     pending.remove(trade)
                     state.save()
+                except Exception as e:
+                    log(f"❌ Settle error (will retry): {e}")
+                    if trade in pending:
+                        settlements.requeue(trade, state, saved)
 
             # === CHECK IF WE CAN TRADE ===
             can_trade, reason = state.can_trade()
@@ -227,8 +250,7 @@ Related Commands:
                 continue
 
             # === GET RECENT OUTCOMES ===
-            log("🔍 Fetching recent outcomes...")
-            outcomes = client.get_recent_outcomes(count=trigger + 2)
+            outcomes = outcome_history.recent(count=trigger + 2)
             if len(outcomes) < trigger:
                 log(f"⚠️  Only {len(outcomes)} recent outcomes, need {trigger}")
                 bet_timestamps.add(target_ts)  # skip this window
@@ -293,6 +315,7 @@ Related Commands:
             state.record_trade(trade)
             bet_timestamps.add(target_ts)
             pending.append(trade)
+            settlements.add(trade)
             state.save()
 
             # === STATUS ===
@@ -309,8 +332,17 @@ Related Commands:
             log(f"❌ Error: {e}")
             time.sleep(10)
 
+    outcome_history.stop()
+    settlements.stop()
+    settle_stats = settlements.stats
+    log(
+        f"🔎 Settlement checks: {settle_stats['fetches']} API calls "
+        f"(~{settle_stats['calls_saved_per_hour']}/h saved vs per-tick polling)"
+    )
+
     # Save state on exit
     state.save()
+    state.flush()
     log(f"💾 State saved. Bankroll: ${state.bankroll:.2f}")
     log(f"📊 Session: {state.daily_bets} bets, PnL: ${state.daily_pnl:+.2f}")
 
@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 """Calculate max consecutive loss streak."""
 
-import json
+from src.infra.trade_store import get_history_store
 
-with open("trade_history_full.json", "r") as f:
-    trades = json.load(f)
+trades = list(get_history_store().entries())
 
 # Sort by timestamp to get chronological order
 trades_sorted = sorted(trades, key=lambda x: x["execution"]["timestamp"])
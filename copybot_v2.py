@@ -19,15 +19,23 @@ import queue
 import re
 import signal
 import sys
+import threading
 import time
 from datetime import datetime, timedelta
 
 from src.config import Config, LOCAL_TZ, TIMEZONE_NAME
 from src.strategies.copytrade import CopySignal
 from src.strategies.copytrade_ws import HybridCopytradeMonitor
+from src.strategies.cadence import CadenceController
+from src.strategies.poll_scheduler import StaggeredPollScheduler
 from src.infra.logging_config import get_logger
-from src.core.polymarket import PolymarketClient, DelayImpactModel
+from src.core.orderbook import BookDepth
+from src.core.polymarket import PolymarketClient, quote_execution
+from src.core.mark_to_market import get_mark_to_market
 from src.core.polymarket_ws import MarketDataCache, TradeEvent
+from src.core.prefetch import SignalPrefetcher
+from src.core.settlement import SettlementScheduler
+from src.core.windows import WindowSubscriptionManager
 from src.infra.resilience import (
     CircuitBreaker,
     RateLimiter,
@@ -52,14 +60,20 @@ def handle_signal(sig, _frame):
     running = False
 
 
+def book_depth(book: dict | None) -> BookDepth:
+    """Depth index for a book dict, reusing the one the WS cache attached."""
+    if book and isinstance(book.get("depth"), BookDepth):
+        return book["depth"]
+    return BookDepth.from_snapshot(book)
+
+
 def estimate_execution_from_book(
-    book: dict, side: str, amount_usd: float, copy_delay_ms: int = 0
+    book: dict | BookDepth, side: str, amount_usd: float, copy_delay_ms: int = 0
 ):
     """Estimate execution details from a pre-fetched orderbook snapshot."""
-    bids = book.get("bids", []) if book else []
-    asks = book.get("asks", []) if book else []
+    depth = book if isinstance(book, BookDepth) else book_depth(book)
 
-    if not bids or not asks:
+    if depth.is_empty:
         return {
             "execution_price": 0.5,
             "spread": 0.0,
@@ -72,82 +86,7 @@ def estimate_execution_from_book(
             "depth_at_best": 0.0,
         }
 
-    asks_sorted = sorted(asks, key=lambda x: float(x["price"]))
-    bids_sorted = sorted(bids, key=lambda x: float(x["price"]), reverse=True)
-
-    best_ask = float(asks_sorted[0]["price"])
-    best_bid = float(bids_sorted[0]["price"])
-    spread = best_ask - best_bid
-
-    levels = asks_sorted if side == "BUY" else bids_sorted
-    best_level = levels[0]
-    depth_at_best = float(best_level["price"]) * float(best_level["size"])
-
-    remaining_usd = amount_usd
-    total_shares = 0.0
-    total_cost = 0.0
-
-    for level in levels:
-        price = float(level["price"])
-        size = float(level["size"])
-        level_value = price * size
-        if remaining_usd <= 0:
-            break
-        if level_value >= remaining_usd:
-            shares_to_take = remaining_usd / price
-            total_shares += shares_to_take
-            total_cost += remaining_usd
-            remaining_usd = 0
-        else:
-            total_shares += size
-            total_cost += level_value
-            remaining_usd -= level_value
-
-    filled_amount = amount_usd - remaining_usd
-    fill_pct = (filled_amount / amount_usd * 100) if amount_usd > 0 else 100.0
-
-    if total_shares <= 0:
-        execution_price = (best_ask + best_bid) / 2
-        slippage_pct = 0.0
-    else:
-        execution_price = total_cost / total_shares
-        ref_price = best_ask if side == "BUY" else best_bid
-        if ref_price > 0:
-            if side == "BUY":
-                slippage_pct = (execution_price - ref_price) / ref_price * 100
-            else:
-                slippage_pct = (ref_price - execution_price) / ref_price * 100
-        else:
-            slippage_pct = 0.0
-
-    delay_impact_pct = 0.0
-    delay_breakdown = None
-    if copy_delay_ms > 0:
-        delay_model = DelayImpactModel()
-        delay_impact_pct, delay_breakdown = delay_model.calculate_impact(
-            delay_ms=copy_delay_ms,
-            order_size=amount_usd,
-            depth_at_best=depth_at_best,
-            spread=spread,
-            side=side,
-        )
-        if side == "BUY":
-            execution_price *= 1 + delay_impact_pct / 100
-        else:
-            execution_price *= 1 - delay_impact_pct / 100
-        execution_price = max(0.01, min(0.99, execution_price))
-
-    return {
-        "execution_price": execution_price,
-        "spread": spread,
-        "slippage_pct": max(0.0, slippage_pct),
-        "fill_pct": fill_pct,
-        "delay_impact_pct": delay_impact_pct,
-        "delay_breakdown": delay_breakdown,
-        "best_bid": best_bid,
-        "best_ask": best_ask,
-        "depth_at_best": depth_at_best,
-    }
+    return quote_execution(depth, side, amount_usd, copy_delay_ms)
 
 
 def main():
@@ -172,6 +111,7 @@ Environment Variables (.env):
   MIN_BET            Minimum bet size (default: 1)
   MAX_DAILY_BETS     Maximum bets per day (default: 50)
   MAX_DAILY_LOSS     Stop trading after this loss (default: 50)
+  MAX_SLIPPAGE_PCT   Size bets to book depth within this slippage (default: 0 = off)
   COPY_WALLETS       Comma-separated wallet addresses to copy
   FAST_POLL_INTERVAL Fast polling interval in seconds (default: 1.5)
   USE_WEBSOCKET      Enable WebSocket for orderbook data (default: true)
@@ -259,6 +199,12 @@ Examples:
         metavar="USD",
         help=f"Stop after this daily loss (default: {Config.MAX_DAILY_LOSS})",
     )
+    parser.add_argument(
+        "--max-slippage",
+        type=float,
+        metavar="PCT",
+        help=f"Cap bet size to book depth within this slippage %% (default: {Config.MAX_SLIPPAGE_PCT or 'off'})",
+    )
     parser.add_argument(
         "--retry",
         type=int,
@@ -302,6 +248,9 @@ Examples:
         paper_mode = Config.PAPER_TRADE
 
     bet_amount = args.amount or Config.BET_AMOUNT
+    max_slippage_pct = (
+        args.max_slippage if args.max_slippage is not None else Config.MAX_SLIPPAGE_PCT
+    )
     poll_interval = args.poll or Config.FAST_POLL_INTERVAL
     use_websocket = Config.USE_WEBSOCKET and not args.no_websocket
 
@@ -351,15 +300,11 @@ Examples:
         },
     )
 
-    # Pre-fetch upcoming markets (silent)
-    upcoming = client.get_upcoming_market_timestamps(count=5)
-    client.prefetch_markets(upcoming)
-
     # Market data cache with optional WebSocket
     market_cache: MarketDataCache | None = None
     if use_websocket:
         try:
-            market_cache = MarketDataCache(use_websocket=True)
+            market_cache = MarketDataCache(use_websocket=True, rest_client=client)
             market_cache.start()
             time.sleep(1)  # Wait for connection
 
@@ -375,32 +320,127 @@ Examples:
             log.warning("websocket_init_failed", error=str(e))
             use_websocket = False
 
-    # Fast hybrid monitor (REST polling for activity)
-    monitor = HybridCopytradeMonitor(wallets, poll_interval=poll_interval)
+    # Rolling window subscriptions: fetch/subscribe upcoming windows ahead of
+    # each boundary, unsubscribe and evict settled ones (flat memory)
+    windows = WindowSubscriptionManager(client=client, cache=market_cache)
+    windows.tick()
+    health.register("windows", lambda: {"healthy": True, **windows.stats})
+
+    # Fast hybrid monitor (REST polling for activity); scheduled and
+    # WebSocket-triggered polls share one Data API request budget
+    poll_budget = RateLimiter(
+        requests_per_minute=Config.POLL_BUDGET_PER_SEC, window_size=1.0
+    )
+    # Per-wallet poll cadence learned from when each copied wallet trades
+    # within the window (history, then every detected trade)
+    cadence = None
+    if Config.ADAPTIVE_CADENCE:
+        from src.infra.trade_store import get_history_store
+
+        cadence = CadenceController()
+        learned = cadence.learn(get_history_store().recent(strategy="copytrade"))
+        log.debug("cadence_learned", trades=learned)
+    monitor = HybridCopytradeMonitor(
+        wallets,
+        poll_interval=poll_interval,
+        rate_limiter=poll_budget,
+        cadence=cadence,
+    )
 
-    # Signal queue for thread-safe delivery from WebSocket callbacks
+    # Signal queue for thread-safe delivery: the monitor's poll workers
+    # enqueue each wallet's signals as soon as its response arrives, and
+    # wake the main loop so it doesn't sleep out the interval first
     signal_queue: queue.Queue[CopySignal] = queue.Queue()
+    signal_ready = threading.Event()
+
+    def enqueue_signal(sig: CopySignal):
+        signal_queue.put(sig)
+        signal_ready.set()
+
+    monitor.on_signal(enqueue_signal)
+
+    # Wallet polls are staggered across the interval (K phase-offset
+    # pollers for POLL_PRIORITY_WALLETS) instead of fired as one burst
+    poll_scheduler = StaggeredPollScheduler(monitor, interval=poll_interval)
+
+    def sleep_without_polling(seconds: float):
+        """Sleep with the poll scheduler paused, then drop signals queued
+        meanwhile (by WebSocket-triggered polls) whose window has closed."""
+        poll_scheduler.stop()
+        try:
+            time.sleep(seconds)
+        finally:
+            poll_scheduler.start()
+        now = time.time()
+        fresh, stale = [], 0
+        while True:
+            try:
+                sig = signal_queue.get_nowait()
+            except queue.Empty:
+                break
+            if sig.market_ts + 300 > now:
+                fresh.append(sig)
+            else:
+                stale += 1
+        for sig in fresh:
+            signal_queue.put(sig)
+        if stale:
+            log.debug("stale_signals_dropped", count=stale)
+
+    # Market + both books of a triggering window, fetched while its
+    # activity poll is in flight so its signals price with no extra I/O
+    prefetcher = SignalPrefetcher(client, market_cache)
+    health.register("prefetch", lambda: {"healthy": True, **prefetcher.stats})
 
     # Wire up WebSocket trade callback for immediate polling
     if market_cache:
 
         def on_btc_trade(trade: TradeEvent):
             """Callback when WebSocket detects a trade on BTC 5-min market."""
-            # Check if this is a BTC 5-min market
-            if trade.market_id and BTC_5M_PATTERN.match(trade.market_id):
-                # Trigger immediate poll to detect the trade details
-                signals = monitor.trigger_immediate_poll(trade.market_id)
+            # Check if this is a BTC 5-min market (slug resolved by the cache
+            # from the event's asset/condition ID)
+            match = BTC_5M_PATTERN.match(trade.slug) if trade.slug else None
+            if match:
+                # A burst of trades on the current window speeds every
+                # wallet's cadence up; re-lay the poll slots so the faster
+                # periods apply now
+                current = int(time.time()) // 300 * 300
+                if (
+                    cadence is not None
+                    and int(match.group(1)) == current
+                    and cadence.note_market_trade(trade.timestamp)
+                ):
+                    poll_scheduler.retime()
+                    log.debug("cadence_burst", market=trade.slug)
+
+                # Speculatively fetch the market and both books, then
+                # trigger an immediate poll to detect the trade details
+                # (signals reach signal_queue through the monitor callback)
+                trigger_start = time.time()
+                fetch = prefetcher.prefetch(int(match.group(1)))
+                signals = monitor.trigger_immediate_poll(trade.slug)
+                poll_ms = (time.time() - trigger_start) * 1000
                 for sig in signals:
-                    signal_queue.put(sig)
                     log.debug(
                         "ws_triggered_signal",
-                        market=trade.market_id,
+                        market=trade.slug,
                         trader=sig.trader_name,
                         direction=sig.direction,
                         latency_ms=int((time.time() - trade.timestamp) * 1000)
                         if trade.timestamp
                         else 0,
                     )
+                if signals and fetch is not None and fetch.done():
+                    # Sequential would cost poll + prefetch; overlapped, max()
+                    entry = fetch.result()
+                    log.debug(
+                        "ws_trigger_stages",
+                        market=trade.slug,
+                        poll_ms=int(poll_ms),
+                        market_ms=int(entry.market_ms),
+                        books_ms=int(entry.books_ms),
+                        overlap_ms=int(min(poll_ms, entry.total_ms)),
+                    )
 
         market_cache.on_trade(on_btc_trade)
         log.debug("websocket_callback_registered")
@@ -408,13 +448,13 @@ Examples:
     # Register monitor health check
     health.register(
         "monitor",
-        lambda: {
-            "healthy": True,
-            "polls": monitor.polls,
-            "triggered_polls": monitor._triggered_polls,
-            "avg_latency_ms": monitor.avg_poll_latency_ms,
-        },
+        lambda: {"healthy": True, **monitor.stats},
     )
+    health.register("poll_scheduler", lambda: {"healthy": True, **poll_scheduler.stats})
+
+    # Mark-to-market of pending trades, fed by the cache's WebSocket mids
+    marks = get_mark_to_market(market_cache)
+    health.register("marks", lambda: {"healthy": True, **marks.stats})
 
     # Load trading state
     state = TradingState.load()
@@ -425,7 +465,23 @@ Examples:
     if paper_mode:
         trader = PaperTrader(market_cache=market_cache)
     else:
-        trader = LiveTrader(market_cache=market_cache)
+        trader = LiveTrader(
+            market_cache=market_cache, presign=True, order_sizes=[bet_amount]
+        )
+        # Pre-sign FOK order templates as each window's token IDs become
+        # known, so place_bet can post without signing on the signal path.
+        # The window manager has just fetched the market through the shared
+        # client, so read it from that cache instead of fetching again.
+        if trader.order_templates is not None:
+            windows.on_subscribe(
+                lambda ts: trader.prepare_orders(client.peek_market(ts))
+            )
+            for ts in windows.subscribed:
+                trader.prepare_orders(client.peek_market(ts))
+            health.register(
+                "order_templates",
+                lambda: {"healthy": True, **trader.order_templates.stats},
+            )
 
     # Startup banner
     mode_str = "PAPER" if paper_mode else "LIVE"
@@ -434,13 +490,17 @@ Examples:
     log.status_line(
         f"Amount: ${bet_amount:.2f} | Bankroll: ${state.bankroll:.2f} | Poll: {poll_interval}s | WS: {ws_str}"
     )
+    if max_slippage_pct > 0:
+        log.status_line(f"Depth sizing: ON | max slippage {max_slippage_pct:.2f}%")
     if selective_filter:
         log.status_line(
             f"Selective: ON | delay<={selective_filter.max_delay_ms / 1000:.1f}s | fill={selective_filter.min_fill_price:.2f}-{selective_filter.max_fill_price:.2f}"
         )
     log.status_line(f"Tracking {len(wallets)} wallet(s)")
     for w in wallets:
-        log.status_line(f"  └─ {w[:10]}...{w[-6:]}")
+        k = poll_scheduler.pollers[w]
+        stagger = f" | {k} pollers, every {poll_interval / k:.2f}s" if k > 1 else ""
+        log.status_line(f"  └─ {w[:10]}...{w[-6:]}{stagger}")
 
     # Track what markets we've already copied (initialize from state to avoid duplicates)
     copied_markets: set[tuple[str, int]] = set()
@@ -457,6 +517,16 @@ Examples:
     if copied_markets:
         log.status_line(f"Loaded {len(copied_markets)} previously copied market(s)")
 
+    # Settlement checks run off the main loop, keyed by window end, so they
+    # no longer spend the rate-limiter budget copy detection needs
+    settlements = SettlementScheduler(
+        client, rate_limiter=rate_limiter, poll_interval=poll_interval
+    )
+    for trade in pending:
+        settlements.add(trade)
+    settlements.start()
+    health.register("settlement", lambda: {"healthy": True, **settlements.stats})
+
     session_wins = 0
     session_losses = 0
     session_pnl = 0.0
@@ -469,6 +539,7 @@ Examples:
                 f"  Recent: {sig.trader_name} {sig.side} {sig.direction.upper()} @ {sig.price:.2f} (${sig.usdc_amount:.2f})"
             )
     print()  # Blank line before main loop
+    poll_scheduler.start()
 
     # Stats tracking
     last_stats_time = time.time()
@@ -481,100 +552,82 @@ Examples:
             now = int(time.time())
             poll_start = time.time()
 
-            # === SETTLE PENDING TRADES ===
-            # Sort by timestamp to settle in chronological order (oldest markets first)
-            pending.sort(key=lambda t: t.timestamp)
-
-            # BTC 5-min markets resolve ~30-90 seconds after window closes
-            for trade in list(pending):
-                try:
-                    # Use circuit breaker for API calls
-                    if not api_circuit.allow_request():
-                        log.warning("circuit_open", action="settle_trade")
-                        break
-
-                    # Check rate limit
-                    if not rate_limiter.allow_request():
-                        wait = rate_limiter.time_until_allowed()
-                        log.debug("rate_limited", wait_time=wait)
-                        time.sleep(min(wait, 0.5))
-                        continue
-
-                    # IMPORTANT: use_cache=False to get fresh resolution status
-                    market = client.get_market(trade.timestamp, use_cache=False)
+            # === ROLL WINDOW SUBSCRIPTIONS (no-op between boundaries) ===
+            try:
+                if api_circuit.allow_request() and windows.tick():
                     api_circuit.record_success()
+            except Exception as e:
+                api_circuit.record_failure()
+                log.debug("window_roll_error", error=str(e))
 
-                    if market and market.closed and market.outcome:
-                        state.settle_trade(trade, market.outcome, market=market)
-                        won = trade.direction == market.outcome
+            # === SETTLE PENDING TRADES ===
+            # The scheduler checks each window from ~30s after it closes
+            # (with backoff) on its own thread; resolved trades arrive here
+            # oldest first
+            for trade, market in settlements.drain():
+                if trade not in pending:
+                    continue
+                saved = settlements.checkpoint(state)
+                try:
+                    state.settle_trade(trade, market.outcome, market=market)
+                    won = trade.direction == market.outcome
 
-                        if won:
-                            session_wins += 1
-                        else:
-                            session_losses += 1
-                        session_pnl += trade.pnl
-
-                        log.trade_settled(
-                            market=trade.market_slug,
-                            direction=trade.direction,
-                            outcome=market.outcome,
-                            pnl=trade.pnl,
-                            won=won,
-                            fee_pct=trade.fee_pct if won else 0,
-                            bankroll=state.bankroll,
-                            pending=len(pending) - 1,
-                            wins=session_wins,
-                            losses=session_losses,
+                    if won:
+                        session_wins += 1
+                    else:
+                        session_losses += 1
+                    session_pnl += trade.pnl
+
+                    log.trade_settled(
+                        market=trade.market_slug,
+                        direction=trade.direction,
+                        outcome=market.outcome,
+                        pnl=trade.pnl,
+                        won=won,
+                        fee_pct=trade.fee_pct if won else 0,
+                        bankroll=state.bankroll,
+                        pending=len(pending) - 1,
+                        wins=session_wins,
+                        losses=session_losses,
+                    )
+                    pending.remove(trade)
+                    state.save()
+
+                    # === IMMEDIATE BANKRUPTCY CHECK ===
+                    # Just like real trading: if you can't afford the next bet, you're done
+                    if state.bankroll < Config.MIN_BET:
+                        log.status_line("")
+                        log.status_line("╔════════════════════════════════════════╗")
+                        log.status_line("║  SIMULATION ENDED - INSUFFICIENT FUNDS ║")
+                        log.status_line("╠════════════════════════════════════════╣")
+                        log.status_line(
+                            f"║  Final Bankroll: ${state.bankroll:.2f}".ljust(41) + "║"
                         )
-                        pending.remove(trade)
-                        state.save()
-
-                        # === IMMEDIATE BANKRUPTCY CHECK ===
-                        # Just like real trading: if you can't afford the next bet, you're done
-                        if state.bankroll < Config.MIN_BET:
-                            log.status_line("")
-                            log.status_line(
-                                "╔════════════════════════════════════════╗"
-                            )
-                            log.status_line(
-                                "║  SIMULATION ENDED - INSUFFICIENT FUNDS ║"
-                            )
-                            log.status_line(
-                                "╠════════════════════════════════════════╣"
-                            )
-                            log.status_line(
-                                f"║  Final Bankroll: ${state.bankroll:.2f}".ljust(41)
-                                + "║"
-                            )
-                            log.status_line(
-                                f"║  Minimum Required: ${Config.MIN_BET:.2f}".ljust(41)
-                                + "║"
-                            )
-                            log.status_line(
-                                f"║  Session P&L: ${session_pnl:+.2f}".ljust(41) + "║"
-                            )
-                            log.status_line(
-                                f"║  Record: {session_wins}W / {session_losses}L".ljust(
-                                    41
-                                )
-                                + "║"
-                            )
-                            log.status_line(
-                                "╚════════════════════════════════════════╝"
-                            )
-                            bankrupt = True
-                            break  # Exit the for loop
+                        log.status_line(
+                            f"║  Minimum Required: ${Config.MIN_BET:.2f}".ljust(41)
+                            + "║"
+                        )
+                        log.status_line(
+                            f"║  Session P&L: ${session_pnl:+.2f}".ljust(41) + "║"
+                        )
+                        log.status_line(
+                            f"║  Record: {session_wins}W / {session_losses}L".ljust(41)
+                            + "║"
+                        )
+                        log.status_line("╚════════════════════════════════════════╝")
+                        bankrupt = True
+                        break  # Exit the for loop
 
-                except CircuitOpenError:
-                    log.warning("circuit_open", action="settle_trade")
-                    break
                 except Exception as e:
-                    api_circuit.record_failure()
                     category = categorize_error(e)
                     if category == ErrorCategory.FATAL:
                         log.error("settle_error_fatal", error=str(e))
                     else:
                         log.warning("settle_error_retry", error=str(e))
+                    if trade in pending:
+                        # Not applied: undo any partial settlement and check
+                        # the window again
+                        settlements.requeue(trade, state, saved)
 
             # Exit immediately if bankrupt
             if bankrupt:
@@ -613,13 +666,13 @@ Examples:
                     log.status_line(
                         f"Daily bet limit reached ({Config.MAX_DAILY_BETS}). Sleeping {hours}h {minutes}m until midnight reset..."
                     )
-                    time.sleep(seconds_until_reset)
+                    sleep_without_polling(seconds_until_reset)
                     state.daily_bets = 0  # Reset counter after sleep
                     state.daily_pnl = 0.0
                     log.status_line("Daily limit reset. Resuming trading...")
                     continue
                 else:
-                    time.sleep(30)
+                    sleep_without_polling(30)
                     continue
 
             # === CHECK CIRCUIT BREAKER ===
@@ -628,15 +681,17 @@ Examples:
                     "circuit_open_wait",
                     recovery_time=Config.CIRCUIT_BREAKER_RECOVERY_TIME,
                 )
-                time.sleep(5)
+                sleep_without_polling(5)
                 continue
 
             # === POLL FOR NEW SIGNALS (Fast polling) ===
-            signals = monitor.poll()
+            # The poll scheduler fires each wallet's staggered slots on its
+            # own thread; every signal (including those from WebSocket-
+            # triggered polls) arrives through signal_queue
             polls_since_stats += 1
+            signals: list[CopySignal] = []
 
-            # === CHECK FOR WEBSOCKET-TRIGGERED SIGNALS ===
-            # These are signals found by immediate polls triggered by WebSocket events
+            # === COLLECT QUEUED SIGNALS ===
             while True:
                 try:
                     ws_signal = signal_queue.get_nowait()
@@ -670,22 +725,32 @@ Examples:
                     copied_markets.add(key)
                     continue
 
+                # Per-stage timings (ms) from the signal being dequeued
+                stage_start = time.time()
+                stages: dict[str, int] = {}
+                # A prefetch still in flight finishes sooner than a new fetch
+                prefetched = prefetcher.take(sig.market_ts, wait=Config.REST_TIMEOUT)
+
                 try:
-                    # Check rate limit before API call
-                    if not rate_limiter.allow_request():
-                        wait = rate_limiter.time_until_allowed()
-                        log.debug("rate_limited", wait_time=wait)
-                        time.sleep(min(wait, 0.5))
+                    if prefetched is not None:
+                        market = prefetched.market
+                    else:
+                        # Check rate limit before API call
+                        if not rate_limiter.allow_request():
+                            wait = rate_limiter.time_until_allowed()
+                            log.debug("rate_limited", wait_time=wait)
+                            time.sleep(min(wait, 0.5))
+
+                        # Check circuit breaker
+                        if not api_circuit.allow_request():
+                            log.warning("circuit_open", action="get_market")
+                            break
 
-                    # Check circuit breaker
-                    if not api_circuit.allow_request():
-                        log.warning("circuit_open", action="get_market")
-                        break
+                        market = client.get_market(sig.market_ts)
+                        api_circuit.record_success()
+                    stages["market_ms"] = int((time.time() - stage_start) * 1000)
 
                     # Check if market is still tradeable
-                    market = client.get_market(sig.market_ts)
-                    api_circuit.record_success()
-
                     if not market:
                         log.debug("skip_market_not_found", market_ts=sig.market_ts)
                         copied_markets.add(key)
@@ -755,15 +820,33 @@ Examples:
                     market.up_token_id if direction == "up" else market.down_token_id
                 )
                 precomputed_execution = None
+                book_start = time.time()
                 if token_id:
                     try:
-                        if market_cache:
+                        book = prefetched.books.get(token_id) if prefetched else None
+                        if book is None and market_cache:
                             book = market_cache.get_orderbook(token_id)
-                        else:
+                        elif book is None:
                             book = client.get_orderbook(token_id)
+                        depth = book_depth(book)
+
+                        # Depth-aware sizing: shrink to what the book absorbs
+                        # within the slippage budget (same index, no re-walk)
+                        if max_slippage_pct > 0 and not depth.is_empty:
+                            depth_cap = depth.max_size_for_slippage(
+                                "BUY", max_slippage_pct
+                            )
+                            if depth_cap < amount:
+                                log.info(
+                                    "size_capped_by_depth",
+                                    requested=amount,
+                                    capped=round(depth_cap, 2),
+                                    max_slippage_pct=max_slippage_pct,
+                                )
+                                amount = depth_cap
 
                         exec_est = estimate_execution_from_book(
-                            book=book,
+                            book=depth,
                             side="BUY",
                             amount_usd=amount,
                             copy_delay_ms=copy_delay_ms,
@@ -791,6 +874,19 @@ Examples:
                             market=market.slug,
                         )
 
+                stages["book_ms"] = int((time.time() - book_start) * 1000)
+
+                if amount < Config.MIN_BET:
+                    log.warning(
+                        "skip_insufficient_depth",
+                        capped=round(amount, 2),
+                        minimum=Config.MIN_BET,
+                        max_slippage_pct=max_slippage_pct,
+                        market=market.slug,
+                    )
+                    copied_markets.add(key)
+                    continue
+
                 if selective_enabled and selective_filter:
                     execution_info = precomputed_execution or {
                         "execution_price": market.up_price
@@ -832,6 +928,7 @@ Examples:
                         else:
                             break
 
+                place_start = time.time()
                 trade = trader.place_bet(
                     market=market,
                     direction=direction,
@@ -857,6 +954,20 @@ Examples:
                     consecutive_losses=consecutive_losses,
                 )
 
+                stages["place_ms"] = int((time.time() - place_start) * 1000)
+                log.debug(
+                    "signal_stages",
+                    market_ts=sig.market_ts,
+                    prefetched=prefetched is not None,
+                    detect_ms=int((sig.detected_at - sig.trade_ts) * 1000)
+                    if sig.detected_at
+                    else None,
+                    queued_ms=int((stage_start - sig.detected_at) * 1000)
+                    if sig.detected_at
+                    else None,
+                    **stages,
+                )
+
                 if trade is None:
                     log.warning("order_rejected", trader=sig.trader_name)
                     copied_markets.add(key)
@@ -865,6 +976,7 @@ Examples:
                 state.record_trade(trade)
                 copied_markets.add(key)
                 pending.append(trade)
+                settlements.add(trade)
                 state.save()
 
                 log.trade_placed(
@@ -879,57 +991,28 @@ Examples:
             if bankrupt:
                 break
 
+            # === MARK PENDING TRADES ===
+            # WS mids are read in memory; tokens without a book are fetched
+            # in one batched REST call at most every MARK_REST_INTERVAL
+            try:
+                if pending and api_circuit.allow_request():
+                    marks.refresh(pending)
+            except Exception as e:
+                log.debug("mark_refresh_error", error=str(e))
+
             # === HEARTBEAT (every ~60s) ===
             if time.time() - last_stats_time >= 60:
-                # Calculate unrealized PnL for pending trades
-                unrealized_pnl = 0.0
-                pending_info = []
-                for trade in pending:
-                    try:
-                        if rate_limiter.allow_request():
-                            # use_cache=False for fresh prices during heartbeat
-                            market = client.get_market(trade.timestamp, use_cache=False)
-                            if market:
-                                current_price = (
-                                    market.up_price
-                                    if trade.direction == "up"
-                                    else market.down_price
-                                )
-                                exec_price = (
-                                    trade.execution_price
-                                    if trade.execution_price > 0
-                                    else trade.entry_price
-                                )
-                                shares = (
-                                    trade.amount / exec_price if exec_price > 0 else 0
-                                )
-
-                                win_prob = current_price
-                                gross_win = shares - trade.amount
-                                fee_on_win = (
-                                    gross_win * trade.fee_pct if gross_win > 0 else 0
-                                )
-                                net_win = gross_win - fee_on_win
-                                ev = (win_prob * net_win) + (
-                                    (1 - win_prob) * (-trade.amount)
-                                )
-                                unrealized_pnl += ev
-
-                                # Track for pending display
-                                implied_winner = (
-                                    "up"
-                                    if market.up_price > market.down_price
-                                    else "down"
-                                )
-                                pending_info.append(
-                                    {
-                                        "direction": trade.direction,
-                                        "current_prob": current_price,
-                                        "likely_win": trade.direction == implied_winner,
-                                    }
-                                )
-                    except Exception:
-                        pass
+                # Unrealized PnL from the current marks (no network calls)
+                unrealized_pnl = marks.apply(pending)
+                pending_info = [
+                    {
+                        "direction": trade.direction,
+                        "current_prob": trade.current_price,
+                        "likely_win": trade.direction == trade.implied_outcome,
+                    }
+                    for trade in pending
+                    if trade.current_price is not None
+                ]
 
                 # Compact heartbeat log
                 log.heartbeat(
@@ -940,30 +1023,33 @@ Examples:
                     bankroll=state.bankroll,
                     unrealized=unrealized_pnl,
                     ws_connected=market_cache.ws_connected if market_cache else False,
+                    drawdown=state.aggregates.drawdown,
+                    losing_streak=state.aggregates.losing_streak,
                 )
 
                 # Show pending trades on separate line if any
                 if pending_info:
                     log.pending_trades(pending_info)
 
+                # Measured detection delay (first seen - trade_ts) per wallet
+                for wallet, delay in monitor.stats["detection_delay_s"].items():
+                    log.info(
+                        "detection_delay",
+                        wallet=wallet,
+                        mean_s=delay["mean"],
+                        p95_s=delay["p95"],
+                        trades=delay["n"],
+                    )
+
                 last_stats_time = time.time()
                 polls_since_stats = 0
 
-                # Pre-fetch upcoming markets periodically
-                try:
-                    if api_circuit.allow_request():
-                        upcoming = client.get_upcoming_market_timestamps(count=3)
-                        client.prefetch_markets(upcoming)
-                        api_circuit.record_success()
-                except Exception as e:
-                    api_circuit.record_failure()
-                    log.debug("prefetch_error", error=str(e))
-
             # === SLEEP ===
-            # Calculate how long the poll took and sleep the remainder
+            # Sleep the remainder of the tick, or until a signal arrives
             poll_duration = time.time() - poll_start
             sleep_time = max(0.1, poll_interval - poll_duration)
-            time.sleep(sleep_time)
+            signal_ready.wait(sleep_time)
+            signal_ready.clear()
 
         except KeyboardInterrupt:
             break
@@ -982,6 +1068,42 @@ Examples:
     if market_cache:
         market_cache.stop()
 
+    poll_scheduler.stop()
+    monitor.close()
+    prefetcher.close()
+    monitor_stats = monitor.stats
+    log.status_line(
+        f"Wallet polls: p50 {monitor_stats['latency_ms'].get('p50', 0)}ms, "
+        f"p95 {monitor_stats['latency_ms'].get('p95', 0)}ms, "
+        f"{monitor_stats['deadline_misses']} deadline misses, "
+        f"{poll_scheduler.deferred} deferred by the "
+        f"{Config.POLL_BUDGET_PER_SEC}/s budget"
+    )
+    expected = poll_scheduler.stats["expected_delay_s"]
+    for wallet, delay in monitor_stats["detection_delay_s"].items():
+        log.status_line(
+            f"  {wallet} detection delay: mean {delay['mean']:.2f}s, "
+            f"p95 {delay['p95']:.1f}s over {delay['n']} trade(s) "
+            f"(poll wait ~{expected.get(wallet, 0):.2f}s)"
+        )
+
+    if not paper_mode:
+        if trader.order_templates is not None:
+            presign = trader.order_templates.stats
+            log.status_line(
+                f"Order templates: {presign['hits']} used / {presign['misses']} missed, "
+                f"signing {presign['sign_ms']}ms each, "
+                f"~{presign['saved_ms_per_trade']}ms saved per trade"
+            )
+        trader.close()
+
+    settlements.stop()
+    settle_stats = settlements.stats
+    log.status_line(
+        f"Settlement checks: {settle_stats['fetches']} API calls "
+        f"(~{settle_stats['calls_saved_per_hour']}/h saved vs per-tick polling)"
+    )
+
     # Mark pending trades as force_exit before saving
     if bankrupt:
         state.mark_pending_as_force_exit("insufficient_bankroll")
@@ -989,6 +1111,9 @@ Examples:
         state.mark_pending_as_force_exit("shutdown")
 
     state.save()
+    # Writes are asynchronous; the retry path below exec's without atexit
+    if not state.flush():
+        log.warning("state_flush_timeout")
 
     total = session_wins + session_losses
     win_rate = (session_wins / total * 100) if total > 0 else 0
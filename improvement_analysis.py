@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 """Analyze what went wrong and suggest improvements."""
 
-import json
 import sys
 import os
 
+from src.infra.trade_store import get_history_store
+
 if sys.platform == "win32":
     os.environ.setdefault("PYTHONIOENCODING", "utf-8")
     try:
@@ -18,15 +19,13 @@ print("STRATEGY IMPROVEMENT ANALYSIS")
 print("=" * 70)
 print()
 
-with open("trade_history_full.json", "r") as f:
-    trades = json.load(f)
-
-# Analyze loss patterns
-losses = [t for t in trades if not t["settlement"]["won"]]
-wins = [t for t in trades if t["settlement"]["won"]]
+# Aggregated by the history store (one SQL query with the sqlite backend)
+stats = get_history_store().summary()
 
 print("CURRENT PERFORMANCE:")
-print(f"  Win Rate: {len(wins)}/{len(trades)} ({len(wins) / len(trades) * 100:.1f}%)")
+print(
+    f"  Win Rate: {stats['wins']}/{stats['settled_trades']} ({stats['win_rate']:.1f}%)"
+)
 print(f"  Expected: 67-82%")
 print(f"  Gap: Underperforming by ~20%")
 print()
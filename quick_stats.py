@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 """Quick trade stats summary."""
 
-import json
 import sys
 import os
 
+from src.infra.trade_store import get_history_store
+
 if sys.platform == "win32":
     os.environ.setdefault("PYTHONIOENCODING", "utf-8")
     try:
@@ -18,21 +19,21 @@ print("TRADING PERFORMANCE SUMMARY")
 print("=" * 70)
 print()
 
-with open("trade_history_full.json", "r") as f:
-    trades = json.load(f)
+# Aggregates and the last settled trades come from the history store
+# (SQL with the sqlite backend) instead of loading every record
+history = get_history_store()
+stats = history.summary()
+trades = history.recent(5, status="settled")
 
-# Calculate stats
-wins = [t for t in trades if t["settlement"]["won"]]
-losses = [t for t in trades if not t["settlement"]["won"]]
-total_pnl = sum(t["settlement"]["net_profit"] for t in trades)
-total_fees = sum(t["settlement"]["fee_amount"] for t in trades)
+total_pnl = stats["realized_pnl"]
+total_fees = stats["total_fees_paid"]
 
-print(f"Total Trades: {len(trades)}")
-print(f"Wins: {len(wins)}")
-print(f"Losses: {len(losses)}")
-print(f"Win Rate: {len(wins) / len(trades) * 100:.1f}%" if trades else "N/A")
+print(f"Total Trades: {stats['total_trades']}")
+print(f"Wins: {stats['wins']}")
+print(f"Losses: {stats['losses']}")
+print(f"Win Rate: {stats['win_rate']:.1f}%" if stats["settled_trades"] else "N/A")
 print()
-print(f"Gross Profit: ${sum(t['settlement']['gross_profit'] for t in trades):+.2f}")
+print(f"Gross Profit: ${stats['total_gross_profit']:+.2f}")
 print(f"Total Fees: ${total_fees:.2f}")
 print(f"Net PnL: ${total_pnl:+.2f}")
 print()
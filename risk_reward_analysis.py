@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 """Calculate required win rate to be profitable."""
 
-import json
+from src.infra.trade_store import get_history_store
 
-with open("trade_history_full.json", "r") as f:
-    trades = json.load(f)
+# Aggregated by the history store (one SQL query with the sqlite backend)
+stats = get_history_store().summary()
 
 print("=" * 70)
 print("RISK/REWARD PROBLEM ANALYSIS")
@@ -12,14 +12,8 @@ print("=" * 70)
 print()
 
 # Average win vs loss
-wins = [t for t in trades if t["settlement"]["won"]]
-losses = [t for t in trades if not t["settlement"]["won"]]
-avg_win = sum(t["settlement"]["net_profit"] for t in wins) / len(wins) if wins else 0
-avg_loss = (
-    abs(sum(t["settlement"]["net_profit"] for t in losses)) / len(losses)
-    if losses
-    else 0
-)
+avg_win = stats["avg_win"]
+avg_loss = abs(stats["avg_loss"])
 
 print("CURRENT MATH:")
 print(f"  Average Win: +${avg_win:.2f}")
@@ -31,10 +25,14 @@ print()
 # Breakeven = Loss / (Win + Loss) = 5 / (4.20 + 5) = 54.3%
 breakeven = avg_loss / (avg_win + avg_loss)
 
+win_rate = stats["win_rate"]
+expected = win_rate / 100 * avg_win - (1 - win_rate / 100) * avg_loss
+
 print("BREAKEVEN ANALYSIS:")
 print(f"  To breakeven, you need: {breakeven * 100:.1f}% win rate")
-print(f"  Your actual win rate: 46.7%")
-print(f"  Gap: You're {breakeven * 100 - 46.7:.1f} percentage points short!")
+print(f"  Your actual win rate: {win_rate:.1f}%")
+print(f"  Gap: {breakeven * 100 - win_rate:+.1f} percentage points")
+print(f"  Expected value: ${expected:+.2f} per trade")
 print()
 
 print("=" * 70)
@@ -57,9 +55,15 @@ print("     Win: 10 × $1.00 = $10.00")
 print("     Fee: $10 × 0.025 = $0.25")
 print("     Net: $10 - $5 - $0.25 = $4.75")
 print()
-print("3. THE MATH DOESN'T WORK")
-print("   With 46.7% win rate and $4.75 avg win / $5.00 avg loss:")
-print("   Expected Value = (0.467 × $4.75) - (0.533 × $5.00) = -$0.46 per trade")
+print("3. THE MATH")
+print(
+    f"   With {win_rate:.1f}% win rate and ${avg_win:.2f} avg win / ${avg_loss:.2f} avg loss:"
+)
+print(
+    f"   Expected Value = ({win_rate / 100:.3f} × ${avg_win:.2f}) - "
+    f"({1 - win_rate / 100:.3f} × ${avg_loss:.2f}) = ${expected:+.2f} per trade"
+)
+print("   Ruin risk and drawdowns over many trades: scripts/simulate.py")
 print()
 
 print("=" * 70)
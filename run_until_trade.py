@@ -18,6 +18,8 @@ if sys.platform == "win32":
 from datetime import datetime
 from src.config import Config, LOCAL_TZ, TIMEZONE_NAME
 from src.core.polymarket import PolymarketClient
+from src.core.outcomes import OutcomeTracker
+from src.core.settlement import SettlementScheduler
 from src.strategies.streak import evaluate
 from src.core.trader import LiveTrader, TradingState
 
@@ -56,6 +58,19 @@ log("")
 
 bet_timestamps = {t.timestamp for t in state.trades}
 pending = []
+# Windows are checked from ~30s after they close, off the main loop
+settlements = SettlementScheduler(client, poll_interval=10)
+settlements.start()
+# Resolved outcomes live in a local store: startup fetches only missing
+# windows and new ones are recorded in the background, so the streak
+# check at entry time reads memory
+outcome_history = OutcomeTracker(client)
+backfilled = outcome_history.backfill()
+outcome_history.start()
+log(
+    f"[HISTORY] Outcome history: {len(outcome_history.store)} windows "
+    f"({backfilled} backfilled)"
+)
 traded = False
 check_count = 0
 
@@ -67,15 +82,19 @@ while running and not traded:
         next_window = current_window + 300
 
         # Check for settled trades
-        for trade in list(pending):
-            market = client.get_market(trade.timestamp)
-            if market and market.closed and market.outcome:
-                state.settle_trade(trade, market.outcome)
+        for trade, market in settlements.drain():
+            saved = settlements.checkpoint(state)
+            try:
+                state.settle_trade(trade, market.outcome, market=market)
                 log(
                     f"[SETTLED] {trade.direction.upper()} -> {market.outcome.upper()} | PnL: ${trade.pnl:+.2f}"
                 )
                 pending.remove(trade)
                 state.save()
+            except Exception as e:
+                log(f"[ERROR] Settle failed, will retry: {e}")
+                if trade in pending:
+                    settlements.requeue(trade, state, saved)
 
         # Check if we can trade
         can_trade, reason = state.can_trade()
@@ -104,7 +123,7 @@ while running and not traded:
 
         # Time to evaluate
         log("[ANALYZE] Checking for streak...")
-        outcomes = client.get_recent_outcomes(count=Config.STREAK_TRIGGER + 2)
+        outcomes = outcome_history.recent(count=Config.STREAK_TRIGGER + 2)
         log(f"[DATA] Outcomes: {' -> '.join(o.upper() for o in outcomes)}")
 
         sig = evaluate(outcomes, trigger=Config.STREAK_TRIGGER)
@@ -157,6 +176,7 @@ while running and not traded:
         state.record_trade(trade)
         bet_timestamps.add(target_ts)
         pending.append(trade)
+        settlements.add(trade)
         state.save()
 
         log("")
@@ -181,6 +201,9 @@ while running and not traded:
         time.sleep(10)
         check_count += 1
 
+settlements.stop()
+outcome_history.stop()
+
 # Save final state
 state.save()
 
@@ -1,139 +1,138 @@
 #!/usr/bin/env python3
-"""Backtest streak reversal strategy against historical data."""
+"""Backtest streak reversal strategy against historical data.
+
+Reads the dataset built by ``scripts/build_dataset.py`` (or a JSON list of
+markets with ``closed`` / ``outcome`` fields) and evaluates every
+(trigger, fee, sizing) combination in one vectorized pass
+(``src/research/backtest.py``). Requires NumPy (``pip install .[research]``).
+
+Usage:
+    python scripts/backtest.py
+    python scripts/backtest.py --triggers 2,3,4,5,6 --amounts 5,10 --fees 0.02,0.05
+    python scripts/backtest.py --kelly 0.25,0.5,1 --curves curves.npz
+"""
 
 import argparse
 import json
+import os
+import sys
+import time
+
+import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def backtest(
-    data_file: str,
-    trigger: int,
-    bet_amount: float,
-    bankroll: float,
-    fee_pct: float = 0.05,
-):
-    with open(data_file) as f:
+from src.config import Config
+from src.research.backtest import streak_table, sweep
+
+
+def load_outcomes(data: str) -> np.ndarray:
+    """Resolved outcomes in window order (1 = up, 0 = down)."""
+    if os.path.isdir(data) or not os.path.exists(data):
+        path = os.path.join(data, "outcome.npy")
+        if not os.path.exists(path):
+            sys.exit(f"No dataset at {data}: run scripts/build_dataset.py first")
+        return np.load(path, mmap_mode="r")
+    with open(data) as f:
         markets = json.load(f)
+    return np.array(
+        [
+            m["outcome"] == "up"
+            for m in markets
+            if m.get("closed") and m["outcome"] in ("up", "down")
+        ],
+        dtype=np.int8,
+    )
 
-    closed = [m for m in markets if m.get("closed") and m["outcome"] in ("up", "down")]
-    outcomes = [m["outcome"] for m in closed]
 
-    print(f"=== BACKTEST: trigger={trigger}, bet=${bet_amount}, fee={fee_pct:.0%} ===")
+def number_list(value: str) -> list[float]:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def print_sweep(rows: list[dict]):
     print(
-        f"Markets: {len(closed)}, Up: {sum(1 for o in outcomes if o == 'up')}, Down: {sum(1 for o in outcomes if o == 'down')}"
+        f"{'trig':>4} {'fee':>5} {'sizing':<12} {'bets':>6} {'win%':>6} "
+        f"{'PnL':>11} {'ROI':>7} {'final':>11} {'maxDD':>10} {'maxDD%':>7}"
     )
-    print()
-
-    trades = []
-    wins = 0
-    losses = 0
-    total_pnl = 0.0
-    max_drawdown = 0.0
-    peak_bankroll = bankroll
-
-    for i in range(trigger, len(outcomes)):
-        window = outcomes[i - trigger : i]
-        if len(set(window)) != 1:
-            continue
-
-        # Streak detected — bet on reversal
-        streak_dir = window[0]
-        bet_dir = "down" if streak_dir == "up" else "up"
-        actual = outcomes[i]
-        won = bet_dir == actual
-
-        if won:
-            pnl = bet_amount * (1 - fee_pct)  # win minus fee
-            wins += 1
-        else:
-            pnl = -bet_amount
-            losses += 1
-
-        bankroll += pnl
-        total_pnl += pnl
-        peak_bankroll = max(peak_bankroll, bankroll)
-        drawdown = peak_bankroll - bankroll
-        max_drawdown = max(max_drawdown, drawdown)
-
-        trades.append(
-            {
-                "idx": i,
-                "streak": f"{trigger}x{streak_dir}",
-                "bet": bet_dir,
-                "actual": actual,
-                "won": won,
-                "pnl": pnl,
-                "bankroll": bankroll,
-            }
+    for r in rows:
+        print(
+            f"{r['trigger']:>4} {r['fee']:>5.1%} {r['sizing']:<12} {r['bets']:>6} "
+            f"{r['win_rate']:>6.1%} {r['pnl']:>+11.2f} {r['roi']:>+7.1%} "
+            f"{r['final_bankroll']:>11.2f} {r['max_drawdown']:>10.2f} "
+            f"{r['max_drawdown_pct']:>7.1%}"
         )
 
-    total_bets = wins + losses
-    if total_bets == 0:
-        print("No trades triggered.")
-        return
-
-    win_rate = wins / total_bets
-    avg_pnl = total_pnl / total_bets
-
-    print(f"Total bets:    {total_bets}")
-    print(f"Wins:          {wins} ({win_rate:.1%})")
-    print(f"Losses:        {losses} ({1 - win_rate:.1%})")
-    print(f"Total PnL:     ${total_pnl:+.2f}")
-    print(f"Avg PnL/trade: ${avg_pnl:+.2f}")
-    print(f"Final bankroll: ${bankroll:.2f}")
-    print(f"Max drawdown:  ${max_drawdown:.2f}")
-    print(f"ROI:           {(total_pnl / (bet_amount * total_bets)) * 100:+.1f}%")
-    print()
-
-    # Streak breakdown
-    print("=== STREAK LENGTH BREAKDOWN ===")
-    for sl in range(trigger, min(trigger + 4, 8)):
-        sl_wins = sl_total = 0
-        for i in range(sl, len(outcomes)):
-            window = outcomes[i - sl : i]
-            # Must be exactly this streak length (not longer)
-            if len(set(window)) == 1:
-                if i - sl - 1 >= 0 and outcomes[i - sl - 1] == window[0]:
-                    continue  # streak is actually longer
-                sl_total += 1
-                bet_dir = "down" if window[0] == "up" else "up"
-                if outcomes[i] == bet_dir:
-                    sl_wins += 1
-        if sl_total:
-            print(
-                f"  Exactly {sl}-streak: {sl_wins}/{sl_total} ({sl_wins / sl_total:.1%} reversal)"
-            )
-
-    # Print last 10 trades
-    print()
-    print("=== LAST 10 TRADES ===")
-    for t in trades[-10:]:
-        emoji = "✅" if t["won"] else "❌"
+
+def print_streaks(rows: list[dict]):
+    print(f"{'len':>4} {'exact':>8} {'reversal':>9} {'>=len':>8} {'reversal':>9}")
+    for r in rows:
+        exact = f"{r['exact_reversal']:.1%}" if r["exact_reversal"] is not None else "-"
+        at_least = (
+            f"{r['at_least_reversal']:.1%}"
+            if r["at_least_reversal"] is not None
+            else "-"
+        )
         print(
-            f"  {emoji} {t['streak']} → bet {t['bet']} → actual {t['actual']} "
-            f"| PnL: ${t['pnl']:+.2f} | Bankroll: ${t['bankroll']:.2f}"
+            f"{r['length']:>4} {r['exact']:>8} {exact:>9} {r['at_least']:>8} {at_least:>9}"
         )
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(description="Streak reversal backtest")
     parser.add_argument(
-        "--data", default="../polymarket-research/data/polymarket_all_resolved.json"
+        "--data",
+        default=Config.DATASET_DIR,
+        help="Dataset directory (scripts/build_dataset.py) or JSON market list",
+    )
+    parser.add_argument("--triggers", type=number_list, default=[3, 4, 5])
+    parser.add_argument(
+        "--amounts", type=number_list, default=[10], help="Flat bet sizes"
     )
-    parser.add_argument("--trigger", type=int, default=4)
-    parser.add_argument("--amount", type=float, default=10)
-    parser.add_argument("--bankroll", type=float, default=1000)
     parser.add_argument(
-        "--fee", type=float, default=0.05, help="Fee as decimal (0.05 = 5%)"
+        "--fees", type=number_list, default=[0.05], help="Fees as decimals (0.05 = 5%%)"
     )
+    parser.add_argument(
+        "--kelly", type=number_list, default=[], help="Kelly fractions (e.g. 0.25,1)"
+    )
+    parser.add_argument("--bankroll", type=float, default=1000)
+    parser.add_argument("--price", type=float, default=0.5, help="Entry price")
+    parser.add_argument("--max-streak", type=int, default=10)
+    parser.add_argument("--curves", help="Save equity curves to this .npz file")
     args = parser.parse_args()
 
-    backtest(args.data, args.trigger, args.amount, args.bankroll, args.fee)
+    outcomes = load_outcomes(args.data)
+    ups = int(np.count_nonzero(outcomes))
+    print(f"Markets: {len(outcomes)}, Up: {ups}, Down: {len(outcomes) - ups}")
+    if not len(outcomes):
+        print("No resolved markets to backtest")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    result = sweep(
+        outcomes,
+        triggers=[int(t) for t in args.triggers],
+        amounts=args.amounts,
+        fees=args.fees,
+        kelly_fractions=args.kelly,
+        bankroll=args.bankroll,
+        price=args.price,
+    )
+    streaks = streak_table(outcomes, max_len=args.max_streak)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n=== SWEEP ({len(result.rows)} configs, {elapsed * 1000:.0f}ms) ===")
+    print_sweep(result.rows)
+
+    print("\n=== REVERSAL RATE BY STREAK LENGTH ===")
+    print_streaks(streaks)
 
-    # Also run with different triggers for comparison
-    print("\n" + "=" * 60)
-    print("=== COMPARISON ACROSS TRIGGERS ===")
-    print("=" * 60)
-    for t in [3, 4, 5]:
-        print()
-        backtest(args.data, t, args.amount, args.bankroll, args.fee)
+    print("\n=== BEST BY PnL ===")
+    print_sweep(result.best("pnl", n=5))
+
+    if args.curves:
+        np.savez_compressed(
+            args.curves,
+            equity=result.equity.astype(np.float32),
+            configs=np.array([json.dumps(r) for r in result.rows]),
+        )
+        print(f"\nSaved {len(result.rows)} equity curves to {args.curves}")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: prefix-sum depth index vs walking the book per quote.
+
+Compares the previous per-call walk over raw string-dict levels (sort +
+float() on every call) with a prebuilt ``BookDepth`` answered by binary
+search, at several book depths. Also times the inverse query
+(max size under a slippage limit) and the one-off index build.
+
+Usage:
+    python scripts/bench_depth.py
+    python scripts/bench_depth.py --levels 10,100,1000 --quotes 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.orderbook import BookDepth
+
+
+def legacy_quote(
+    book: dict, side: str, amount_usd: float
+) -> tuple[float, float, float]:
+    """Previous estimate_execution_from_book walk, kept here only for comparison."""
+    asks_sorted = sorted(book["asks"], key=lambda x: float(x["price"]))
+    bids_sorted = sorted(book["bids"], key=lambda x: float(x["price"]), reverse=True)
+    levels = asks_sorted if side == "BUY" else bids_sorted
+
+    remaining_usd = amount_usd
+    total_shares = 0.0
+    total_cost = 0.0
+    for level in levels:
+        price = float(level["price"])
+        size = float(level["size"])
+        level_value = price * size
+        if remaining_usd <= 0:
+            break
+        if level_value >= remaining_usd:
+            total_shares += remaining_usd / price
+            total_cost += remaining_usd
+            remaining_usd = 0
+        else:
+            total_shares += size
+            total_cost += level_value
+            remaining_usd -= level_value
+
+    exec_price = total_cost / total_shares
+    best = float(levels[0]["price"])
+    slippage_pct = abs(exec_price - best) / best * 100
+    fill_pct = (amount_usd - remaining_usd) / amount_usd * 100
+    return exec_price, slippage_pct, fill_pct
+
+
+def legacy_max_size(book: dict, side: str, max_slippage_pct: float) -> float:
+    """Walk-based max size under slippage: grow the order level by level."""
+    if side == "BUY":
+        levels = sorted(book["asks"], key=lambda x: float(x["price"]))
+    else:
+        levels = sorted(book["bids"], key=lambda x: float(x["price"]), reverse=True)
+    best = float(levels[0]["price"])
+    sign = 1 if side == "BUY" else -1
+    limit = best * (1 + sign * max_slippage_pct / 100)
+
+    shares = notional = 0.0
+    for level in levels:
+        price = float(level["price"])
+        size = float(level["size"])
+        if sign * (notional + price * size) > sign * limit * (shares + size):
+            partial = (limit * shares - notional) / (1 - limit / price)
+            return notional + max(0.0, min(partial, price * size))
+        shares += size
+        notional += price * size
+    return notional
+
+
+def make_book(levels: int, rng: random.Random) -> dict:
+    """Book with `levels` levels per side spread across (0.01, 0.99)."""
+    step = 0.49 / levels
+    bids = [
+        {"price": f"{0.495 - i * step:.5f}", "size": f"{rng.uniform(5, 500):.2f}"}
+        for i in range(levels)
+    ]
+    asks = [
+        {"price": f"{0.505 + i * step:.5f}", "size": f"{rng.uniform(5, 500):.2f}"}
+        for i in range(levels)
+    ]
+    rng.shuffle(bids)
+    rng.shuffle(asks)
+    return {"bids": bids, "asks": asks}
+
+
+def timed(fn, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Depth index micro-benchmark")
+    parser.add_argument(
+        "--levels", default="10,100,1000", help="Comma-separated levels per side"
+    )
+    parser.add_argument("--quotes", type=int, default=5000, help="Quotes to time")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print("=== DEPTH INDEX BENCH (µs per call) ===")
+    print(
+        f"{'levels':>7}{'walk quote':>12}{'idx quote':>11}{'speedup':>9}"
+        f"{'walk maxsz':>12}{'idx maxsz':>11}{'idx build':>11}"
+    )
+
+    for levels in (int(x) for x in args.levels.split(",")):
+        book = make_book(levels, rng)
+        depth = BookDepth.from_snapshot(book)
+        total = depth.asks.total_notional
+        # Sizes from a single level up to ~half the side
+        sizes = [rng.uniform(1, total / 2) for _ in range(args.quotes)]
+
+        # Both implementations must agree
+        for amount in sizes[:50]:
+            for side in ("BUY", "SELL"):
+                a = legacy_quote(book, side, amount)
+                b = depth.quote(side, amount)
+                assert all(abs(x - y) < 1e-6 for x, y in zip(a, b)), (side, a, b)
+        for pct in (0.5, 2.0, 10.0):
+            for side in ("BUY", "SELL"):
+                a = legacy_max_size(book, side, pct)
+                b = depth.max_size_for_slippage(side, pct)
+                assert abs(a - b) < 1e-6, (side, pct, a, b)
+
+        n = args.quotes if levels <= 100 else max(200, args.quotes // 10)
+        # Loop variables bound as defaults so each lambda sees this level
+        walk_q = timed(
+            lambda i, book=book, sizes=sizes: legacy_quote(book, "BUY", sizes[i]), n
+        )
+        idx_q = timed(
+            lambda i, depth=depth, sizes=sizes: depth.quote("BUY", sizes[i]),
+            args.quotes,
+        )
+        walk_m = timed(lambda i, book=book: legacy_max_size(book, "BUY", 1 + i % 5), n)
+        idx_m = timed(
+            lambda i, depth=depth: depth.max_size_for_slippage("BUY", 1 + i % 5),
+            args.quotes,
+        )
+        build = timed(
+            lambda i, book=book: BookDepth.from_snapshot(book), max(50, n // 10)
+        )
+
+        print(
+            f"{levels:>7}{walk_q:>12.2f}{idx_q:>11.2f}{walk_q / idx_q:>8.0f}x"
+            f"{walk_m:>12.2f}{idx_m:>11.2f}{build:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
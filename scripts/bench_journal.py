@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Benchmark: save latency of the append-only journal vs full-file rewrites.
+
+Grows one journal from 100 to 1,000,000 trades and, at each size, times a
+save round as the bot does it: append a new trade, then append its settled
+copy. The previous implementation (load + rewrite ``trade_history_full.json``
+with indent=2, twice per save) is timed alongside at the smaller sizes.
+Also reports how long reopening the journal (index load) and reading the
+pending set take.
+
+Usage:
+    python scripts/bench_journal.py
+    python scripts/bench_journal.py --sizes 100,1000,10000 --legacy-max 10000
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.trader import Trade
+from src.infra.journal import TradeJournal
+
+
+def make_record(template: dict, i: int, settled: bool = True) -> dict:
+    """Synthetic nested trade record number ``i``."""
+    record = copy.deepcopy(template)
+    ts = 1_700_000_000 + i * 300
+    record["id"] = f"{ts}_{ts * 1000 + 7}_up"
+    record["market"]["timestamp"] = ts
+    record["market"]["slug"] = f"btc-updown-5m-{ts}"
+    record["execution"]["timestamp"] = ts * 1000 + 7
+    if settled:
+        record["settlement"].update(
+            status="settled", outcome="up", won=True, net_profit=4.5
+        )
+    return record
+
+
+def legacy_save(path: str, record: dict, settled: dict):
+    """Old TradingState.save history path: append pass + settlement pass."""
+    with open(path) as f:
+        history = json.load(f)
+    history.append(record)
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+
+    with open(path) as f:
+        history = json.load(f)
+    history[-1] = settled
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trade journal save benchmark")
+    parser.add_argument(
+        "--sizes",
+        default="100,1000,10000,100000,1000000",
+        help="Comma-separated history sizes",
+    )
+    parser.add_argument("--rounds", type=int, default=200, help="Saves per size")
+    parser.add_argument(
+        "--legacy-max", type=int, default=10000, help="Largest size for old path"
+    )
+    args = parser.parse_args()
+
+    template = Trade(
+        timestamp=1_700_000_000,
+        market_slug="btc-updown-5m-1700000000",
+        direction="up",
+        amount=5.0,
+        entry_price=0.52,
+        streak_length=4,
+        confidence=0.6,
+        paper=True,
+        executed_at=1_700_000_000_007,
+    ).to_nested_json()
+
+    sizes = sorted(int(x) for x in args.sizes.split(","))
+    workdir = tempfile.mkdtemp(prefix="bench_journal_")
+    path = os.path.join(workdir, "trade_history.jsonl")
+    legacy_path = os.path.join(workdir, "trade_history_full.json")
+    journal = TradeJournal(path, legacy_path="", compact_min_dead=10**9)
+
+    print(f"=== TRADE JOURNAL SAVE BENCH ({args.rounds} saves/size) ===")
+    print(
+        f"{'trades':>9}{'save p50':>11}{'save p99':>11}{'legacy':>11}"
+        f"{'reopen':>10}{'pending':>10}{'file MB':>9}"
+    )
+
+    count = 0
+    next_id = 10**7  # ids for timed saves never collide with the fill
+    for size in sizes:
+        # Grow the history (settled trades, like a long-running bot)
+        journal.append_many(make_record(template, i) for i in range(count, size))
+        count = size
+
+        lat_ms = []
+        for _ in range(args.rounds):
+            pending = make_record(template, next_id, settled=False)
+            settled = make_record(template, next_id)
+            next_id += 1
+            start = time.perf_counter()
+            journal.append(pending)
+            journal.append(settled)
+            lat_ms.append((time.perf_counter() - start) * 1000)
+
+        legacy_ms = None
+        if size <= args.legacy_max:
+            history = [make_record(template, i) for i in range(size)]
+            with open(legacy_path, "w") as f:
+                json.dump(history, f, indent=2)
+            del history
+            reps = 5
+            start = time.perf_counter()
+            for r in range(reps):
+                legacy_save(
+                    legacy_path,
+                    make_record(template, next_id + r, settled=False),
+                    make_record(template, next_id + r),
+                )
+            legacy_ms = (time.perf_counter() - start) / reps * 1000
+
+        journal.close()
+        start = time.perf_counter()
+        journal = TradeJournal(path, legacy_path="", compact_min_dead=10**9)
+        reopen_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        pending_count = sum(1 for _ in journal.entries(status="pending"))
+        pending_ms = (time.perf_counter() - start) * 1000
+        assert pending_count == 0
+
+        legacy = f"{legacy_ms:>9.1f}ms" if legacy_ms is not None else f"{'-':>11}"
+        print(
+            f"{size:>9}{percentile(lat_ms, 0.5) * 1000:>9.0f}µs"
+            f"{percentile(lat_ms, 0.99) * 1000:>9.0f}µs{legacy}"
+            f"{reopen_ms:>8.0f}ms{pending_ms:>8.1f}ms"
+            f"{os.path.getsize(path) / 1e6:>9.1f}"
+        )
+
+    journal.close()
+    for name in os.listdir(workdir):
+        os.remove(os.path.join(workdir, name))
+    os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    main()
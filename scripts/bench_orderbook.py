@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: tick-indexed order book vs the previous list-based book.
+
+Replays the same stream of price_change deltas into both implementations and
+reports per-delta apply cost, top-of-book read cost and execution quote cost.
+
+Usage:
+    python scripts/bench_orderbook.py
+    python scripts/bench_orderbook.py --levels 100 --deltas 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.orderbook import OrderBookLevel, TickOrderBook
+
+
+class LegacyOrderBook:
+    """Previous CachedOrderBook update logic, kept here only for comparison."""
+
+    def __init__(self):
+        self.bids: list[OrderBookLevel] = []
+        self.asks: list[OrderBookLevel] = []
+        self.best_bid = 0.0
+        self.best_ask = 0.0
+        self.mid = 0.5
+        self.timestamp = 0.0
+
+    def update_from_snapshot(self, data: dict):
+        self.bids = [
+            OrderBookLevel(float(b["price"]), float(b["size"]))
+            for b in data.get("bids", [])
+        ]
+        self.asks = [
+            OrderBookLevel(float(a["price"]), float(a["size"]))
+            for a in data.get("asks", [])
+        ]
+        self._recalculate()
+
+    def update_from_delta(self, data: dict):
+        for change in data.get("changes", []):
+            side = change.get("side")
+            price = float(change.get("price", 0))
+            size = float(change.get("size", 0))
+            if side == "BUY":
+                self._update_level(self.bids, price, size, reverse=True)
+            elif side == "SELL":
+                self._update_level(self.asks, price, size, reverse=False)
+        self._recalculate()
+
+    def _update_level(self, levels, price, size, reverse):
+        for i, level in enumerate(levels):
+            if abs(level.price - price) < 0.0001:
+                if size == 0:
+                    levels.pop(i)
+                else:
+                    level.size = size
+                return
+        if size > 0:
+            levels.append(OrderBookLevel(price, size))
+            levels.sort(key=lambda x: x.price, reverse=reverse)
+
+    def _recalculate(self):
+        self.timestamp = time.time()
+        if self.bids:
+            self.bids.sort(key=lambda x: x.price, reverse=True)
+            self.best_bid = self.bids[0].price
+        if self.asks:
+            self.asks.sort(key=lambda x: x.price)
+            self.best_ask = self.asks[0].price
+        if self.best_bid > 0 and self.best_ask > 0:
+            self.mid = (self.best_bid + self.best_ask) / 2
+
+    def get_execution_price(self, side, amount_usd):
+        levels = self.asks if side == "BUY" else self.bids
+        if not levels:
+            return self.mid, 0.0, 0.0
+        remaining = amount_usd
+        total_shares = 0.0
+        total_cost = 0.0
+        for level in levels:
+            if remaining <= 0:
+                break
+            level_value = level.price * level.size
+            if level_value >= remaining:
+                total_shares += remaining / level.price
+                total_cost += remaining
+                remaining = 0
+            else:
+                total_shares += level.size
+                total_cost += level_value
+                remaining -= level_value
+        if total_shares == 0:
+            return self.mid, 0.0, 0.0
+        exec_price = total_cost / total_shares
+        fill_pct = (amount_usd - remaining) / amount_usd * 100
+        best = self.best_ask if side == "BUY" else self.best_bid
+        slippage_pct = abs(exec_price - best) / best * 100 if best > 0 else 0.0
+        return exec_price, slippage_pct, fill_pct
+
+
+def make_snapshot(levels: int, rng: random.Random) -> dict:
+    """Build a book with `levels` levels per side on a 0.001 grid around 0.50."""
+    bids = [
+        {"price": f"{0.499 - i * 0.001:.3f}", "size": f"{rng.uniform(5, 500):.2f}"}
+        for i in range(levels)
+    ]
+    asks = [
+        {"price": f"{0.501 + i * 0.001:.3f}", "size": f"{rng.uniform(5, 500):.2f}"}
+        for i in range(levels)
+    ]
+    return {"bids": bids, "asks": asks}
+
+
+def make_deltas(levels: int, count: int, rng: random.Random) -> list[dict]:
+    """Deltas concentrated near the top of book, ~25% of them removals."""
+    deltas = []
+    for _ in range(count):
+        side = rng.choice(("BUY", "SELL"))
+        offset = min(int(rng.expovariate(0.15)), levels + 10)
+        price = 0.499 - offset * 0.001 if side == "BUY" else 0.501 + offset * 0.001
+        size = 0.0 if rng.random() < 0.25 else rng.uniform(5, 500)
+        deltas.append(
+            {"changes": [{"side": side, "price": f"{price:.3f}", "size": f"{size}"}]}
+        )
+    return deltas
+
+
+def bench(book, snapshot: dict, deltas: list[dict], quotes: int) -> dict:
+    book.update_from_snapshot(snapshot)
+
+    start = time.perf_counter()
+    for delta in deltas:
+        book.update_from_delta(delta)
+    apply_us = (time.perf_counter() - start) / len(deltas) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(quotes):
+        _ = (book.best_bid, book.best_ask, book.mid)
+    top_us = (time.perf_counter() - start) / quotes * 1e6
+
+    start = time.perf_counter()
+    for i in range(quotes):
+        book.get_execution_price("BUY" if i % 2 else "SELL", 50.0)
+    quote_us = (time.perf_counter() - start) / quotes * 1e6
+
+    return {"apply_us": apply_us, "top_us": top_us, "quote_us": quote_us}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order book micro-benchmark")
+    parser.add_argument("--levels", type=int, default=50, help="Levels per side")
+    parser.add_argument("--deltas", type=int, default=20000, help="Deltas to apply")
+    parser.add_argument("--quotes", type=int, default=5000, help="Quotes to time")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    snapshot = make_snapshot(args.levels, rng)
+    deltas = make_deltas(args.levels, args.deltas, rng)
+
+    legacy = LegacyOrderBook()
+    tick = TickOrderBook()
+    legacy_res = bench(legacy, snapshot, deltas, args.quotes)
+    tick_res = bench(tick, snapshot, deltas, args.quotes)
+
+    # Both engines must agree on the final book
+    assert abs(legacy.best_bid - tick.best_bid) < 1e-9
+    assert abs(legacy.best_ask - tick.best_ask) < 1e-9
+    for side in ("BUY", "SELL"):
+        a = legacy.get_execution_price(side, 250.0)
+        b = tick.get_execution_price(side, 250.0)
+        assert all(abs(x - y) < 1e-9 for x, y in zip(a, b)), (side, a, b)
+
+    print(f"=== ORDER BOOK BENCH: {args.levels} levels/side, {args.deltas} deltas ===")
+    print(f"{'':<20}{'legacy':>12}{'tick':>12}{'speedup':>10}")
+    for key, label in (
+        ("apply_us", "apply delta (µs)"),
+        ("top_us", "top-of-book (µs)"),
+        ("quote_us", "exec quote (µs)"),
+    ):
+        speedup = legacy_res[key] / tick_res[key] if tick_res[key] > 0 else 0
+        print(
+            f"{label:<20}{legacy_res[key]:>12.3f}{tick_res[key]:>12.3f}{speedup:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Benchmark: history queries on the SQLite trade store vs the journal.
+
+Writes N synthetic trades (mixed strategies, copied wallets and settlement
+states) to a JSONL journal, imports it into a TradeStore in one pass, then
+times the queries behind ``history.py --stats`` / ``--limit`` / filters on
+both backends. The journal answers them by reading records in Python; the
+store runs one indexed SQL query. Journal timings are skipped above
+``--journal-max`` trades.
+
+Usage:
+    python scripts/bench_trade_store.py
+    python scripts/bench_trade_store.py --trades 100000 --journal-max 100000
+"""
+
+import argparse
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.trader import Trade
+from src.infra.journal import TradeJournal
+from src.infra.trade_store import TradeStore
+
+WALLETS = [f"0x{i:040x}" for i in range(50)]
+
+
+def make_record(template: dict, copy_template: dict, i: int) -> dict:
+    """Synthetic nested trade record number ``i``."""
+    record = copy.deepcopy(copy_template if i % 3 == 0 else template)
+    ts = 1_700_000_000 + i * 300
+    record["id"] = f"{ts}_{ts * 1000 + 7}_up"
+    record["market"]["timestamp"] = ts
+    record["market"]["slug"] = f"btc-updown-5m-{ts}"
+    record["execution"]["timestamp"] = ts * 1000 + 7
+    record["execution"]["slippage_pct"] = (i % 7) * 0.1
+    if record.get("copytrade"):
+        record["copytrade"]["wallet"] = WALLETS[i % len(WALLETS)]
+    if i % 100 == 99:
+        return record  # 1% still pending
+    won = i % 5 < 3
+    record["settlement"].update(
+        status="settled",
+        outcome="up" if won else "down",
+        won=won,
+        gross_profit=4.6 if won else -5.0,
+        fee_amount=0.1 if won else 0.0,
+        net_profit=4.5 if won else -5.0,
+    )
+    return record
+
+
+def timed(fn, reps: int) -> tuple[float, object]:
+    """Best-of-``reps`` wall time in ms, and the last result."""
+    best, result = float("inf"), None
+    for _ in range(reps):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trade store query benchmark")
+    parser.add_argument("--trades", type=int, default=1_000_000)
+    parser.add_argument("--reps", type=int, default=5, help="Repetitions per query")
+    parser.add_argument(
+        "--journal-max",
+        type=int,
+        default=200_000,
+        help="Largest history the journal queries are timed on",
+    )
+    args = parser.parse_args()
+
+    base = dict(
+        timestamp=1_700_000_000,
+        market_slug="btc-updown-5m-1700000000",
+        direction="up",
+        amount=5.0,
+        entry_price=0.52,
+        streak_length=4,
+        confidence=0.6,
+        paper=True,
+        executed_at=1_700_000_000_007,
+        fee_pct=0.025,
+    )
+    template = Trade(**base).to_nested_json()
+    copy_template = Trade(
+        **base,
+        strategy="copytrade",
+        copied_from=WALLETS[0],
+        trader_name="whale",
+        delay_impact_pct=0.4,
+    ).to_nested_json()
+
+    workdir = tempfile.mkdtemp(prefix="bench_store_")
+    journal_path = os.path.join(workdir, "trade_history.jsonl")
+    db_path = os.path.join(workdir, "trades.db")
+
+    print(f"=== TRADE STORE BENCH ({args.trades:,} trades) ===")
+    start = time.perf_counter()
+    journal = TradeJournal(journal_path, legacy_path="", compact_min_dead=10**9)
+    journal.append_many(
+        make_record(template, copy_template, i) for i in range(args.trades)
+    )
+    journal.close()
+    print(f"Journal written:   {time.perf_counter() - start:8.1f}s")
+
+    start = time.perf_counter()
+    store = TradeStore(db_path, import_paths=[journal_path])
+    print(
+        f"One-pass import:   {time.perf_counter() - start:8.1f}s "
+        f"({len(store):,} rows, {os.path.getsize(db_path) / 1e6:.0f} MB)"
+    )
+
+    wallet = WALLETS[7]
+    queries = [
+        ("summary (--stats)", lambda h: h.summary()),
+        ("summary strategy", lambda h: h.summary(strategy="copytrade")),
+        ("summary wallet", lambda h: h.summary(wallet=wallet)),
+        ("recent 20 (--limit)", lambda h: h.recent(20)),
+        ("recent 20 wallet", lambda h: h.recent(20, wallet=wallet)),
+        ("pending set", lambda h: h.recent(status="pending")),
+    ]
+
+    journal = None
+    if args.trades <= args.journal_max:
+        journal = TradeJournal(journal_path, legacy_path="", compact_min_dead=10**9)
+
+    print(f"\n{'query':<22}{'sqlite':>11}{'journal':>12}")
+    for name, query in queries:
+        sql_ms, sql_result = timed(lambda query=query: query(store), args.reps)
+        journal_col = f"{'-':>12}"
+        if journal is not None:
+            journal_ms, journal_result = timed(lambda query=query: query(journal), 1)
+            journal_col = f"{journal_ms:>10.1f}ms"
+            if isinstance(sql_result, dict):
+                assert sql_result["wins"] == journal_result["wins"], name
+                assert (
+                    abs(sql_result["realized_pnl"] - journal_result["realized_pnl"])
+                    < 1e-6
+                )
+            else:
+                assert [r["id"] for r in sql_result] == [
+                    r["id"] for r in journal_result
+                ], name
+        print(f"{name:<22}{sql_ms:>9.1f}ms{journal_col}")
+
+    if journal is not None:
+        journal.close()
+    store.close()
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Build or extend the historical BTC 5-min market dataset.
+
+Enumerates windows (``btc-updown-5m-{ts}``) over a date range, fetches
+the ones the dataset doesn't have with bounded concurrency, and stores
+them as columnar ``.npy`` files (see ``src/core/dataset.py``). Progress is
+checkpointed, so an interrupted build resumes, and re-runs fetch only new
+windows. ``scripts/backtest.py`` reads the result.
+
+Usage:
+    python scripts/build_dataset.py                      # last 365 days
+    python scripts/build_dataset.py --days 30
+    python scripts/build_dataset.py --start 2025-01-01 --end 2025-07-01
+    python scripts/build_dataset.py --workers 16 --rate 60
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.core.dataset import build_dataset
+
+
+def parse_date(value: str) -> int:
+    """YYYY-MM-DD (UTC) -> unix seconds."""
+    day = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return int(day.timestamp())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historical market dataset builder")
+    parser.add_argument("--start", type=parse_date, help="First day (UTC, YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_date, help="Stop before this day (UTC)")
+    parser.add_argument(
+        "--days", type=int, default=365, help="Range ending now when --start is unset"
+    )
+    parser.add_argument("--out", default=Config.DATASET_DIR, help="Dataset directory")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent fetches")
+    parser.add_argument("--rate", type=int, default=60, help="Max requests per second")
+    args = parser.parse_args()
+
+    end = args.end or int(time.time())
+    start = args.start or end - args.days * 86400
+
+    print(f"=== DATASET BUILD -> {args.out} ===")
+    print(
+        f"Range: {datetime.fromtimestamp(start, tz=timezone.utc):%Y-%m-%d %H:%M} -> "
+        f"{datetime.fromtimestamp(end, tz=timezone.utc):%Y-%m-%d %H:%M} UTC "
+        f"({args.workers} workers, {args.rate} req/s)"
+    )
+    try:
+        result = build_dataset(
+            start, end, path=args.out, workers=args.workers, rate_per_sec=args.rate
+        )
+    except KeyboardInterrupt:
+        print("\nInterrupted; completed windows are saved. Re-run to resume.")
+        return
+
+    print(
+        f"\nWindows: {result['windows']:,} ({result['already_present']:,} already present)"
+    )
+    print(f"Fetched: {result['fetched']:,}, added: {result['added']:,}")
+    print(f"Dataset: {result['rows']:,} resolved markets")
+    print(f"Time:    {result['seconds']:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
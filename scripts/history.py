@@ -11,28 +11,84 @@ Usage:
     python history.py --stats          # Show statistics only
     python history.py --export json    # Export to trade_history.json
     python history.py --export csv     # Export to trade_history.csv
+    python history.py --stats --strategy copytrade  # Filter by strategy
+    python history.py --limit 50 --wallet 0xabc...  # Filter by copied wallet
+    python history.py --import-json trade_history_full.json  # Load into store
     python history.py --backfill       # Backfill settlement data for unsettled trades
     python history.py --backfill --watch  # Keep retrying until all settled (every 5 min)
+
+--backfill and --import-json write the trade history, so they refuse to run
+while a bot holds the journal's writer lock (the bot settles its own trades).
 """
 
 import argparse
 import time
 from datetime import datetime
 from src.config import TIMEZONE_NAME
-from src.core.trader import TradingState
+from src.core.trader import Trade, TradingState
+from src.infra.journal import JournalLockedError
+from src.infra.trade_store import get_history_store, iter_history_file
+
+
+def print_stats(stats: dict):
+    """Print the statistics block."""
+    print("\n" + "=" * 60)
+    print(f"TRADING STATISTICS ({TIMEZONE_NAME})")
+    print("=" * 60)
+    print("\nTrades:")
+    print(f"  Total:    {stats['total_trades']}")
+    print(f"  Settled:  {stats['settled_trades']}")
+    print(f"  Pending:  {stats['pending_trades']}")
+    print(f"  Wins:     {stats['wins']}")
+    print(f"  Losses:   {stats['losses']}")
+    print(f"  Win Rate: {stats['win_rate']:.1f}%")
+
+    print("\nProfit & Loss:")
+    print(f"  Realized P&L:    ${stats['realized_pnl']:+.2f}")
+    if stats["pending_trades"] > 0:
+        print(
+            f"  Unrealized P&L:  ${stats['unrealized_pnl']:+.2f} ({stats['pending_trades']} pending)"
+        )
+        print(f"  Total P&L (est): ${stats['total_pnl']:+.2f}")
+    print(f"  Gross Profit:    ${stats['total_gross_profit']:+.2f}")
+    print(f"  Fees Paid:       ${stats['total_fees_paid']:.2f}")
+    print(f"  Avg Win:         ${stats['avg_win']:+.2f}")
+    print(f"  Avg Loss:        ${stats['avg_loss']:+.2f}")
+    print(f"  Largest Win:     ${stats['largest_win']:+.2f}")
+    print(f"  Largest Loss:    ${stats['largest_loss']:+.2f}")
+
+    print("\nCosts (Averages):")
+    print(f"  Fee:             {stats['avg_fee_pct']:.2f}%")
+    print(f"  Slippage:        {stats['avg_slippage_pct']:.2f}%")
+    print(f"  Delay Impact:    {stats['avg_delay_impact_pct']:.2f}%")
+
+    print(f"\nBankroll: ${stats['bankroll']:.2f}")
+    print("=" * 60 + "\n")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Trade History Viewer")
     parser.add_argument("--all", action="store_true", help="Show all trades")
     parser.add_argument(
-        "--limit", type=int, default=20, help="Number of trades to show"
+        "--limit",
+        type=int,
+        default=None,
+        help="Number of trades to show (default 20) or export (default all)",
     )
     parser.add_argument("--stats", action="store_true", help="Show statistics only")
     parser.add_argument(
         "--export", choices=["json", "csv"], help="Export history to file"
     )
     parser.add_argument("--output", type=str, help="Output file path for export")
+    parser.add_argument("--strategy", type=str, help="Only trades of this strategy")
+    parser.add_argument(
+        "--wallet", type=str, help="Only trades copied from this wallet"
+    )
+    parser.add_argument(
+        "--import-json",
+        metavar="PATH",
+        help="Import a JSON/JSONL history file into the history store",
+    )
     parser.add_argument(
         "--recent",
         action="store_true",
@@ -56,13 +112,24 @@ def main():
     )
     args = parser.parse_args()
 
+    if args.import_json:
+        try:
+            count = get_history_store().append_many(iter_history_file(args.import_json))
+        except JournalLockedError as e:
+            raise SystemExit(f"Cannot import: {e}")
+        print(f"Imported {count} trade records from {args.import_json}")
+        return
+
     # Backfill settlement data if requested
     if args.backfill:
         print("Backfilling settlement data for unsettled trades...")
         total_updated = 0
 
         while True:
-            updated, remaining = TradingState.backfill_settlements()
+            try:
+                updated, remaining = TradingState.backfill_settlements()
+            except JournalLockedError as e:
+                raise SystemExit(f"Cannot backfill: {e}")
             total_updated += updated
 
             if remaining == 0:
@@ -96,12 +163,39 @@ def main():
 
         return
 
-    # Load full history by default, or recent only if requested
+    # Statistics are aggregated by the history store (SQL with the sqlite
+    # backend); only pending trades are loaded, marked once for unrealized PnL
+    if args.stats and not args.recent:
+        state = TradingState.load()
+        state.update_unrealized_pnl(
+            [
+                Trade.from_nested_json(r)
+                for r in get_history_store().recent(
+                    strategy=args.strategy, wallet=args.wallet, status="pending"
+                )
+            ]
+        )
+        print_stats(
+            state.get_statistics(
+                full_history=True, strategy=args.strategy, wallet=args.wallet
+            )
+        )
+        return
+
+    # Load full history by default, or recent only if requested. Only the
+    # last --limit matching trades are read from the store.
+    limit = args.limit
+    if args.all or (limit is None and args.export):
+        limit = None
+    elif limit is None:
+        limit = 20
     if args.recent:
         state = TradingState.load()
         print("(Showing recent trades from working state)")
     else:
-        state = TradingState.load_full_history()
+        state = TradingState.load_full_history(
+            limit=limit, strategy=args.strategy, wallet=args.wallet
+        )
         print(f"(Loaded full history: {len(state.trades)} trades)")
 
     if not state.trades:
@@ -118,46 +212,16 @@ def main():
             state.export_history_csv(filepath)
         return
 
+    # Mark pending trades once; the views below read the marks
+    state.update_unrealized_pnl()
+
     # Show statistics
     if args.stats:
-        stats = state.get_statistics()
-        print("\n" + "=" * 60)
-        print(f"TRADING STATISTICS ({TIMEZONE_NAME})")
-        print("=" * 60)
-        print("\nTrades:")
-        print(f"  Total:    {stats['total_trades']}")
-        print(f"  Settled:  {stats['settled_trades']}")
-        print(f"  Pending:  {stats['pending_trades']}")
-        print(f"  Wins:     {stats['wins']}")
-        print(f"  Losses:   {stats['losses']}")
-        print(f"  Win Rate: {stats['win_rate']:.1f}%")
-
-        print("\nProfit & Loss:")
-        print(f"  Realized P&L:    ${stats['realized_pnl']:+.2f}")
-        if stats["pending_trades"] > 0:
-            print(
-                f"  Unrealized P&L:  ${stats['unrealized_pnl']:+.2f} ({stats['pending_trades']} pending)"
-            )
-            print(f"  Total P&L (est): ${stats['total_pnl']:+.2f}")
-        print(f"  Gross Profit:    ${stats['total_gross_profit']:+.2f}")
-        print(f"  Fees Paid:       ${stats['total_fees_paid']:.2f}")
-        print(f"  Avg Win:         ${stats['avg_win']:+.2f}")
-        print(f"  Avg Loss:        ${stats['avg_loss']:+.2f}")
-        print(f"  Largest Win:     ${stats['largest_win']:+.2f}")
-        print(f"  Largest Loss:    ${stats['largest_loss']:+.2f}")
-
-        print("\nCosts (Averages):")
-        print(f"  Fee:             {stats['avg_fee_pct']:.2f}%")
-        print(f"  Slippage:        {stats['avg_slippage_pct']:.2f}%")
-        print(f"  Delay Impact:    {stats['avg_delay_impact_pct']:.2f}%")
-
-        print(f"\nBankroll: ${stats['bankroll']:.2f}")
-        print("=" * 60 + "\n")
+        print_stats(state.get_statistics())
         return
 
     # Show trade history
-    limit = len(state.trades) if args.all else args.limit
-    state.print_history(limit=limit)
+    state.print_history(limit=len(state.trades) if limit is None else limit)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Monte Carlo bankroll simulation from your trade history.
+
+Resamples settled trades (win rate and PnL per dollar) into 100k+
+bankroll paths and compares sizing rules under the MIN_BET,
+MAX_DAILY_BETS and MAX_DAILY_LOSS limits (``src/research/montecarlo.py``).
+Without enough history, ``--win-rate`` / ``--price`` describe the bets
+instead. Requires NumPy (``pip install .[research]``).
+
+Usage:
+    python scripts/simulate.py
+    python scripts/simulate.py --sizing flat,kelly,kelly:1,martingale --bets 10000
+    python scripts/simulate.py --strategy streak --bankroll 50 --amount 2
+    python scripts/simulate.py --win-rate 0.667 --price 0.52
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.core.trader import Trade
+from src.infra.trade_store import get_history_store
+from src.research.montecarlo import (
+    Sizing,
+    outcomes_from_trades,
+    simulate,
+    synthetic_outcomes,
+)
+
+
+def parse_sizing(value: str, amount: float, max_levels: int) -> list[Sizing]:
+    """Parse e.g. ``flat,kelly:0.5,martingale`` (kelly defaults to 0.25)."""
+    rules = []
+    for spec in value.split(","):
+        mode, _, arg = spec.strip().partition(":")
+        if mode == "kelly":
+            rules.append(Sizing("kelly", fraction=float(arg or 0.25)))
+        elif mode == "martingale":
+            rules.append(
+                Sizing("martingale", amount=float(arg or amount), max_levels=max_levels)
+            )
+        elif mode == "flat":
+            rules.append(Sizing("flat", amount=float(arg or amount)))
+        else:
+            raise SystemExit(f"Unknown sizing: {spec}")
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo bankroll simulator")
+    parser.add_argument(
+        "--sizing",
+        default="flat,kelly,kelly:0.5,martingale",
+        help="Comma-separated: flat[:amount], kelly[:fraction], martingale[:base]",
+    )
+    parser.add_argument("--strategy", help="Only resample this strategy's trades")
+    parser.add_argument("--bankroll", type=float, default=100.0)
+    parser.add_argument("--amount", type=float, default=Config.BET_AMOUNT)
+    parser.add_argument("--bets", type=int, default=1000, help="Bets per path")
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--bets-per-day", type=int, help="Default: history's rate")
+    parser.add_argument("--max-levels", type=int, default=6, help="Martingale cap")
+    parser.add_argument("--min-trades", type=int, default=30)
+    parser.add_argument("--win-rate", type=float, help="Simulate this win rate")
+    parser.add_argument("--price", type=float, default=0.5, help="With --win-rate")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.win_rate is None:
+        records = get_history_store().recent(strategy=args.strategy)
+        outcomes = outcomes_from_trades(Trade.from_nested_json(r) for r in records)
+        source = f"{len(outcomes.returns)} settled trades"
+        if len(outcomes.returns) < args.min_trades:
+            print(f"Only {source}; pass --win-rate to simulate without history.")
+            return
+    else:
+        outcomes = synthetic_outcomes(args.win_rate, args.price)
+        source = f"win rate {args.win_rate:.1%} at {args.price:.2f}"
+
+    print("=" * 100)
+    print(f"MONTE CARLO: {args.paths:,} paths x {args.bets:,} bets from {source}")
+    print(
+        f"Win rate {outcomes.win_rate:.1%}, edge {outcomes.edge:+.2%}/$ | "
+        f"bankroll ${args.bankroll:.2f} | min bet ${Config.MIN_BET:g}, "
+        f"max {Config.MAX_DAILY_BETS}/day, daily loss ${Config.MAX_DAILY_LOSS:g}"
+    )
+    print("=" * 100)
+    print(
+        f"{'sizing':<26} {'ruin':>7} {'p5 final':>10} {'median':>10} {'p95 final':>11} "
+        f"{'DD p50':>7} {'DD p95':>7} {'DD p99':>7} {'growth/bet':>11} {'time':>6}"
+    )
+    for sizing in parse_sizing(args.sizing, args.amount, args.max_levels):
+        started = time.perf_counter()
+        r = simulate(
+            outcomes,
+            sizing,
+            bankroll=args.bankroll,
+            bets=args.bets,
+            paths=args.paths,
+            bets_per_day=args.bets_per_day,
+            seed=args.seed,
+        )
+        elapsed = time.perf_counter() - started
+        final = r["final_quantiles"]
+        dd = r["drawdown_quantiles"]
+        growth = (
+            f"{r['growth_per_bet']:+.5f}" if r["growth_per_bet"] is not None else "-"
+        )
+        print(
+            f"{r['sizing']:<26} {r['ruin_probability']:>7.2%} {final[0.05]:>10.2f} "
+            f"{final[0.5]:>10.2f} {final[0.95]:>11.2f} {dd[0.5]:>7.1%} "
+            f"{dd[0.95]:>7.1%} {dd[0.99]:>7.1%} {growth:>11} {elapsed:>5.1f}s"
+        )
+    print(
+        f"\n{r['bets_per_day']} bets/day; growth/bet = median log growth of survivors"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Soak test: simulate weeks of 5-min window rollovers and check memory stays flat.
+
+Drives WindowSubscriptionManager against an offline market source on a
+simulated clock. Each minute it ticks the manager, feeds book snapshots for
+every subscribed asset, and performs the same lookups the bots do
+(settlement of ended windows, recent-outcome history). Cache sizes are
+asserted against the configured band and traced memory after day 1 is
+compared with the end of the run.
+
+Usage:
+    python scripts/soak_windows.py
+    python scripts/soak_windows.py --days 60
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.polymarket import Market, PolymarketClient
+from src.core.polymarket_ws import MarketDataCache
+from src.core.windows import WINDOW_SECONDS, WindowSubscriptionManager
+
+
+class SimulatedClient(PolymarketClient):
+    """PolymarketClient whose Gamma lookups are generated from the window ts."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self._clock = clock
+
+    def get_market(self, timestamp: int, use_cache: bool = True) -> Market | None:
+        cached = self._market_cache.get(timestamp)
+        if use_cache and cached is not None and (cached.outcome or not cached.closed):
+            if cached.outcome or self._clock() < timestamp + WINDOW_SECONDS:
+                return cached
+
+        now = self._clock()
+        closed = now >= timestamp + WINDOW_SECONDS + 60
+        outcome = (
+            ("up" if (timestamp // WINDOW_SECONDS) % 3 else "down") if closed else None
+        )
+        market = Market(
+            timestamp=timestamp,
+            slug=f"btc-updown-5m-{timestamp}",
+            title="",
+            closed=closed,
+            outcome=outcome,
+            up_token_id=f"{timestamp}1",
+            down_token_id=f"{timestamp}2",
+            up_price=1.0 if outcome == "up" else 0.5,
+            down_price=1.0 if outcome == "down" else 0.5,
+            volume=0.0,
+            accepting_orders=not closed,
+            condition_id=f"0x{timestamp:x}",
+        )
+        self._token_cache[timestamp] = (market.up_token_id, market.down_token_id)
+        self._market_cache[timestamp] = market
+        return market
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Window rollover soak test")
+    parser.add_argument("--days", type=int, default=30, help="Simulated days")
+    parser.add_argument("--step", type=int, default=60, help="Tick interval (s)")
+    args = parser.parse_args()
+
+    now = [1_700_000_000.0]
+
+    def clock() -> float:
+        return now[0]
+
+    client = SimulatedClient(clock)
+    # Never started: no network
+    cache = MarketDataCache(use_websocket=True, rest_client=SimulatedClient(clock))
+    ws = cache._ws
+    manager = WindowSubscriptionManager(client=client, cache=cache)
+
+    # Every cached window must fall inside [now - retain, now + ahead]
+    band = manager.ahead + manager.retain + 2
+
+    book_msg = {
+        "event_type": "book",
+        "bids": [{"price": "0.48", "size": "100"}],
+        "asks": [{"price": "0.52", "size": "100"}],
+    }
+
+    loop = asyncio.new_event_loop()
+    tracemalloc.start()
+    baseline = None
+    peak_sizes: dict[str, int] = {}
+    steps_per_day = 86400 // args.step
+    end = now[0] + args.days * 86400
+    step = 0
+
+    while now[0] < end:
+        manager.tick(now[0])
+
+        # WS book snapshots for everything currently subscribed
+        for token_id in list(ws._subscribed_tokens):
+            loop.run_until_complete(
+                ws._handle_event({**book_msg, "asset_id": token_id})
+            )
+
+        # Settlement lookups for the window that just ended
+        current = int(now[0] // WINDOW_SECONDS) * WINDOW_SECONDS
+        client.get_market(current - WINDOW_SECONDS, use_cache=False)
+
+        # History lookups like get_recent_outcomes (last 6 windows)
+        if step % 5 == 0:
+            for i in range(1, 7):
+                client.get_market(current - i * WINDOW_SECONDS)
+
+        sizes = {
+            "client.market_cache": len(client._market_cache),
+            "client.token_cache": len(client._token_cache),
+            "cache.rest.market_cache": len(cache.rest_client._market_cache),
+            "cache.token_cache": len(cache._token_cache),
+            "cache.market_cache": len(cache._market_cache),
+            "cache.slug_by_asset": len(cache._slug_by_asset),
+            "ws.orderbooks": len(ws._orderbooks),
+            "ws.subscribed_markets": len(ws._subscribed_markets),
+        }
+        for key, size in sizes.items():
+            peak_sizes[key] = max(peak_sizes.get(key, 0), size)
+
+        step += 1
+        if step == steps_per_day:
+            baseline = tracemalloc.take_snapshot()
+        now[0] += args.step
+
+    final = tracemalloc.take_snapshot()
+    growth = sum(s.size_diff for s in final.compare_to(baseline, "filename"))
+    tracemalloc.stop()
+    loop.close()
+
+    print(f"=== WINDOW SOAK: {args.days} days, {manager.rollovers} rollovers ===")
+    for key, peak in peak_sizes.items():
+        print(f"  {key:<26} peak {peak}")
+    print(f"  manager stats: {json.dumps(manager.stats)}")
+    print(f"  traced growth day 1 -> day {args.days}: {growth / 1024:.1f} KiB")
+
+    # Bounded: per-window structures never exceed the band (x3 for per-asset maps)
+    for key, peak in peak_sizes.items():
+        limit = band * 3 if key == "cache.slug_by_asset" else band * 2
+        assert peak <= limit, f"{key} grew to {peak} (limit {limit})"
+    assert manager.evicted_total >= manager.rollovers - band
+    # Flat: allow small allocator noise, nothing proportional to windows seen
+    assert growth < 256 * 1024, f"memory grew {growth / 1024:.1f} KiB"
+    print("OK: memory bounded")
+
+
+if __name__ == "__main__":
+    main()
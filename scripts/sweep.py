@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Sweep selective-filter and delay-model parameters over copytrade history.
+
+Exports settled copytrades from the trade history to memory-mapped
+columns, evaluates every configuration of the grid across all cores
+(``src/research/sweep.py``) and prints the best by risk-adjusted return.
+Results are appended to ``--out`` as they complete; re-running the same
+grid resumes where an interrupted sweep stopped. Requires NumPy
+(``pip install .[research]``).
+
+Usage:
+    python scripts/sweep.py
+    python scripts/sweep.py --grid grid.json --workers 8
+    python scripts/sweep.py --rank pnl_per_drawdown --min-trades 50
+
+A grid file maps parameter names to value lists, e.g.
+    {"max_delay_ms": [5000, 10000, 20000], "base_coef": [0.6, 0.8, 1.0]}
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infra.trade_store import get_history_store
+from src.research.sweep import (
+    export_copytrades,
+    load_results,
+    rank,
+    run_sweep,
+)
+
+DEFAULT_GRID = {
+    "max_delay_ms": [5000, 10000, 15000, 20000, 30000],
+    "min_fill_price": [0.45, 0.50, 0.55, 0.60],
+    "max_fill_price": [0.75, 0.80, 0.85, 0.90],
+    "max_spread": [0.015, 0.025, 0.04],
+    "max_volatility_factor": [1.0, 1.25, 1.5, 2.1],
+    "min_depth_at_best": [0.0, 5.0, 20.0],
+    "base_coef": [0.4, 0.8, 1.2],
+    "baseline_spread": [0.01, 0.02, 0.03],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copytrade parameter sweep")
+    parser.add_argument("--grid", help="JSON file of {param: [values]}")
+    parser.add_argument(
+        "--data", default="data/copytrades", help="Exported copytrade columns"
+    )
+    parser.add_argument(
+        "--out", default="data/sweeps/selective.jsonl", help="Results file (JSONL)"
+    )
+    parser.add_argument("--workers", type=int, help="Processes (default: all cores)")
+    parser.add_argument(
+        "--rank",
+        default="sharpe",
+        choices=["sharpe", "pnl_per_drawdown", "pnl", "roi"],
+        help="Ranking metric",
+    )
+    parser.add_argument("--min-trades", type=int, default=20)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    meta = export_copytrades(
+        get_history_store().recent(strategy="copytrade"), args.data
+    )
+    print(f"=== PARAMETER SWEEP ({meta['rows']:,} settled copytrades) ===")
+    if not meta["rows"]:
+        print("No settled copytrades in history.")
+        return
+
+    try:
+        result = run_sweep(grid, args.data, args.out, workers=args.workers)
+    except KeyboardInterrupt:
+        print("\nInterrupted; completed results are saved. Re-run to resume.")
+        return
+    print(
+        f"Configs: {result['configs']:,} ({result['already_done']:,} already done), "
+        f"evaluated {result['evaluated']:,} in {result['seconds']:.1f}s "
+        f"({result['per_second']:,.0f}/s)"
+    )
+
+    results = load_results(args.out, fingerprint=result["fingerprint"])
+    best = rank(results, key=args.rank, min_trades=args.min_trades)
+    print(
+        f"\n=== TOP {args.top} BY {args.rank.upper()} (>= {args.min_trades} trades) ==="
+    )
+    for r in best[: args.top]:
+        print(
+            f"{r['sharpe']:>6.3f} sharpe | {r['trades']:>5} trades "
+            f"{r['win_rate']:>6.1%} win | PnL ${r['pnl']:>+9.2f} "
+            f"ROI {r['roi']:>+6.1%} | maxDD ${r['max_drawdown']:.2f}"
+        )
+        print(f"       {json.dumps(r['params'], sort_keys=True)}")
+
+
+if __name__ == "__main__":
+    main()
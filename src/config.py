@@ -36,6 +36,8 @@ class Config:
     MIN_BET: float = float(os.getenv("MIN_BET", "1"))
     MAX_DAILY_BETS: int = int(os.getenv("MAX_DAILY_BETS", "100"))
     MAX_DAILY_LOSS: float = float(os.getenv("MAX_DAILY_LOSS", "50"))
+    # Shrink copy bets to what the book absorbs within this slippage (0 = off)
+    MAX_SLIPPAGE_PCT: float = float(os.getenv("MAX_SLIPPAGE_PCT", "0"))
 
     # Timing
     ENTRY_SECONDS_BEFORE: int = int(os.getenv("ENTRY_SECONDS_BEFORE", "30"))
@@ -46,6 +48,14 @@ class Config:
     # Logging
     LOG_FILE: str = "bot.log"
     TRADES_FILE: str = "trades.json"
+    # Append-only trade history (src/infra/journal.py); the legacy JSON array
+    # is imported once when the journal is first created
+    HISTORY_FILE: str = "trade_history.jsonl"
+    LEGACY_HISTORY_FILE: str = "trade_history_full.json"
+    # "journal" (default) or "sqlite" (src/infra/trade_store.py); the SQLite
+    # database imports the journal (or legacy JSON) once when first created
+    HISTORY_BACKEND: str = os.getenv("HISTORY_BACKEND", "journal").lower()
+    TRADE_DB_FILE: str = os.getenv("TRADE_DB_FILE", "trades.db")
 
     # Copytrade
     DATA_API = "https://data-api.polymarket.com"
@@ -60,13 +70,81 @@ class Config:
     WS_RTDS_URL = "wss://ws-live-data.polymarket.com"
     USE_WEBSOCKET: bool = os.getenv("USE_WEBSOCKET", "true").lower() == "true"
 
+    # Seconds to wait for a WS snapshot before resyncing a book via REST
+    WS_RESYNC_TIMEOUT: float = float(os.getenv("WS_RESYNC_TIMEOUT", "2"))
+
+    # Seconds to wait for a user-channel fill/cancel before polling REST
+    ORDER_CONFIRM_TIMEOUT: float = float(os.getenv("ORDER_CONFIRM_TIMEOUT", "3"))
+
+    # Trade-event dispatch off the WebSocket thread
+    DISPATCH_WORKERS: int = int(os.getenv("DISPATCH_WORKERS", "2"))
+    DISPATCH_QUEUE_SIZE: int = int(os.getenv("DISPATCH_QUEUE_SIZE", "256"))
+    DISPATCH_COALESCE_MS: int = int(os.getenv("DISPATCH_COALESCE_MS", "300"))
+
+    # Rolling window subscriptions (see src/core/windows.py)
+    WINDOW_LOOKAHEAD: int = int(os.getenv("WINDOW_LOOKAHEAD", "3"))
+    WINDOW_RETAIN: int = int(os.getenv("WINDOW_RETAIN", "12"))  # past windows kept
+    WINDOW_EVICT_AFTER: int = int(os.getenv("WINDOW_EVICT_AFTER", "300"))
+
     # Fast polling mode (1-2s for copytrade)
     FAST_POLL_INTERVAL: float = float(os.getenv("FAST_POLL_INTERVAL", "1.5"))
+    # Concurrent wallet polls (= HTTP pool size) and per-wallet deadline (s)
+    POLL_WORKERS: int = int(os.getenv("POLL_WORKERS", "10"))
+    POLL_WALLET_DEADLINE: float = float(os.getenv("POLL_WALLET_DEADLINE", "3"))
+    # Wallets polled by POLL_STAGGER phase-offset pollers per interval, and the
+    # Data API request budget (req/s) all wallet polls share
+    POLL_PRIORITY_WALLETS: list[str] = [
+        w.strip()
+        for w in os.getenv("POLL_PRIORITY_WALLETS", "").split(",")
+        if w.strip()
+    ]
+    POLL_STAGGER: int = int(os.getenv("POLL_STAGGER", "3"))
+    POLL_BUDGET_PER_SEC: int = int(os.getenv("POLL_BUDGET_PER_SEC", "20"))
+    # Adaptive cadence: poll faster in each wallet's hot window phases and on
+    # market trade bursts, slower when idle (interval x factor in min..max)
+    ADAPTIVE_CADENCE: bool = os.getenv("ADAPTIVE_CADENCE", "true").lower() == "true"
+    CADENCE_MIN_FACTOR: float = float(os.getenv("CADENCE_MIN_FACTOR", "0.33"))
+    CADENCE_MAX_FACTOR: float = float(os.getenv("CADENCE_MAX_FACTOR", "3"))
+    # Seconds a market/orderbook prefetched on a WebSocket trigger stays usable
+    PREFETCH_MAX_AGE: float = float(os.getenv("PREFETCH_MAX_AGE", "2"))
+    # Live mode (copybot): pre-sign FOK orders per window at these sizes
+    # (default BET_AMOUNT) and a grid of price limits ORDER_TEMPLATE_PRICE_STEP
+    # apart. Off until validated against a real ClobClient.
+    PRESIGN_ORDERS: bool = os.getenv("PRESIGN_ORDERS", "false").lower() == "true"
+    ORDER_TEMPLATE_SIZES: list[float] = [
+        float(s) for s in os.getenv("ORDER_TEMPLATE_SIZES", "").split(",") if s.strip()
+    ]
+    ORDER_TEMPLATE_PRICE_STEP: float = float(
+        os.getenv("ORDER_TEMPLATE_PRICE_STEP", "0.05")
+    )
 
     # REST client settings
     REST_TIMEOUT: float = float(os.getenv("REST_TIMEOUT", "3"))  # Faster timeout
     REST_RETRIES: int = int(os.getenv("REST_RETRIES", "2"))
 
+    # Settlement backfill (history.py --backfill): concurrent market fetches
+    BACKFILL_WORKERS: int = int(os.getenv("BACKFILL_WORKERS", "8"))
+    BACKFILL_RATE_PER_SEC: int = int(os.getenv("BACKFILL_RATE_PER_SEC", "40"))
+    BACKFILL_CHECKPOINT_FILE: str = "backfill_checkpoint.json"
+
+    # Settlement scheduler: first check this long after a window closes,
+    # then retry with doubling delays up to SETTLE_RETRY_MAX (seconds)
+    SETTLE_FIRST_CHECK: float = float(os.getenv("SETTLE_FIRST_CHECK", "30"))
+    SETTLE_RETRY_BASE: float = float(os.getenv("SETTLE_RETRY_BASE", "10"))
+    SETTLE_RETRY_MAX: float = float(os.getenv("SETTLE_RETRY_MAX", "120"))
+
+    # Local outcome history for streak evaluation (src/infra/outcome_store.py):
+    # closed windows kept complete, backfilled at startup if missing
+    OUTCOMES_FILE: str = os.getenv("OUTCOMES_FILE", "outcomes.jsonl")
+    OUTCOME_LOOKBACK: int = int(os.getenv("OUTCOME_LOOKBACK", "288"))
+
+    # Historical market dataset (scripts/build_dataset.py, src/core/dataset.py)
+    DATASET_DIR: str = os.getenv("DATASET_DIR", "data/btc5m")
+
+    # Mark-to-market of pending trades: seconds between REST mid refreshes
+    # for tokens without a WebSocket book
+    MARK_REST_INTERVAL: float = float(os.getenv("MARK_REST_INTERVAL", "15"))
+
     # Trading client settings
     SIGNATURE_TYPE: int = int(
         os.getenv("SIGNATURE_TYPE", "0")
@@ -0,0 +1,254 @@
+"""Historical dataset of resolved BTC 5-min markets.
+
+Provides:
+- build_dataset: enumerate windows over a time range, fetch the ones the
+  dataset doesn't have yet with bounded concurrency
+  (``PolymarketClient.get_markets`` + ``RateLimiter``), checkpoint each
+  result as it arrives, and merge into the columns chunk by chunk
+- load_dataset: read the columns back (stdlib ``array``s)
+
+Layout (one ``.npy`` file per column, so NumPy can memory-map them with
+``np.load(path, mmap_mode="r")``; written with the stdlib only):
+
+    data/btc5m/
+        timestamp.npy   int64   window start (unix seconds), ascending
+        outcome.npy     int8    1 = up, 0 = down
+        up_price.npy    float64 final Up price
+        down_price.npy  float64 final Down price
+        volume.npy      float64 market volume (USD)
+        fee_bps.npy     int32   taker base fee
+        meta.json       row count, range, last update
+        checkpoint.jsonl  rows fetched since the last merge (resume)
+
+Only resolved markets are stored; windows that were missing or not yet
+resolved are fetched again on the next run.
+"""
+
+import ast
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+
+from src.config import Config
+from src.infra.persistence import atomic_write_json
+
+WINDOW_SECONDS = 300
+
+# name -> (array typecode, npy dtype)
+COLUMNS = {
+    "timestamp": ("q", "<i8"),
+    "outcome": ("b", "|i1"),
+    "up_price": ("d", "<f8"),
+    "down_price": ("d", "<f8"),
+    "volume": ("d", "<f8"),
+    "fee_bps": ("i", "<i4"),
+}
+
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_CHECKPOINT = "checkpoint.jsonl"
+
+
+def _write_npy(path: str, typecode: str, dtype: str, values):
+    """Write a 1-D ``.npy`` (format 1.0) atomically."""
+    arr = array(typecode, values)
+    if sys.byteorder != "little" and dtype[0] == "<":
+        arr.byteswap()
+    header = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({len(arr)},), }}"
+    # Data starts on a 64-byte boundary: magic(8) + length(2) + header + \n
+    header += " " * (63 - (10 + len(header)) % 64) + "\n"
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_NPY_MAGIC)
+        f.write(struct.pack("<H", len(header)))
+        f.write(header.encode("latin1"))
+        arr.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_npy(path: str, typecode: str) -> array:
+    """Read a 1-D ``.npy`` written by ``_write_npy``."""
+    with open(path, "rb") as f:
+        if f.read(8) != _NPY_MAGIC:
+            raise ValueError(f"{path}: not a version 1.0 .npy file")
+        (header_len,) = struct.unpack("<H", f.read(2))
+        header = ast.literal_eval(f.read(header_len).decode("latin1"))
+        arr = array(typecode)
+        arr.frombytes(f.read())
+    if sys.byteorder != "little" and header["descr"][0] == "<":
+        arr.byteswap()
+    return arr
+
+
+def load_dataset(path: str | None = None) -> dict[str, array]:
+    """Columns of the dataset at ``path`` (empty arrays if none yet)."""
+    path = path or Config.DATASET_DIR
+    columns = {}
+    for name, (typecode, _) in COLUMNS.items():
+        file = os.path.join(path, f"{name}.npy")
+        columns[name] = (
+            _read_npy(file, typecode) if os.path.exists(file) else array(typecode)
+        )
+    return columns
+
+
+def _row(market) -> list:
+    return [
+        market.timestamp,
+        1 if market.outcome == "up" else 0,
+        market.up_price,
+        market.down_price,
+        float(market.volume or 0),
+        int(market.taker_fee_bps),
+    ]
+
+
+def _read_checkpoint(path: str) -> list[list]:
+    rows = []
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # torn final line
+    return rows
+
+
+def _merge(path: str, columns: dict[str, array], rows: list[list]) -> dict[str, array]:
+    """Merge rows into the columns (sorted, deduplicated) and write them."""
+    existing = zip(*(columns[name] for name in COLUMNS))
+    merged = {row[0]: row for row in existing}
+    for row in rows:
+        merged[row[0]] = row
+    ordered = [merged[ts] for ts in sorted(merged)]
+
+    new_columns = {}
+    for i, (name, (typecode, dtype)) in enumerate(COLUMNS.items()):
+        values = array(typecode, (row[i] for row in ordered))
+        _write_npy(os.path.join(path, f"{name}.npy"), typecode, dtype, values)
+        new_columns[name] = values
+    timestamps = new_columns["timestamp"]
+    atomic_write_json(
+        os.path.join(path, "meta.json"),
+        {
+            "version": 1,
+            "rows": len(timestamps),
+            "first": timestamps[0] if timestamps else None,
+            "last": timestamps[-1] if timestamps else None,
+            "updated_at": int(time.time()),
+        },
+    )
+    return new_columns
+
+
+def build_dataset(
+    start: int,
+    end: int,
+    path: str | None = None,
+    client=None,
+    workers: int | None = None,
+    rate_per_sec: int | None = None,
+    chunk_size: int = 2000,
+    progress: bool = True,
+) -> dict:
+    """Fetch the resolved windows in ``[start, end)`` the dataset lacks.
+
+    Results are appended to ``checkpoint.jsonl`` as they arrive and merged
+    into the columns after every chunk, so an interrupted run resumes
+    where it stopped.
+
+    Args:
+        start: First window timestamp (rounded down to a window)
+        end: Stop before this timestamp (capped at the last closed window)
+        path: Dataset directory (default Config.DATASET_DIR)
+        client: PolymarketClient (default: one without a market cache)
+        workers: Concurrent fetches (default Config.BACKFILL_WORKERS)
+        rate_per_sec: Request cap (default Config.BACKFILL_RATE_PER_SEC)
+        chunk_size: Windows fetched between merges
+        progress: Print progress lines
+
+    Returns:
+        Dict with windows, already_present, fetched, added, rows, seconds
+    """
+    from src.core.polymarket import PolymarketClient
+    from src.infra.resilience import RateLimiter
+
+    path = path or Config.DATASET_DIR
+    os.makedirs(path, exist_ok=True)
+    client = client or PolymarketClient(use_cache=False)
+    limiter = RateLimiter(
+        requests_per_minute=rate_per_sec or Config.BACKFILL_RATE_PER_SEC,
+        window_size=1.0,
+    )
+
+    started = time.time()
+    columns = load_dataset(path)
+    checkpoint_path = os.path.join(path, _CHECKPOINT)
+    resumed = _read_checkpoint(checkpoint_path)
+    if resumed:
+        columns = _merge(path, columns, resumed)
+        os.remove(checkpoint_path)
+        if progress:
+            print(f"[dataset] Resumed {len(resumed):,} checkpointed windows")
+
+    # Only windows that closed (and had time to resolve) are requested
+    last_closed = int(started // WINDOW_SECONDS) * WINDOW_SECONDS - WINDOW_SECONDS
+    end = min(end, last_closed)
+    start -= start % WINDOW_SECONDS
+    have = set(columns["timestamp"])
+    windows = range(start, end, WINDOW_SECONDS)
+    todo = [ts for ts in windows if ts not in have]
+
+    added = 0
+    fetched = 0
+    with open(checkpoint_path, "a") as checkpoint:
+
+        def on_result(ts, market):
+            nonlocal fetched
+            fetched += 1
+            if market and market.closed and market.outcome:
+                chunk_rows.append(_row(market))
+                checkpoint.write(json.dumps(chunk_rows[-1]) + "\n")
+
+        for offset in range(0, len(todo), chunk_size):
+            chunk = todo[offset : offset + chunk_size]
+            chunk_rows: list[list] = []
+            try:
+                client.get_markets(
+                    chunk,
+                    max_workers=workers,
+                    rate_limiter=limiter,
+                    on_result=on_result,
+                )
+            finally:
+                checkpoint.flush()
+                if chunk_rows:
+                    columns = _merge(path, columns, chunk_rows)
+                    added += len(chunk_rows)
+                checkpoint.truncate(0)
+                for ts in chunk:
+                    client.evict_window(ts)  # token IDs aren't needed here
+
+            if progress:
+                elapsed = time.time() - started
+                rate = fetched / elapsed * 60 if elapsed else 0
+                eta = (len(todo) - fetched) / rate if rate else 0
+                print(
+                    f"[dataset] {fetched:,}/{len(todo):,} fetched, {added:,} added "
+                    f"({rate:,.0f}/min, ETA {eta:.0f}m)"
+                )
+    os.remove(checkpoint_path)
+
+    return {
+        "windows": len(windows),
+        "already_present": len(windows) - len(todo),
+        "fetched": fetched,
+        "added": added,
+        "rows": len(columns["timestamp"]),
+        "seconds": round(time.time() - started, 1),
+    }
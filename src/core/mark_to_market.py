@@ -0,0 +1,263 @@
+"""Shared mark-to-market for pending trades.
+
+One ``MarkToMarket`` per process tracks the open positions, marks them
+from the WebSocket mids held by ``MarketDataCache`` and keeps the
+expected value of each. Readers (the copybot heartbeat,
+``TradingState.print_history`` / ``get_statistics``) call ``apply()``,
+which never touches the network. ``refresh()`` is the only method that
+does: it resolves token IDs for new positions and fetches, in one batched
+``/midpoints`` request, the mids of tokens the WebSocket has no book for,
+at most once per ``rest_interval``.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+from src.config import Config
+
+
+def position_key(trade) -> str:
+    """Trade ID as used by the history store."""
+    return f"{trade.timestamp}_{trade.executed_at}_{trade.direction}"
+
+
+def expected_value(trade, win_prob: float) -> float:
+    """Expected PnL of a pending trade if its side wins with ``win_prob``.
+
+    Win payout is $1 per share minus the fee on the gross profit; a loss
+    forfeits the stake.
+    """
+    exec_price = (
+        trade.execution_price if trade.execution_price > 0 else trade.entry_price
+    )
+    shares = trade.amount / exec_price if exec_price > 0 else 0
+
+    gross_win = shares - trade.amount
+    fee_on_win = gross_win * trade.fee_pct if gross_win > 0 else 0
+    net_win = gross_win - fee_on_win
+    return win_prob * net_win + (1 - win_prob) * (-trade.amount)
+
+
+@dataclass
+class Mark:
+    """Latest mark of one position."""
+
+    current_price: float  # mid of the position's side
+    implied_outcome: str | None  # side priced above the other, if any
+    unrealized_pnl: float  # expected value at current_price
+    source: str  # "ws" or "rest"
+    marked_at: float
+
+
+class MarkToMarket:
+    """Expected value of open positions from WebSocket mids.
+
+    Usage:
+        marks = get_mark_to_market(market_cache)
+        marks.refresh(pending)           # main loop: WS reads, rare REST batch
+        total = marks.apply(pending)     # heartbeat/stats: no network
+        marks.untrack(trade)             # on settlement
+    """
+
+    def __init__(self, cache=None, client=None, rest_interval: float | None = None):
+        """Initialize the service.
+
+        Args:
+            cache: MarketDataCache whose WebSocket books supply the mids
+            client: PolymarketClient for the REST fallback (default: the
+                cache's client, or a new one when first needed)
+            rest_interval: Minimum seconds between REST refreshes of a
+                token without a WebSocket book
+        """
+        self._cache = cache
+        self._client = client
+        self.rest_interval = (
+            rest_interval if rest_interval is not None else Config.MARK_REST_INTERVAL
+        )
+
+        self._lock = threading.Lock()
+        self._tokens: dict[int, tuple[str, str]] = {}  # window -> (up, down)
+        self._positions: dict[str, int] = {}  # position key -> window
+        self._rest_mids: dict[str, tuple[float, float]] = {}  # token -> (mid, at)
+
+        # Statistics
+        self.ws_marks = 0
+        self.rest_marks = 0
+        self.rest_batches = 0
+        self.rest_tokens = 0
+
+    def attach(self, cache):
+        """Read mids from ``cache`` from now on (e.g. once its WS is up)."""
+        self._cache = cache
+
+    @property
+    def client(self):
+        if self._client is None:
+            if self._cache is not None:
+                self._client = self._cache.rest_client
+            else:
+                from src.core.polymarket import PolymarketClient
+
+                self._client = PolymarketClient()
+        return self._client
+
+    # === TRACKING ===
+
+    def track(self, trade):
+        """Start marking a pending trade (no network; tokens resolve on refresh)."""
+        if trade.outcome is None:
+            with self._lock:
+                self._positions[position_key(trade)] = trade.timestamp
+
+    def untrack(self, trade):
+        """Stop marking a trade and drop its window once no position uses it."""
+        key = position_key(trade)
+        with self._lock:
+            window = self._positions.pop(key, None)
+            if window is not None and window not in self._positions.values():
+                for token in self._tokens.pop(window, ()):
+                    self._rest_mids.pop(token, None)
+
+    # === REFRESH (network only here) ===
+
+    def refresh(self, trades=None, force: bool = False) -> int:
+        """Resolve new positions and fetch mids the WebSocket lacks.
+
+        Args:
+            trades: Pending trades to track before refreshing
+            force: Ignore ``rest_interval`` (one-shot callers such as
+                ``scripts/history.py``)
+
+        Returns:
+            Number of tokens fetched over REST
+        """
+        for trade in trades or ():
+            self.track(trade)
+
+        with self._lock:
+            windows = set(self._positions.values())
+        self._resolve_tokens([w for w in windows if w not in self._tokens])
+
+        now = time.time()
+        stale = []
+        for window in windows:
+            for token in self._tokens.get(window, ()):
+                if self._ws_mid(token) is not None:
+                    continue
+                fetched = self._rest_mids.get(token)
+                if force or fetched is None or now - fetched[1] >= self.rest_interval:
+                    stale.append(token)
+        if not stale:
+            return 0
+
+        mids = self.client.get_midpoints(stale)
+        self.rest_batches += 1
+        self.rest_tokens += len(stale)
+        with self._lock:
+            for token, mid in mids.items():
+                self._rest_mids[token] = (mid, now)
+        return len(stale)
+
+    def _resolve_tokens(self, windows: list[int]):
+        """Token IDs for new windows, subscribing them through the cache."""
+        if not windows:
+            return
+        if self._cache is not None:
+            # Windows the bet was placed on are normally cached already
+            for window in windows:
+                tokens = self._cache.get_token_ids(window)
+                if tokens and all(tokens):
+                    self._tokens[window] = tokens
+            return
+        for window, market in self.client.get_markets(windows).items():
+            if market and market.up_token_id and market.down_token_id:
+                self._tokens[window] = (market.up_token_id, market.down_token_id)
+
+    # === READS (no network) ===
+
+    def _ws_mid(self, token: str) -> float | None:
+        return self._cache.get_ws_mid(token) if self._cache is not None else None
+
+    def _mid(self, token: str) -> tuple[float, str] | None:
+        mid = self._ws_mid(token)
+        if mid is not None:
+            return mid, "ws"
+        fetched = self._rest_mids.get(token)
+        return (fetched[0], "rest") if fetched else None
+
+    def mark(self, trade) -> Mark | None:
+        """Current mark of a tracked trade from in-memory mids."""
+        tokens = self._tokens.get(trade.timestamp)
+        if not tokens:
+            return None
+        up, down = self._mid(tokens[0]), self._mid(tokens[1])
+        side = up if trade.direction == "up" else down
+        if side is None:
+            return None
+
+        implied = None
+        if up is not None and down is not None and up[0] != down[0]:
+            implied = "up" if up[0] > down[0] else "down"
+
+        price, source = side
+        mark = Mark(
+            current_price=price,
+            implied_outcome=implied,
+            unrealized_pnl=expected_value(trade, price),
+            source=source,
+            marked_at=time.time(),
+        )
+        if source == "ws":
+            self.ws_marks += 1
+        else:
+            self.rest_marks += 1
+        return mark
+
+    def apply(self, trades) -> float:
+        """Write current marks onto pending trades; returns their total EV.
+
+        Trades without a mark yet keep their previous values.
+        """
+        total = 0.0
+        for trade in trades:
+            if trade.outcome is not None:
+                continue
+            mark = self.mark(trade)
+            if mark is not None:
+                trade.current_price = mark.current_price
+                trade.implied_outcome = mark.implied_outcome
+                trade.unrealized_pnl = mark.unrealized_pnl
+            if trade.unrealized_pnl is not None:
+                total += trade.unrealized_pnl
+        return total
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            positions = len(self._positions)
+        marks = self.ws_marks + self.rest_marks
+        return {
+            "positions": positions,
+            "windows": len(self._tokens),
+            "ws_marks": self.ws_marks,
+            "rest_marks": self.rest_marks,
+            "ws_mark_pct": round(self.ws_marks / marks * 100, 1) if marks else None,
+            "rest_batches": self.rest_batches,
+            "rest_tokens": self.rest_tokens,
+        }
+
+
+_marks: MarkToMarket | None = None
+_marks_lock = threading.Lock()
+
+
+def get_mark_to_market(cache=None) -> MarkToMarket:
+    """Return the process-wide service, attaching ``cache`` if given."""
+    global _marks
+    with _marks_lock:
+        if _marks is None:
+            _marks = MarkToMarket(cache=cache)
+        elif cache is not None:
+            _marks.attach(cache)
+        return _marks
@@ -0,0 +1,278 @@
+"""Pre-signed FOK order templates for live trading.
+
+``LiveTrader.place_bet`` otherwise builds and EIP-712-signs its FOK
+market order (``create_market_order``, which also fetches the book to
+price it) after the signal arrives, then posts it. ``OrderTemplateCache``
+moves that work off the critical path: once a window's token IDs are
+known it signs, on a background thread, BUY orders for both sides at
+each configured size and at a grid of price limits
+(``ORDER_TEMPLATE_PRICE_STEP`` apart). ``take`` hands ``place_bet`` the
+template with the largest size not above the bet (and at least
+``MIN_SIZE_RATIO`` of it) and the lowest limit at or above the worst
+book level the bet reaches, so it can post immediately.
+
+The limit is only the order's worst acceptable price; a FOK order fills
+at the book's prices, so a template at most one step above the level
+an inline order would have used gives the same fill. A template is used
+once (each signed order has its own salt) and is re-signed in the
+background; templates expire with their window.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from src.config import Config
+
+WINDOW_SECONDS = 300
+
+
+@dataclass
+class OrderTemplate:
+    """A signed FOK BUY order waiting for a matching bet."""
+
+    token_id: str
+    amount: float  # USD to spend
+    limit_price: float  # worst acceptable price
+    signed_order: object
+    expires_at: float
+    sign_ms: float
+
+
+class OrderTemplateCache:
+    """Sign candidate FOK orders per window ahead of the signals.
+
+    Usage:
+        templates = OrderTemplateCache(clob_client, sizes=[5.0])
+        templates.prepare_async(market)          # when token IDs are known
+        template = templates.take(token_id, amount, worst_price)
+        if template:
+            client.post_order(template.signed_order, OrderType.FOK)
+    """
+
+    MIN_SIZE_RATIO = 0.9  # smallest template size as a fraction of the bet
+
+    def __init__(
+        self,
+        client,
+        sizes: list[float] | None = None,
+        price_step: float | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            client: Authenticated ``ClobClient`` used for signing
+            sizes: Bet sizes (USD) to sign (default Config.ORDER_TEMPLATE_SIZES,
+                else Config.BET_AMOUNT)
+            price_step: Spacing of the price-limit grid (default
+                Config.ORDER_TEMPLATE_PRICE_STEP)
+        """
+        self._client = client
+        self.sizes = sorted(
+            set(sizes or Config.ORDER_TEMPLATE_SIZES or [Config.BET_AMOUNT])
+        )
+        self.price_step = price_step or Config.ORDER_TEMPLATE_PRICE_STEP
+        self.limits = [
+            round(i * self.price_step, 4)
+            for i in range(1, int(round(1 / self.price_step)))
+        ]
+
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="presign")
+        self._lock = threading.Lock()
+        # (token_id, amount) -> templates sorted by limit_price
+        self._templates: dict[tuple[str, float], list[OrderTemplate]] = {}
+        self._prepared: dict[int, float] = {}  # window ts -> expiry
+
+        # Stats
+        self.signed = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.errors = 0
+        self._sign_ms: deque[float] = deque(maxlen=500)
+        self._inline_ms: deque[float] = deque(maxlen=100)
+        self._saved_ms: deque[float] = deque(maxlen=100)
+
+    def prepare_async(self, market) -> bool:
+        """Sign ``market``'s templates in the background (once per window).
+
+        Returns:
+            True if signing was queued
+        """
+        if market is None or not market.token_ids:
+            return False
+        expires_at = market.timestamp + WINDOW_SECONDS
+        with self._lock:
+            if market.timestamp in self._prepared or expires_at <= time.time():
+                return False
+            self._prepared[market.timestamp] = expires_at
+        try:
+            prices = {
+                market.up_token_id: market.up_price,
+                market.down_token_id: market.down_price,
+            }
+            self._pool.submit(self._prepare, prices, expires_at)
+        except RuntimeError:  # shut down
+            return False
+        return True
+
+    def _prepare(self, prices: dict[str, float], expires_at: float):
+        self.expire()
+        for token_id, price in prices.items():
+            if not token_id:
+                continue
+            # Limits nearest the current price are the likeliest; sign them first
+            limits = sorted(self.limits, key=lambda limit: abs(limit - price))
+            for amount in self.sizes:
+                for limit in limits:
+                    if time.time() >= expires_at:
+                        return
+                    self._sign(token_id, amount, limit, expires_at)
+
+    def _sign(self, token_id: str, amount: float, limit: float, expires_at: float):
+        from py_clob_client.clob_types import MarketOrderArgs, OrderType
+        from py_clob_client.order_builder.constants import BUY
+
+        started = time.perf_counter()
+        try:
+            # An explicit price skips create_market_order's book lookup
+            signed = self._client.create_market_order(
+                MarketOrderArgs(
+                    token_id=token_id,
+                    amount=amount,
+                    side=BUY,
+                    price=limit,
+                    order_type=OrderType.FOK,
+                )
+            )
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"[presign] {token_id[:10]}... ${amount:g} @ {limit}: {e}")
+            return
+        sign_ms = (time.perf_counter() - started) * 1000
+        template = OrderTemplate(token_id, amount, limit, signed, expires_at, sign_ms)
+        with self._lock:
+            bucket = self._templates.setdefault((token_id, amount), [])
+            bucket.append(template)
+            bucket.sort(key=lambda t: t.limit_price)
+            self.signed += 1
+            self._sign_ms.append(sign_ms)
+
+    def take(
+        self, token_id: str, amount: float, worst_price: float
+    ) -> OrderTemplate | None:
+        """Remove and return the closest template for a bet, if any.
+
+        Args:
+            token_id: Token being bought
+            amount: Bet size (USD); the template may be up to
+                ``1 - MIN_SIZE_RATIO`` smaller, never larger
+            worst_price: Worst book level the bet reaches (its price limit);
+                the template's limit is at most one grid step above it
+
+        Returns:
+            The template (re-signed in the background), or None
+        """
+        if worst_price <= 0:
+            with self._lock:
+                self.misses += 1
+            return None
+        now = time.time()
+        template = None
+        ceiling = worst_price + self.price_step + 1e-9
+        with self._lock:
+            for size in reversed(self.sizes):
+                if size > amount + 1e-9 or size < amount * self.MIN_SIZE_RATIO:
+                    continue
+                bucket = self._templates.get((token_id, size), [])
+                for i, candidate in enumerate(bucket):
+                    if candidate.limit_price > ceiling:
+                        break  # sorted by limit
+                    if candidate.expires_at > now and (
+                        candidate.limit_price >= worst_price - 1e-9
+                    ):
+                        template = bucket.pop(i)
+                        break
+                if template:
+                    break
+            if template is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        try:
+            # Replace it for the next bet in this window
+            self._pool.submit(
+                self._sign,
+                template.token_id,
+                template.amount,
+                template.limit_price,
+                template.expires_at,
+            )
+        except RuntimeError:
+            pass
+        return template
+
+    def record_inline(self, create_ms: float):
+        """Record an inline build+sign (a miss) to size the savings."""
+        with self._lock:
+            self._inline_ms.append(create_ms)
+
+    def saved_ms(self) -> float:
+        """Build+sign time a template hit keeps off the critical path.
+
+        Uses measured inline builds (which include the book lookup) when
+        there are any, else the background signing time.
+        """
+        with self._lock:
+            samples = self._inline_ms or self._sign_ms
+            saved = sum(samples) / len(samples) if samples else 0.0
+            self._saved_ms.append(saved)
+            return saved
+
+    def expire(self):
+        """Drop templates and window records whose window has ended."""
+        now = time.time()
+        with self._lock:
+            for key, bucket in list(self._templates.items()):
+                live = [t for t in bucket if t.expires_at > now]
+                self.expired += len(bucket) - len(live)
+                if live:
+                    self._templates[key] = live
+                else:
+                    del self._templates[key]
+            for ts in [ts for ts, exp in self._prepared.items() if exp <= now]:
+                del self._prepared[ts]
+
+    def close(self):
+        """Stop background signing."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _mean(samples) -> float:
+        return round(sum(samples) / len(samples), 2) if samples else 0.0
+
+    @property
+    def stats(self) -> dict:
+        """Get template statistics."""
+        with self._lock:
+            ordered = sorted(self._sign_ms)
+            return {
+                "sizes": self.sizes,
+                "limits": len(self.limits),
+                "windows": len(self._prepared),
+                "ready": sum(len(b) for b in self._templates.values()),
+                "signed": self.signed,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "errors": self.errors,
+                "sign_ms": self._mean(self._sign_ms),
+                "sign_ms_p95": round(ordered[int(len(ordered) * 0.95)], 2)
+                if ordered
+                else 0.0,
+                "inline_create_ms": self._mean(self._inline_ms),
+                "saved_ms_per_trade": self._mean(self._saved_ms),
+            }
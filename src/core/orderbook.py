@@ -0,0 +1,375 @@
+"""Array-backed order book engine keyed by integer price tick.
+
+Polymarket prices live on a 0.001/0.01 grid inside [0, 1], so every level
+maps to one of ``NUM_TICKS`` slots. Sizes are stored in preallocated arrays
+indexed by tick; the set of populated ticks is kept sorted so best bid/ask
+are read from its ends without sorting.
+
+``DepthIndex``/``BookDepth`` hold prefix sums of shares and notional per
+side, so execution quotes and max-size-under-slippage queries are a binary
+search instead of a walk over every level.
+"""
+
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+
+# 0.001 resolution covers both the 0.01 and 0.001 tick-size markets
+TICKS_PER_UNIT = 1000
+NUM_TICKS = TICKS_PER_UNIT + 1
+
+
+def price_to_tick(price: float) -> int:
+    """Convert a price in [0, 1] to its integer tick index."""
+    return int(round(price * TICKS_PER_UNIT))
+
+
+def tick_to_price(tick: int) -> float:
+    """Convert an integer tick index back to a price."""
+    return tick / TICKS_PER_UNIT
+
+
+@dataclass
+class OrderBookLevel:
+    """Single price level in orderbook."""
+
+    price: float
+    size: float
+
+
+def _levels(levels) -> list[tuple[float, float]]:
+    """(price, size) pairs of a snapshot side with positive price and size."""
+    parsed = ((float(lvl["price"]), float(lvl["size"])) for lvl in levels)
+    return [(price, size) for price, size in parsed if price > 0 and size > 0]
+
+
+class DepthIndex:
+    """Cumulative share/notional arrays for one side of a book.
+
+    Levels are stored best-first (asks ascending, bids descending). Index
+    ``k`` of each cumulative array covers the first ``k`` levels, so
+    ``cum_notional[0] == 0``.
+    """
+
+    __slots__ = ("prices", "cum_shares", "cum_notional", "_vwap_key", "_sign")
+
+    def __init__(self, prices: list[float], sizes: list[float], is_bid: bool):
+        self.prices = prices
+        self.cum_shares = [0.0] * (len(prices) + 1)
+        self.cum_notional = [0.0] * (len(prices) + 1)
+        # VWAP after consuming k full levels, signed so it is non-decreasing
+        # on both sides (asks get worse upward, bids downward).
+        self._sign = -1.0 if is_bid else 1.0
+        self._vwap_key = [0.0] * len(prices)
+
+        shares = notional = 0.0
+        for i, (price, size) in enumerate(zip(prices, sizes)):
+            shares += size
+            notional += price * size
+            self.cum_shares[i + 1] = shares
+            self.cum_notional[i + 1] = notional
+            self._vwap_key[i] = self._sign * notional / shares
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def best(self) -> float:
+        return self.prices[0] if self.prices else 0.0
+
+    @property
+    def total_notional(self) -> float:
+        return self.cum_notional[-1]
+
+    def depth_at_best(self) -> float:
+        """USD value resting at the best level."""
+        return self.cum_notional[1] if self.prices else 0.0
+
+    def quote(self, amount_usd: float) -> tuple[float, float, float]:
+        """VWAP for spending ``amount_usd`` against this side.
+
+        Returns: (execution_price, slippage_pct, fill_pct). Execution price
+        is 0.0 when nothing can be filled.
+        """
+        if not self.prices or amount_usd <= 0:
+            return 0.0, 0.0, 0.0
+
+        cum_notional = self.cum_notional
+        # First k whose prefix covers the order; level k-1 is partially taken
+        k = bisect_left(cum_notional, amount_usd, 1)
+        if k >= len(cum_notional):
+            shares = self.cum_shares[-1]
+            filled = cum_notional[-1]
+        else:
+            price = self.prices[k - 1]
+            shares = self.cum_shares[k - 1] + (amount_usd - cum_notional[k - 1]) / price
+            filled = amount_usd
+
+        exec_price = filled / shares
+        best = self.prices[0]
+        slippage_pct = abs(exec_price - best) / best * 100 if best > 0 else 0.0
+        return exec_price, slippage_pct, filled / amount_usd * 100
+
+    def worst_price(self, amount_usd: float) -> float:
+        """Price of the last level an order of ``amount_usd`` reaches.
+
+        This is the limit a FOK order needs to fill completely (the last
+        level when the book is too thin); 0.0 for an empty side.
+        """
+        if not self.prices or amount_usd <= 0:
+            return 0.0
+        k = bisect_left(self.cum_notional, amount_usd, 1)
+        return self.prices[min(k, len(self.prices)) - 1]
+
+    def max_size_for_slippage(self, max_slippage_pct: float) -> float:
+        """Largest USD order whose VWAP stays within ``max_slippage_pct`` of best.
+
+        Binary-searches the last fully consumable level, then solves for
+        the partial amount at the next level where VWAP hits the limit.
+        """
+        if not self.prices:
+            return 0.0
+
+        best = self.prices[0]
+        limit = best * (1 + self._sign * max_slippage_pct / 100)
+        # Number of full levels whose cumulative VWAP is within the limit
+        k = bisect_right(self._vwap_key, self._sign * limit + 1e-12)
+        if k >= len(self.prices):
+            return self.cum_notional[-1]
+
+        # (N + x) / (S + x / p) = L  =>  x = (L*S - N) / (1 - L/p)
+        price = self.prices[k]
+        shares = self.cum_shares[k]
+        notional = self.cum_notional[k]
+        partial = (limit * shares - notional) / (1 - limit / price)
+        level_notional = self.cum_notional[k + 1] - notional
+        return notional + max(0.0, min(partial, level_notional))
+
+
+class BookDepth:
+    """Both sides of a book as ``DepthIndex`` prefix sums.
+
+    Build once per book version, then quote any number of sizes in
+    O(log levels).
+    """
+
+    __slots__ = ("bids", "asks", "best_bid", "best_ask", "mid")
+
+    def __init__(self, bids: DepthIndex, asks: DepthIndex, mid: float = 0.5):
+        self.bids = bids
+        self.asks = asks
+        self.best_bid = bids.best
+        self.best_ask = asks.best
+        if self.best_bid > 0 and self.best_ask > 0:
+            mid = (self.best_bid + self.best_ask) / 2
+        self.mid = mid
+
+    @classmethod
+    def from_snapshot(cls, book: dict | None) -> "BookDepth":
+        """Build from a REST/WS snapshot with string price/size levels.
+
+        Parses and sorts each side once; empty or unpriced levels are skipped.
+        """
+        book = book or {}
+        bids = sorted(_levels(book.get("bids", [])), reverse=True)
+        asks = sorted(_levels(book.get("asks", [])))
+        return cls(
+            DepthIndex([p for p, _ in bids], [s for _, s in bids], is_bid=True),
+            DepthIndex([p for p, _ in asks], [s for _, s in asks], is_bid=False),
+        )
+
+    def side(self, side: str) -> DepthIndex:
+        """Levels a taker on ``side`` would consume (BUY hits asks)."""
+        return self.asks if side == "BUY" else self.bids
+
+    @property
+    def spread(self) -> float:
+        if self.best_bid > 0 and self.best_ask > 0:
+            return self.best_ask - self.best_bid
+        return 0.0
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.bids.prices or not self.asks.prices
+
+    def depth_at_best(self, side: str) -> float:
+        return self.side(side).depth_at_best()
+
+    def quote(self, side: str, amount_usd: float) -> tuple[float, float, float]:
+        """Returns: (execution_price, slippage_pct, fill_pct)"""
+        exec_price, slippage_pct, fill_pct = self.side(side).quote(amount_usd)
+        if exec_price <= 0:
+            return self.mid, 0.0, 0.0
+        return exec_price, slippage_pct, fill_pct
+
+    def worst_price(self, side: str, amount_usd: float) -> float:
+        return self.side(side).worst_price(amount_usd)
+
+    def max_size_for_slippage(self, side: str, max_slippage_pct: float) -> float:
+        return self.side(side).max_size_for_slippage(max_slippage_pct)
+
+
+class TickOrderBook:
+    """Order book with O(1) level updates and O(1) top-of-book reads.
+
+    - Updating the size of an existing level is a single array write.
+    - Adding or removing a level is a bisect into the sorted tick list
+      (a memmove of at most ``NUM_TICKS`` ints, no re-sort).
+    - ``best_bid``/``best_ask``/``mid`` are maintained after every change.
+    """
+
+    def __init__(self):
+        self._bid_sizes = array("d", bytes(8 * NUM_TICKS))
+        self._ask_sizes = array("d", bytes(8 * NUM_TICKS))
+        # Populated ticks, ascending. Best bid = last, best ask = first.
+        self._bid_ticks: list[int] = []
+        self._ask_ticks: list[int] = []
+
+        self.timestamp = 0.0
+        self.best_bid = 0.0
+        self.best_ask = 0.0
+        self.mid = 0.5
+
+        # Prefix-sum index, rebuilt lazily after the book changes
+        self._depth: BookDepth | None = None
+
+    # === Updates ===
+
+    def update_from_snapshot(self, data: dict):
+        """Replace book contents from a full orderbook snapshot."""
+        self._clear_side(self._bid_sizes, self._bid_ticks)
+        self._clear_side(self._ask_sizes, self._ask_ticks)
+
+        self._load_side(self._bid_sizes, self._bid_ticks, data.get("bids", []))
+        self._load_side(self._ask_sizes, self._ask_ticks, data.get("asks", []))
+        self._refresh_top()
+
+    def update_from_delta(self, data: dict):
+        """Apply an orderbook delta (price_change event)."""
+        for change in data.get("changes", []):
+            side = change.get("side")
+            price = float(change.get("price", 0))
+            size = float(change.get("size", 0))
+            self.set_level(side, price, size)
+        self._refresh_top()
+
+    def set_level(self, side: str, price: float, size: float):
+        """Set the resting size at a price level (size 0 removes it).
+
+        Does not refresh top-of-book; callers batching several changes
+        should call ``_refresh_top`` once afterwards.
+        """
+        tick = price_to_tick(price)
+        if tick < 0 or tick >= NUM_TICKS:
+            return
+
+        self._depth = None
+        if side == "BUY":
+            sizes, ticks = self._bid_sizes, self._bid_ticks
+        elif side == "SELL":
+            sizes, ticks = self._ask_sizes, self._ask_ticks
+        else:
+            return
+
+        had_level = sizes[tick] > 0
+        if size > 0:
+            sizes[tick] = size
+            if not had_level:
+                insort(ticks, tick)
+        elif had_level:
+            sizes[tick] = 0.0
+            del ticks[bisect_left(ticks, tick)]
+
+    def _clear_side(self, sizes: array, ticks: list[int]):
+        """Zero only the populated slots (O(levels), not O(NUM_TICKS))."""
+        for tick in ticks:
+            sizes[tick] = 0.0
+        ticks.clear()
+
+    def _load_side(self, sizes: array, ticks: list[int], levels: list[dict]):
+        """Fill one side from snapshot levels, sorting the tick list once."""
+        for level in levels:
+            tick = price_to_tick(float(level["price"]))
+            size = float(level["size"])
+            if size <= 0 or tick < 0 or tick >= NUM_TICKS:
+                continue
+            if sizes[tick] <= 0:
+                ticks.append(tick)
+            sizes[tick] = size
+        ticks.sort()
+
+    def _refresh_top(self):
+        """Recalculate best bid/ask and mid from the tick list ends."""
+        self.timestamp = time.time()
+        self._depth = None
+        self.best_bid = tick_to_price(self._bid_ticks[-1]) if self._bid_ticks else 0.0
+        self.best_ask = tick_to_price(self._ask_ticks[0]) if self._ask_ticks else 0.0
+        if self.best_bid > 0 and self.best_ask > 0:
+            self.mid = (self.best_bid + self.best_ask) / 2
+
+    # === Reads ===
+
+    @property
+    def bids(self) -> list[OrderBookLevel]:
+        """Bid levels, best (highest) first."""
+        sizes = self._bid_sizes
+        return [
+            OrderBookLevel(tick_to_price(t), sizes[t])
+            for t in reversed(self._bid_ticks)
+        ]
+
+    @property
+    def asks(self) -> list[OrderBookLevel]:
+        """Ask levels, best (lowest) first."""
+        sizes = self._ask_sizes
+        return [OrderBookLevel(tick_to_price(t), sizes[t]) for t in self._ask_ticks]
+
+    def depth_at_best(self, side: str) -> float:
+        """USD value resting at the best level on the side a taker would hit."""
+        if side == "BUY":
+            if not self._ask_ticks:
+                return 0.0
+            tick = self._ask_ticks[0]
+            return tick_to_price(tick) * self._ask_sizes[tick]
+        if not self._bid_ticks:
+            return 0.0
+        tick = self._bid_ticks[-1]
+        return tick_to_price(tick) * self._bid_sizes[tick]
+
+    def depth(self) -> BookDepth:
+        """Prefix-sum index of the current book (cached until the next update)."""
+        depth = self._depth
+        if depth is None:
+            bid_ticks = self._bid_ticks[::-1]
+            ask_ticks = list(self._ask_ticks)
+            bid_sizes, ask_sizes = self._bid_sizes, self._ask_sizes
+            depth = BookDepth(
+                DepthIndex(
+                    [t / TICKS_PER_UNIT for t in bid_ticks],
+                    [bid_sizes[t] for t in bid_ticks],
+                    is_bid=True,
+                ),
+                DepthIndex(
+                    [t / TICKS_PER_UNIT for t in ask_ticks],
+                    [ask_sizes[t] for t in ask_ticks],
+                    is_bid=False,
+                ),
+                mid=self.mid,
+            )
+            self._depth = depth
+        return depth
+
+    def get_execution_price(
+        self, side: str, amount_usd: float
+    ) -> tuple[float, float, float]:
+        """Calculate execution price from the depth index.
+
+        Returns: (execution_price, slippage_pct, fill_pct)
+        """
+        return self.depth().quote(side, amount_usd)
+
+    @property
+    def level_count(self) -> int:
+        """Total populated levels across both sides."""
+        return len(self._bid_ticks) + len(self._ask_ticks)
@@ -0,0 +1,215 @@
+"""Resolved-outcome history for streak evaluation.
+
+``OutcomeTracker`` keeps the last ``lookback`` windows' outcomes in the
+local ``OutcomeStore``. ``backfill()`` fetches only the windows the store
+is missing (concurrently, at startup), and a background thread records
+each new window once it resolves: first checked ``first_check`` seconds
+after close, then with doubling delays. ``recent()`` reads from memory,
+so the entry decision needs no HTTP requests when the window opens.
+"""
+
+import threading
+import time
+
+from src.config import Config
+from src.infra.outcome_store import get_outcome_store
+
+WINDOW_SECONDS = 300
+
+
+class OutcomeTracker:
+    """Follow resolved outcomes of BTC 5-min windows in the background.
+
+    Usage:
+        outcomes = OutcomeTracker(client)
+        outcomes.backfill()             # startup: missing windows only
+        outcomes.start()
+        outcomes.recent(trigger + 2)    # oldest first, no network
+        outcomes.stop()
+    """
+
+    def __init__(
+        self,
+        client=None,
+        store=None,
+        lookback: int | None = None,
+        first_check: float | None = None,
+        retry_base: float | None = None,
+        retry_max: float | None = None,
+        max_attempts: int = 8,
+    ):
+        """Initialize the tracker.
+
+        Args:
+            client: PolymarketClient used for market fetches
+            store: OutcomeStore (default: the shared one)
+            lookback: Closed windows to keep complete (default
+                Config.OUTCOME_LOOKBACK)
+            first_check: Seconds after window end of the first check
+            retry_base: First retry delay, doubled per unresolved check
+            retry_max: Cap on the retry delay
+            max_attempts: Unresolved checks before a window is skipped
+                (markets missing from Gamma) until the next restart
+        """
+        if client is None:
+            from src.core.polymarket import PolymarketClient
+
+            client = PolymarketClient()
+        self._client = client
+        self.store = store if store is not None else get_outcome_store()
+        self.lookback = lookback if lookback is not None else Config.OUTCOME_LOOKBACK
+        self.first_check = (
+            first_check if first_check is not None else Config.SETTLE_FIRST_CHECK
+        )
+        self.retry_base = (
+            retry_base if retry_base is not None else Config.SETTLE_RETRY_BASE
+        )
+        self.retry_max = retry_max if retry_max is not None else Config.SETTLE_RETRY_MAX
+        self.max_attempts = max_attempts
+
+        self._next_check: dict[int, float] = {}  # window -> due time
+        self._attempts: dict[int, int] = {}  # window -> unresolved checks
+        self._skipped: set[int] = set()
+
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        # Statistics
+        self.fetches = 0
+        self.recorded = 0
+        self.reads = 0
+
+    # === WINDOWS ===
+
+    def closed_windows(self, now: float | None = None) -> list[int]:
+        """The last ``lookback`` closed windows, newest first."""
+        now = time.time() if now is None else now
+        last = int(now // WINDOW_SECONDS) * WINDOW_SECONDS - WINDOW_SECONDS
+        return [last - i * WINDOW_SECONDS for i in range(self.lookback)]
+
+    def _wanted(self, now: float) -> list[int]:
+        return [
+            ts
+            for ts in self.store.missing(self.closed_windows(now))
+            if ts not in self._skipped
+        ]
+
+    # === FETCHING ===
+
+    def _fetch(self, windows: list[int]) -> int:
+        """Fetch windows concurrently and record resolved ones."""
+        markets = self._client.get_markets(windows)
+        checked = time.time()
+        self.fetches += len(windows)
+        recorded = 0
+        for ts in windows:
+            market = markets.get(ts)
+            if market and market.closed and market.outcome:
+                if self.store.add(ts, market.outcome):
+                    recorded += 1
+                self._next_check.pop(ts, None)
+                self._attempts.pop(ts, None)
+                continue
+            attempts = self._attempts.get(ts, 0) + 1
+            if attempts >= self.max_attempts:
+                self._skipped.add(ts)
+                self._next_check.pop(ts, None)
+                self._attempts.pop(ts, None)
+            else:
+                self._attempts[ts] = attempts
+                delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+                self._next_check[ts] = checked + delay
+        self.recorded += recorded
+        return recorded
+
+    def backfill(self, now: float | None = None) -> int:
+        """Fetch the closed windows the store is missing.
+
+        Returns:
+            Number of outcomes recorded
+        """
+        now = time.time() if now is None else now
+        missing = [
+            ts
+            for ts in self._wanted(now)
+            if now >= ts + WINDOW_SECONDS + self.first_check
+        ]
+        return self._fetch(missing) if missing else 0
+
+    def poll(self, now: float | None = None) -> int:
+        """Fetch windows that are due (new closes and retries)."""
+        now = time.time() if now is None else now
+        wanted = self._wanted(now)
+
+        # Windows that left the lookback band are no longer retried
+        band = set(wanted)
+        for ts in [ts for ts in self._next_check if ts not in band]:
+            self._next_check.pop(ts, None)
+            self._attempts.pop(ts, None)
+
+        due = []
+        for ts in wanted:
+            at = self._next_check.setdefault(ts, ts + WINDOW_SECONDS + self.first_check)
+            if at <= now:
+                due.append(ts)
+        return self._fetch(due) if due else 0
+
+    def _seconds_until_due(self, now: float) -> float:
+        next_close = (int(now // WINDOW_SECONDS) + 1) * WINDOW_SECONDS
+        due = [next_close + self.first_check, *self._next_check.values()]
+        return max(0.0, min(due) - now)
+
+    # === READS (no network) ===
+
+    def recent(self, count: int = 10, now: float | None = None) -> list[str]:
+        """Last ``count`` resolved outcomes, oldest first.
+
+        Same walk as ``PolymarketClient.get_recent_outcomes`` (windows
+        without an outcome are skipped, up to ``count + 10`` windows back),
+        served from memory.
+        """
+        self.reads += 1
+        outcomes = []
+        for ts in self.closed_windows(now)[: count + 10]:
+            outcome = self.store.get(ts)
+            if outcome:
+                outcomes.append(outcome)
+                if len(outcomes) == count:
+                    break
+        outcomes.reverse()
+        return outcomes
+
+    # === BACKGROUND THREAD ===
+
+    def start(self):
+        """Record new outcomes on a background thread."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="outcomes", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[outcomes] Check failed: {e}")
+            self._stopped.wait(max(self._seconds_until_due(time.time()), 1.0))
+
+    @property
+    def stats(self) -> dict:
+        return {
+            **self.store.stats,
+            "fetches": self.fetches,
+            "recorded": self.recorded,
+            "retrying": len(self._next_check),
+            "skipped": len(self._skipped),
+            "reads": self.reads,
+        }
@@ -3,13 +3,16 @@
 import json
 import math
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from typing import Callable
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from src.config import Config
+from src.core.orderbook import BookDepth
 
 
 @dataclass
@@ -94,6 +97,65 @@ class DelayImpactModel:
         return final_impact, breakdown
 
 
+def quote_execution(
+    depth: BookDepth, side: str, amount_usd: float, copy_delay_ms: int = 0
+) -> dict:
+    """Quote an order against a depth index and apply copy delay impact.
+
+    Shared by the REST client, the WebSocket cache and the copybot
+    pre-trade estimate so all three price orders the same way.
+
+    Args:
+        depth: Prefix-sum index of the book
+        side: "BUY" or "SELL"
+        amount_usd: Order size in USD
+        copy_delay_ms: Milliseconds since the original trade (for copytrade)
+
+    Returns:
+        Dict with execution_price, spread, slippage_pct, fill_pct,
+        delay_impact_pct, delay_breakdown, best_bid, best_ask, depth_at_best,
+        worst_price (the last book level the order reaches)
+    """
+    spread = depth.spread
+    depth_at_best = depth.depth_at_best(side)
+    execution_price, slippage_pct, fill_pct = depth.quote(side, amount_usd)
+
+    # Calculate copy delay price impact using the improved model
+    delay_impact_pct = 0.0
+    delay_breakdown = None
+    if copy_delay_ms > 0 and fill_pct > 0:
+        delay_model = DelayImpactModel()
+        delay_impact_pct, delay_breakdown = delay_model.calculate_impact(
+            delay_ms=copy_delay_ms,
+            order_size=amount_usd,
+            depth_at_best=depth_at_best,
+            spread=spread,
+            side=side,
+        )
+
+        # Apply delay impact to execution price
+        if side == "BUY":
+            execution_price *= 1 + delay_impact_pct / 100
+        else:
+            execution_price *= 1 - delay_impact_pct / 100
+
+        # Cap execution price at reasonable bounds
+        execution_price = max(0.01, min(0.99, execution_price))
+
+    return {
+        "execution_price": execution_price,
+        "spread": spread,
+        "slippage_pct": slippage_pct,
+        "fill_pct": fill_pct,
+        "delay_impact_pct": delay_impact_pct,
+        "delay_breakdown": delay_breakdown,
+        "best_bid": depth.best_bid,
+        "best_ask": depth.best_ask,
+        "depth_at_best": depth_at_best,
+        "worst_price": depth.worst_price(side, amount_usd),
+    }
+
+
 @dataclass
 class Market:
     """A single BTC 5-min up/down market."""
@@ -111,6 +173,12 @@ class Market:
     accepting_orders: bool
     taker_fee_bps: int = 1000  # Default 10% base fee
     resolved: bool = False  # True when umaResolutionStatus == "resolved"
+    condition_id: str | None = None  # Gamma conditionId (0x...)
+
+    @property
+    def token_ids(self) -> list[str]:
+        """CLOB asset IDs for this market (up first), for WS subscriptions."""
+        return [t for t in (self.up_token_id, self.down_token_id) if t]
 
 
 class PolymarketClient:
@@ -139,9 +207,10 @@ class PolymarketClient:
         )
 
         # Configure connection pooling
+        self.pool_size = 20
         adapter = HTTPAdapter(
-            pool_connections=20,
-            pool_maxsize=20,
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
             max_retries=retry_strategy,
         )
         self.session.mount("https://", adapter)
@@ -255,6 +324,7 @@ class PolymarketClient:
                 accepting_orders=m.get("acceptingOrders", False),
                 taker_fee_bps=taker_fee_bps,
                 resolved=is_resolved,
+                condition_id=m.get("conditionId") or None,
             )
 
             # Cache market
@@ -283,6 +353,19 @@ class PolymarketClient:
             return (market.up_token_id, market.down_token_id)
         return (None, None)
 
+    def peek_market(self, timestamp: int) -> Market | None:
+        """Return the cached market for a window without fetching."""
+        return self._market_cache.get(timestamp)
+
+    def cached_windows(self) -> set[int]:
+        """Window timestamps currently held in the market/token caches."""
+        return set(self._market_cache) | set(self._token_cache)
+
+    def evict_window(self, timestamp: int):
+        """Drop a window from the market and token caches."""
+        self._market_cache.pop(timestamp, None)
+        self._token_cache.pop(timestamp, None)
+
     def prefetch_markets(self, timestamps: list[int]) -> int:
         """Pre-fetch and cache multiple markets.
 
@@ -294,6 +377,54 @@ class PolymarketClient:
                 success += 1
         return success
 
+    def get_markets(
+        self,
+        timestamps: list[int],
+        max_workers: int | None = None,
+        rate_limiter=None,
+        on_result: Callable[[int, "Market | None"], None] | None = None,
+    ) -> dict[int, "Market | None"]:
+        """Fetch distinct markets concurrently.
+
+        Duplicate timestamps are fetched once. Workers are capped by the
+        session's connection pool so requests never wait for a socket.
+
+        Args:
+            timestamps: Window timestamps (duplicates allowed)
+            max_workers: Worker threads (default Config.BACKFILL_WORKERS)
+            rate_limiter: Optional RateLimiter each request waits on
+            on_result: Called on the caller's thread as each market arrives
+
+        Returns:
+            Timestamp -> Market (None if not found or the fetch failed)
+        """
+        unique = list(dict.fromkeys(timestamps))
+        if not unique:
+            return {}
+        workers = max(
+            1, min(max_workers or Config.BACKFILL_WORKERS, self.pool_size, len(unique))
+        )
+
+        def fetch(ts: int) -> Market | None:
+            if rate_limiter is not None:
+                while not rate_limiter.allow_request():
+                    time.sleep(max(rate_limiter.time_until_allowed(), 0.01))
+            return self.get_market(ts)
+
+        results: dict[int, Market | None] = {}
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="markets")
+        try:
+            futures = {pool.submit(fetch, ts): ts for ts in unique}
+            for future in as_completed(futures):
+                ts = futures[future]
+                results[ts] = future.result()
+                if on_result is not None:
+                    on_result(ts, results[ts])
+        finally:
+            # On interrupt, drop queued fetches instead of draining them
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
     def get_upcoming_market_timestamps(self, count: int = 5) -> list[int]:
         """Get timestamps of upcoming BTC 5-min windows.
 
@@ -398,6 +529,34 @@ class PolymarketClient:
             print(f"[polymarket] Error fetching midpoint: {e}")
             return None
 
+    def get_midpoints(self, token_ids: list[str]) -> dict[str, float]:
+        """Get midpoint prices for several tokens in one request.
+
+        Falls back to individual requests if the batch call fails.
+
+        Returns:
+            Token ID -> mid (tokens without a book are omitted)
+        """
+        if not token_ids:
+            return {}
+        try:
+            resp = self.session.post(
+                f"{self.clob}/midpoints",
+                json=[{"token_id": tid} for tid in token_ids],
+                timeout=self.timeout,
+            )
+            if resp.status_code == 200:
+                return {tid: float(mid) for tid, mid in resp.json().items()}
+        except Exception:
+            pass
+
+        results = {}
+        for tid in token_ids:
+            mid = self.get_midpoint(tid)
+            if mid is not None:
+                results[tid] = mid
+        return results
+
     def get_price(self, token_id: str, side: str = "BUY") -> float | None:
         """Get best price for a token (fastest endpoint).
 
@@ -493,105 +652,16 @@ class PolymarketClient:
         if not book:
             return (0.5, 0.0, 0.0, 100.0, 0.0, None)
 
-        # Get best bid/ask for spread calculation
-        bids = book.get("bids", [])
-        asks = book.get("asks", [])
-
-        if not bids or not asks:
+        depth = BookDepth.from_snapshot(book)
+        if depth.is_empty:
             return (0.5, 0.0, 0.0, 100.0, 0.0, None)
 
-        # Sort: asks ascending (lowest first), bids descending (highest first)
-        asks_sorted = sorted(asks, key=lambda x: float(x["price"]))
-        bids_sorted = sorted(bids, key=lambda x: float(x["price"]), reverse=True)
-
-        best_ask = float(asks_sorted[0]["price"])
-        best_bid = float(bids_sorted[0]["price"])
-        spread = best_ask - best_bid
-
-        # Calculate depth at best price level
-        if side == "BUY":
-            # Depth at best ask
-            best_level = asks_sorted[0]
-            depth_at_best = float(best_level["price"]) * float(best_level["size"])
-            levels = asks_sorted
-        else:
-            # Depth at best bid
-            best_level = bids_sorted[0]
-            depth_at_best = float(best_level["price"]) * float(best_level["size"])
-            levels = bids_sorted
-
-        remaining_usd = amount_usd
-        total_shares = 0.0
-        total_cost = 0.0
-
-        for level in levels:
-            price = float(level["price"])
-            size = float(level["size"])
-            level_value = price * size  # USD value at this level
-
-            if remaining_usd <= 0:
-                break
-
-            if level_value >= remaining_usd:
-                # This level can fill the rest
-                shares_to_take = remaining_usd / price
-                total_shares += shares_to_take
-                total_cost += remaining_usd
-                remaining_usd = 0
-            else:
-                # Take entire level
-                total_shares += size
-                total_cost += level_value
-                remaining_usd -= level_value
-
-        # Calculate fill percentage
-        filled_amount = amount_usd - remaining_usd
-        fill_pct = (filled_amount / amount_usd * 100) if amount_usd > 0 else 100.0
-
-        if total_shares == 0:
-            midpoint = (best_ask + best_bid) / 2
-            return (midpoint, spread, 0.0, 0.0, 0.0, None)
-
-        execution_price = total_cost / total_shares
-
-        # Calculate slippage vs best price
-        if side == "BUY":
-            slippage_pct = (
-                (execution_price - best_ask) / best_ask * 100 if best_ask > 0 else 0
-            )
-        else:
-            slippage_pct = (
-                (best_bid - execution_price) / best_bid * 100 if best_bid > 0 else 0
-            )
-
-        # Calculate copy delay price impact using the improved model
-        delay_impact_pct = 0.0
-        delay_breakdown = None
-
-        if copy_delay_ms > 0:
-            delay_model = DelayImpactModel()
-            delay_impact_pct, delay_breakdown = delay_model.calculate_impact(
-                delay_ms=copy_delay_ms,
-                order_size=amount_usd,
-                depth_at_best=depth_at_best,
-                spread=spread,
-                side=side,
-            )
-
-            # Apply delay impact to execution price
-            if side == "BUY":
-                execution_price *= 1 + delay_impact_pct / 100
-            else:
-                execution_price *= 1 - delay_impact_pct / 100
-
-            # Cap execution price at reasonable bounds
-            execution_price = max(0.01, min(0.99, execution_price))
-
+        quote = quote_execution(depth, side, amount_usd, copy_delay_ms)
         return (
-            execution_price,
-            spread,
-            max(0, slippage_pct),
-            fill_pct,
-            delay_impact_pct,
-            delay_breakdown,
+            quote["execution_price"],
+            quote["spread"],
+            quote["slippage_pct"],
+            quote["fill_pct"],
+            quote["delay_impact_pct"],
+            quote["delay_breakdown"],
         )
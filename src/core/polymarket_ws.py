@@ -4,137 +4,112 @@ Provides ~100ms latency vs ~1s for REST API polling.
 """
 
 import asyncio
+import concurrent.futures
 import json
 import threading
 import time
-from dataclasses import dataclass, field
+from collections import deque
+from dataclasses import dataclass
 from typing import Callable
 
 import websockets
 from websockets.exceptions import ConnectionClosed
 
+from src.config import Config
+from src.core.orderbook import TickOrderBook
+from src.infra.dispatch import EventDispatcher
 
-@dataclass
-class OrderBookLevel:
-    """Single price level in orderbook."""
 
-    price: float
-    size: float
+class CachedOrderBook(TickOrderBook):
+    """Cached order book state for one token, backed by the tick engine.
 
+    Tracks feed continuity: a delta that arrives out of order, or whose
+    result disagrees with the best bid/ask the feed reports alongside it,
+    marks the book invalid until the next full snapshot.
+    """
 
-@dataclass
-class CachedOrderBook:
-    """Cached order book state with timestamp."""
+    def __init__(self, token_id: str):
+        super().__init__()
+        self.token_id = token_id
 
-    token_id: str
-    bids: list[OrderBookLevel] = field(default_factory=list)
-    asks: list[OrderBookLevel] = field(default_factory=list)
-    timestamp: float = 0.0
-    best_bid: float = 0.0
-    best_ask: float = 0.0
-    mid: float = 0.5
-
-    def update_from_snapshot(self, data: dict):
-        """Update from full orderbook snapshot."""
-        self.bids = [
-            OrderBookLevel(float(b["price"]), float(b["size"]))
-            for b in data.get("bids", [])
-        ]
-        self.asks = [
-            OrderBookLevel(float(a["price"]), float(a["size"]))
-            for a in data.get("asks", [])
-        ]
-        self._recalculate()
-
-    def update_from_delta(self, data: dict):
-        """Update from orderbook delta (price_change event)."""
-        changes = data.get("changes", [])
-        for change in changes:
-            side = change.get("side")
-            price = float(change.get("price", 0))
-            size = float(change.get("size", 0))
-
-            if side == "BUY":
-                self._update_level(self.bids, price, size, reverse=True)
-            elif side == "SELL":
-                self._update_level(self.asks, price, size, reverse=False)
-        self._recalculate()
-
-    def _update_level(
-        self, levels: list[OrderBookLevel], price: float, size: float, reverse: bool
-    ):
-        """Update a single price level."""
-        # Find existing level
-        for i, level in enumerate(levels):
-            if abs(level.price - price) < 0.0001:
-                if size == 0:
-                    levels.pop(i)
-                else:
-                    level.size = size
-                return
+        self.valid = True
+        self.invalid_reason = ""
+        self.invalid_since = 0.0
+        self.feed_ts = 0  # feed timestamp (ms) of the last applied event
+        self.snapshot_ts = 0  # feed timestamp (ms) of the last snapshot
+        self.hash = ""
 
-        # Add new level if size > 0
-        if size > 0:
-            levels.append(OrderBookLevel(price, size))
-            levels.sort(key=lambda x: x.price, reverse=reverse)
-
-    def _recalculate(self):
-        """Recalculate best bid/ask and mid."""
-        self.timestamp = time.time()
-        if self.bids:
-            self.bids.sort(key=lambda x: x.price, reverse=True)
-            self.best_bid = self.bids[0].price
-        if self.asks:
-            self.asks.sort(key=lambda x: x.price)
-            self.best_ask = self.asks[0].price
-        if self.best_bid > 0 and self.best_ask > 0:
-            self.mid = (self.best_bid + self.best_ask) / 2
+    def apply_snapshot(self, data: dict) -> float | None:
+        """Replace contents from a snapshot and mark the book valid.
 
-    def get_execution_price(
-        self, side: str, amount_usd: float
-    ) -> tuple[float, float, float]:
-        """Calculate execution price by walking the book.
-
-        Returns: (execution_price, slippage_pct, fill_pct)
+        Returns:
+            Milliseconds the book spent invalid if this snapshot recovered
+            it, else None
         """
-        levels = self.asks if side == "BUY" else self.bids
-
-        if not levels:
-            return self.mid, 0.0, 0.0
-
-        remaining = amount_usd
-        total_shares = 0.0
-        total_cost = 0.0
-
-        for level in levels:
-            if remaining <= 0:
-                break
-            level_value = level.price * level.size
-            if level_value >= remaining:
-                shares = remaining / level.price
-                total_shares += shares
-                total_cost += remaining
-                remaining = 0
-            else:
-                total_shares += level.size
-                total_cost += level_value
-                remaining -= level_value
+        self.update_from_snapshot(data)
+        ts = _feed_ts(data)
+        self.feed_ts = self.snapshot_ts = max(ts, self.snapshot_ts)
+        self.hash = data.get("hash", "")
+
+        if self.valid:
+            return None
+        recovered_ms = (time.time() - self.invalid_since) * 1000
+        self.valid = True
+        self.invalid_reason = ""
+        self.invalid_since = 0.0
+        return recovered_ms
+
+    def apply_delta(self, changes: list[dict], feed_ts: int) -> bool:
+        """Apply validated price changes.
+
+        Deltas older than the last snapshot are already reflected in it and
+        are skipped. A delta older than the last applied delta would
+        overwrite newer level sizes, so it invalidates the book.
+
+        Returns:
+            False if the book is (now) invalid
+        """
+        if not self.valid:
+            return False
+        if feed_ts and feed_ts < self.feed_ts:
+            if feed_ts <= self.snapshot_ts:
+                return True
+            self.invalidate("out_of_order")
+            return False
 
-        if total_shares == 0:
-            return self.mid, 0.0, 0.0
+        self.update_from_delta({"changes": changes})
+        if feed_ts:
+            self.feed_ts = feed_ts
+        if changes and changes[-1].get("hash"):
+            self.hash = changes[-1]["hash"]
+
+        # The feed reports the resulting top of book with each change
+        last = changes[-1] if changes else {}
+        for key, ours in (("best_bid", self.best_bid), ("best_ask", self.best_ask)):
+            theirs = last.get(key)
+            if theirs not in (None, "") and abs(float(theirs) - ours) > 1e-9:
+                self.invalidate(f"{key}_mismatch")
+                return False
+
+        if self.best_bid > 0 and self.best_ask > 0 and self.best_bid >= self.best_ask:
+            self.invalidate("crossed")
+            return False
+        return True
 
-        exec_price = total_cost / total_shares
-        filled_amount = amount_usd - remaining
-        fill_pct = (filled_amount / amount_usd * 100) if amount_usd > 0 else 100.0
+    def invalidate(self, reason: str):
+        """Mark the book unusable until the next snapshot."""
+        if self.valid:
+            self.valid = False
+            self.invalid_reason = reason
+            self.invalid_since = time.time()
 
-        # Calculate slippage vs best price
-        best_price = self.best_ask if side == "BUY" else self.best_bid
-        if best_price > 0:
-            slippage_pct = abs(exec_price - best_price) / best_price * 100
-        else:
-            slippage_pct = 0.0
 
-        return exec_price, slippage_pct, fill_pct
+def _feed_ts(data: dict) -> int:
+    """Feed timestamp in ms (0 if absent)."""
+    try:
+        return int(data.get("timestamp") or 0)
+    except (TypeError, ValueError):
+        return 0
 
 
 @dataclass
@@ -149,6 +124,7 @@ class TradeEvent:
     timestamp: float  # unix seconds
     taker_address: str = ""
     maker_address: str = ""
+    slug: str = ""  # Filled in by MarketDataCache for markets it tracks
 
 
 class PolymarketWebSocket:
@@ -158,115 +134,133 @@ class PolymarketWebSocket:
     - Order book subscriptions with ~100ms latency
     - Trade event streaming
     - Automatic reconnection
+
+    Runs as a task on the shared WSRuntime. ``WSRuntime.market_feed()``
+    returns the one instance consumers share; start/stop and market
+    subscriptions are reference-counted so consumers don't tear down each
+    other's state. Public methods are safe to call from any thread.
     """
 
     WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
     USER_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/user"
 
-    def __init__(self, on_trade: Callable[[TradeEvent], None] | None = None):
+    def __init__(
+        self,
+        on_trade: Callable[[TradeEvent], None] | None = None,
+        runtime=None,
+    ):
         """Initialize WebSocket client.
 
         Args:
-            on_trade: Callback for trade events (called from asyncio thread)
+            on_trade: Callback for trade events (called on the runtime loop;
+                must not block - MarketDataCache hands off to a worker pool)
+            runtime: WSRuntime to run on (defaults to the process-wide one)
         """
-        self._on_trade = on_trade
+        self._trade_listeners: list[Callable[[TradeEvent], None]] = []
+        if on_trade:
+            self._trade_listeners.append(on_trade)
+        self._runtime = runtime
         self._orderbooks: dict[str, CachedOrderBook] = {}
-        self._subscribed_tokens: set[str] = set()
-        self._subscribed_markets: set[str] = set()  # condition IDs
+        self._subscribed_tokens: set[str] = set()  # CLOB asset IDs
+        # condition ID -> asset IDs, so a market can be unsubscribed as a unit
+        self._subscribed_markets: dict[str, list[str]] = {}
+        # condition ID -> subscriber count; the socket is shared by consumers
+        self._market_refs: dict[str, int] = {}
         self._ws = None
         self._running = False
-        self._loop: asyncio.AbstractEventLoop | None = None
-        self._thread: threading.Thread | None = None
-        self._connected = asyncio.Event()
+        self._users = 0
+        self._feed = None  # concurrent Future of _connect_loop on the runtime
+        self._connected = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
         self._lock = threading.Lock()
 
-        # Trade callback queue for thread-safe delivery
-        self._trade_queue: list[TradeEvent] = []
-
         # Connection stats
         self.reconnect_count = 0
         self.last_message_time = 0.0
         self.messages_received = 0
 
-    def start(self):
-        """Start WebSocket connection in background thread."""
-        if self._running:
-            return
+        # Book validation / resync
+        self._resyncing: set[str] = set()
+        self._rest_client = None  # created on first REST resync
+        self.invalidations = 0
+        self.resync_count = 0
+        self.resyncs_ws = 0
+        self.resyncs_rest = 0
+        self._recover_ms: deque = deque(maxlen=200)
 
-        self._running = True
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+    @property
+    def runtime(self):
+        """The WSRuntime this feed runs on."""
+        if self._runtime is None:
+            from src.core.ws_runtime import get_runtime
 
-        # Wait for connection (with timeout)
-        timeout = 5.0
-        start = time.time()
-        while not self._connected.is_set() and time.time() - start < timeout:
-            time.sleep(0.1)
+            self._runtime = get_runtime()
+        return self._runtime
 
-    def stop(self):
-        """Stop WebSocket connection gracefully."""
-        self._running = False
+    def start(self, timeout: float = 5.0):
+        """Start the feed on the shared runtime and wait for the connection.
 
-        if self._loop and self._loop.is_running():
-            try:
-                # Schedule graceful shutdown
-                asyncio.run_coroutine_threadsafe(self._graceful_shutdown(), self._loop)
-                # Give it time to close cleanly
-                time.sleep(0.5)
-                # Now stop the loop
-                self._loop.call_soon_threadsafe(self._loop.stop)
-            except RuntimeError:
-                # Event loop already closed, ignore
-                pass
-
-        if self._thread:
-            self._thread.join(timeout=2.0)
-
-    async def _graceful_shutdown(self):
-        """Gracefully close WebSocket and cancel tasks."""
-        # Close WebSocket connection
-        if self._ws:
-            try:
-                await self._ws.close()
-            except Exception:
-                pass
-
-        # Cancel all pending tasks except current
-        tasks = [
-            t for t in asyncio.all_tasks(self._loop) if t is not asyncio.current_task()
-        ]
-        for task in tasks:
-            task.cancel()
-
-        # Wait for tasks to be cancelled
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
-
-    def _run_loop(self):
-        """Run asyncio event loop in background thread."""
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-        try:
-            self._loop.run_until_complete(self._connect_loop())
-        except Exception as e:
-            if self._running:  # Only log if not intentionally stopped
-                print(f"[ws] Event loop error: {e}")
-        finally:
-            # Clean up any remaining tasks
-            try:
-                pending = asyncio.all_tasks(self._loop)
-                for task in pending:
-                    task.cancel()
-                if pending:
-                    self._loop.run_until_complete(
-                        asyncio.gather(*pending, return_exceptions=True)
-                    )
-            except Exception:
-                pass
-            self._loop.close()
+        Reference-counted: each consumer calls start/stop once and the socket
+        stays open while any consumer remains.
+        """
+        with self._lock:
+            self._users += 1
+            launch = not self._running
+            if launch:
+                self._running = True
+                self._stopped.clear()
+        if launch:
+            self._feed = self.runtime.run_feed(
+                f"market-{id(self):x}", self._connect_loop()
+            )
+        self._connected.wait(timeout)
+
+    def stop(self, timeout: float = 2.0):
+        """Release one consumer; close the socket when the last one leaves."""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users or not self._running:
+                return
+            self._running = False
+            feed = self._feed
+            self._feed = None
+        self._shutdown_feed(feed, timeout)
+
+    def _shutdown_feed(self, feed, timeout: float):
+        """Close the socket cleanly if open, else cancel the (sleeping) task."""
+        ws = self._ws
+        if ws is not None and self._connected.is_set():
+            # _connect_loop exits on its own once the close completes
+            self.runtime.submit(ws.close())
+            if self._stopped.wait(timeout):
+                return
+        if feed is not None:
+            feed.cancel()
+        self._stopped.wait(timeout)
+
+    def add_trade_listener(self, callback: Callable[[TradeEvent], None]):
+        """Register a trade callback (runs on the runtime loop; must not block)."""
+        with self._lock:
+            self._trade_listeners.append(callback)
+
+    def remove_trade_listener(self, callback: Callable[[TradeEvent], None]):
+        """Unregister a trade callback."""
+        with self._lock:
+            if callback in self._trade_listeners:
+                self._trade_listeners.remove(callback)
 
     async def _connect_loop(self):
         """Main connection loop with reconnection logic."""
+        try:
+            await self._run_connection()
+        finally:
+            self._ws = None
+            self._connected.clear()
+            self._stopped.set()
+
+    async def _run_connection(self):
+        """Connect, stream, and reconnect with backoff until stopped."""
         while self._running:
             try:
                 async with websockets.connect(
@@ -300,6 +294,13 @@ class PolymarketWebSocket:
                 print(f"[ws] Connection error: {e}")
                 self._connected.clear()
 
+            # Deltas may have been lost while disconnected; the resubscribe
+            # on reconnect delivers fresh snapshots
+            with self._lock:
+                for book in self._orderbooks.values():
+                    if book.timestamp > 0:
+                        book.invalidate("reconnect")
+
             if self._running:
                 self.reconnect_count += 1
                 wait_time = min(30, 2 ** min(self.reconnect_count, 5))
@@ -307,21 +308,28 @@ class PolymarketWebSocket:
                 await asyncio.sleep(wait_time)
 
     async def _resubscribe(self):
-        """Resubscribe to all tokens/markets after reconnect."""
-        if self._subscribed_markets:
-            for market_id in self._subscribed_markets:
-                await self._send_subscribe(market_id)
+        """Resubscribe to all tracked assets after (re)connect.
 
-    async def _send_subscribe(self, market_id: str):
-        """Send subscription message for a market."""
-        if not self._ws:
+        The market channel's initial message carries the full asset list.
+        """
+        with self._lock:
+            assets = sorted(self._subscribed_tokens)
+        if assets and self._ws:
+            msg = {"type": "market", "assets_ids": assets}
+            await self._ws.send(json.dumps(msg))
+
+        # Fall back to REST for any book the resubscribe doesn't restore
+        with self._lock:
+            invalid = [t for t, b in self._orderbooks.items() if not b.valid]
+        for token_id in invalid:
+            self._schedule_resync(token_id, resubscribe=False)
+
+    async def _send_subscribe(self, token_ids: list[str], operation: str = "subscribe"):
+        """Add or remove asset IDs on the live connection."""
+        if not self._ws or not token_ids:
             return
 
-        msg = {
-            "type": "subscribe",
-            "channel": "market",
-            "market": market_id,
-        }
+        msg = {"assets_ids": token_ids, "operation": operation}
         await self._ws.send(json.dumps(msg))
 
     async def _handle_message(self, raw: str):
@@ -331,23 +339,54 @@ class PolymarketWebSocket:
         except json.JSONDecodeError:
             return
 
+        # Subscription replies batch one book snapshot per asset in a list
+        if isinstance(data, list):
+            for event in data:
+                if isinstance(event, dict):
+                    await self._handle_event(event)
+        elif isinstance(data, dict):
+            await self._handle_event(data)
+
+    async def _handle_event(self, data: dict):
+        """Handle a single market-channel event."""
         msg_type = data.get("type", data.get("event_type", ""))
 
         if msg_type == "book":
             # Full orderbook snapshot
             token_id = data.get("asset_id", "")
             if token_id:
-                with self._lock:
-                    if token_id not in self._orderbooks:
-                        self._orderbooks[token_id] = CachedOrderBook(token_id=token_id)
-                    self._orderbooks[token_id].update_from_snapshot(data)
+                if "bids" not in data and "buys" in data:
+                    data = {**data, "bids": data["buys"], "asks": data.get("sells", [])}
+                self._apply_snapshot(token_id, data, source="ws")
 
         elif msg_type == "price_change":
-            # Orderbook delta
-            token_id = data.get("asset_id", "")
-            if token_id and token_id in self._orderbooks:
-                with self._lock:
-                    self._orderbooks[token_id].update_from_delta(data)
+            # Orderbook delta: either one asset with "changes", or a batch of
+            # "price_changes" each carrying its own asset_id
+            if "price_changes" in data:
+                by_token: dict[str, list[dict]] = {}
+                for change in data["price_changes"]:
+                    by_token.setdefault(change.get("asset_id", ""), []).append(change)
+            else:
+                # Older format: hash/timestamp sit on the event itself
+                changes = list(data.get("changes", []))
+                if changes and data.get("hash"):
+                    changes[-1] = {**changes[-1], "hash": data["hash"]}
+                by_token = {data.get("asset_id", ""): changes}
+
+            feed_ts = _feed_ts(data)
+            failed = []
+            with self._lock:
+                for token_id, changes in by_token.items():
+                    book = self._orderbooks.get(token_id)
+                    if book is None or book.timestamp <= 0:
+                        continue
+                    was_valid = book.valid
+                    if not book.apply_delta(changes, feed_ts) and was_valid:
+                        self.invalidations += 1
+                        failed.append((token_id, book.invalid_reason))
+            for token_id, reason in failed:
+                print(f"[ws] Book {token_id[:10]}... invalid ({reason}), resyncing")
+                self._schedule_resync(token_id)
 
         elif msg_type == "last_trade_price":
             # Trade event
@@ -357,6 +396,8 @@ class PolymarketWebSocket:
             size = float(data.get("size", 0))
             side = data.get("side", "BUY")
             ts = float(data.get("timestamp", time.time()))
+            if ts > 1e12:  # Feed sends unix ms
+                ts /= 1000
 
             trade = TradeEvent(
                 token_id=token_id,
@@ -367,41 +408,110 @@ class PolymarketWebSocket:
                 timestamp=ts,
             )
 
-            if self._on_trade:
-                self._on_trade(trade)
+            with self._lock:
+                listeners = list(self._trade_listeners)
+            for callback in listeners:
+                try:
+                    callback(trade)
+                except Exception as e:
+                    print(f"[ws] Trade listener error: {e}")
+
+    def _apply_snapshot(self, token_id: str, data: dict, source: str):
+        """Apply a full snapshot (WS or REST) and record recovery."""
+        with self._lock:
+            book = self._orderbooks.get(token_id)
+            if book is None:
+                # Late snapshot for an asset we've since unsubscribed
+                if token_id not in self._subscribed_tokens:
+                    return
+                book = self._orderbooks[token_id] = CachedOrderBook(token_id)
+            recovered_ms = book.apply_snapshot(data)
+            if recovered_ms is not None:
+                self.resync_count += 1
+                if source == "rest":
+                    self.resyncs_rest += 1
+                else:
+                    self.resyncs_ws += 1
+                self._recover_ms.append(recovered_ms)
+
+    def _schedule_resync(self, token_id: str, resubscribe: bool = True):
+        """Start a targeted resync for one book (loop thread only)."""
+        if token_id in self._resyncing:
+            return
+        self._resyncing.add(token_id)
+        asyncio.ensure_future(self._resync(token_id, resubscribe))
 
-    def subscribe_market(self, condition_id: str, token_ids: list[str] | None = None):
+    async def _resync(self, token_id: str, resubscribe: bool):
+        """Restore an invalid book: WS resubscribe first, REST /book if that
+        doesn't deliver a snapshot within RESYNC_TIMEOUT."""
+        try:
+            if resubscribe and self._connected.is_set():
+                # Re-adding the asset makes the server resend its snapshot
+                await self._send_subscribe([token_id], operation="unsubscribe")
+                await self._send_subscribe([token_id])
+
+            deadline = time.time() + Config.WS_RESYNC_TIMEOUT
+            while time.time() < deadline:
+                await asyncio.sleep(0.1)
+                with self._lock:
+                    book = self._orderbooks.get(token_id)
+                    if book is None or book.valid:
+                        return
+
+            from src.core.polymarket import PolymarketClient
+
+            if self._rest_client is None:
+                self._rest_client = PolymarketClient()
+            data = await asyncio.to_thread(self._rest_client.get_orderbook, token_id)
+            if data:
+                self._apply_snapshot(token_id, data, source="rest")
+        except Exception as e:
+            print(f"[ws] Resync error for {token_id[:10]}...: {e}")
+        finally:
+            self._resyncing.discard(token_id)
+
+    def subscribe_market(self, condition_id: str, token_ids: list[str]):
         """Subscribe to a market's orderbook and trade updates.
 
+        The market channel is keyed by CLOB asset ID; the condition ID is
+        only used to group the assets for later unsubscribe. Safe to call
+        from any thread; subscriptions are counted per consumer.
+
         Args:
             condition_id: Market condition ID
-            token_ids: Optional list of token IDs to track orderbooks for
+            token_ids: CLOB token (asset) IDs to track orderbooks for
         """
-        self._subscribed_markets.add(condition_id)
-
-        if token_ids:
+        with self._lock:
+            self._market_refs[condition_id] = self._market_refs.get(condition_id, 0) + 1
+            new_tokens = [t for t in token_ids if t not in self._subscribed_tokens]
+            self._subscribed_markets[condition_id] = list(token_ids)
+            self._subscribed_tokens.update(token_ids)
             for tid in token_ids:
-                self._subscribed_tokens.add(tid)
-                with self._lock:
-                    if tid not in self._orderbooks:
-                        self._orderbooks[tid] = CachedOrderBook(token_id=tid)
+                if tid not in self._orderbooks:
+                    self._orderbooks[tid] = CachedOrderBook(token_id=tid)
 
-        if self._loop and self._connected.is_set():
-            asyncio.run_coroutine_threadsafe(
-                self._send_subscribe(condition_id), self._loop
-            )
+        # Not connected yet: _resubscribe sends everything on connect
+        if new_tokens and self._connected.is_set():
+            self.runtime.submit(self._send_subscribe(new_tokens))
 
     def unsubscribe_market(self, condition_id: str):
-        """Unsubscribe from a market."""
-        self._subscribed_markets.discard(condition_id)
-
-        if self._loop and self._ws:
-            msg = {
-                "type": "unsubscribe",
-                "channel": "market",
-                "market": condition_id,
-            }
-            asyncio.run_coroutine_threadsafe(self._ws.send(json.dumps(msg)), self._loop)
+        """Release a market subscription; the last consumer out unsubscribes
+        its assets and drops their order books."""
+        with self._lock:
+            refs = self._market_refs.get(condition_id, 0) - 1
+            if refs > 0:
+                self._market_refs[condition_id] = refs
+                return
+            self._market_refs.pop(condition_id, None)
+            token_ids = self._subscribed_markets.pop(condition_id, [])
+            for tid in token_ids:
+                self._subscribed_tokens.discard(tid)
+                self._orderbooks.pop(tid, None)
+
+        if token_ids and self._connected.is_set():
+            self.runtime.submit(
+                self._send_subscribe(token_ids, operation="unsubscribe")
+            )
 
     def get_orderbook(self, token_id: str) -> CachedOrderBook | None:
         """Get cached orderbook for a token.
@@ -419,58 +529,23 @@ class PolymarketWebSocket:
         Returns: (exec_price, spread, slippage_pct, fill_pct, delay_impact_pct, delay_breakdown)
         Falls back to REST API if no cached data.
         """
-        from src.core.polymarket import DelayImpactModel
-
-        book = self.get_orderbook(token_id)
-
-        if book and book.timestamp > 0:
-            # Use cached orderbook
-            exec_price, slippage_pct, fill_pct = book.get_execution_price(
-                side, amount_usd
-            )
-            spread = (
-                book.best_ask - book.best_bid
-                if book.best_ask > 0 and book.best_bid > 0
-                else 0
-            )
-
-            # Calculate depth at best level
-            if side == "BUY":
-                depth_at_best = (
-                    book.asks[0].price * book.asks[0].size if book.asks else 0
-                )
-            else:
-                depth_at_best = (
-                    book.bids[0].price * book.bids[0].size if book.bids else 0
-                )
+        from src.core.polymarket import quote_execution
 
-            # Calculate delay impact using the improved model
-            delay_impact_pct = 0.0
-            delay_breakdown = None
-
-            if copy_delay_ms > 0:
-                delay_model = DelayImpactModel()
-                delay_impact_pct, delay_breakdown = delay_model.calculate_impact(
-                    delay_ms=copy_delay_ms,
-                    order_size=amount_usd,
-                    depth_at_best=depth_at_best,
-                    spread=spread,
-                    side=side,
-                )
-
-                if side == "BUY":
-                    exec_price *= 1 + delay_impact_pct / 100
-                else:
-                    exec_price *= 1 - delay_impact_pct / 100
-                exec_price = max(0.01, min(0.99, exec_price))
+        # Take the immutable depth index under the lock; quote outside it
+        with self._lock:
+            book = self._orderbooks.get(token_id)
+            # Never price off a book that failed validation
+            depth = book.depth() if book and book.timestamp > 0 and book.valid else None
 
+        if depth is not None:
+            quote = quote_execution(depth, side, amount_usd, copy_delay_ms)
             return (
-                exec_price,
-                spread,
-                slippage_pct,
-                fill_pct,
-                delay_impact_pct,
-                delay_breakdown,
+                quote["execution_price"],
+                quote["spread"],
+                quote["slippage_pct"],
+                quote["fill_pct"],
+                quote["delay_impact_pct"],
+                quote["delay_breakdown"],
             )
 
         # No cached data
@@ -478,11 +553,36 @@ class PolymarketWebSocket:
 
     def get_mid(self, token_id: str) -> float | None:
         """Get midpoint price from cached orderbook."""
-        book = self.get_orderbook(token_id)
-        if book and book.timestamp > 0:
-            return book.mid
+        with self._lock:
+            book = self._orderbooks.get(token_id)
+            if book and book.timestamp > 0 and book.valid:
+                return book.mid
         return None
 
+    def snapshot_orderbook(self, token_id: str) -> dict | None:
+        """Consistent copy of a valid cached book, for callers off the loop.
+
+        Returns:
+            Dict with bids, asks, timestamp and depth, or None if the book
+            is missing, empty or invalid
+        """
+        with self._lock:
+            book = self._orderbooks.get(token_id)
+            if not book or book.timestamp <= 0 or not book.valid:
+                return None
+            return {
+                "bids": [
+                    {"price": str(level.price), "size": str(level.size)}
+                    for level in book.bids
+                ],
+                "asks": [
+                    {"price": str(level.price), "size": str(level.size)}
+                    for level in book.asks
+                ],
+                "timestamp": book.timestamp,
+                "depth": book.depth(),
+            }
+
     def is_connected(self) -> bool:
         """Check if WebSocket is connected."""
         return self._connected.is_set()
@@ -490,6 +590,9 @@ class PolymarketWebSocket:
     @property
     def stats(self) -> dict:
         """Get connection statistics."""
+        with self._lock:
+            books = list(self._orderbooks.values())
+        recover = list(self._recover_ms)
         return {
             "connected": self.is_connected(),
             "reconnect_count": self.reconnect_count,
@@ -497,8 +600,19 @@ class PolymarketWebSocket:
             "last_message_age": time.time() - self.last_message_time
             if self.last_message_time
             else None,
+            "consumers": self._users,
             "subscribed_markets": len(self._subscribed_markets),
+            "subscribed_assets": len(self._subscribed_tokens),
             "cached_orderbooks": len(self._orderbooks),
+            "invalid_books": sum(1 for b in books if not b.valid),
+            "invalidations": self.invalidations,
+            "resync_count": self.resync_count,
+            "resyncs_ws": self.resyncs_ws,
+            "resyncs_rest": self.resyncs_rest,
+            "recover_ms_avg": round(sum(recover) / len(recover), 1)
+            if recover
+            else None,
+            "recover_ms_max": round(max(recover), 1) if recover else None,
         }
 
 
@@ -523,6 +637,7 @@ class UserWebSocket:
         api_secret: str,
         api_passphrase: str,
         on_order_update: Callable[[dict], None] | None = None,
+        runtime=None,
     ):
         """Initialize authenticated User WebSocket.
 
@@ -531,72 +646,96 @@ class UserWebSocket:
             api_secret: API secret
             api_passphrase: API passphrase
             on_order_update: Callback for order status updates
+            runtime: WSRuntime to run on (defaults to the process-wide one)
         """
         self._api_key = api_key
         self._api_secret = api_secret
         self._api_passphrase = api_passphrase
         self._on_order_update = on_order_update
 
+        self._runtime = runtime
         self._ws = None
         self._running = False
-        self._loop: asyncio.AbstractEventLoop | None = None
-        self._thread: threading.Thread | None = None
-        self._connected = asyncio.Event()
-        self._authenticated = asyncio.Event()
+        self._feed = None  # concurrent Future of _connect_loop on the runtime
+        self._connected = threading.Event()
+        self._authenticated = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
         self._lock = threading.Lock()
 
         # Track pending orders for status updates
         self._pending_orders: dict[str, dict] = {}  # order_id -> order info
+        # Futures resolved on a terminal update; FOK fills can arrive before
+        # post_order returns the ID, so recent terminal updates are kept too
+        self._order_futures: dict[str, concurrent.futures.Future] = {}
+        self._recent_terminal: dict[str, dict] = {}
 
         # Statistics
         self.reconnect_count = 0
         self.last_message_time = 0.0
         self.messages_received = 0
         self.orders_tracked = 0
+        self.orders_resolved = 0
 
-    def start(self):
-        """Start WebSocket connection in background thread."""
-        if self._running:
-            return
+    # Statuses after which an order will not change again (FOK orders)
+    TERMINAL_STATUSES = {"filled", "cancelled", "failed"}
+    RECENT_TERMINAL_MAX = 256
+
+    @property
+    def runtime(self):
+        """The WSRuntime this feed runs on."""
+        if self._runtime is None:
+            from src.core.ws_runtime import get_runtime
 
-        self._running = True
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+            self._runtime = get_runtime()
+        return self._runtime
 
-        # Wait for authentication (with timeout)
-        timeout = 10.0
-        start = time.time()
-        while not self._authenticated.is_set() and time.time() - start < timeout:
-            time.sleep(0.1)
+    def start(self, timeout: float = 10.0):
+        """Start the feed on the shared runtime and wait for authentication."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._stopped.clear()
+        self._feed = self.runtime.run_feed(f"user-{id(self):x}", self._connect_loop())
 
-        if not self._authenticated.is_set():
+        if not self._authenticated.wait(timeout):
             print("[user-ws] Warning: Authentication timeout")
 
-    def stop(self):
+    def stop(self, timeout: float = 2.0):
         """Stop WebSocket connection."""
-        self._running = False
-        if self._loop and self._loop.is_running():
-            try:
-                self._loop.call_soon_threadsafe(self._loop.stop)
-            except RuntimeError:
-                # Event loop already closed, ignore
-                pass
-        if self._thread:
-            self._thread.join(timeout=2.0)
-
-    def _run_loop(self):
-        """Run asyncio event loop in background thread."""
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-        try:
-            self._loop.run_until_complete(self._connect_loop())
-        except Exception as e:
-            print(f"[user-ws] Event loop error: {e}")
-        finally:
-            self._loop.close()
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            feed = self._feed
+            self._feed = None
+        self._shutdown_feed(feed, timeout)
+
+    def _shutdown_feed(self, feed, timeout: float):
+        """Close the socket cleanly if open, else cancel the (sleeping) task."""
+        ws = self._ws
+        if ws is not None and self._connected.is_set():
+            # _connect_loop exits on its own once the close completes
+            self.runtime.submit(ws.close())
+            if self._stopped.wait(timeout):
+                return
+        if feed is not None:
+            feed.cancel()
+        self._stopped.wait(timeout)
 
     async def _connect_loop(self):
         """Main connection loop with reconnection logic."""
+        try:
+            await self._run_connection()
+        finally:
+            self._ws = None
+            self._connected.clear()
+            self._authenticated.clear()
+            self._stopped.set()
+
+    async def _run_connection(self):
+        """Connect, authenticate, stream, and reconnect until stopped."""
         while self._running:
             try:
                 async with websockets.connect(
@@ -665,7 +804,8 @@ class UserWebSocket:
         except json.JSONDecodeError:
             return
 
-        msg_type = data.get("type", data.get("event_type", ""))
+        # Order/trade events carry event_type; "type" is PLACEMENT/UPDATE/...
+        msg_type = data.get("event_type") or data.get("type", "")
 
         # Handle authentication response
         if msg_type == "subscribed" or msg_type == "authenticated":
@@ -684,15 +824,22 @@ class UserWebSocket:
 
     async def _handle_order_update(self, data: dict):
         """Handle order status update."""
-        order_id = data.get("order_id", data.get("orderId", data.get("id", "")))
+        order_id = (
+            data.get("order_id")
+            or data.get("orderId")
+            or data.get("taker_order_id")
+            or data.get("id", "")
+        )
         status = data.get("status", data.get("order_status", ""))
-        event = data.get("event", data.get("event_type", ""))
+        event = data.get("event", data.get("type", ""))
 
         update = {
             "order_id": order_id,
             "status": status,
             "event": event,
             "timestamp": time.time(),
+            "filled_size": float(data.get("size_matched") or data.get("size") or 0),
+            "avg_price": float(data.get("price") or 0),
             "data": data,
         }
 
@@ -707,13 +854,23 @@ class UserWebSocket:
             update["status"] = "failed"
         elif event == "RETRYING" or status == "RETRYING":
             update["status"] = "retrying"
-        elif event == "CANCELED" or status == "CANCELED":
+        elif event in ("CANCELED", "CANCELLATION") or status == "CANCELED":
             update["status"] = "cancelled"
 
-        # Update pending order if tracked
+        # Update pending order if tracked; resolve anyone waiting on it
+        future = None
         with self._lock:
             if order_id in self._pending_orders:
                 self._pending_orders[order_id].update(update)
+            if update["status"] in self.TERMINAL_STATUSES:
+                future = self._order_futures.pop(order_id, None)
+                if future is None:
+                    self._recent_terminal[order_id] = update
+                    if len(self._recent_terminal) > self.RECENT_TERMINAL_MAX:
+                        self._recent_terminal.pop(next(iter(self._recent_terminal)))
+        if future is not None and not future.done():
+            future.set_result(update)
+            self.orders_resolved += 1
 
         # Call callback
         if self._on_order_update:
@@ -738,6 +895,28 @@ class UserWebSocket:
             }
             self.orders_tracked += 1
 
+    def expect_order(self, order_id: str) -> concurrent.futures.Future:
+        """Future resolved with the order's first terminal update.
+
+        Resolves to the update dict (status filled/cancelled/failed). If the
+        update already arrived - FOK orders often match before post_order
+        returns - the future is resolved immediately.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            update = self._recent_terminal.pop(order_id, None)
+            if update is None:
+                self._order_futures[order_id] = future
+        if update is not None:
+            future.set_result(update)
+            self.orders_resolved += 1
+        return future
+
+    def forget_order(self, order_id: str):
+        """Drop a pending future (e.g. after a timeout fell back to REST)."""
+        with self._lock:
+            self._order_futures.pop(order_id, None)
+
     def get_order_status(self, order_id: str) -> dict | None:
         """Get current status of a tracked order."""
         with self._lock:
@@ -762,6 +941,8 @@ class UserWebSocket:
             "messages_received": self.messages_received,
             "orders_tracked": self.orders_tracked,
             "pending_orders": len(self._pending_orders),
+            "awaiting_orders": len(self._order_futures),
+            "orders_resolved": self.orders_resolved,
             "last_message_age": time.time() - self.last_message_time
             if self.last_message_time
             else None,
@@ -771,13 +952,21 @@ class UserWebSocket:
 class MarketDataCache:
     """High-level cache for BTC 5-min market data.
 
-    Combines WebSocket feeds with REST API fallback.
+    Combines WebSocket feeds with REST API fallback. The WebSocket side is
+    the process-wide shared market feed (see WSRuntime.market_feed).
     """
 
-    def __init__(self, use_websocket: bool = True):
+    def __init__(self, use_websocket: bool = True, rest_client=None):
+        """Initialize cache.
+
+        Args:
+            use_websocket: Stream books over the shared market feed
+            rest_client: PolymarketClient for market lookups and REST
+                fallbacks (share the bot's so each window is fetched once)
+        """
         from src.core.polymarket import PolymarketClient
 
-        self._rest_client = PolymarketClient()
+        self._rest_client = rest_client or PolymarketClient()
         self._ws: PolymarketWebSocket | None = None
         self._use_websocket = use_websocket
 
@@ -787,28 +976,57 @@ class MarketDataCache:
         ] = {}  # timestamp -> (up_token, down_token)
         self._condition_cache: dict[int, str] = {}  # timestamp -> condition_id
         self._market_cache: dict[int, dict] = {}  # timestamp -> market data
+        self._slug_by_asset: dict[str, str] = {}  # token/condition ID -> slug
+        self._ws_subscribed: set[int] = set()  # windows holding a feed subscription
         self._cache_ttl = 60  # seconds
 
-        # Trade callbacks
+        # Lookups served from the WS cache vs REST fallback, per method
+        self._ws_hits: dict[str, int] = {"orderbook": 0, "execution": 0, "mid": 0}
+        self._rest_hits: dict[str, int] = {"orderbook": 0, "execution": 0, "mid": 0}
+
+        # Trade callbacks run on a worker pool so slow handlers (HTTP polls)
+        # never stall the WebSocket loop; bursts per market are coalesced
         self._trade_callbacks: list[Callable[[TradeEvent], None]] = []
+        self._dispatcher = EventDispatcher(
+            self._dispatch_trade,
+            key=lambda t: t.market_id or t.token_id,
+            name="cache-dispatch",
+        )
 
         if use_websocket:
-            self._ws = PolymarketWebSocket(on_trade=self._handle_trade)
+            from src.core.ws_runtime import get_runtime
+
+            self._ws = get_runtime().market_feed()
+            self._ws.add_trade_listener(self._handle_trade)
 
     def start(self):
         """Start data feeds."""
         if self._ws:
+            self._dispatcher.start()
             self._ws.start()
             print("[cache] WebSocket started")
 
     def stop(self):
         """Stop data feeds."""
         if self._ws:
+            self._ws.remove_trade_listener(self._handle_trade)
+            for ts in list(self._ws_subscribed):
+                self.unsubscribe_window(ts)
             self._ws.stop()
+            self._dispatcher.stop()
             print("[cache] WebSocket stopped")
 
     def _handle_trade(self, trade: TradeEvent):
-        """Internal trade handler - dispatches to callbacks."""
+        """Internal trade handler (WS thread) - queues for the worker pool."""
+        if self._trade_callbacks:
+            # Events carry condition/asset IDs; resolve to the market slug
+            trade.slug = self._slug_by_asset.get(
+                trade.token_id
+            ) or self._slug_by_asset.get(trade.market_id, "")
+            self._dispatcher.submit(trade)
+
+    def _dispatch_trade(self, trade: TradeEvent):
+        """Run registered callbacks for one trade (worker thread)."""
         for cb in self._trade_callbacks:
             try:
                 cb(trade)
@@ -816,7 +1034,7 @@ class MarketDataCache:
                 print(f"[cache] Trade callback error: {e}")
 
     def on_trade(self, callback: Callable[[TradeEvent], None]):
-        """Register a trade callback."""
+        """Register a trade callback (invoked on a dispatch worker thread)."""
         self._trade_callbacks.append(callback)
 
     def prefetch_markets(self, timestamps: list[int]):
@@ -827,6 +1045,35 @@ class MarketDataCache:
         for ts in timestamps:
             self._fetch_and_cache_market(ts)
 
+    def prefetch_market(self, timestamp: int) -> bool:
+        """Fetch, cache and subscribe one window. Returns False if not listed yet."""
+        return self._fetch_and_cache_market(timestamp)
+
+    @property
+    def rest_client(self):
+        """The REST client used for fallbacks (its caches are managed too)."""
+        return self._rest_client
+
+    def cached_windows(self) -> set[int]:
+        """Window timestamps currently held in the token/market caches."""
+        return set(self._token_cache) | set(self._market_cache)
+
+    def unsubscribe_window(self, timestamp: int):
+        """Stop streaming a window's books; keeps its token IDs cached."""
+        condition_id = self._condition_cache.get(timestamp)
+        if condition_id and self._ws and timestamp in self._ws_subscribed:
+            self._ws_subscribed.discard(timestamp)
+            self._ws.unsubscribe_market(condition_id)
+
+    def evict_window(self, timestamp: int):
+        """Drop all cached state for a window (unsubscribing if needed)."""
+        self.unsubscribe_window(timestamp)
+        condition_id = self._condition_cache.pop(timestamp, None)
+        tokens = self._token_cache.pop(timestamp, None) or ()
+        self._market_cache.pop(timestamp, None)
+        for asset_id in (*tokens, condition_id):
+            self._slug_by_asset.pop(asset_id, None)
+
     def _fetch_and_cache_market(self, timestamp: int) -> bool:
         """Fetch market data and cache token IDs."""
         if timestamp in self._token_cache:
@@ -844,18 +1091,19 @@ class MarketDataCache:
         self._market_cache[timestamp] = {
             "up_token_id": market.up_token_id,
             "down_token_id": market.down_token_id,
+            "condition_id": market.condition_id,
             "fetched_at": time.time(),
         }
+        condition_id = market.condition_id or market.slug
+        self._condition_cache[timestamp] = condition_id
+        for asset_id in (*market.token_ids, condition_id):
+            self._slug_by_asset[asset_id] = market.slug
 
-        # Subscribe to WebSocket if available
-        if self._ws and self._ws.is_connected():
-            # Use slug as condition_id for BTC markets
-            token_ids = [
-                token_id
-                for token_id in (market.up_token_id, market.down_token_id)
-                if token_id is not None
-            ]
-            self._ws.subscribe_market(market.slug, token_ids)
+        # Subscribe by asset ID; if the socket is still connecting, the
+        # subscription is recorded and sent on connect
+        if self._ws and market.token_ids:
+            self._ws.subscribe_market(condition_id, market.token_ids)
+            self._ws_subscribed.add(timestamp)
 
         return True
 
@@ -876,22 +1124,17 @@ class MarketDataCache:
         """Get orderbook - from WebSocket cache or REST fallback."""
         # Try WebSocket cache first
         if self._ws and self._ws.is_connected():
-            book = self._ws.get_orderbook(token_id)
-            if book and book.timestamp > time.time() - 5:  # Max 5s stale
-                return {
-                    "bids": [
-                        {"price": str(level.price), "size": str(level.size)}
-                        for level in book.bids
-                    ],
-                    "asks": [
-                        {"price": str(level.price), "size": str(level.size)}
-                        for level in book.asks
-                    ],
-                    "source": "websocket",
-                    "age_ms": int((time.time() - book.timestamp) * 1000),
-                }
+            book = self._ws.snapshot_orderbook(token_id)
+            if book and book["timestamp"] > time.time() - 5:  # Max 5s stale
+                self._ws_hits["orderbook"] += 1
+                book["source"] = "websocket"
+                book["age_ms"] = int((time.time() - book.pop("timestamp")) * 1000)
+                # book["depth"] is the prebuilt index, so callers can quote
+                # without re-parsing
+                return book
 
         # Fallback to REST
+        self._rest_hits["orderbook"] += 1
         book = self._rest_client.get_orderbook(token_id)
         if book:
             book["source"] = "rest"
@@ -907,12 +1150,15 @@ class MarketDataCache:
         # Try WebSocket cache first
         if self._ws and self._ws.is_connected():
             book = self._ws.get_orderbook(token_id)
-            if book and book.timestamp > time.time() - 2:  # Max 2s stale for execution
+            # Max 2s stale for execution; invalid books go to REST until resynced
+            if book and book.valid and book.timestamp > time.time() - 2:
+                self._ws_hits["execution"] += 1
                 return self._ws.get_execution_price(
                     token_id, side, amount_usd, copy_delay_ms
                 )
 
         # Fallback to REST
+        self._rest_hits["execution"] += 1
         return self._rest_client.get_execution_price(
             token_id, side, amount_usd, copy_delay_ms
         )
@@ -923,11 +1169,19 @@ class MarketDataCache:
         if self._ws and self._ws.is_connected():
             mid = self._ws.get_mid(token_id)
             if mid is not None:
+                self._ws_hits["mid"] += 1
                 return mid
 
         # Fallback to REST
+        self._rest_hits["mid"] += 1
         return self._rest_client.get_midpoint(token_id)
 
+    def get_ws_mid(self, token_id: str) -> float | None:
+        """Midpoint from the WebSocket book only (never calls REST)."""
+        if self._ws and self._ws.is_connected():
+            return self._ws.get_mid(token_id)
+        return None
+
     @property
     def ws_connected(self) -> bool:
         """Check if WebSocket is connected."""
@@ -936,10 +1190,17 @@ class MarketDataCache:
     @property
     def stats(self) -> dict:
         """Get cache statistics."""
+        ws_hits = sum(self._ws_hits.values())
+        rest_hits = sum(self._rest_hits.values())
+        lookups = ws_hits + rest_hits
         stats = {
             "cached_markets": len(self._token_cache),
             "use_websocket": self._use_websocket,
+            "ws_hits": dict(self._ws_hits),
+            "rest_fallbacks": dict(self._rest_hits),
+            "ws_hit_rate_pct": round(ws_hits / lookups * 100, 1) if lookups else None,
         }
         if self._ws:
             stats["websocket"] = self._ws.stats
+            stats["dispatch"] = self._dispatcher.stats
         return stats
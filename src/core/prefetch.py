@@ -0,0 +1,200 @@
+"""Speculative market and orderbook prefetch for copy signals.
+
+A WebSocket trade on a BTC 5-min window triggers an activity poll, and a
+signal from that poll then needs the window's ``Market`` and the book of
+the side being copied before it can be priced, filtered and placed. Run
+one after the other those are three round-trips. ``SignalPrefetcher``
+starts the market lookup and both (up and down) books on worker threads
+when the trigger fires, so they overlap the activity poll; the main loop
+then ``take``s them and prices the signal without further I/O.
+
+Entries older than ``max_age`` are not used (books move), and a miss
+just falls back to fetching inline as before.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from src.config import Config
+
+
+@dataclass
+class Prefetched:
+    """A window's market and books, fetched ahead of its signal."""
+
+    market_ts: int
+    started: float
+    market: object | None = None  # Market
+    books: dict[str, dict] = field(default_factory=dict)  # token ID -> book
+    market_ms: float = 0.0
+    books_ms: float = 0.0
+    done_at: float = 0.0
+
+    @property
+    def total_ms(self) -> float:
+        return (self.done_at - self.started) * 1000 if self.done_at else 0.0
+
+
+class SignalPrefetcher:
+    """Fetch a window's Market and both books while its poll is in flight.
+
+    Usage:
+        prefetcher = SignalPrefetcher(client, market_cache)
+        prefetcher.prefetch(market_ts)           # on the WebSocket trigger
+        signals = monitor.trigger_immediate_poll(slug)
+        entry = prefetcher.take(sig.market_ts)   # main loop; None on a miss
+    """
+
+    def __init__(
+        self,
+        client,
+        market_cache=None,
+        max_age: float | None = None,
+        workers: int = 2,
+    ):
+        """Initialize the prefetcher.
+
+        Args:
+            client: PolymarketClient for the market lookup (and books
+                without a cache)
+            market_cache: Optional MarketDataCache (WebSocket books, REST
+                fallback)
+            max_age: Seconds a prefetched entry stays usable (default
+                Config.PREFETCH_MAX_AGE)
+            workers: Windows fetched concurrently (each also has two
+                book fetches in flight)
+        """
+        self._client = client
+        self._cache = market_cache
+        self.max_age = max_age or Config.PREFETCH_MAX_AGE
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="prefetch"
+        )
+        # Separate pool so a window's fetch never waits on its own queue
+        self._book_pool = ThreadPoolExecutor(
+            max_workers=2 * workers, thread_name_prefix="prefetch-book"
+        )
+        self._lock = threading.Lock()
+        self._entries: dict[int, Prefetched] = {}
+        self._in_flight: dict[int, Future] = {}
+
+        # Stats
+        self.prefetches = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.errors = 0
+        self.fetched = 0
+        self._market_ms = 0.0
+        self._books_ms = 0.0
+
+    def prefetch(self, market_ts: int) -> Future | None:
+        """Start fetching ``market_ts``'s market and books in the background.
+
+        Returns:
+            The fetch's future, or None if a fresh entry exists or a fetch
+            for the window is already running
+        """
+        now = time.time()
+        with self._lock:
+            if market_ts in self._in_flight:
+                return None
+            entry = self._entries.get(market_ts)
+            if entry and entry.done_at and now - entry.done_at < self.max_age / 2:
+                return None
+            self.prefetches += 1
+            try:
+                future = self._pool.submit(self._fetch, market_ts, now)
+            except RuntimeError:  # pool shut down
+                return None
+            self._in_flight[market_ts] = future
+        return future
+
+    def _fetch(self, market_ts: int, started: float) -> Prefetched:
+        entry = Prefetched(market_ts=market_ts, started=started)
+        try:
+            entry.market = self._client.get_market(market_ts)
+            entry.market_ms = (time.time() - started) * 1000
+            token_ids = entry.market.token_ids if entry.market else []
+            if token_ids:
+                books_start = time.time()
+                futures = {t: self._book_pool.submit(self._book, t) for t in token_ids}
+                for token_id, future in futures.items():
+                    book = future.result()
+                    if book:  # failed fetches are retried inline by the caller
+                        entry.books[token_id] = book
+                entry.books_ms = (time.time() - books_start) * 1000
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"[prefetch] {market_ts} failed: {e}")
+        entry.done_at = time.time()
+        with self._lock:
+            self._in_flight.pop(market_ts, None)
+            if entry.market is not None:
+                self._entries[market_ts] = entry
+                self.fetched += 1
+                self._market_ms += entry.market_ms
+                self._books_ms += entry.books_ms
+            # Keep only recent windows
+            for ts in [ts for ts in self._entries if ts < market_ts - 600]:
+                del self._entries[ts]
+        return entry
+
+    def _book(self, token_id: str) -> dict:
+        if self._cache is not None:
+            return self._cache.get_orderbook(token_id)
+        return self._client.get_orderbook(token_id)
+
+    def take(self, market_ts: int, wait: float = 0.0) -> Prefetched | None:
+        """Prefetched entry for ``market_ts`` if it is fresh.
+
+        Args:
+            market_ts: Window timestamp
+            wait: Seconds to wait for a fetch still in flight
+
+        Returns:
+            The entry, or None (fetch inline instead)
+        """
+        with self._lock:
+            future = self._in_flight.get(market_ts)
+        if future is not None and wait > 0:
+            try:
+                future.result(timeout=wait)
+            except Exception:
+                pass
+        with self._lock:
+            entry = self._entries.get(market_ts)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry.done_at > self.max_age:
+                self.stale += 1
+                return None
+            self.hits += 1
+            return entry
+
+    def close(self):
+        """Stop the fetch workers."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._book_pool.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def stats(self) -> dict:
+        """Get prefetch statistics."""
+        with self._lock:
+            fetched = max(1, self.fetched)
+            return {
+                "max_age": self.max_age,
+                "prefetches": self.prefetches,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "errors": self.errors,
+                "fetched": self.fetched,
+                "in_flight": len(self._in_flight),
+                "avg_market_ms": round(self._market_ms / fetched, 1),
+                "avg_books_ms": round(self._books_ms / fetched, 1),
+            }
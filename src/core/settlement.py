@@ -0,0 +1,303 @@
+"""Settlement scheduler for pending trades.
+
+BTC 5-min markets resolve some 30-90s after their window closes, so
+polling a pending trade before then (or on every main-loop tick) only
+burns rate-limiter budget. ``SettlementScheduler`` keys pending trades by
+window and checks a window first ``first_check`` seconds after it ends,
+then backs off. All windows due at the same moment are fetched in one
+concurrent pass (``PolymarketClient.get_markets``) on a background thread,
+and resolved trades are queued for the main loop, which applies them with
+``drain()`` so ``TradingState`` is only touched from one thread.
+"""
+
+import copy
+import queue
+import threading
+import time
+
+from src.config import Config
+from src.core.mark_to_market import get_mark_to_market
+
+WINDOW_SECONDS = 300
+
+
+class SettlementScheduler:
+    """Check pending trades' markets only once resolution is plausible.
+
+    Usage:
+        settlements = SettlementScheduler(client, poll_interval=1.5)
+        settlements.start()
+        settlements.add(trade)                      # after record_trade
+        for trade, market in settlements.drain():   # main loop
+            saved = settlements.checkpoint(state)
+            try:
+                state.settle_trade(trade, market.outcome, market=market)
+            except Exception:
+                settlements.requeue(trade, state, saved)
+        settlements.stop()
+
+    ``poll_interval`` is the caller's loop tick; it is only used to report
+    how many per-tick ``get_market`` calls the schedule saved.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        rate_limiter=None,
+        poll_interval: float = 1.5,
+        first_check: float | None = None,
+        retry_base: float | None = None,
+        retry_max: float | None = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            client: PolymarketClient used for market fetches
+            rate_limiter: Optional RateLimiter each fetch waits on
+            poll_interval: Caller's loop tick (for the calls-saved estimate)
+            first_check: Seconds after window end of the first check
+            retry_base: First retry delay, doubled per unresolved check
+            retry_max: Cap on the retry delay
+        """
+        if client is None:
+            from src.core.polymarket import PolymarketClient
+
+            client = PolymarketClient()
+        self._client = client
+        self._rate_limiter = rate_limiter
+        self.poll_interval = poll_interval
+        self.first_check = (
+            first_check if first_check is not None else Config.SETTLE_FIRST_CHECK
+        )
+        self.retry_base = (
+            retry_base if retry_base is not None else Config.SETTLE_RETRY_BASE
+        )
+        self.retry_max = retry_max if retry_max is not None else Config.SETTLE_RETRY_MAX
+
+        self._lock = threading.Lock()
+        self._trades: dict[int, list] = {}  # window -> pending trades
+        self._added_at: dict[int, float] = {}  # id(trade) -> time added
+        self._next_check: dict[int, float] = {}  # window -> due time
+        self._attempts: dict[int, int] = {}  # window -> unresolved checks
+        self._results: queue.Queue = queue.Queue()
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        # Statistics
+        self.started_at = time.time()
+        self.passes = 0
+        self.fetches = 0
+        self.settled = 0
+        self._settle_delay_total = 0.0  # window end -> settlement seen
+        self._pending_seconds = 0.0  # settled trades' time spent pending
+
+    # === SCHEDULING ===
+
+    def add(self, trade, delay: float | None = None):
+        """Schedule a pending trade's window for settlement checks.
+
+        Args:
+            trade: Unsettled trade
+            delay: Check the window this many seconds from now instead of
+                ``first_check`` after it ends (e.g. to retry a drained
+                result the caller failed to apply)
+        """
+        if trade.outcome is not None:
+            return
+        window = trade.timestamp
+        now = time.time()
+        with self._lock:
+            trades = self._trades.setdefault(window, [])
+            if any(t is trade for t in trades):
+                return
+            trades.append(trade)
+            self._added_at[id(trade)] = now
+            if window not in self._next_check:
+                self._next_check[window] = (
+                    now + delay
+                    if delay is not None
+                    else window + WINDOW_SECONDS + self.first_check
+                )
+                self._attempts[window] = 0
+        self._wake.set()
+
+    @staticmethod
+    def checkpoint(state) -> tuple:
+        """Capture what ``settle_trade`` changes, for ``requeue``.
+
+        Args:
+            state: TradingState about to apply a drained result
+
+        Returns:
+            Opaque snapshot of bankroll, daily PnL and aggregates
+        """
+        return state.bankroll, state.daily_pnl, copy.deepcopy(state.aggregates)
+
+    def requeue(self, trade, state, saved: tuple):
+        """Undo a drained result the caller failed to apply and retry it.
+
+        The window was dropped when its result was queued, so without this
+        the trade would stay pending forever.
+
+        Args:
+            trade: Trade whose settlement raised part-way
+            state: TradingState it was being applied to
+            saved: ``checkpoint(state)`` taken before applying
+        """
+        state.bankroll, state.daily_pnl, state.aggregates = saved
+        trade.outcome = None
+        trade.settlement_status = "pending"
+        get_mark_to_market().track(trade)
+        self.add(trade, delay=self.retry_base)
+
+    def remove(self, trade):
+        """Stop checking a trade (e.g. settled or force-exited elsewhere)."""
+        window = trade.timestamp
+        with self._lock:
+            trades = [t for t in self._trades.get(window, []) if t is not trade]
+            self._added_at.pop(id(trade), None)
+            if trades:
+                self._trades[window] = trades
+            else:
+                self._drop(window)
+
+    def _drop(self, window: int):
+        self._trades.pop(window, None)
+        self._next_check.pop(window, None)
+        self._attempts.pop(window, None)
+
+    def seconds_until_due(self, now: float | None = None) -> float | None:
+        """Seconds until the next window is due (None if nothing pending)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._next_check:
+                return None
+            return max(0.0, min(self._next_check.values()) - now)
+
+    # === CHECKING ===
+
+    def poll(self, now: float | None = None) -> int:
+        """Fetch every due window in one concurrent pass.
+
+        Resolved trades are queued for ``drain()``; unresolved windows are
+        rescheduled with exponential backoff.
+
+        Returns:
+            Number of trades settled
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            due = sorted(w for w, at in self._next_check.items() if at <= now)
+        if not due:
+            return 0
+
+        markets = self._client.get_markets(due, rate_limiter=self._rate_limiter)
+        checked = time.time()
+        self.passes += 1
+        self.fetches += len(due)
+
+        settled = 0
+        with self._lock:
+            for window in due:
+                if window not in self._next_check:
+                    continue  # removed while fetching
+                market = markets.get(window)
+                if market and market.closed and market.outcome:
+                    trades = self._trades.get(window, [])
+                    for trade in trades:
+                        added = self._added_at.pop(id(trade), checked)
+                        self._pending_seconds += checked - added
+                        self._results.put((trade, market))
+                    settled += len(trades)
+                    self._settle_delay_total += len(trades) * (
+                        checked - (window + WINDOW_SECONDS)
+                    )
+                    self._drop(window)
+                else:
+                    attempts = self._attempts[window]
+                    self._attempts[window] = attempts + 1
+                    delay = min(self.retry_base * 2**attempts, self.retry_max)
+                    self._next_check[window] = checked + delay
+        self.settled += settled
+        return settled
+
+    def drain(self) -> list[tuple]:
+        """Settled ``(trade, market)`` pairs since the last call, oldest first."""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+        results.sort(key=lambda r: r[0].timestamp)
+        return results
+
+    # === BACKGROUND THREAD ===
+
+    def start(self):
+        """Check due windows on a background thread."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="settlement", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread (queued results stay drainable)."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            wait = self.seconds_until_due()
+            if wait is None or wait > 0:
+                # Sleep until the next due window or a new trade is added
+                self._wake.wait(wait if wait is not None else 60)
+                self._wake.clear()
+                continue
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[settlement] Check failed: {e}")
+                self._stopped.wait(self.retry_base)
+
+    # === STATISTICS ===
+
+    @property
+    def stats(self) -> dict:
+        """Scheduler counters and the estimated API calls saved.
+
+        The baseline is one ``get_market`` per pending trade per caller
+        tick, which is what checking every pending trade in the main loop
+        costs.
+        """
+        now = time.time()
+        with self._lock:
+            pending = sum(len(t) for t in self._trades.values())
+            pending_seconds = self._pending_seconds + sum(
+                now - added for added in self._added_at.values()
+            )
+            windows = len(self._trades)
+        baseline = pending_seconds / self.poll_interval if self.poll_interval else 0
+        saved = max(0.0, baseline - self.fetches)
+        hours = max(now - self.started_at, 1.0) / 3600
+        return {
+            "pending": pending,
+            "windows": windows,
+            "passes": self.passes,
+            "fetches": self.fetches,
+            "settled": self.settled,
+            "avg_settle_delay_s": round(self._settle_delay_total / self.settled, 1)
+            if self.settled
+            else None,
+            "baseline_calls": int(baseline),
+            "calls_saved": int(saved),
+            "calls_saved_per_hour": round(saved / hours),
+        }
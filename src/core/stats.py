@@ -0,0 +1,219 @@
+"""Running trade statistics updated in O(1) per trade.
+
+``TradingState`` owns one ``TradeAggregates`` and feeds it from
+``record_trade`` / ``settle_trade``, so win rate, PnL, cost averages,
+drawdown and losing streaks are read without rescanning trades. The
+aggregates are persisted in ``trades.json`` next to the working state.
+
+Means and variances use Welford's update (``RunningStat``), which is
+numerically stable and needs only count/mean/M2 per series.
+"""
+
+import math
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass
+class RunningStat:
+    """Streaming mean/variance (Welford)."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+@dataclass
+class Breakdown:
+    """Counts and PnL for one strategy or copied wallet."""
+
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    pnl: float = 0.0
+    fees: float = 0.0
+
+    @property
+    def win_rate(self) -> float:
+        settled = self.wins + self.losses
+        return self.wins / settled * 100 if settled else 0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "win_rate": self.win_rate}
+
+
+@dataclass
+class TradeAggregates:
+    """Lifetime statistics maintained incrementally.
+
+    Settled means "has an outcome", as in ``TradingState.get_statistics``;
+    force-exited trades stay pending. Drawdown is measured on cumulative
+    realized PnL in settlement order.
+
+    Usage:
+        agg = TradeAggregates()
+        agg.add_trade(trade)      # from record_trade
+        agg.add_settlement(trade) # from settle_trade, after PnL is set
+        agg.snapshot()            # get_statistics-style dict
+    """
+
+    trades: int = 0
+    settled: int = 0
+    wins: int = 0
+    losses: int = 0
+
+    realized_pnl: float = 0.0
+    gross_profit: float = 0.0
+    fees_paid: float = 0.0
+    win_pnl: float = 0.0
+    loss_pnl: float = 0.0
+    largest_win: float = 0.0
+    largest_loss: float = 0.0
+
+    # Cost series over settled trades
+    slippage_pct: RunningStat = field(default_factory=RunningStat)
+    delay_impact_pct: RunningStat = field(default_factory=RunningStat)
+    fill_pct: RunningStat = field(default_factory=RunningStat)
+    fee_pct: RunningStat = field(default_factory=RunningStat)
+
+    # Equity curve (cumulative realized PnL)
+    peak_pnl: float = 0.0
+    max_drawdown: float = 0.0
+
+    # Outcome streaks
+    losing_streak: int = 0
+    longest_losing_streak: int = 0
+
+    by_strategy: dict[str, Breakdown] = field(default_factory=dict)
+    by_wallet: dict[str, Breakdown] = field(default_factory=dict)
+
+    def _breakdowns(self, trade) -> list[Breakdown]:
+        groups = [self.by_strategy.setdefault(trade.strategy or "streak", Breakdown())]
+        if trade.copied_from:
+            groups.append(
+                self.by_wallet.setdefault(trade.copied_from.lower(), Breakdown())
+            )
+        return groups
+
+    def add_trade(self, trade):
+        """Count a newly recorded trade."""
+        self.trades += 1
+        for group in self._breakdowns(trade):
+            group.trades += 1
+
+    def add_settlement(self, trade):
+        """Fold in a trade whose outcome and PnL were just set."""
+        pnl = trade.pnl
+        self.settled += 1
+        self.realized_pnl += pnl
+        self.gross_profit += trade.gross_profit
+        self.fees_paid += trade.fee_amount
+
+        if trade.won:
+            self.largest_win = max(self.largest_win, pnl) if self.wins else pnl
+            self.wins += 1
+            self.win_pnl += pnl
+            self.losing_streak = 0
+        else:
+            self.largest_loss = min(self.largest_loss, pnl) if self.losses else pnl
+            self.losses += 1
+            self.loss_pnl += pnl
+            self.losing_streak += 1
+            self.longest_losing_streak = max(
+                self.longest_losing_streak, self.losing_streak
+            )
+
+        self.slippage_pct.add(trade.slippage_pct)
+        self.delay_impact_pct.add(trade.delay_impact_pct)
+        self.fill_pct.add(trade.fill_pct)
+        self.fee_pct.add(trade.fee_pct)
+
+        self.peak_pnl = max(self.peak_pnl, self.realized_pnl)
+        self.max_drawdown = max(self.max_drawdown, self.peak_pnl - self.realized_pnl)
+
+        for group in self._breakdowns(trade):
+            if trade.won:
+                group.wins += 1
+            else:
+                group.losses += 1
+            group.pnl += pnl
+            group.fees += trade.fee_amount
+
+    @classmethod
+    def from_trades(cls, trades) -> "TradeAggregates":
+        """Build from existing trades (settled ones in settlement order)."""
+        agg = cls()
+        for trade in trades:
+            agg.add_trade(trade)
+        settled = [t for t in trades if t.outcome]
+        settled.sort(key=lambda t: t.settled_at or t.executed_at or 0)
+        for trade in settled:
+            agg.add_settlement(trade)
+        return agg
+
+    @property
+    def drawdown(self) -> float:
+        """Current drop of realized PnL below its peak."""
+        return self.peak_pnl - self.realized_pnl
+
+    def snapshot(self) -> dict:
+        """Statistics dict (keys of ``TradingState.get_statistics`` plus extras)."""
+        return {
+            "total_trades": self.trades,
+            "settled_trades": self.settled,
+            "pending_trades": self.trades - self.settled,
+            "wins": self.wins,
+            "losses": self.losses,
+            "win_rate": self.wins / self.settled * 100 if self.settled else 0,
+            "realized_pnl": self.realized_pnl,
+            "total_fees_paid": self.fees_paid,
+            "total_gross_profit": self.gross_profit,
+            "avg_win": self.win_pnl / self.wins if self.wins else 0,
+            "avg_loss": self.loss_pnl / self.losses if self.losses else 0,
+            "largest_win": self.largest_win,
+            "largest_loss": self.largest_loss,
+            "avg_slippage_pct": self.slippage_pct.mean,
+            "std_slippage_pct": self.slippage_pct.std,
+            "avg_fee_pct": self.fee_pct.mean * 100,
+            "avg_delay_impact_pct": self.delay_impact_pct.mean,
+            "std_delay_impact_pct": self.delay_impact_pct.std,
+            "avg_fill_pct": self.fill_pct.mean,
+            "std_fill_pct": self.fill_pct.std,
+            "max_drawdown": self.max_drawdown,
+            "drawdown": self.drawdown,
+            "losing_streak": self.losing_streak,
+            "longest_losing_streak": self.longest_losing_streak,
+            "by_strategy": {k: v.to_dict() for k, v in self.by_strategy.items()},
+            "by_wallet": {k: v.to_dict() for k, v in self.by_wallet.items()},
+        }
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form for the state file."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TradeAggregates":
+        """Restore from ``to_dict`` output (unknown keys are ignored)."""
+        agg = cls()
+        for key, value in data.items():
+            if key in ("slippage_pct", "delay_impact_pct", "fill_pct", "fee_pct"):
+                setattr(agg, key, RunningStat(**value))
+            elif key in ("by_strategy", "by_wallet"):
+                setattr(agg, key, {k: Breakdown(**v) for k, v in value.items()})
+            elif hasattr(agg, key):
+                setattr(agg, key, value)
+        return agg
@@ -1,5 +1,7 @@
 """Trading execution — paper and live modes."""
 
+import concurrent.futures
+import copy
 import json
 import os
 import time
@@ -8,7 +10,11 @@ from datetime import datetime, timezone
 from typing import cast
 
 from src.config import Config, LOCAL_TZ, TIMEZONE_NAME
+from src.core.mark_to_market import get_mark_to_market
 from src.core.polymarket import Market
+from src.core.stats import TradeAggregates
+from src.infra.trade_store import get_history_store
+from src.infra.persistence import atomic_write_json, get_writer
 
 
 @dataclass
@@ -75,6 +81,10 @@ class Trade:
 
     # === ORDER STATUS (live trading) ===
     order_status: str = "pending"  # pending, submitted, filled, cancelled, failed
+    confirm_latency_ms: float | None = None  # post_order -> fill/cancel known
+    confirm_source: str | None = None  # "ws" (user channel) or "rest" (polling)
+    submit_latency_ms: float | None = None  # bet -> post_order returned
+    presigned: bool | None = None  # posted a pre-signed order template
 
     # === UNREALIZED P&L (for pending trades) ===
     current_price: float | None = None  # current market price for our direction
@@ -176,6 +186,12 @@ class Trade:
             "best_ask": self.best_ask,
             "price_movement_pct": self.price_movement_pct,
         }
+        if self.confirm_latency_ms is not None:
+            execution["confirm_latency_ms"] = self.confirm_latency_ms
+            execution["confirm_source"] = self.confirm_source
+        if self.submit_latency_ms is not None:
+            execution["submit_latency_ms"] = self.submit_latency_ms
+            execution["presigned"] = self.presigned
 
         # === FEES ===
         fees = {
@@ -345,6 +361,10 @@ class Trade:
             best_ask=execution.get("best_ask", 0.0),
             # Order status -> settlement_status
             order_status="pending",
+            confirm_latency_ms=execution.get("confirm_latency_ms"),
+            confirm_source=execution.get("confirm_source"),
+            submit_latency_ms=execution.get("submit_latency_ms"),
+            presigned=execution.get("presigned"),
             # Pattern analysis fields
             hour_utc=timing.get("hour_utc", 0),
             minute_of_hour=timing.get("minute", 0),
@@ -464,10 +484,14 @@ class TradingState:
     daily_pnl: float = 0.0
     last_reset_date: str = ""
     bankroll: float = 100.0  # starting bankroll
+    # Lifetime statistics, updated by record_trade/settle_trade
+    aggregates: TradeAggregates = field(default_factory=TradeAggregates)
 
-    # Track which trades have been saved to full history
-    _saved_trade_ids: set = field(default_factory=set)
+    # Last trade appended to the history journal, the settlement status
+    # most recently queued per trade ID, and IDs whose journal write failed
     _last_saved_trade_id: str = ""
+    _journaled: dict = field(default_factory=dict)
+    _unjournaled: set = field(default_factory=set)
 
     def reset_daily_if_needed(self):
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
@@ -492,6 +516,7 @@ class TradingState:
     def record_trade(self, trade: Trade):
         self.trades.append(trade)
         self.daily_bets += 1
+        self.aggregates.add_trade(trade)
 
     def settle_trade(self, trade: Trade, outcome: str, market: "Market | None" = None):
         """Settle a trade and calculate all P&L details.
@@ -501,6 +526,7 @@ class TradingState:
             outcome: The market outcome ("up" or "down")
             market: Optional market object for resolution timing data
         """
+        first_settlement = trade.outcome is None
         trade.outcome = outcome
         trade.won = trade.direction == outcome
         trade.settled_at = int(time.time() * 1000)
@@ -553,6 +579,9 @@ class TradingState:
 
         self.daily_pnl += trade.pnl
         self.bankroll += trade.pnl
+        if first_settlement:
+            self.aggregates.add_settlement(trade)
+            get_mark_to_market().untrack(trade)
 
     def mark_pending_as_force_exit(self, reason: str):
         """Mark all pending trades as force_exit before shutdown.
@@ -566,149 +595,98 @@ class TradingState:
                 trade.force_exit_reason = reason
 
     def save(self):
-        """Save current state and append new trades to full history."""
-        # Save working state (recent trades for fast loading) using nested format
-        data = {
-            "trades": [
-                t.to_nested_json() for t in self.trades[-100:]
-            ],  # keep last 100 for working state
+        """Queue current state and new/settled trades for the background writer.
+
+        Costs the caller a shallow copy of the recent trades and an enqueue;
+        serialization and disk I/O happen on the persistence thread. Call
+        ``flush()`` before exiting or exec'ing.
+        """
+        writer = get_writer()
+
+        # Append new trades and settlement updates to the trade history
+        writer.submit_records(
+            get_history_store(),
+            self._journal_updates(),
+            on_error=self._journal_failed,
+        )
+
+        # Working state (recent trades for fast loading) using nested format.
+        # Trades are mutated in place on settlement, so hand over copies.
+        recent = [copy.copy(t) for t in self.trades[-100:]]  # keep last 100
+        header = {
             "daily_bets": self.daily_bets,
             "daily_pnl": self.daily_pnl,
             "last_reset_date": self.last_reset_date,
             "bankroll": self.bankroll,
             "last_trade_id": self._last_saved_trade_id,
+            "aggregates": self.aggregates.to_dict(),
         }
-        with open(Config.TRADES_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        writer.submit_state(
+            Config.TRADES_FILE,
+            lambda: {"trades": [t.to_nested_json() for t in recent], **header},
+        )
 
-        # Append new trades to full history file (never truncated)
-        self._append_to_full_history()
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until every queued save is on disk."""
+        return get_writer().flush(timeout)
 
-        # Update any settled trades in full history
-        self._update_settled_trades_in_history()
+    def _journal_updates(self) -> list[Trade]:
+        """Copies of trades the trade history doesn't have in this state.
 
-    def _append_to_full_history(self):
-        """Append only new trades to the full history file."""
-        history_file = "trade_history_full.json"
+        New trades are appended; trades settled (or force-exited) since the
+        history last saw them are appended again, and the latest record per
+        trade wins. Status is taken from what this state already queued,
+        else from the journal index (or a SQLite primary-key lookup).
+        Trades whose last write failed (``_journal_failed``) are always
+        re-sent.
+        """
+        journal = get_history_store()
 
-        # Find trades that haven't been saved yet
-        new_trades = []
+        new_count = 0
+        retry_count = 0
+        updates = []
         for t in self.trades:
             trade_id = f"{t.timestamp}_{t.executed_at}_{t.direction}"
-            if trade_id not in self._saved_trade_ids:
-                new_trades.append(t)
-                self._saved_trade_ids.add(trade_id)
+            if trade_id in self._unjournaled:
+                # Last write failed; the journal index may still list it
+                self._unjournaled.discard(trade_id)
+                self._journaled[trade_id] = t.settlement_status
+                updates.append(copy.copy(t))
+                retry_count += 1
+                continue
+            saved = self._journaled.get(trade_id) or journal.status(trade_id)
+            if saved is None:
+                new_count += 1
                 self._last_saved_trade_id = trade_id
+            elif saved != "pending" or t.settlement_status not in (
+                "settled",
+                "force_exit",
+            ):
+                self._journaled[trade_id] = saved
+                continue
+            self._journaled[trade_id] = t.settlement_status
+            updates.append(copy.copy(t))
 
-        if not new_trades:
-            return
-
-        # Load existing history or create new
-        existing = []
-        if os.path.exists(history_file):
-            try:
-                with open(history_file) as f:
-                    existing = json.load(f)
-            except (json.JSONDecodeError, Exception):
-                existing = []
-
-        # Append new trades (excluding transient fields)
-        for t in new_trades:
-            existing.append(t.to_json_dict())
-
-        # Save full history
-        with open(history_file, "w") as f:
-            json.dump(existing, f, indent=2)
-
-        if new_trades:
+        if new_count:
             print(
-                f"[history] Appended {len(new_trades)} trade(s) to {history_file} (total: {len(existing)})"
+                f"[history] Appending {new_count} trade(s) to {journal.path} (total: {len(journal) + new_count})"
             )
-
-    def _update_settled_trades_in_history(self):
-        """Update settled trades in the full history file (nested format)."""
-        history_file = "trade_history_full.json"
-
-        if not os.path.exists(history_file):
-            return
-
-        # Find settled or force_exit trades that need updating
-        settled_trades = {
-            f"{t.timestamp}_{t.executed_at}_{t.direction}": t
-            for t in self.trades
-            if t.settlement_status in ("settled", "force_exit")
-        }
-
-        if not settled_trades:
-            return
-
-        # Load existing history
-        try:
-            with open(history_file) as f:
-                history = json.load(f)
-        except (json.JSONDecodeError, Exception):
-            return
-
-        # Update settled trades in history (nested format)
-        updated_count = 0
-        for i, entry in enumerate(history):
-            # Get trade ID from nested format (or reconstruct from old format for migration)
-            trade_id = entry.get("id")
-            if not trade_id:
-                # Fallback for old flat format during migration
-                market = entry.get("market", {})
-                position = entry.get("position", {})
-                execution = entry.get("execution", {})
-                ts = market.get("timestamp") or entry.get("timestamp")
-                exec_at = execution.get("timestamp") or entry.get("executed_at")
-                direction = position.get("direction") or entry.get("direction")
-                if ts and exec_at and direction:
-                    trade_id = f"{ts}_{exec_at}_{direction}"
-
-            if not trade_id:
-                continue
-
-            # Check if this trade has been settled/force_exit but history entry is not
-            settlement = entry.get("settlement", {})
-            current_status = settlement.get("status", "pending")
-
-            if trade_id in settled_trades and current_status == "pending":
-                settled_trade = settled_trades[trade_id]
-
-                # Update settlement object in nested structure
-                history[i]["settlement"] = {
-                    "status": settled_trade.settlement_status,
-                    "outcome": settled_trade.outcome,
-                    "won": settled_trade.won,
-                    "timestamp": settled_trade.settled_at,
-                    "resolution_delay_sec": settled_trade.resolution_delay_seconds,
-                    "price_at_close": settled_trade.price_at_close,
-                    "gross_payout": settled_trade.gross_payout,
-                    "gross_profit": settled_trade.gross_profit,
-                    "fee_amount": settled_trade.fee_amount,
-                    "net_profit": settled_trade.net_profit,
-                }
-
-                # Add force_exit_reason if applicable
-                if settled_trade.settlement_status == "force_exit":
-                    history[i]["settlement"]["force_exit_reason"] = (
-                        settled_trade.force_exit_reason
-                    )
-
-                # Update position.shares if it was calculated during settlement
-                if settled_trade.shares_bought > 0:
-                    if "position" in history[i]:
-                        history[i]["position"]["shares"] = settled_trade.shares_bought
-
-                updated_count += 1
-
-        # Save if any updates were made
-        if updated_count > 0:
-            with open(history_file, "w") as f:
-                json.dump(history, f, indent=2)
+        if retry_count:
             print(
-                f"[history] Updated {updated_count} settled trade(s) in {history_file}"
+                f"[history] Retrying {retry_count} trade(s) from a failed write to {journal.path}"
             )
+        if len(updates) > new_count + retry_count:
+            print(
+                f"[history] Updating {len(updates) - new_count - retry_count} settled trade(s) in {journal.path}"
+            )
+        return updates
+
+    def _journal_failed(self, records: list[Trade]):
+        """Writer callback: queue records from a failed write again."""
+        for t in records:
+            trade_id = f"{t.timestamp}_{t.executed_at}_{t.direction}"
+            self._journaled.pop(trade_id, None)
+            self._unjournaled.add(trade_id)
 
     def export_history_json(self, filepath: str = "trade_history.json"):
         """Export full trade history to JSON file."""
@@ -741,9 +719,9 @@ class TradingState:
             print("No trade history")
             return
 
-        # Update unrealized PnL for pending trades
+        # Unrealized PnL of pending trades from the current marks
         if update_unrealized:
-            self.update_unrealized_pnl()
+            self.apply_marks(trades)
 
         print(f"\n{'=' * 80}")
         print(f"TRADE HISTORY (last {len(trades)} trades) - {TIMEZONE_NAME}")
@@ -839,110 +817,99 @@ class TradingState:
         print(f"Current Bankroll: ${self.bankroll:.2f}")
         print(f"{'=' * 80}\n")
 
-    def update_unrealized_pnl(self):
-        """Update unrealized PnL for all pending trades based on current market prices."""
-        from src.core.polymarket import PolymarketClient
+    def update_unrealized_pnl(self, trades: list[Trade] | None = None):
+        """Refresh marks of pending trades and apply them.
 
-        pending = [t for t in self.trades if t.outcome is None]
+        Marks come from the shared mark-to-market service (WebSocket mids,
+        one batched REST request for tokens without a book). Readers that
+        must not block on the network use ``apply_marks`` instead.
+
+        Args:
+            trades: Trades to update (default ``self.trades``)
+        """
+        pending = [
+            t for t in (self.trades if trades is None else trades) if t.outcome is None
+        ]
         if not pending:
             return
+        marks = get_mark_to_market()
+        try:
+            marks.refresh(pending, force=True)
+        except Exception as e:
+            print(f"[unrealized] Error refreshing marks: {e}")
+        marks.apply(pending)
 
-        client = PolymarketClient()
-
-        for trade in pending:
-            try:
-                market = client.get_market(trade.timestamp)
-                if not market:
-                    continue
-
-                # Get current price for our direction
-                if trade.direction == "up":
-                    current_price = market.up_price
-                else:
-                    current_price = market.down_price
-
-                trade.current_price = current_price
-
-                # Implied outcome based on which side has higher probability
-                if market.up_price > market.down_price:
-                    trade.implied_outcome = "up"
-                elif market.down_price > market.up_price:
-                    trade.implied_outcome = "down"
-                else:
-                    trade.implied_outcome = None
-
-                # Calculate unrealized PnL
-                # If we win: receive $1 per share, minus fees
-                # If we lose: lose entire amount
-                exec_price = (
-                    trade.execution_price
-                    if trade.execution_price > 0
-                    else trade.entry_price
-                )
-                shares = trade.amount / exec_price if exec_price > 0 else 0
-
-                # Expected value = (prob of win * win payout) + (prob of lose * lose payout)
-                # Win payout = shares - amount - fees
-                # Lose payout = -amount
-                win_prob = current_price
-                lose_prob = 1 - current_price
+    def apply_marks(self, trades: list[Trade] | None = None) -> float:
+        """Set unrealized PnL of pending trades from current marks (no network).
 
-                gross_win = shares - trade.amount
-                fee_on_win = gross_win * trade.fee_pct if gross_win > 0 else 0
-                net_win = gross_win - fee_on_win
+        Returns:
+            Total unrealized PnL of the pending trades
+        """
+        pending = [
+            t for t in (self.trades if trades is None else trades) if t.outcome is None
+        ]
+        return get_mark_to_market().apply(pending)
 
-                # Unrealized PnL = expected value
-                trade.unrealized_pnl = (win_prob * net_win) + (
-                    lose_prob * (-trade.amount)
-                )
+    def get_statistics(
+        self,
+        update_unrealized: bool = True,
+        full_history: bool = False,
+        strategy: str | None = None,
+        wallet: str | None = None,
+    ) -> dict:
+        """Get comprehensive trading statistics.
 
-            except Exception as e:
-                print(f"[unrealized] Error updating {trade.market_slug}: {e}")
+        Args:
+            update_unrealized: Apply current marks to pending trades (no
+                network calls; see ``update_unrealized_pnl``)
+            full_history: Aggregate the history store (with filters) instead
+                of reading ``self.aggregates`` (one SQL query with the sqlite
+                backend); only pending trades are loaded, for unrealized PnL
+            strategy: With full_history, only trades of this strategy
+            wallet: With full_history, only trades copied from this wallet
+        """
+        if full_history:
+            return self._history_statistics(update_unrealized, strategy, wallet)
 
-    def get_statistics(self, update_unrealized: bool = True) -> dict:
-        """Get comprehensive trading statistics."""
-        # Update unrealized PnL for pending trades
+        # Counts, PnL and cost averages come from the running aggregates;
+        # only pending trades are visited, for unrealized PnL
+        pending = [t for t in self.trades if t.outcome is None]
         if update_unrealized:
-            self.update_unrealized_pnl()
+            self.apply_marks(pending)
+        unrealized_pnl = sum(
+            t.unrealized_pnl for t in pending if t.unrealized_pnl is not None
+        )
 
-        settled = [t for t in self.trades if t.outcome]
-        pending = [t for t in self.trades if t.outcome is None]
-        wins = [t for t in settled if t.won]
-        losses = [t for t in settled if not t.won]
+        stats = self.aggregates.snapshot()
+        stats["unrealized_pnl"] = unrealized_pnl
+        stats["total_pnl"] = stats["realized_pnl"] + unrealized_pnl
+        stats["bankroll"] = self.bankroll
+        return stats
 
-        realized_pnl = sum(t.pnl for t in settled)
+    def _history_statistics(
+        self,
+        update_unrealized: bool,
+        strategy: str | None,
+        wallet: str | None,
+    ) -> dict:
+        """get_statistics over the history store (aggregates pushed down)."""
+        history = get_history_store()
+        stats = history.summary(strategy=strategy, wallet=wallet)
+
+        pending = [
+            Trade.from_nested_json(r)
+            for r in history.recent(strategy=strategy, wallet=wallet, status="pending")
+        ]
+        if update_unrealized:
+            self.apply_marks(pending)
         unrealized_pnl = sum(
             t.unrealized_pnl for t in pending if t.unrealized_pnl is not None
         )
 
-        return {
-            "total_trades": len(self.trades),
-            "settled_trades": len(settled),
-            "pending_trades": len(pending),
-            "wins": len(wins),
-            "losses": len(losses),
-            "win_rate": len(wins) / len(settled) * 100 if settled else 0,
-            "realized_pnl": realized_pnl,
-            "unrealized_pnl": unrealized_pnl,
-            "total_pnl": realized_pnl + unrealized_pnl,
-            "total_fees_paid": sum(t.fee_amount for t in settled),
-            "total_gross_profit": sum(t.gross_profit for t in settled),
-            "avg_win": sum(t.pnl for t in wins) / len(wins) if wins else 0,
-            "avg_loss": sum(t.pnl for t in losses) / len(losses) if losses else 0,
-            "largest_win": max((t.pnl for t in wins), default=0),
-            "largest_loss": min((t.pnl for t in losses), default=0),
-            "avg_slippage_pct": sum(t.slippage_pct for t in settled) / len(settled)
-            if settled
-            else 0,
-            "avg_fee_pct": sum(t.fee_pct for t in settled) / len(settled) * 100
-            if settled
-            else 0,
-            "avg_delay_impact_pct": sum(t.delay_impact_pct for t in settled)
-            / len(settled)
-            if settled
-            else 0,
-            "bankroll": self.bankroll,
-        }
+        stats["unrealized_pnl"] = unrealized_pnl
+        stats["total_pnl"] = stats["realized_pnl"] + unrealized_pnl
+        stats["bankroll"] = self.bankroll
+        return stats
 
     @classmethod
     def load(cls) -> "TradingState":
@@ -972,28 +939,23 @@ class TradingState:
                 state.last_reset_date = data.get("last_reset_date", "")
                 state.bankroll = data.get("bankroll", 100.0)
                 state._last_saved_trade_id = data.get("last_trade_id", "")
+                if "aggregates" in data:
+                    state.aggregates = TradeAggregates.from_dict(data["aggregates"])
             except Exception as e:
                 print(f"[trader] Error loading state: {e}")
 
-        # Load saved trade IDs from full history to avoid duplicates
-        history_file = "trade_history_full.json"
-        if os.path.exists(history_file):
-            try:
-                with open(history_file) as f:
-                    history = json.load(f)
-                for t in history:
-                    # Handle both nested and flat format for trade ID extraction
-                    if "id" in t:
-                        trade_id = t["id"]
-                    else:
-                        # Legacy format
-                        trade_id = f"{t.get('timestamp')}_{t.get('executed_at')}_{t.get('direction')}"
-                    state._saved_trade_ids.add(trade_id)
-                print(
-                    f"[history] Loaded {len(state._saved_trade_ids)} trades from history"
+        # Open the trade history (index only) so saves can skip known trades
+        try:
+            journal = get_history_store()
+            print(f"[history] Loaded {len(journal)} trades from history")
+            if not state.aggregates.trades and len(journal):
+                # State saved before aggregates existed: one pass over history
+                state.aggregates = TradeAggregates.from_trades(
+                    [Trade.from_nested_json(r) for r in journal.entries()]
                 )
-            except Exception as e:
-                print(f"[history] Error loading history: {e}")
+                print(f"[history] Rebuilt statistics from {len(journal)} trades")
+        except Exception as e:
+            print(f"[history] Error loading history: {e}")
 
         return state
 
@@ -1001,133 +963,145 @@ class TradingState:
     def backfill_settlements(cls) -> tuple[int, int]:
         """Backfill settlement data for unsettled trades by querying markets.
 
-        Works with nested JSON format. Returns tuple of (updated_count, remaining_count).
+        Pending records are read via the history index and grouped by market
+        window; each distinct market is fetched once, concurrently (bounded
+        pool + rate limiter). Resolved markets are checkpointed as they
+        arrive so an interrupted run resumes without refetching them, and
+        all settlements are written in a single append.
+
+        Returns tuple of (updated_count, remaining_count).
+
+        Raises:
+            JournalLockedError: A running bot holds the journal's writer
+                lock (it settles its own trades; stop it to backfill)
         """
         from src.core.polymarket import PolymarketClient
+        from src.infra.journal import JournalLockedError
+        from src.infra.resilience import RateLimiter
 
-        history_file = "trade_history_full.json"
-        if not os.path.exists(history_file):
-            print("[backfill] No history file found")
-            return 0, 0
-
-        # Load history
         try:
-            with open(history_file) as f:
-                history = json.load(f)
+            journal = get_history_store()
         except Exception as e:
             print(f"[backfill] Error loading history: {e}")
             return 0, 0
 
-        # Find unsettled trades (nested format)
-        unsettled = []
-        for i, t in enumerate(history):
-            settlement = t.get("settlement", {})
-            if settlement.get("status", "pending") == "pending":
-                unsettled.append((i, t))
+        # Fail before fetching anything; holding the lock from here on also
+        # keeps a bot started meanwhile from writing until backfill exits
+        if getattr(journal, "read_only", False):
+            raise JournalLockedError(
+                f"{journal.path} is being written by another process; "
+                "stop the bot before backfilling"
+            )
+
+        if not len(journal):
+            print("[backfill] No history file found")
+            return 0, 0
+
+        # Group unsettled trades (nested format) by market window
+        by_market: dict[int, list[dict]] = {}
+        for entry in journal.entries(status="pending"):
+            market_ts = entry.get("market", {}).get("timestamp")
+            if market_ts:
+                by_market.setdefault(market_ts, []).append(entry)
 
-        if not unsettled:
+        if not by_market:
             print("[backfill] No unsettled trades found")
             return 0, 0
 
+        checkpoint_path = Config.BACKFILL_CHECKPOINT_FILE
+        resolved = _load_backfill_checkpoint(checkpoint_path)
+        to_fetch = [ts for ts in by_market if str(ts) not in resolved]
+        pending_count = sum(len(v) for v in by_market.values())
         print(
-            f"[backfill] Found {len(unsettled)} unsettled trades, querying markets..."
+            f"[backfill] Found {pending_count} unsettled trades in "
+            f"{len(by_market)} market(s); fetching {len(to_fetch)}, "
+            f"{len(by_market) - len(to_fetch)} resolved in checkpoint"
         )
 
         client = PolymarketClient()
-        updated_count = 0
-        still_pending = 0
-
-        for idx, entry in unsettled:
-            # Get market timestamp from nested format
-            market_obj = entry.get("market", {})
-            market_ts = market_obj.get("timestamp")
-            if not market_ts:
-                continue
+        limiter = RateLimiter(
+            requests_per_minute=Config.BACKFILL_RATE_PER_SEC, window_size=1.0
+        )
+        unsaved = 0
+
+        def on_result(ts: int, market: Market | None):
+            nonlocal unsaved
+            if market and market.closed and market.outcome:
+                resolved[str(ts)] = {
+                    "slug": market.slug,
+                    "outcome": market.outcome,
+                    "up_price": market.up_price,
+                    "down_price": market.down_price,
+                }
+                unsaved += 1
+                if unsaved >= 50:
+                    atomic_write_json(checkpoint_path, resolved)
+                    unsaved = 0
 
-            market = client.get_market(market_ts)
-            if not market:
-                print(f"[backfill] Market not found for ts={market_ts}")
-                still_pending += 1
-                continue
+        start = time.time()
+        try:
+            client.get_markets(to_fetch, rate_limiter=limiter, on_result=on_result)
+        finally:
+            if unsaved:
+                atomic_write_json(checkpoint_path, resolved)
+        elapsed = time.time() - start
 
-            if not market.closed or not market.outcome:
-                print(f"[backfill] Market {market.slug} not yet settled")
-                still_pending += 1
+        updated = []
+        still_pending = 0
+        for market_ts, entries in by_market.items():
+            market = resolved.get(str(market_ts))
+            if market is None:
+                print(f"[backfill] Market btc-updown-5m-{market_ts} not yet settled")
+                still_pending += len(entries)
                 continue
+            for entry in entries:
+                _apply_settlement(entry, market)
+                updated.append(entry)
+                settlement = entry["settlement"]
+                emoji = "✓" if settlement["won"] else "✗"
+                direction = entry["position"]["direction"]
+                print(
+                    f"[backfill] {emoji} {market['slug']}: {direction.upper()} -> "
+                    f"{market['outcome'].upper()} | PnL: ${settlement['net_profit']:+.2f}"
+                )
 
-            # Calculate settlement from nested format
-            position = entry.get("position", {})
-            execution = entry.get("execution", {})
-            fees = entry.get("fees", {})
-
-            direction = position.get("direction")
-            outcome = market.outcome
-            won = direction == outcome
-            amount = position.get("amount", 0)
-            exec_price = execution.get("fill_price") or execution.get(
-                "entry_price", 0.5
-            )
-            fee_pct = fees.get("pct", 0)
-
-            shares_bought = amount / exec_price if exec_price > 0 else 0
-
-            if won:
-                gross_payout = shares_bought  # $1 per share
-                gross_profit = gross_payout - amount
-                fee_amount = gross_profit * fee_pct if gross_profit > 0 else 0
-                net_profit = gross_profit - fee_amount
-            else:
-                gross_payout = 0.0
-                gross_profit = -amount
-                fee_amount = 0.0
-                net_profit = -amount
-
-            # Update settlement in nested structure
-            history[idx]["settlement"] = {
-                "status": "settled",
-                "outcome": outcome,
-                "won": won,
-                "timestamp": int(time.time() * 1000),
-                "resolution_delay_sec": None,
-                "price_at_close": market.up_price
-                if direction == "up"
-                else market.down_price,
-                "gross_payout": gross_payout,
-                "gross_profit": gross_profit,
-                "fee_amount": fee_amount,
-                "net_profit": net_profit,
-            }
-
-            # Update position shares
-            if "position" in history[idx]:
-                history[idx]["position"]["shares"] = shares_bought
-
-            emoji = "✓" if won else "✗"
+        # Append settled copies in one write (latest record per trade wins)
+        if updated:
+            journal.append_many(updated)
+            journal.sync()
             print(
-                f"[backfill] {emoji} {market.slug}: {direction.upper()} -> {outcome.upper()} | PnL: ${net_profit:+.2f}"
+                f"[backfill] Updated {len(updated)} trades in {journal.path} "
+                f"({len(to_fetch)} fetches in {elapsed:.1f}s)"
             )
-            updated_count += 1
-
-        # Save updated history
-        if updated_count > 0:
-            with open(history_file, "w") as f:
-                json.dump(history, f, indent=2)
-            print(f"[backfill] Updated {updated_count} trades in {history_file}")
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
 
-        return updated_count, still_pending
+        return len(updated), still_pending
 
     @classmethod
-    def load_full_history(cls) -> "TradingState":
-        """Load complete trade history from the full history file."""
+    def load_full_history(
+        cls,
+        limit: int | None = None,
+        strategy: str | None = None,
+        wallet: str | None = None,
+    ) -> "TradingState":
+        """Load trade history from the history store.
+
+        Args:
+            limit: Only the most recent N matching trades (default all)
+            strategy: Only trades of this strategy
+            wallet: Only trades copied from this wallet
+
+        Filters and the limit are applied by the store (SQL with the
+        sqlite backend), so only the selected records are parsed.
+        """
         state = cls()
-        history_file = "trade_history_full.json"
 
-        if os.path.exists(history_file):
-            try:
-                with open(history_file) as f:
-                    history = json.load(f)
+        try:
+            journal = get_history_store()
+            if len(journal):
                 loaded_trades = []
-                for t in history:
+                for t in journal.recent(limit, strategy=strategy, wallet=wallet):
                     # Nested format has "id" field
                     if "id" in t or "market" in t:
                         loaded_trades.append(Trade.from_nested_json(t))
@@ -1135,9 +1109,10 @@ class TradingState:
                         # Legacy flat format - skip
                         continue
                 state.trades = loaded_trades
+                state.aggregates = TradeAggregates.from_trades(loaded_trades)
                 print(f"[history] Loaded {len(state.trades)} trades from full history")
-            except Exception as e:
-                print(f"[history] Error loading full history: {e}")
+        except Exception as e:
+            print(f"[history] Error loading full history: {e}")
 
         # Also load current bankroll from working state
         if os.path.exists(Config.TRADES_FILE):
@@ -1151,6 +1126,64 @@ class TradingState:
         return state
 
 
+def _load_backfill_checkpoint(path: str) -> dict:
+    """Resolved markets saved by an interrupted backfill (str(ts) -> data)."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[backfill] Ignoring unreadable checkpoint {path}: {e}")
+        return {}
+
+
+def _apply_settlement(entry: dict, market: dict):
+    """Settle a nested trade record in place from a resolved market."""
+    position = entry.get("position", {})
+    execution = entry.get("execution", {})
+    fees = entry.get("fees", {})
+
+    direction = position.get("direction")
+    outcome = market["outcome"]
+    won = direction == outcome
+    amount = position.get("amount", 0)
+    exec_price = execution.get("fill_price") or execution.get("entry_price", 0.5)
+    fee_pct = fees.get("pct", 0)
+
+    shares_bought = amount / exec_price if exec_price > 0 else 0
+
+    if won:
+        gross_payout = shares_bought  # $1 per share
+        gross_profit = gross_payout - amount
+        fee_amount = gross_profit * fee_pct if gross_profit > 0 else 0
+        net_profit = gross_profit - fee_amount
+    else:
+        gross_payout = 0.0
+        gross_profit = -amount
+        fee_amount = 0.0
+        net_profit = -amount
+
+    entry["settlement"] = {
+        "status": "settled",
+        "outcome": outcome,
+        "won": won,
+        "timestamp": int(time.time() * 1000),
+        "resolution_delay_sec": None,
+        "price_at_close": market["up_price"]
+        if direction == "up"
+        else market["down_price"],
+        "gross_payout": gross_payout,
+        "gross_profit": gross_profit,
+        "fee_amount": fee_amount,
+        "net_profit": net_profit,
+    }
+
+    # Update position shares
+    if "position" in entry:
+        entry["position"]["shares"] = shares_bought
+
+
 class PaperTrader:
     """Paper trading — logs trades without executing, with realistic simulation."""
 
@@ -1398,17 +1431,28 @@ class LiveTrader:
     - EOA/MetaMask wallets (signature_type=0, default)
     - Magic/proxy wallets (signature_type=1, requires funder address)
     - FOK (Fill-Or-Kill) market orders for immediate execution
-    - Order status tracking and confirmation
+    - Order confirmation pushed by the user WebSocket channel, with REST
+      polling (exponential backoff) only when the channel is down
+    - Pre-signed FOK order templates per window (``prepare_orders``), so a
+      matching bet posts without building or signing an order
     """
 
     # Minimum order size in USD
     MIN_ORDER_SIZE = 1.0
 
-    def __init__(self, market_cache=None):
+    def __init__(
+        self, market_cache=None, user_ws=None, presign=False, order_sizes=None
+    ):
         """Initialize live trader.
 
         Args:
             market_cache: Optional MarketDataCache for faster orderbook lookups
+            user_ws: Optional started UserWebSocket; by default one is created
+                from the derived API credentials when USE_WEBSOCKET is on
+            presign: Caller feeds windows to ``prepare_orders``; the template
+                cache is only created then (and when PRESIGN_ORDERS is on)
+            order_sizes: Bet sizes (USD) to pre-sign order templates for
+                (default ORDER_TEMPLATE_SIZES)
         """
         if not Config.PRIVATE_KEY:
             raise ValueError("PRIVATE_KEY not set in .env")
@@ -1420,7 +1464,16 @@ class LiveTrader:
             )
 
         self._market_cache = market_cache
+        self._user_ws = user_ws
         self._init_client()
+        if self._user_ws is None and Config.USE_WEBSOCKET:
+            self._init_user_ws()
+
+        self.order_templates = None
+        if presign and Config.PRESIGN_ORDERS:
+            from src.core.order_templates import OrderTemplateCache
+
+            self.order_templates = OrderTemplateCache(self.client, sizes=order_sizes)
 
     def _init_client(self):
         """Initialize py-clob-client with wallet credentials."""
@@ -1450,6 +1503,7 @@ class LiveTrader:
             # Derive API credentials
             creds = self.client.create_or_derive_api_creds()
             self.client.set_api_creds(creds)
+            self._creds = creds
 
             wallet_type = "proxy" if Config.SIGNATURE_TYPE == 1 else "EOA"
             print(f"[trader] Live trading client initialized ({wallet_type} wallet)")
@@ -1461,6 +1515,38 @@ class LiveTrader:
         except Exception as e:
             raise RuntimeError(f"Failed to init trading client: {e}")
 
+    def _init_user_ws(self):
+        """Start the user channel for push order confirmations."""
+        from src.core.polymarket_ws import UserWebSocket
+
+        try:
+            self._user_ws = UserWebSocket(
+                api_key=self._creds.api_key,
+                api_secret=self._creds.api_secret,
+                api_passphrase=self._creds.api_passphrase,
+            )
+            self._user_ws.start()
+        except Exception as e:
+            print(f"[trader] User WebSocket unavailable, using REST polling: {e}")
+            self._user_ws = None
+
+    def prepare_orders(self, market: Market | None) -> bool:
+        """Pre-sign order templates for a window whose token IDs are known.
+
+        Returns:
+            True if signing was queued (once per window)
+        """
+        if self.order_templates is None:
+            return False
+        return self.order_templates.prepare_async(market)
+
+    def close(self):
+        """Stop the user channel (if this trader started one)."""
+        if self.order_templates is not None:
+            self.order_templates.close()
+        if self._user_ws:
+            self._user_ws.stop()
+
     def _validate_order(
         self, market: Market, direction: str, amount: float
     ) -> tuple[bool, str]:
@@ -1491,20 +1577,65 @@ class LiveTrader:
 
         return True, ""
 
+    def _await_order(self, order_id: str) -> dict:
+        """Wait for a submitted order to fill or cancel.
+
+        Waits on the user channel's future for the order when the socket is
+        up; polls REST only if it is down or stays silent past
+        ORDER_CONFIRM_TIMEOUT.
+
+        Returns:
+            Order status dict with keys: status, filled_size, avg_price,
+            source ("ws"/"rest") and latency_ms
+        """
+        start = time.perf_counter()
+        result = None
+
+        if self._user_ws and self._user_ws.is_connected():
+            future = self._user_ws.expect_order(order_id)
+            try:
+                update = future.result(timeout=Config.ORDER_CONFIRM_TIMEOUT)
+                result = {
+                    "status": update["status"],
+                    "filled_size": update.get("filled_size", 0),
+                    "avg_price": update.get("avg_price", 0),
+                    "order": update.get("data"),
+                    "source": "ws",
+                }
+            except concurrent.futures.TimeoutError:
+                self._user_ws.forget_order(order_id)
+                print(f"[trader] No user-channel update for {order_id}, polling")
+
+        if result is None:
+            result = self._get_order_status(order_id)
+            result["source"] = "rest"
+
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
     def _get_order_status(
-        self, order_id: str, max_attempts: int = 5, poll_interval: float = 0.5
+        self,
+        order_id: str,
+        max_attempts: int = 6,
+        initial_interval: float = 0.1,
+        backoff: float = 2.0,
     ) -> dict:
-        """Poll for order status until filled or timeout.
+        """Poll for order status until filled or timeout (fallback path).
 
         Args:
             order_id: Order ID to check
             max_attempts: Maximum polling attempts
-            poll_interval: Seconds between polls
+            initial_interval: Seconds before the second poll
+            backoff: Multiplier applied to the interval after each poll
 
         Returns:
             Order status dict with keys: status, filled_size, avg_price, etc.
         """
+        interval = initial_interval
         for attempt in range(max_attempts):
+            if attempt:
+                time.sleep(interval)
+                interval *= backoff
             try:
                 order = self.client.get_order(order_id)
                 status = order.get("status", "unknown")
@@ -1526,17 +1657,10 @@ class LiveTrader:
                         "avg_price": 0,
                         "order": order,
                     }
-                elif status == "LIVE":
-                    # FOK should not rest on book, but check anyway
-                    time.sleep(poll_interval)
-                    continue
-                else:
-                    # Unknown status, keep polling
-                    time.sleep(poll_interval)
+                # LIVE (FOK should not rest on book) or unknown: keep polling
 
             except Exception as e:
                 print(f"[trader] Error polling order {order_id}: {e}")
-                time.sleep(poll_interval)
 
         # Timeout - return unknown status
         return {
@@ -1568,8 +1692,9 @@ class LiveTrader:
             print(f"[LIVE] Order rejected: {error_msg}")
             return None
 
-        # Precomputed execution data is only used by paper mode; discard if passed
-        kwargs.pop("precomputed_execution", None)
+        # Live fills come from the exchange; the precomputed quote only
+        # supplies the price limit for picking a pre-signed template
+        precomputed = kwargs.pop("precomputed_execution", None) or {}
 
         token_id = market.up_token_id if direction == "up" else market.down_token_id
         entry_price = market.up_price if direction == "up" else market.down_price
@@ -1577,9 +1702,24 @@ class LiveTrader:
             entry_price = 0.5
 
         executed_at = int(time.time() * 1000)  # milliseconds
+        submit_start = time.perf_counter()
+        requested_amount = amount
         order_id = None
         order_status = "pending"
         execution_price = entry_price
+        confirm_latency_ms = None
+        confirm_source = None
+        submit_latency_ms = None
+        saved_ms = 0.0
+
+        # Closest pre-signed order for this bet, if one is ready
+        template = None
+        if self.order_templates is not None and token_id:
+            template = self.order_templates.take(
+                token_id, amount, precomputed.get("worst_price", 0.0)
+            )
+            if template is not None:
+                amount = template.amount
         filled_amount = amount
 
         # Get fee rate from market
@@ -1599,21 +1739,36 @@ class LiveTrader:
 
             fok_order_type = cast(OrderType, OrderType.FOK)
 
-            # Create FOK market order
-            # For BUY orders, amount is in USD (how much to spend)
-            market_order = MarketOrderArgs(
-                token_id=token_id,
-                amount=amount,  # USD amount to spend
-                side=BUY,
-                order_type=fok_order_type,  # Fill-Or-Kill for immediate execution
-            )
+            if template is not None:
+                signed_order = template.signed_order
+                saved_ms = self.order_templates.saved_ms()
+            else:
+                # Create FOK market order
+                # For BUY orders, amount is in USD (how much to spend)
+                market_order = MarketOrderArgs(
+                    token_id=token_id,
+                    amount=amount,  # USD amount to spend
+                    side=BUY,
+                    order_type=fok_order_type,  # Fill-Or-Kill for immediate execution
+                )
+
+                # Sign the order (prices it from the book first)
+                signed_order = self.client.create_market_order(market_order)
+                if self.order_templates is not None:
+                    self.order_templates.record_inline(
+                        (time.perf_counter() - submit_start) * 1000
+                    )
 
-            # Sign and submit the order
-            signed_order = self.client.create_market_order(market_order)
             response = self.client.post_order(signed_order, fok_order_type)
+            submit_latency_ms = round((time.perf_counter() - submit_start) * 1000, 1)
 
             order_id = response.get("orderID", response.get("id", "unknown"))
             order_status = "submitted"
+            if template is not None:
+                print(
+                    f"[LIVE] Pre-signed ${amount:g} @ <= {template.limit_price:.2f} "
+                    f"posted in {submit_latency_ms:.0f}ms (~{saved_ms:.0f}ms signing saved)"
+                )
 
             # Log based on strategy type
             if kwargs.get("strategy") == "copytrade":
@@ -1628,10 +1783,12 @@ class LiveTrader:
                     f"| {market.title} | order={order_id} (FOK)"
                 )
 
-            # Poll for order status (FOK should resolve quickly)
+            # Wait for the fill/cancel (FOK should resolve quickly)
             if order_id and not order_id.startswith("FAILED"):
-                status_result = self._get_order_status(order_id)
+                status_result = self._await_order(order_id)
                 order_status = status_result["status"]
+                confirm_latency_ms = status_result["latency_ms"]
+                confirm_source = status_result["source"]
 
                 if order_status == "filled":
                     filled_amount = (
@@ -1639,10 +1796,11 @@ class LiveTrader:
                     )
                     execution_price = status_result["avg_price"]
                     print(
-                        f"[LIVE] Order filled: {status_result['filled_size']:.2f} shares @ {execution_price:.3f}"
+                        f"[LIVE] Order filled: {status_result['filled_size']:.2f} shares @ {execution_price:.3f} "
+                        f"({confirm_latency_ms:.0f}ms via {confirm_source})"
                     )
-                elif order_status == "cancelled":
-                    print("[LIVE] Order cancelled (FOK not filled)")
+                elif order_status in ("cancelled", "failed"):
+                    print(f"[LIVE] Order {order_status} (FOK not filled)")
                     return None
                 else:
                     print(f"[LIVE] Order status: {order_status}")
@@ -1672,11 +1830,16 @@ class LiveTrader:
             order_id=order_id,
             executed_at=executed_at,
             market_price_at_copy=entry_price,
+            order_status=order_status,
+            confirm_latency_ms=confirm_latency_ms,
+            confirm_source=confirm_source,
+            submit_latency_ms=submit_latency_ms,
+            presigned=template is not None,
             # Realistic execution fields
             fee_rate_bps=fee_rate_bps,
             fee_pct=fee_pct,
             execution_price=execution_price,
-            requested_amount=amount,
+            requested_amount=requested_amount,
             price_at_signal=entry_price,
             price_at_execution=execution_price,
             **kwargs,  # pass copytrade fields
@@ -0,0 +1,194 @@
+"""Rolling subscription manager for BTC 5-min windows.
+
+Keeps market metadata and WebSocket subscriptions for a fixed band of
+windows around "now": the next ``ahead`` windows are fetched and
+subscribed before their boundary, and windows behind it are unsubscribed
+once settled and evicted from every cache, so memory stays flat however
+long the process runs.
+"""
+
+import time
+
+from src.config import Config
+
+WINDOW_SECONDS = 300
+
+
+class WindowSubscriptionManager:
+    """Subscribe ahead of window boundaries and evict settled windows.
+
+    Call ``tick()`` from the bot's main loop. It is a no-op between
+    boundaries unless a fetch for an upcoming window is pending retry.
+
+    Lifecycle of a window ``ts``:
+    - ``ts <= now < ts + ahead*300``: fetched (token IDs) and WS-subscribed
+    - ended and settled (or ``evict_after`` seconds past end): WS
+      unsubscribed and its order books dropped
+    - older than ``retain`` windows: metadata evicted from all caches
+    """
+
+    RETRY_INTERVAL = 30  # seconds between retries for windows not yet on Gamma
+
+    def __init__(
+        self,
+        client=None,
+        cache=None,
+        ahead: int | None = None,
+        retain: int | None = None,
+        evict_after: int | None = None,
+    ):
+        """Initialize manager.
+
+        Args:
+            client: PolymarketClient whose market/token caches to manage
+            cache: MarketDataCache to subscribe through and evict from
+            ahead: Windows to keep subscribed ahead of the current one
+            retain: Past windows to keep metadata for (history lookups)
+            evict_after: Seconds after window end to drop an unsettled window
+        """
+        self._client = client
+        self._cache = cache
+        self.ahead = ahead if ahead is not None else Config.WINDOW_LOOKAHEAD
+        self.retain = retain if retain is not None else Config.WINDOW_RETAIN
+        self.evict_after = (
+            evict_after if evict_after is not None else Config.WINDOW_EVICT_AFTER
+        )
+
+        self._last_window = 0
+        self._pending: set[int] = set()  # upcoming windows not fetched yet
+        self._last_retry = 0.0
+        self._subscribed: set[int] = set()
+        self._on_subscribe: list = []  # callbacks(ts) once token IDs are known
+
+        # Statistics
+        self.rollovers = 0
+        self.subscribed_total = 0
+        self.unsubscribed_total = 0
+        self.evicted_total = 0
+
+    def on_subscribe(self, callback):
+        """Call ``callback(ts)`` for each window once it is fetched and subscribed."""
+        self._on_subscribe.append(callback)
+
+    @property
+    def subscribed(self) -> list[int]:
+        """Windows currently subscribed, oldest first."""
+        return sorted(self._subscribed)
+
+    def tick(self, now: float | None = None) -> bool:
+        """Roll the window band forward if a boundary has passed.
+
+        Args:
+            now: Current unix time (defaults to time.time())
+
+        Returns:
+            True if any work was done
+        """
+        now = time.time() if now is None else now
+        current = int(now // WINDOW_SECONDS) * WINDOW_SECONDS
+
+        if current == self._last_window:
+            if not self._pending or now - self._last_retry < self.RETRY_INTERVAL:
+                return False
+            self._last_retry = now
+            self._subscribe(self._pending)
+            return True
+
+        self._last_window = current
+        self._last_retry = now
+        self.rollovers += 1
+
+        upcoming = {current + i * WINDOW_SECONDS for i in range(self.ahead + 1)}
+        self._pending = upcoming - self._subscribed
+        self._subscribe(self._pending)
+        self._unsubscribe_settled(now)
+        self._evict_old(current)
+        return True
+
+    def _subscribe(self, windows: set[int]):
+        """Fetch and subscribe upcoming windows, keeping failures for retry."""
+        for ts in sorted(windows):
+            # One fetch per window: through the cache (which subscribes it)
+            # when there is one, else through the client
+            ok = True
+            if self._cache is not None:
+                ok = self._cache.prefetch_market(ts)
+            elif self._client is not None:
+                ok = self._client.get_market(ts) is not None
+            if ok:
+                self._pending.discard(ts)
+                self._subscribed.add(ts)
+                self.subscribed_total += 1
+                for callback in self._on_subscribe:
+                    try:
+                        callback(ts)
+                    except Exception as e:
+                        print(f"[windows] Subscribe callback failed for {ts}: {e}")
+
+    def _unsubscribe_settled(self, now: float):
+        """Drop WS subscriptions for windows that have ended and settled."""
+        for ts in sorted(self._subscribed):
+            end = ts + WINDOW_SECONDS
+            if now < end:
+                continue
+            if self._is_settled(ts) or now >= end + self.evict_after:
+                if self._cache is not None:
+                    self._cache.unsubscribe_window(ts)
+                self._subscribed.discard(ts)
+                self.unsubscribed_total += 1
+
+    def _is_settled(self, ts: int) -> bool:
+        """True if a cached copy of the market already has its outcome."""
+        for client in self._clients():
+            market = client.peek_market(ts)
+            if market is not None and market.closed and market.outcome:
+                return True
+        return False
+
+    def _evict_old(self, current: int):
+        """Evict metadata for windows older than the retention band.
+
+        Scans cache keys rather than only windows this manager subscribed,
+        so entries added by settlement or history lookups are bounded too.
+        """
+        cutoff = current - self.retain * WINDOW_SECONDS
+        stale: set[int] = set()
+        for client in self._clients():
+            stale.update(ts for ts in client.cached_windows() if ts < cutoff)
+        if self._cache is not None:
+            stale.update(ts for ts in self._cache.cached_windows() if ts < cutoff)
+        # Windows that never settled in time are still subscribed here
+        stale.update(ts for ts in self._subscribed if ts < cutoff)
+
+        for ts in stale:
+            if ts in self._subscribed and self._cache is not None:
+                self._cache.unsubscribe_window(ts)
+                self.unsubscribed_total += 1
+            self._subscribed.discard(ts)
+            if self._cache is not None:
+                self._cache.evict_window(ts)
+            for client in self._clients():
+                client.evict_window(ts)
+            self.evicted_total += 1
+
+    def _clients(self) -> list:
+        """All PolymarketClient instances whose caches are managed."""
+        clients = []
+        if self._client is not None:
+            clients.append(self._client)
+        if self._cache is not None and self._cache.rest_client is not self._client:
+            clients.append(self._cache.rest_client)
+        return clients
+
+    @property
+    def stats(self) -> dict:
+        """Get window manager statistics."""
+        return {
+            "current_window": self._last_window,
+            "subscribed_windows": len(self._subscribed),
+            "pending_windows": len(self._pending),
+            "rollovers": self.rollovers,
+            "subscribed_total": self.subscribed_total,
+            "unsubscribed_total": self.unsubscribed_total,
+            "evicted_total": self.evicted_total,
+        }
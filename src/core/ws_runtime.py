@@ -0,0 +1,153 @@
+"""Process-wide asyncio runtime shared by all WebSocket feeds.
+
+One daemon thread runs one event loop. Feeds (market, user, copytrade)
+run as tasks on it instead of each owning a thread and loop, and the
+market channel is a single shared connection that every consumer
+subscribes through.
+
+Synchronous code talks to the loop only through ``submit``/``run_sync``/
+``call_soon``, which are thread-safe.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from collections.abc import Coroutine
+from typing import Any, Callable
+
+
+class WSRuntime:
+    """Single event loop thread hosting every WebSocket feed.
+
+    Usage:
+        runtime = get_runtime()
+        future = runtime.run_feed("user", user_ws._connect_loop())
+        ...
+        runtime.cancel_feed("user")
+    """
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._feeds: dict[str, concurrent.futures.Future] = {}
+        self._market_feed = None
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if needed and return the running loop."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._ready.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="ws-runtime", daemon=True
+                )
+                self._thread.start()
+        self._ready.wait()
+        return self._loop
+
+    def _run(self):
+        """Run the event loop until shutdown."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        loop.call_soon(self._ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            loop.close()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        """The runtime loop (None until started)."""
+        return self._loop
+
+    def is_running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run_sync(self, coro: Coroutine, timeout: float | None = None) -> Any:
+        """Run a coroutine on the loop and block for its result.
+
+        Must not be called from the loop thread itself.
+        """
+        return self.submit(coro).result(timeout=timeout)
+
+    def call_soon(self, fn: Callable, *args):
+        """Run a plain callable on the loop thread."""
+        self.start().call_soon_threadsafe(fn, *args)
+
+    def run_feed(self, name: str, coro: Coroutine) -> concurrent.futures.Future:
+        """Start a long-running feed task under ``name``."""
+        future = self.submit(coro)
+        with self._lock:
+            self._feeds[name] = future
+        future.add_done_callback(lambda f, n=name: self._forget(n, f))
+        return future
+
+    def _forget(self, name: str, future: concurrent.futures.Future):
+        with self._lock:
+            if self._feeds.get(name) is future:
+                del self._feeds[name]
+
+    def cancel_feed(self, name: str):
+        """Cancel a feed task (returns immediately)."""
+        with self._lock:
+            future = self._feeds.get(name)
+        if future is not None:
+            future.cancel()
+
+    def market_feed(self):
+        """The shared market-channel connection (created on first use)."""
+        from src.core.polymarket_ws import PolymarketWebSocket
+
+        with self._lock:
+            if self._market_feed is None:
+                self._market_feed = PolymarketWebSocket(runtime=self)
+            return self._market_feed
+
+    def shutdown(self, timeout: float = 2.0):
+        """Cancel all feeds and stop the loop thread."""
+        with self._lock:
+            feeds = list(self._feeds.values())
+            thread = self._thread
+        for future in feeds:
+            future.cancel()
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if thread is not None:
+            thread.join(timeout=timeout)
+
+    @property
+    def stats(self) -> dict:
+        """Get runtime statistics."""
+        with self._lock:
+            feeds = sorted(self._feeds)
+        return {
+            "running": self.is_running(),
+            "feeds": feeds,
+            "tasks": len(asyncio.all_tasks(self._loop)) if self.is_running() else 0,
+        }
+
+
+_runtime: WSRuntime | None = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> WSRuntime:
+    """Return the process-wide runtime."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = WSRuntime()
+        return _runtime
@@ -0,0 +1,194 @@
+"""Non-blocking event dispatch off the WebSocket thread.
+
+Provides:
+- EventDispatcher: Bounded queue + worker pool that runs slow callbacks
+  (HTTP polls, enrichment) without stalling the producer, with
+  per-key coalescing of duplicate events
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from src.config import Config
+
+_STOP = object()
+
+
+class EventDispatcher:
+    """Hand events from a latency-sensitive thread to a worker pool.
+
+    ``submit`` never blocks: duplicate events for the same key inside the
+    coalesce window are merged, and events are dropped (and counted) when
+    the queue is full rather than back-pressuring the producer.
+
+    Usage:
+        dispatcher = EventDispatcher(handle_trade, key=lambda t: t.market_id)
+        dispatcher.start()
+
+        # From the WebSocket loop
+        dispatcher.submit(trade)
+
+        dispatcher.stop()
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], None],
+        key: Callable[[Any], str] | None = None,
+        workers: int | None = None,
+        max_queue: int | None = None,
+        coalesce_window: float | None = None,
+        name: str = "dispatch",
+    ):
+        """Initialize dispatcher.
+
+        Args:
+            handler: Called with each event on a worker thread
+            key: Coalescing key for an event (None disables coalescing)
+            workers: Worker thread count
+            max_queue: Maximum queued events before dropping
+            coalesce_window: Seconds within which same-key events are merged
+            name: Thread name prefix and log tag
+        """
+        self._handler = handler
+        self._key = key
+        self.workers = workers or Config.DISPATCH_WORKERS
+        self.max_queue = max_queue or Config.DISPATCH_QUEUE_SIZE
+        self.coalesce_window = (
+            coalesce_window
+            if coalesce_window is not None
+            else Config.DISPATCH_COALESCE_MS / 1000
+        )
+        self.name = name
+
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queue)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._last_accepted: dict[str, float] = {}  # key -> submit time
+        self._lags_ms: deque = deque(maxlen=500)
+
+        # Statistics
+        self.submitted = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.dispatched = 0
+        self.errors = 0
+
+    def start(self):
+        """Start worker threads."""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            t = threading.Thread(
+                target=self._worker, name=f"{self.name}-{i}", daemon=True
+            )
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 2.0):
+        """Stop workers after they finish the event in hand."""
+        if not self._threads:
+            return
+        # Discard the backlog so sentinels are picked up promptly
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        for _ in self._threads:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                break
+        deadline = time.time() + timeout
+        for t in self._threads:
+            t.join(timeout=max(0.0, deadline - time.time()))
+        self._threads = []
+
+    def submit(self, event: Any) -> bool:
+        """Queue an event for dispatch without blocking.
+
+        Returns:
+            True if queued, False if coalesced into a recent event or dropped
+        """
+        now = time.time()
+        key = last = None
+        with self._lock:
+            self.submitted += 1
+            if self._key is not None and self.coalesce_window > 0:
+                key = self._key(event)
+                last = self._last_accepted.get(key)
+                if last is not None and now - last < self.coalesce_window:
+                    self.coalesced += 1
+                    return False
+                self._last_accepted[key] = now
+                if len(self._last_accepted) > 1024:
+                    self._prune_keys(now)
+
+        try:
+            self._queue.put_nowait((now, event))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                # A dropped event must not coalesce away the ones after it
+                if key is not None and self._last_accepted.get(key) == now:
+                    if last is None:
+                        del self._last_accepted[key]
+                    else:
+                        self._last_accepted[key] = last
+            return False
+        return True
+
+    def _prune_keys(self, now: float):
+        """Forget coalescing keys whose window has passed (caller holds lock)."""
+        cutoff = now - self.coalesce_window
+        self._last_accepted = {
+            k: t for k, t in self._last_accepted.items() if t >= cutoff
+        }
+
+    def _worker(self):
+        """Worker loop: run the handler for each queued event."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            enqueued_at, event = item
+            lag_ms = (time.time() - enqueued_at) * 1000
+            try:
+                self._handler(event)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                print(f"[{self.name}] Handler error: {e}")
+            with self._lock:
+                self.dispatched += 1
+                self._lags_ms.append(lag_ms)
+
+    @property
+    def queue_depth(self) -> int:
+        """Events waiting for a worker."""
+        return self._queue.qsize()
+
+    @property
+    def stats(self) -> dict:
+        """Get dispatcher statistics."""
+        with self._lock:
+            lags = sorted(self._lags_ms)
+            stats = {
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "max_queue": self.max_queue,
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "dispatched": self.dispatched,
+                "errors": self.errors,
+            }
+        if lags:
+            stats["lag_ms_avg"] = round(sum(lags) / len(lags), 2)
+            stats["lag_ms_p95"] = round(lags[int(len(lags) * 0.95)], 2)
+            stats["lag_ms_max"] = round(lags[-1], 2)
+        return stats
@@ -0,0 +1,682 @@
+"""Append-only trade history journal.
+
+Provides:
+- TradeJournal: JSONL file of nested trade records (``Trade.to_nested_json``)
+  where every new trade and every settlement update is appended as a full
+  record, plus a small ID -> offset index sidecar so single trades and the
+  pending set are read without parsing the whole history. Superseded
+  records are dropped by periodic background compaction.
+
+File layout:
+    trade_history.jsonl       one JSON record per line (latest record wins)
+    trade_history.jsonl.idx   one line per append: id, offset, length,
+                              settlement status, market timestamp
+    trade_history.jsonl.lock  flock'd by the one process allowed to write
+
+Offsets come from the writer's in-memory size, so only one process may
+append (or compact) at a time. A journal opened while another process
+holds the lock is read-only until the lock is released; its appends raise
+``JournalLockedError``.
+"""
+
+import json
+import os
+import threading
+from collections.abc import Iterable, Iterator
+
+from src.config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, a single writer is assumed
+    fcntl = None
+
+_INDEX_SUFFIX = ".idx"
+_LOCK_SUFFIX = ".lock"
+
+
+class JournalLockedError(RuntimeError):
+    """Another process holds the journal's writer lock."""
+
+
+class _Entry:
+    """Index entry for the latest record of one trade."""
+
+    __slots__ = ("offset", "length", "status", "market_ts")
+
+    def __init__(self, offset: int, length: int, status: str, market_ts: int):
+        self.offset = offset
+        self.length = length
+        self.status = status
+        self.market_ts = market_ts
+
+
+def _record_id(record: dict) -> str:
+    """Trade ID of a nested record (reconstructed for old flat entries)."""
+    trade_id = record.get("id")
+    if trade_id:
+        return trade_id
+    market = record.get("market", {})
+    position = record.get("position", {})
+    execution = record.get("execution", {})
+    if not isinstance(market, dict):
+        market = {}
+    ts = market.get("timestamp") or record.get("timestamp")
+    exec_at = execution.get("timestamp") or record.get("executed_at")
+    direction = position.get("direction") or record.get("direction")
+    return f"{ts}_{exec_at}_{direction}"
+
+
+def _index_fields(record: dict) -> tuple[str, int]:
+    """(settlement status, market timestamp) kept in the index."""
+    settlement = record.get("settlement") or {}
+    market = record.get("market")
+    market_ts = market.get("timestamp") if isinstance(market, dict) else None
+    return (
+        settlement.get("status", "pending"),
+        int(market_ts or record.get("timestamp") or 0),
+    )
+
+
+def record_matches(
+    record: dict,
+    strategy: str | None = None,
+    wallet: str | None = None,
+    status: str | None = None,
+) -> bool:
+    """True if a nested record passes the history filters."""
+    if strategy and (record.get("context") or {}).get("strategy") != strategy:
+        return False
+    if wallet:
+        copied = (record.get("copytrade") or {}).get("wallet") or ""
+        if copied.lower() != wallet.lower():
+            return False
+    if status and (record.get("settlement") or {}).get("status", "pending") != status:
+        return False
+    return True
+
+
+def summarize(records: Iterable[dict]) -> dict:
+    """Aggregate statistics over nested records (settled = has an outcome).
+
+    Keys match ``TradingState.get_statistics`` minus the unrealized and
+    bankroll fields; TradeStore.summary computes the same in SQL.
+    """
+    total = settled = wins = losses = 0
+    realized = fees = gross = win_sum = loss_sum = 0.0
+    largest_win = largest_loss = 0.0
+    slippage = fee_pct = delay = 0.0
+    for r in records:
+        total += 1
+        s = r.get("settlement") or {}
+        if not s.get("outcome"):
+            continue
+        settled += 1
+        pnl = s.get("net_profit") or 0.0
+        realized += pnl
+        fees += s.get("fee_amount") or 0.0
+        gross += s.get("gross_profit") or 0.0
+        slippage += (r.get("execution") or {}).get("slippage_pct") or 0.0
+        fee_pct += (r.get("fees") or {}).get("pct") or 0.0
+        delay += (r.get("copytrade") or {}).get("delay_impact_pct") or 0.0
+        if s.get("won"):
+            wins += 1
+            win_sum += pnl
+            largest_win = max(largest_win, pnl) if wins > 1 else pnl
+        else:
+            losses += 1
+            loss_sum += pnl
+            largest_loss = min(largest_loss, pnl) if losses > 1 else pnl
+    return {
+        "total_trades": total,
+        "settled_trades": settled,
+        "pending_trades": total - settled,
+        "wins": wins,
+        "losses": losses,
+        "win_rate": wins / settled * 100 if settled else 0,
+        "realized_pnl": realized,
+        "total_fees_paid": fees,
+        "total_gross_profit": gross,
+        "avg_win": win_sum / wins if wins else 0,
+        "avg_loss": loss_sum / losses if losses else 0,
+        "largest_win": largest_win,
+        "largest_loss": largest_loss,
+        "avg_slippage_pct": slippage / settled if settled else 0,
+        "avg_fee_pct": fee_pct / settled * 100 if settled else 0,
+        "avg_delay_impact_pct": delay / settled if settled else 0,
+    }
+
+
+class TradeJournal:
+    """Append-only JSONL trade history with an on-disk ID index.
+
+    ``append`` costs one write to each file regardless of history size.
+    Reads go through the in-memory index (loaded from the sidecar, which
+    is a fraction of the journal's size), so ``get``/``pending`` touch
+    only the records they return.
+
+    Usage:
+        journal = get_journal()
+        journal.append(trade.to_nested_json())      # new trade
+        journal.append(trade.to_nested_json())      # later: settled copy
+        for record in journal.entries(status="pending"):
+            ...
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        legacy_path: str | None = None,
+        compact_min_dead: int = 1000,
+    ):
+        """Open (or create) a journal.
+
+        Args:
+            path: Journal file (defaults to Config.HISTORY_FILE)
+            legacy_path: JSON-array history imported once if the journal
+                doesn't exist yet (defaults to Config.LEGACY_HISTORY_FILE)
+            compact_min_dead: Superseded records tolerated before compaction
+                is considered (it also waits until they reach half the
+                live count, keeping its cost amortized O(1) per append)
+        """
+        self.path = path or Config.HISTORY_FILE
+        self.index_path = self.path + _INDEX_SUFFIX
+        self.lock_path = self.path + _LOCK_SUFFIX
+        self.compact_min_dead = compact_min_dead
+
+        self._lock = threading.Lock()
+        self._index: dict[str, _Entry] = {}  # insertion order = first seen
+        self._size = 0  # bytes of journal covered by the index
+        self._dead = 0  # superseded records still in the file
+        self._compacting = False
+        self._lock_file = None  # held for as long as this process writes
+        self._journal = None
+        self._index_file = None
+        self._reader = None
+
+        # Statistics
+        self.appends = 0
+        self.compactions = 0
+
+        legacy_path = (
+            legacy_path if legacy_path is not None else Config.LEGACY_HISTORY_FILE
+        )
+        migrate = (
+            not os.path.exists(self.path)
+            and legacy_path
+            and os.path.exists(legacy_path)
+        )
+        if self._open_writer():
+            if migrate:
+                self._import_legacy(legacy_path)
+        else:
+            print(
+                f"[journal] {self.path} is being written by another process; "
+                "opened read-only"
+            )
+            self._load_index(persist=False)
+            with open(self.path, "ab"):  # appends nothing; the writer creates it
+                pass
+            self._reader = open(self.path, "rb")  # noqa: SIM115 - closed in close()
+
+    # ------------------------------------------------------------------
+    # Writer lock
+    # ------------------------------------------------------------------
+
+    @property
+    def read_only(self) -> bool:
+        """True while another process holds the writer lock."""
+        return self._journal is None
+
+    def _open_writer(self) -> bool:
+        """Take the writer lock and open the append handles.
+
+        A read-only journal re-indexes what the previous writer appended
+        before its first write. Caller holds ``_lock`` (or is __init__).
+
+        Returns:
+            False if another process holds the lock
+        """
+        if self._journal is not None:
+            return True
+        # Held (and so locked) for as long as this process writes
+        lock_file = open(self.lock_path, "a")  # noqa: SIM115 - closed in close()
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+        self._lock_file = lock_file
+
+        self._index = {}
+        self._load_index()
+        # Long-lived handles, closed in close() or swapped by compaction
+        self._journal = open(self.path, "ab")  # noqa: SIM115 - long-lived
+        if self._journal.tell() > self._size:
+            self._journal.truncate(self._size)  # drop a torn final record
+        self._index_file = open(self.index_path, "a", encoding="utf-8")  # noqa: SIM115 - long-lived
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = open(self.path, "rb")  # noqa: SIM115 - long-lived
+        return True
+
+    def _require_writer(self):
+        """Caller holds ``_lock``."""
+        if not self._open_writer():
+            raise JournalLockedError(
+                f"{self.path} is being written by another process "
+                f"(writer lock {self.lock_path})"
+            )
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _load_index(self, persist: bool = True):
+        """Load the sidecar, then index any journal tail it doesn't cover.
+
+        A sidecar that doesn't match the journal (torn line, entries past
+        the end) is rebuilt from a full scan; that only happens after a
+        crash mid-append. Read-only journals (``persist=False``) keep the
+        rebuilt index in memory only.
+        """
+        journal_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        covered = 0
+        records = 0
+        consistent = True
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 5 or not line.endswith("\n"):
+                        consistent = False
+                        break
+                    trade_id, offset, length, status, market_ts = parts
+                    entry = _Entry(int(offset), int(length), status, int(market_ts))
+                    if entry.offset + entry.length > journal_size:
+                        consistent = False
+                        break
+                    self._index[trade_id] = entry
+                    covered = max(covered, entry.offset + entry.length)
+                    records += 1
+
+        if not consistent:
+            self._index.clear()
+            found, covered = self._scan(0, journal_size)
+            for trade_id, entry in found:
+                self._index[trade_id] = entry
+            records = len(found)
+            if persist:
+                self._write_index_file(self.index_path, found)
+                print(f"[journal] Rebuilt index for {self.path} ({records} records)")
+        elif journal_size > covered:
+            found, covered = self._scan(covered, journal_size)
+            for trade_id, entry in found:
+                self._index[trade_id] = entry
+            if persist and found:
+                with open(self.index_path, "a", encoding="utf-8") as f:
+                    for trade_id, entry in found:
+                        f.write(self._index_line(trade_id, entry))
+                print(f"[journal] Indexed {len(found)} record(s) missing from sidecar")
+            records += len(found)
+
+        self._size = covered
+        self._dead = records - len(self._index)
+
+    def _scan(self, start: int, end: int) -> tuple[list[tuple[str, _Entry]], int]:
+        """Index complete records in the journal between two offsets.
+
+        Returns:
+            (entries, offset just past the last complete line)
+        """
+        found = []
+        offset = start
+        if not os.path.exists(self.path):
+            return found, offset
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            while offset < end:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break  # torn final write; truncated on open
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    offset += len(line)
+                    continue
+                status, market_ts = _index_fields(record)
+                found.append(
+                    (_record_id(record), _Entry(offset, len(line), status, market_ts))
+                )
+                offset += len(line)
+        return found, offset
+
+    def _write_index_file(self, path: str, entries: Iterable[tuple[str, _Entry]]):
+        """Write a complete sidecar atomically."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for trade_id, entry in entries:
+                f.write(self._index_line(trade_id, entry))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _index_line(trade_id: str, entry: _Entry) -> str:
+        return (
+            f"{trade_id}\t{entry.offset}\t{entry.length}\t"
+            f"{entry.status}\t{entry.market_ts}\n"
+        )
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, record: dict) -> str:
+        """Append a trade record (new trade or updated copy of one).
+
+        Returns:
+            The record's trade ID
+        """
+        trade_id = _record_id(record)
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        status, market_ts = _index_fields(record)
+
+        with self._lock:
+            self._require_writer()
+            entry = _Entry(self._size, len(line), status, market_ts)
+            self._journal.write(line)
+            self._journal.flush()
+            self._index_file.write(self._index_line(trade_id, entry))
+            self._index_file.flush()
+            self._size += len(line)
+            if trade_id in self._index:
+                self._dead += 1
+            self._index[trade_id] = entry
+            self.appends += 1
+            compact = self._should_compact()
+
+        if compact:
+            self.compact_async()
+        return trade_id
+
+    def append_many(self, records: Iterable[dict]) -> int:
+        """Append several records with one flush per file."""
+        count = 0
+        with self._lock:
+            self._require_writer()
+            for record in records:
+                trade_id = _record_id(record)
+                line = (json.dumps(record, separators=(",", ":")) + "\n").encode(
+                    "utf-8"
+                )
+                status, market_ts = _index_fields(record)
+                entry = _Entry(self._size, len(line), status, market_ts)
+                self._journal.write(line)
+                self._index_file.write(self._index_line(trade_id, entry))
+                self._size += len(line)
+                if trade_id in self._index:
+                    self._dead += 1
+                self._index[trade_id] = entry
+                count += 1
+            self._journal.flush()
+            self._index_file.flush()
+            self.appends += count
+            compact = self._should_compact()
+
+        if compact:
+            self.compact_async()
+        return count
+
+    def _import_legacy(self, legacy_path: str):
+        """One-pass import of the old JSON-array history file."""
+        try:
+            with open(legacy_path) as f:
+                history = json.load(f)
+        except Exception as e:
+            print(f"[journal] Could not import {legacy_path}: {e}")
+            return
+        count = self.append_many(r for r in history if isinstance(r, dict))
+        print(
+            f"[journal] Imported {count} trade(s) from {legacy_path} into {self.path}"
+        )
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def _should_compact(self) -> bool:
+        """Caller holds the lock."""
+        return (
+            not self._compacting
+            and self._dead >= self.compact_min_dead
+            and self._dead * 2 >= len(self._index)
+        )
+
+    def compact_async(self) -> threading.Thread | None:
+        """Compact on a background thread (no-op if one is running)."""
+        with self._lock:
+            if self._compacting:
+                return None
+            self._compacting = True
+        t = threading.Thread(
+            target=self._compact, kwargs={"claimed": True}, name="journal-compact"
+        )
+        t.daemon = True
+        t.start()
+        return t
+
+    def compact(self):
+        """Rewrite the journal keeping only the latest record per trade."""
+        with self._lock:
+            self._require_writer()
+            if self._compacting:
+                return
+            self._compacting = True
+        self._compact(claimed=True)
+
+    def _compact(self, claimed: bool = False):
+        """Copy live records to a new file, then swap it in.
+
+        The bulk copy runs without the lock (the journal is append-only, so
+        indexed offsets stay valid); only records appended meanwhile are
+        copied while holding it.
+        """
+        tmp_path = self.path + ".compact"
+        try:
+            with self._lock:
+                snapshot = list(self._index.items())
+                copied_to = self._size
+
+            new_index: dict[str, _Entry] = {}
+            with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+                # Copy in file order for sequential reads
+                for trade_id, entry in sorted(snapshot, key=lambda kv: kv[1].offset):
+                    src.seek(entry.offset)
+                    data = src.read(entry.length)
+                    new_index[trade_id] = _Entry(
+                        dst.tell(), len(data), entry.status, entry.market_ts
+                    )
+                    dst.write(data)
+
+                with self._lock:
+                    # Records appended while copying
+                    appended, _ = self._scan(copied_to, self._size)
+                    for trade_id, entry in appended:
+                        src.seek(entry.offset)
+                        data = src.read(entry.length)
+                        new_index[trade_id] = _Entry(
+                            dst.tell(), len(data), entry.status, entry.market_ts
+                        )
+                        dst.write(data)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                    new_size = dst.tell()
+
+                    # Keep first-seen order from the live index
+                    ordered = {tid: new_index[tid] for tid in self._index}
+
+                    self._journal.close()
+                    self._index_file.close()
+                    self._reader.close()
+                    # Journal first: an old sidecar against the new journal
+                    # is detected as inconsistent and rebuilt on open
+                    os.replace(tmp_path, self.path)
+                    self._write_index_file(self.index_path, ordered.items())
+                    # Long-lived handles on the compacted files
+                    self._journal = open(self.path, "ab")  # noqa: SIM115 - long-lived
+                    self._index_file = open(  # noqa: SIM115 - long-lived
+                        self.index_path, "a", encoding="utf-8"
+                    )
+                    self._reader = open(self.path, "rb")  # noqa: SIM115 - long-lived
+
+                    dropped = self._dead
+                    self._index = ordered
+                    self._size = new_size
+                    self._dead = 0
+                    self.compactions += 1
+            print(f"[journal] Compacted {self.path}: dropped {dropped} stale record(s)")
+        except Exception as e:
+            print(f"[journal] Compaction failed: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        finally:
+            if claimed:
+                with self._lock:
+                    self._compacting = False
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def __contains__(self, trade_id: str) -> bool:
+        return trade_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def status(self, trade_id: str) -> str | None:
+        """Settlement status of a trade from the index (no disk read)."""
+        entry = self._index.get(trade_id)
+        return entry.status if entry else None
+
+    def get(self, trade_id: str) -> dict | None:
+        """Latest record for a trade."""
+        with self._lock:
+            entry = self._index.get(trade_id)
+            if entry is None:
+                return None
+            data = os.pread(self._reader.fileno(), entry.length, entry.offset)
+        return json.loads(data)
+
+    def ids(self, status: str | None = None) -> list[str]:
+        """Trade IDs in first-seen order, optionally filtered by status."""
+        with self._lock:
+            return [
+                tid
+                for tid, entry in self._index.items()
+                if status is None or entry.status == status
+            ]
+
+    def entries(
+        self, status: str | None = None, trade_ids: Iterable[str] | None = None
+    ) -> Iterator[dict]:
+        """Yield latest records in first-seen order.
+
+        Args:
+            status: Only trades whose settlement status matches
+            trade_ids: Only these trades (default all)
+        """
+        with self._lock:
+            if trade_ids is None:
+                selected = list(self._index.items())
+            else:
+                selected = [
+                    (tid, self._index[tid]) for tid in trade_ids if tid in self._index
+                ]
+            if status is not None:
+                selected = [(t, e) for t, e in selected if e.status == status]
+            fd = os.dup(self._reader.fileno())
+        try:
+            # The dup keeps reading the pre-compaction file if a swap happens
+            for _, entry in selected:
+                yield json.loads(os.pread(fd, entry.length, entry.offset))
+        finally:
+            os.close(fd)
+
+    def recent(
+        self,
+        limit: int | None = None,
+        strategy: str | None = None,
+        wallet: str | None = None,
+        status: str | None = None,
+    ) -> list[dict]:
+        """Last ``limit`` matching records, oldest first (all if None).
+
+        Status is filtered from the index; strategy/wallet need the record,
+        so records are read newest-first only until ``limit`` match.
+        """
+        ids = self.ids(status)
+        if not strategy and not wallet:
+            ids = ids[-limit:] if limit else ids
+            return list(self.entries(trade_ids=ids))
+
+        matched = []
+        for trade_id in reversed(ids):
+            record = self.get(trade_id)
+            if record is not None and record_matches(record, strategy, wallet):
+                matched.append(record)
+                if limit and len(matched) >= limit:
+                    break
+        matched.reverse()
+        return matched
+
+    def summary(self, strategy: str | None = None, wallet: str | None = None) -> dict:
+        """Aggregate statistics (reads every record; see TradeStore for SQL)."""
+        return summarize(
+            r for r in self.entries() if record_matches(r, strategy, wallet)
+        )
+
+    def sync(self):
+        """fsync the journal and its index."""
+        with self._lock:
+            self._require_writer()
+            os.fsync(self._journal.fileno())
+            os.fsync(self._index_file.fileno())
+
+    def close(self):
+        """Close file handles and release the writer lock."""
+        with self._lock:
+            for f in (self._journal, self._index_file, self._reader, self._lock_file):
+                if f is not None:
+                    f.close()
+            self._journal = self._index_file = self._reader = self._lock_file = None
+
+    @property
+    def stats(self) -> dict:
+        """Get journal statistics."""
+        with self._lock:
+            return {
+                "path": self.path,
+                "read_only": self.read_only,
+                "trades": len(self._index),
+                "stale_records": self._dead,
+                "bytes": self._size,
+                "appends": self.appends,
+                "compactions": self.compactions,
+            }
+
+
+_journals: dict[str, TradeJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(path: str | None = None) -> TradeJournal:
+    """Shared journal instance for a path (opened on first use)."""
+    path = os.path.abspath(path or Config.HISTORY_FILE)
+    with _journals_lock:
+        journal = _journals.get(path)
+        if journal is None:
+            journal = _journals[path] = TradeJournal(path)
+        return journal
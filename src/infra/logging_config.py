@@ -298,9 +298,15 @@ class StructuredLogger:
         bankroll: float,
         unrealized: float = 0,
         ws_connected: bool = False,
+        drawdown: float = 0,
+        losing_streak: int = 0,
         **kwargs,
     ):
-        """Log periodic heartbeat with status."""
+        """Log periodic heartbeat with status.
+
+        ``drawdown`` and ``losing_streak`` (lifetime, from the running
+        aggregates) are shown only when nonzero.
+        """
         ts = datetime.now(LOCAL_TZ).strftime("%H:%M:%S")
         ts_str = self._c(Colors.DIM, f"[{ts}]")
 
@@ -339,6 +345,11 @@ class StructuredLogger:
             unr_sign = "+" if unrealized > 0 else ""
             parts.append(self._c(unr_color, f"(EV:{unr_sign}${unrealized:.2f})"))
 
+        if drawdown > 0:
+            parts.append(self._c(Colors.DIM, f"DD:${drawdown:.2f}"))
+        if losing_streak > 0:
+            parts.append(self._c(Colors.DIM, f"L-streak:{losing_streak}"))
+
         line = " | ".join(parts)
         print(line)
 
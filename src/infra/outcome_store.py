@@ -0,0 +1,131 @@
+"""Append-only store of resolved BTC 5-min outcomes.
+
+Provides:
+- OutcomeStore: JSONL file with one ``{"ts", "outcome"}`` line per
+  resolved window, held in memory as ``ts -> outcome``. New outcomes are
+  visible immediately and written by the background ``PersistenceWriter``,
+  so recording one never blocks the caller on disk.
+
+Outcomes are final once a market resolves, so a window is written at most
+once and the file never needs compaction (about 10 KB per day).
+"""
+
+import json
+import os
+import threading
+from collections.abc import Iterable
+
+from src.config import Config
+from src.infra.persistence import get_writer
+
+
+class OutcomeStore:
+    """Window timestamp -> outcome ("up"/"down"), persisted as JSONL.
+
+    Usage:
+        store = get_outcome_store()
+        store.add(ts, "up")          # in memory now, on disk shortly after
+        store.get(ts)                # -> "up" | None
+        store.missing(windows)       # windows without an outcome
+    """
+
+    def __init__(self, path: str | None = None):
+        """Open (or create) the store and load it into memory.
+
+        Args:
+            path: JSONL file (default Config.OUTCOMES_FILE)
+        """
+        self.path = path or Config.OUTCOMES_FILE
+        self._lock = threading.Lock()
+        self._outcomes: dict[int, str] = {}
+        self._size = 0  # end of the last complete line
+        self._load()
+        # Long-lived handle, closed in close()
+        self._file = open(self.path, "ab")  # noqa: SIM115 - long-lived
+        if self._file.tell() > self._size:
+            self._file.truncate(self._size)  # drop a torn final line
+
+        # Statistics
+        self.loaded = len(self._outcomes)
+        self.added = 0
+
+    def _load(self):
+        """Read existing lines; a torn final line from a crash is skipped."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn final write; truncated on open
+                self._size += len(line)
+                try:
+                    record = json.loads(line)
+                    self._outcomes[int(record["ts"])] = record["outcome"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def add(self, timestamp: int, outcome: str) -> bool:
+        """Record a resolved window; returns False if it was already known."""
+        with self._lock:
+            if timestamp in self._outcomes:
+                return False
+            self._outcomes[timestamp] = outcome
+            self.added += 1
+        get_writer().submit_records(self, [{"ts": timestamp, "outcome": outcome}])
+        return True
+
+    def append_many(self, records: Iterable[dict]) -> int:
+        """Write records to the file (called on the writer thread)."""
+        count = 0
+        with self._lock:
+            for record in records:
+                line = json.dumps(record, separators=(",", ":")) + "\n"
+                self._file.write(line.encode("utf-8"))
+                count += 1
+            self._file.flush()
+        return count
+
+    def sync(self):
+        """fsync the file."""
+        with self._lock:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def get(self, timestamp: int) -> str | None:
+        return self._outcomes.get(timestamp)
+
+    def __contains__(self, timestamp: int) -> bool:
+        return timestamp in self._outcomes
+
+    def __len__(self) -> int:
+        return len(self._outcomes)
+
+    def missing(self, windows: Iterable[int]) -> list[int]:
+        """Windows (in the given order) that have no outcome yet."""
+        return [ts for ts in windows if ts not in self._outcomes]
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "outcomes": len(self._outcomes),
+            "loaded": self.loaded,
+            "added": self.added,
+        }
+
+
+_stores: dict[str, OutcomeStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_outcome_store(path: str | None = None) -> OutcomeStore:
+    """Shared store instance for a path (opened on first use)."""
+    path = os.path.abspath(path or Config.OUTCOMES_FILE)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = OutcomeStore(path)
+        return store
@@ -0,0 +1,249 @@
+"""Background persistence off the trading loop.
+
+Provides:
+- PersistenceWriter: Thread that takes state snapshots and journal records
+  from a queue, batches them, and writes atomically, so ``state.save()``
+  costs the caller only an enqueue
+- atomic_write_json: temp file + fsync + rename (+ directory fsync)
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+_FLUSH = object()
+_STOP = object()
+
+
+def atomic_write_json(path: str, data: Any, indent: int | None = 2):
+    """Write JSON so readers see either the old file or the complete new one."""
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # platforms without directory fds (Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class PersistenceWriter:
+    """Single writer thread for working state and the trade journal.
+
+    Jobs are keyed files: for a state file only the newest snapshot in a
+    batch is written; journal records from all queued jobs are appended
+    in one call. A snapshot is built by a callable on the writer thread,
+    so the producer only hands over immutable copies.
+
+    Usage:
+        writer = get_writer()
+        writer.submit_state(path, build_snapshot)   # build_snapshot() -> dict
+        writer.submit_records(journal, records, on_error=requeue)
+        ...
+        writer.flush()  # before exit / exec
+    """
+
+    def __init__(self, max_batch: int = 256, name: str = "persist"):
+        """Initialize writer.
+
+        Args:
+            max_batch: Maximum jobs drained into one batch
+            name: Thread name and log tag
+        """
+        self.max_batch = max_batch
+        self.name = name
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._write_ms: deque = deque(maxlen=200)
+        self._atexit_registered = False
+
+        # Statistics
+        self.jobs = 0
+        self.batches = 0
+        self.state_writes = 0
+        self.snapshots_coalesced = 0
+        self.records_written = 0
+        self.states_skipped = 0
+        self.errors = 0
+
+    def start(self):
+        """Start the writer thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                # Daemon thread: make sure queued writes land on normal exit
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+    def submit_state(self, path: str, build: Callable[[], Any]):
+        """Queue a state file write; ``build`` runs on the writer thread."""
+        self.start()
+        self.jobs += 1
+        self._queue.put(("state", path, build))
+
+    def submit_records(
+        self,
+        journal,
+        records: list,
+        on_error: Callable[[list], None] | None = None,
+    ):
+        """Queue records for ``journal.append_many``.
+
+        Items may be dicts or objects with ``to_json_dict()`` (serialized on
+        the writer thread). If the write fails, ``on_error(records)`` is
+        called on the writer thread so the producer can queue them again.
+        """
+        if not records:
+            return
+        self.start()
+        self.jobs += 1
+        self._queue.put(("records", journal, (records, on_error)))
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything queued so far is on disk.
+
+        Returns:
+            False if the writer didn't finish within ``timeout``
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done, None))
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """Flush and stop the writer thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put((_STOP, None, None))
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        """Writer loop: drain a batch, coalesce, write."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            waiters = []
+            states: dict[str, Callable] = {}
+            records: dict[int, tuple[Any, list, list]] = {}
+            for kind, target, payload in batch:
+                if kind is _FLUSH:
+                    waiters.append(target)
+                elif kind is _STOP:
+                    stop = True
+                elif kind == "state":
+                    if target in states:
+                        self.snapshots_coalesced += 1
+                    states[target] = payload
+                else:
+                    items, on_error = payload
+                    _, queued, callbacks = records.setdefault(
+                        id(target), (target, [], [])
+                    )
+                    queued.extend(items)
+                    if on_error is not None:
+                        callbacks.append((on_error, items))
+
+            start = time.perf_counter()
+            # Journal first, so a state file never references unsaved trades
+            journal_failed = False
+            for journal, items, callbacks in records.values():
+                try:
+                    journal.append_many(
+                        r if isinstance(r, dict) else r.to_json_dict() for r in items
+                    )
+                    journal.sync()
+                    self.records_written += len(items)
+                except Exception as e:
+                    journal_failed = True
+                    self.errors += 1
+                    print(f"[{self.name}] Journal write failed: {e}")
+                    for on_error, failed in callbacks:
+                        try:
+                            on_error(failed)
+                        except Exception as cb_error:
+                            print(f"[{self.name}] on_error callback failed: {cb_error}")
+            if journal_failed and states:
+                # The next save() re-queues the records with a fresh snapshot
+                self.states_skipped += len(states)
+                print(
+                    f"[{self.name}] Skipping {len(states)} state write(s) after "
+                    "the journal write failed"
+                )
+                states = {}
+            for path, build in states.items():
+                try:
+                    atomic_write_json(path, build())
+                    self.state_writes += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f"[{self.name}] State write failed ({path}): {e}")
+            if states or records:
+                self.batches += 1
+                self._write_ms.append((time.perf_counter() - start) * 1000)
+
+            for done in waiters:
+                done.set()
+            if stop:
+                return
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for the writer."""
+        return self._queue.qsize()
+
+    @property
+    def stats(self) -> dict:
+        """Get writer statistics."""
+        write_ms = list(self._write_ms)
+        return {
+            "queue_depth": self.queue_depth,
+            "jobs": self.jobs,
+            "batches": self.batches,
+            "state_writes": self.state_writes,
+            "snapshots_coalesced": self.snapshots_coalesced,
+            "records_written": self.records_written,
+            "states_skipped": self.states_skipped,
+            "errors": self.errors,
+            "write_ms_avg": round(sum(write_ms) / len(write_ms), 2)
+            if write_ms
+            else None,
+        }
+
+
+_writer: PersistenceWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> PersistenceWriter:
+    """Return the process-wide writer."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PersistenceWriter()
+        return _writer
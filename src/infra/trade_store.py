@@ -0,0 +1,580 @@
+"""SQLite trade history store (optional backend).
+
+Provides:
+- TradeStore: Nested trade records (``Trade.to_nested_json``) normalized
+  into SQLite tables, with the same write/read interface as TradeJournal
+  so ``TradingState`` can use either, plus ``summary()`` / ``recent()``
+  queries that run as indexed SQL instead of scanning every record
+- get_history_store: The backend selected by ``Config.HISTORY_BACKEND``
+  ("journal" by default, "sqlite" for this store)
+
+Schema:
+    trades         one row per trade: market, position, execution, fees,
+                   settlement and context columns
+    copytrades     copied wallet details for copytrade trades (1:0..1)
+    trade_records  the full nested record per trade, so session/timing/
+                   on-chain fields round-trip as-is
+
+Indexes cover market timestamp, strategy, settlement status and copied
+wallet, the columns the history CLI and analysis scripts filter on.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+
+from src.config import Config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    seq                 INTEGER PRIMARY KEY,  -- first-seen order
+    id                  TEXT NOT NULL UNIQUE,
+    -- market
+    market_ts           INTEGER,
+    slug                TEXT,
+    window_close        INTEGER,
+    volume              REAL,
+    -- position
+    direction           TEXT,
+    amount              REAL,
+    requested_amount    REAL,
+    shares              REAL,
+    -- execution
+    executed_at         INTEGER,
+    entry_price         REAL,
+    fill_price          REAL,
+    spread              REAL,
+    slippage_pct        REAL,
+    fill_pct            REAL,
+    best_bid            REAL,
+    best_ask            REAL,
+    price_movement_pct  REAL,
+    confirm_latency_ms  REAL,
+    -- fees
+    fee_rate_bps        REAL,
+    fee_pct             REAL,
+    -- settlement
+    status              TEXT NOT NULL DEFAULT 'pending',
+    outcome             TEXT,
+    won                 INTEGER,
+    settled_at          INTEGER,
+    resolution_delay_sec REAL,
+    price_at_close      REAL,
+    gross_payout        REAL,
+    gross_profit        REAL,
+    fee_amount          REAL,
+    net_profit          REAL,
+    force_exit_reason   TEXT,
+    -- context
+    strategy            TEXT,
+    mode                TEXT
+);
+-- Full nested record, kept apart so aggregate scans read narrow rows
+CREATE TABLE IF NOT EXISTS trade_records (
+    id                  TEXT PRIMARY KEY REFERENCES trades(id),
+    record              TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS copytrades (
+    trade_id            TEXT PRIMARY KEY REFERENCES trades(id),
+    wallet              TEXT NOT NULL,  -- lowercased
+    name                TEXT,
+    direction           TEXT,
+    amount              REAL,
+    price               REAL,
+    timestamp           INTEGER,
+    delay_ms            REAL,
+    delay_impact_pct    REAL
+);
+CREATE INDEX IF NOT EXISTS idx_trades_market_ts ON trades(market_ts);
+CREATE INDEX IF NOT EXISTS idx_trades_strategy ON trades(strategy);
+CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status);
+CREATE INDEX IF NOT EXISTS idx_copytrades_wallet ON copytrades(wallet);
+"""
+
+_TRADE_COLUMNS = (
+    "id",
+    "market_ts",
+    "slug",
+    "window_close",
+    "volume",
+    "direction",
+    "amount",
+    "requested_amount",
+    "shares",
+    "executed_at",
+    "entry_price",
+    "fill_price",
+    "spread",
+    "slippage_pct",
+    "fill_pct",
+    "best_bid",
+    "best_ask",
+    "price_movement_pct",
+    "confirm_latency_ms",
+    "fee_rate_bps",
+    "fee_pct",
+    "status",
+    "outcome",
+    "won",
+    "settled_at",
+    "resolution_delay_sec",
+    "price_at_close",
+    "gross_payout",
+    "gross_profit",
+    "fee_amount",
+    "net_profit",
+    "force_exit_reason",
+    "strategy",
+    "mode",
+)
+
+_COPYTRADE_COLUMNS = (
+    "trade_id",
+    "wallet",
+    "name",
+    "direction",
+    "amount",
+    "price",
+    "timestamp",
+    "delay_ms",
+    "delay_impact_pct",
+)
+
+# Latest record per trade wins (same rule as the journal); seq is kept
+_UPSERT_TRADE = (
+    f"INSERT INTO trades ({', '.join(_TRADE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_TRADE_COLUMNS))}) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in _TRADE_COLUMNS[1:])
+)
+_UPSERT_RECORD = "INSERT OR REPLACE INTO trade_records (id, record) VALUES (?, ?)"
+_UPSERT_COPYTRADE = (
+    f"INSERT OR REPLACE INTO copytrades ({', '.join(_COPYTRADE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_COPYTRADE_COLUMNS))})"
+)
+
+# Settled = has an outcome, as in TradingState.get_statistics
+_SETTLED = "(t.outcome IS NOT NULL AND t.outcome != '')"
+_WIN = f"({_SETTLED} AND t.won = 1)"
+_LOSS = f"({_SETTLED} AND t.won IS NOT 1)"
+
+_SUMMARY_SQL = f"""
+SELECT
+    COUNT(*),
+    TOTAL({_SETTLED}),
+    TOTAL({_WIN}),
+    TOTAL({_LOSS}),
+    TOTAL(CASE WHEN {_SETTLED} THEN t.net_profit END),
+    TOTAL(CASE WHEN {_SETTLED} THEN t.fee_amount END),
+    TOTAL(CASE WHEN {_SETTLED} THEN t.gross_profit END),
+    AVG(CASE WHEN {_WIN} THEN t.net_profit END),
+    AVG(CASE WHEN {_LOSS} THEN t.net_profit END),
+    MAX(CASE WHEN {_WIN} THEN t.net_profit END),
+    MIN(CASE WHEN {_LOSS} THEN t.net_profit END),
+    TOTAL(CASE WHEN {_SETTLED} THEN t.slippage_pct END),
+    TOTAL(CASE WHEN {_SETTLED} THEN t.fee_pct END),
+    TOTAL(CASE WHEN {_SETTLED} THEN c.delay_impact_pct END)
+FROM trades t
+"""
+
+_RECORD_JOIN = " JOIN trade_records r ON r.id = t.id"
+
+_BATCH = 10_000  # rows per executemany during imports
+
+
+def _trade_row(record: dict) -> tuple | None:
+    """Flatten a nested record into a ``trades`` row (None if it has no ID)."""
+    trade_id = record.get("id")
+    if not trade_id:
+        return None
+    market = record.get("market") or {}
+    position = record.get("position") or {}
+    execution = record.get("execution") or {}
+    fees = record.get("fees") or {}
+    settlement = record.get("settlement") or {}
+    context = record.get("context") or {}
+    won = settlement.get("won")
+    return (
+        trade_id,
+        market.get("timestamp"),
+        market.get("slug"),
+        market.get("window_close"),
+        market.get("volume"),
+        position.get("direction"),
+        position.get("amount"),
+        position.get("requested_amount"),
+        position.get("shares"),
+        execution.get("timestamp"),
+        execution.get("entry_price"),
+        execution.get("fill_price"),
+        execution.get("spread"),
+        execution.get("slippage_pct"),
+        execution.get("fill_pct"),
+        execution.get("best_bid"),
+        execution.get("best_ask"),
+        execution.get("price_movement_pct"),
+        execution.get("confirm_latency_ms"),
+        fees.get("rate_bps"),
+        fees.get("pct"),
+        settlement.get("status") or "pending",
+        settlement.get("outcome"),
+        None if won is None else int(bool(won)),
+        settlement.get("timestamp"),
+        settlement.get("resolution_delay_sec"),
+        settlement.get("price_at_close"),
+        settlement.get("gross_payout"),
+        settlement.get("gross_profit"),
+        settlement.get("fee_amount"),
+        settlement.get("net_profit"),
+        settlement.get("force_exit_reason"),
+        context.get("strategy"),
+        context.get("mode"),
+    )
+
+
+def _copytrade_row(record: dict) -> tuple | None:
+    """Flatten the copytrade section into a ``copytrades`` row, if present."""
+    copy = record.get("copytrade")
+    if not copy or not copy.get("wallet") or not record.get("id"):
+        return None
+    return (
+        record["id"],
+        copy["wallet"].lower(),
+        copy.get("name"),
+        copy.get("direction"),
+        copy.get("amount"),
+        copy.get("price"),
+        copy.get("timestamp"),
+        copy.get("delay_ms"),
+        copy.get("delay_impact_pct"),
+    )
+
+
+def _where(
+    strategy: str | None = None,
+    wallet: str | None = None,
+    status: str | None = None,
+) -> tuple[str, list]:
+    """WHERE clause + params for the history filters (aliases t / c)."""
+    clauses, params = [], []
+    if strategy:
+        clauses.append("t.strategy = ?")
+        params.append(strategy)
+    if wallet:
+        clauses.append("c.wallet = ?")
+        params.append(wallet.lower())
+    if status:
+        clauses.append("t.status = ?")
+        params.append(status)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class TradeStore:
+    """SQLite-backed trade history with TradeJournal's interface.
+
+    One connection is shared behind a lock (writes come from the
+    persistence thread, queries from the caller); ``entries()`` streams
+    through its own read connection so a long export doesn't block saves.
+
+    Usage:
+        store = get_history_store()          # with HISTORY_BACKEND=sqlite
+        store.append_many(records)
+        store.summary(strategy="copytrade")  # one aggregate query
+        store.recent(20, wallet="0xabc...")  # indexed, newest 20
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        import_paths: Iterable[str] | None = None,
+    ):
+        """Open (or create) a store.
+
+        Args:
+            path: Database file (defaults to Config.TRADE_DB_FILE)
+            import_paths: History files imported once when the database is
+                created: the first that exists of these (defaults to
+                Config.HISTORY_FILE, then Config.LEGACY_HISTORY_FILE)
+        """
+        self.path = path or Config.TRADE_DB_FILE
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.appends = 0
+        self.imported = 0
+
+        created = not os.path.exists(self.path)
+        self._conn = self._connect()
+        self._conn.executescript(_SCHEMA)
+
+        if created:
+            if import_paths is None:
+                import_paths = (Config.HISTORY_FILE, Config.LEGACY_HISTORY_FILE)
+            for source in import_paths:
+                if source and os.path.exists(source):
+                    self.import_file(source)
+                    break
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, record: dict) -> str:
+        """Insert or replace one trade record. Returns its ID."""
+        self.append_many([record])
+        return record.get("id", "")
+
+    def append_many(self, records: Iterable[dict]) -> int:
+        """Upsert records in one transaction per batch. Returns the count."""
+        count = 0
+        trades, raw, copies = [], [], []
+        for record in records:
+            row = _trade_row(record)
+            if row is None:
+                continue
+            trades.append(row)
+            raw.append((row[0], json.dumps(record, separators=(",", ":"))))
+            copy_row = _copytrade_row(record)
+            if copy_row is not None:
+                copies.append(copy_row)
+            if len(trades) >= _BATCH:
+                count += self._write(trades, raw, copies)
+                trades, raw, copies = [], [], []
+        if trades:
+            count += self._write(trades, raw, copies)
+        return count
+
+    def _write(self, trades: list[tuple], raw: list[tuple], copies: list[tuple]) -> int:
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_TRADE, trades)
+            self._conn.executemany(_UPSERT_RECORD, raw)
+            if copies:
+                self._conn.executemany(_UPSERT_COPYTRADE, copies)
+        self.appends += len(trades)
+        return len(trades)
+
+    def import_file(self, path: str) -> int:
+        """One-pass import of a JSONL journal or a JSON-array history file.
+
+        Records are upserted in batches as they're parsed, so a journal's
+        later settlement records overwrite its earlier pending ones.
+        """
+        try:
+            count = self.append_many(iter_history_file(path))
+        except Exception as e:
+            print(f"[trade_store] Could not import {path}: {e}")
+            return 0
+        self.imported += count
+        print(f"[trade_store] Imported {count} record(s) from {path} into {self.path}")
+        return count
+
+    def sync(self):
+        """Commits are synchronous (WAL, synchronous=FULL); nothing to do."""
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def __contains__(self, trade_id: str) -> bool:
+        return self.status(trade_id) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+
+    def status(self, trade_id: str) -> str | None:
+        """Settlement status of a trade (primary-key lookup)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM trades WHERE id = ?", (trade_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, trade_id: str) -> dict | None:
+        """Latest record for a trade."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM trade_records WHERE id = ?", (trade_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def ids(self, status: str | None = None) -> list[str]:
+        """Trade IDs in first-seen order, optionally filtered by status."""
+        where, params = _where(status=status)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT t.id FROM trades t{where} ORDER BY t.seq", params
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def entries(
+        self, status: str | None = None, trade_ids: Iterable[str] | None = None
+    ) -> Iterator[dict]:
+        """Yield latest records in first-seen order.
+
+        Args:
+            status: Only trades whose settlement status matches
+            trade_ids: Only these trades (default all)
+        """
+        if trade_ids is not None:
+            for trade_id in trade_ids:
+                record = self.get(trade_id)
+                if record is not None and (
+                    status is None
+                    or (record.get("settlement") or {}).get("status") == status
+                ):
+                    yield record
+            return
+
+        where, params = _where(status=status)
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"SELECT r.record FROM trades t{_RECORD_JOIN}{where} ORDER BY t.seq",
+                params,
+            )
+            for (record,) in cursor:
+                yield json.loads(record)
+        finally:
+            conn.close()
+
+    def recent(
+        self,
+        limit: int | None = None,
+        strategy: str | None = None,
+        wallet: str | None = None,
+        status: str | None = None,
+    ) -> list[dict]:
+        """Last ``limit`` matching records, oldest first (all if None)."""
+        where, params = _where(strategy, wallet, status)
+        join = " JOIN copytrades c ON c.trade_id = t.id" if wallet else ""
+        sql = (
+            f"SELECT r.record FROM trades t{_RECORD_JOIN}{join}{where} "
+            "ORDER BY t.seq DESC"
+        )
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(r[0]) for r in reversed(rows)]
+
+    def summary(self, strategy: str | None = None, wallet: str | None = None) -> dict:
+        """Aggregate statistics in one query (same keys as journal.summarize)."""
+        where, params = _where(strategy, wallet)
+        join = (
+            " JOIN copytrades c ON c.trade_id = t.id"
+            if wallet
+            else " LEFT JOIN copytrades c ON c.trade_id = t.id"
+        )
+        with self._lock:
+            row = self._conn.execute(_SUMMARY_SQL + join + where, params).fetchone()
+        (
+            total,
+            settled,
+            wins,
+            losses,
+            realized,
+            fees,
+            gross,
+            avg_win,
+            avg_loss,
+            largest_win,
+            largest_loss,
+            slippage,
+            fee_pct,
+            delay,
+        ) = row
+        settled, wins, losses = int(settled), int(wins), int(losses)
+        return {
+            "total_trades": total,
+            "settled_trades": settled,
+            "pending_trades": total - settled,
+            "wins": wins,
+            "losses": losses,
+            "win_rate": wins / settled * 100 if settled else 0,
+            "realized_pnl": realized,
+            "total_fees_paid": fees,
+            "total_gross_profit": gross,
+            "avg_win": avg_win or 0,
+            "avg_loss": avg_loss or 0,
+            "largest_win": largest_win or 0,
+            "largest_loss": largest_loss or 0,
+            "avg_slippage_pct": slippage / settled if settled else 0,
+            "avg_fee_pct": fee_pct / settled * 100 if settled else 0,
+            "avg_delay_impact_pct": delay / settled if settled else 0,
+        }
+
+    @property
+    def stats(self) -> dict:
+        """Get store statistics."""
+        return {
+            "path": self.path,
+            "trades": len(self),
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "appends": self.appends,
+            "imported": self.imported,
+        }
+
+
+def iter_history_file(path: str) -> Iterator[dict]:
+    """Nested records from a JSONL journal or a JSON-array history file.
+
+    JSONL is streamed line by line; a torn or blank line is skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        if f.read(1) == "[":
+            f.seek(0)
+            yield from (r for r in json.load(f) if isinstance(r, dict))
+            return
+        f.seek(0)
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+_stores: dict[str, TradeStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_trade_store(path: str | None = None) -> TradeStore:
+    """Shared store instance for a database path (opened on first use)."""
+    path = os.path.abspath(path or Config.TRADE_DB_FILE)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = TradeStore(path)
+        return store
+
+
+def get_history_store():
+    """Trade history backend chosen by ``Config.HISTORY_BACKEND``.
+
+    Returns:
+        TradeStore for "sqlite", else the shared TradeJournal
+    """
+    if Config.HISTORY_BACKEND == "sqlite":
+        return get_trade_store()
+    from src.infra.journal import get_journal
+
+    return get_journal()
@@ -0,0 +1,211 @@
+"""Vectorized streak-reversal backtest.
+
+Run lengths are computed once for the whole outcome series; every
+(trigger, fee, sizing) combination is then evaluated with array
+operations over all windows at once, so a sweep costs a few cumulative
+sums instead of one Python loop per configuration.
+
+A bet is placed on window ``i`` when the run ending at ``i - 1`` is at
+least ``trigger`` long, on the opposite side of that run, at ``price``.
+A win pays ``(1 / price - 1) * (1 - fee)`` per dollar staked, a loss
+costs the stake. At the default price of 0.50 this is the
+``bet * (1 - fee)`` / ``-bet`` payoff of the original loop.
+
+Sizing:
+- flat: ``amount`` per bet; PnL is a cumulative sum
+- Kelly: ``fraction`` of the full Kelly stake for the streak's
+  ``REVERSAL_RATES`` confidence (as ``streak.kelly_size``, without its
+  rounding), re-sized from the current bankroll every bet; the equity
+  curve is a cumulative product
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.strategies.streak import REVERSAL_RATES
+
+
+def run_lengths(outcomes: np.ndarray) -> np.ndarray:
+    """Length of the run of equal outcomes ending at each index."""
+    n = len(outcomes)
+    idx = np.arange(n)
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = outcomes[1:] != outcomes[:-1]
+    run_start = np.maximum.accumulate(np.where(starts, idx, 0))
+    return idx - run_start + 1
+
+
+def streak_table(outcomes: np.ndarray, max_len: int = 10) -> list[dict]:
+    """Reversal rates after streaks of each length.
+
+    ``exact`` counts windows preceded by a run of exactly ``length``
+    (the original per-length breakdown); ``at_least`` counts runs of
+    ``length`` or more, which is what a trigger of ``length`` bets on.
+    """
+    runs = run_lengths(outcomes)[:-1]
+    reversed_ = outcomes[1:] != outcomes[:-1]
+    capped = np.minimum(runs, max_len + 1)
+    exact = np.bincount(capped, minlength=max_len + 2)
+    exact_rev = np.bincount(capped, weights=reversed_, minlength=max_len + 2)
+    # Suffix sums: runs >= length (including those beyond max_len)
+    at_least = np.cumsum(exact[::-1])[::-1]
+    at_least_rev = np.cumsum(exact_rev[::-1])[::-1]
+
+    rows = []
+    for length in range(1, max_len + 1):
+        rows.append(
+            {
+                "length": length,
+                "exact": int(exact[length]),
+                "exact_reversal": exact_rev[length] / exact[length]
+                if exact[length]
+                else None,
+                "at_least": int(at_least[length]),
+                "at_least_reversal": at_least_rev[length] / at_least[length]
+                if at_least[length]
+                else None,
+            }
+        )
+    return rows
+
+
+@dataclass
+class SweepResult:
+    """Summary rows and equity curves of a sweep (row ``k`` <-> curve ``k``)."""
+
+    rows: list[dict]
+    equity: np.ndarray  # (configs, windows) bankroll after each window
+
+    def best(self, key: str = "pnl", n: int = 5) -> list[dict]:
+        return sorted(self.rows, key=lambda r: r[key], reverse=True)[:n]
+
+
+def _drawdowns(equity: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Max drawdown in dollars and as a fraction of the running peak."""
+    peaks = np.maximum.accumulate(equity, axis=-1)
+    drop = peaks - equity
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(peaks > 0, drop / peaks, 0.0)
+    return drop.max(axis=-1), pct.max(axis=-1)
+
+
+def sweep(
+    outcomes: np.ndarray,
+    triggers=(3, 4, 5),
+    amounts=(10.0,),
+    fees=(0.05,),
+    kelly_fractions=(),
+    bankroll: float = 1000.0,
+    price: float = 0.5,
+) -> SweepResult:
+    """Backtest every (trigger, fee, sizing) combination in one pass.
+
+    Args:
+        outcomes: 1 = up, 0 = down, in window order
+        triggers: Minimum streak lengths to bet on
+        amounts: Flat bet sizes (one config each)
+        fees: Fee on winnings as decimals (0.05 = 5%)
+        kelly_fractions: Kelly fractions (one config each; 1.0 = full)
+        bankroll: Starting bankroll
+        price: Entry price of the bet side
+
+    Returns:
+        SweepResult with one row and one equity curve per configuration
+        (no rows for an empty series)
+    """
+    outcomes = np.asarray(outcomes, dtype=np.int8)
+    if not len(outcomes):
+        return SweepResult(rows=[], equity=np.empty((0, 0)))
+    triggers = np.asarray(triggers, dtype=np.int64)
+    fees = np.asarray(fees, dtype=np.float64)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    fractions = np.asarray(kelly_fractions, dtype=np.float64)
+    n = len(outcomes)
+
+    # Per window (from index 1): streak before it, and whether it reversed
+    runs = np.zeros(n, dtype=np.int64)
+    runs[1:] = run_lengths(outcomes)[:-1]
+    won = np.zeros(n, dtype=bool)
+    won[1:] = outcomes[1:] != outcomes[:-1]
+
+    # (T, N) bet mask and (F, N) unit returns -> (T, F, N) per-dollar PnL
+    bets = runs[None, :] >= triggers[:, None]
+    win_return = (1 / price - 1) * (1 - fees)
+    unit = np.where(won[None, :], win_return[:, None], -1.0)
+    unit_pnl = np.where(bets[:, None, :], unit[None, :, :], 0.0)
+
+    wins = (bets & won[None, :]).sum(axis=1)
+    counts = bets.sum(axis=1)
+
+    rows: list[dict] = []
+    curves: list[np.ndarray] = []
+
+    # Flat sizing: one cumulative sum per (trigger, fee), scaled per amount
+    if len(amounts):
+        unit_curve = np.cumsum(unit_pnl, axis=-1)
+        flat = bankroll + amounts[None, None, :, None] * unit_curve[:, :, None, :]
+        dd, dd_pct = _drawdowns(flat)
+        for t, trigger in enumerate(triggers):
+            for f, fee in enumerate(fees):
+                for a, amount in enumerate(amounts):
+                    staked = amount * counts[t]
+                    pnl = flat[t, f, a, -1] - bankroll
+                    rows.append(
+                        {
+                            "trigger": int(trigger),
+                            "fee": float(fee),
+                            "sizing": f"flat ${amount:g}",
+                            "bets": int(counts[t]),
+                            "wins": int(wins[t]),
+                            "win_rate": wins[t] / counts[t] if counts[t] else 0.0,
+                            "pnl": float(pnl),
+                            "roi": pnl / staked if staked else 0.0,
+                            "final_bankroll": float(flat[t, f, a, -1]),
+                            "max_drawdown": float(dd[t, f, a]),
+                            "max_drawdown_pct": float(dd_pct[t, f, a]),
+                        }
+                    )
+                    curves.append(flat[t, f, a])
+
+    # Kelly sizing: stake fraction depends on the streak's confidence
+    if len(fractions):
+        table = np.array(
+            [REVERSAL_RATES.get(min(k, 5), 0.5) for k in range(6)], dtype=np.float64
+        )
+        confidence = table[np.minimum(runs, 5)]
+        b = 1 / price - 1
+        full_kelly = np.clip((b * confidence - (1 - confidence)) / b, 0.0, None)
+        stake = fractions[:, None] * full_kelly[None, :]  # (K, N)
+        growth = 1 + stake[None, None, :, :] * unit_pnl[:, :, None, :]
+        with np.errstate(divide="ignore"):
+            log_equity = np.cumsum(np.log(np.clip(growth, 0.0, None)), axis=-1)
+        kelly = bankroll * np.exp(log_equity)
+        dd, dd_pct = _drawdowns(kelly)
+        for t, trigger in enumerate(triggers):
+            for f, fee in enumerate(fees):
+                for k, fraction in enumerate(fractions):
+                    final = kelly[t, f, k, -1]
+                    rows.append(
+                        {
+                            "trigger": int(trigger),
+                            "fee": float(fee),
+                            "sizing": f"kelly x{fraction:g}",
+                            "bets": int(counts[t]),
+                            "wins": int(wins[t]),
+                            "win_rate": wins[t] / counts[t] if counts[t] else 0.0,
+                            "pnl": float(final - bankroll),
+                            "roi": float(final / bankroll - 1),
+                            "final_bankroll": float(final),
+                            "max_drawdown": float(dd[t, f, k]),
+                            "max_drawdown_pct": float(dd_pct[t, f, k]),
+                            "log_growth_per_bet": float(log_equity[t, f, k, -1])
+                            / counts[t]
+                            if counts[t]
+                            else 0.0,
+                        }
+                    )
+                    curves.append(kelly[t, f, k])
+
+    equity = np.stack(curves) if curves else np.empty((0, n))
+    return SweepResult(rows=rows, equity=equity)
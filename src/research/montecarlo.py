@@ -0,0 +1,291 @@
+"""Monte Carlo bankroll simulation from empirical trade outcomes.
+
+Each path bets ``bets`` times; every bet resamples a settled trade from
+history (bootstrap) and applies its per-dollar return to the stake. All
+paths advance together as NumPy arrays, so the cost is one vector step
+per bet regardless of the number of paths.
+
+Sizing (``Sizing.mode``):
+- flat: ``amount`` per bet
+- kelly: ``kelly_size`` of the sampled trade's confidence and entry odds
+  at ``fraction`` (1.0 = full Kelly), capped at ``amount`` when set,
+  floored at ``MIN_BET`` as ``bot.py`` does
+- martingale: ``amount`` doubled (``multiplier``) after each loss, reset
+  after a win or after ``max_levels`` consecutive losses
+
+Limits follow ``TradingState.can_trade``: at most ``MAX_DAILY_BETS`` bets
+per day, no more bets that day once the daily loss reaches
+``MAX_DAILY_LOSS``, and a path is ruined when the bankroll falls below
+``MIN_BET``. Stakes never exceed the bankroll.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.config import Config
+
+
+@dataclass
+class Outcomes:
+    """Empirical per-trade outcomes to resample from."""
+
+    returns: np.ndarray  # PnL per dollar staked (-1.0 on a loss)
+    won: np.ndarray  # bool
+    full_kelly: np.ndarray  # Kelly fraction for the trade's confidence/odds
+    trades_per_day: float
+
+    @property
+    def win_rate(self) -> float:
+        return float(self.won.mean()) if len(self.won) else 0.0
+
+    @property
+    def edge(self) -> float:
+        """Mean PnL per dollar staked."""
+        return float(self.returns.mean()) if len(self.returns) else 0.0
+
+
+def full_kelly(confidence: np.ndarray, entry_price: np.ndarray) -> np.ndarray:
+    """``kelly_size``'s Kelly fraction per trade (0 where it would bet nothing)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        odds = np.where(entry_price > 0, 1 / entry_price, 0.0)
+        b = odds - 1
+        kelly = np.where(b > 0, (b * confidence - (1 - confidence)) / b, 0.0)
+    return np.where((confidence > 0) & (odds > 1) & (kelly > 0), kelly, 0.0)
+
+
+def outcomes_from_trades(trades) -> Outcomes:
+    """Empirical outcomes from settled ``Trade`` objects.
+
+    Trades without a recorded signal confidence use the observed win rate
+    as their Kelly estimate.
+    """
+    settled = [t for t in trades if t.outcome is not None and t.amount > 0]
+    won = np.array([bool(t.won) for t in settled], dtype=bool)
+    returns = np.array([t.pnl / t.amount for t in settled], dtype=np.float64)
+    win_rate = won.mean() if len(won) else 0.0
+    confidence = np.array(
+        [t.confidence if t.confidence > 0 else win_rate for t in settled],
+        dtype=np.float64,
+    )
+    price = np.array(
+        [t.execution_price or t.entry_price for t in settled], dtype=np.float64
+    )
+
+    days = {t.timestamp // 86400 for t in settled}
+    return Outcomes(
+        returns=returns,
+        won=won,
+        full_kelly=full_kelly(confidence, price),
+        trades_per_day=len(settled) / len(days) if days else 0.0,
+    )
+
+
+def synthetic_outcomes(
+    win_rate: float,
+    price: float = 0.5,
+    fee_bps: int = 1000,
+    confidence: float | None = None,
+    resolution: int = 1000,
+) -> Outcomes:
+    """Win/loss outcomes at a fixed entry price (when there is no history).
+
+    The pair is repeated so that uniform resampling wins ``win_rate`` of
+    the time (to ``1 / resolution``).
+    """
+    fee = price * (1 - price) * fee_bps / 10000
+    wins = round(win_rate * resolution)
+    won = np.arange(resolution) < wins
+    confidence = win_rate if confidence is None else confidence
+    return Outcomes(
+        returns=np.where(won, (1 / price - 1) * (1 - fee), -1.0),
+        won=won,
+        full_kelly=full_kelly(
+            np.full(resolution, confidence), np.full(resolution, price)
+        ),
+        trades_per_day=0.0,
+    )
+
+
+@dataclass
+class Sizing:
+    """Bet sizing rule; see the module docstring."""
+
+    mode: str = "flat"  # flat | kelly | martingale
+    amount: float | None = None  # flat bet / martingale base / Kelly cap
+    fraction: float = 0.25  # Kelly fraction
+    multiplier: float = 2.0  # martingale
+    max_levels: int = 6  # martingale losses before reset
+
+    @property
+    def label(self) -> str:
+        if self.mode == "kelly":
+            cap = f" cap ${self.amount:g}" if self.amount else ""
+            return f"kelly x{self.fraction:g}{cap}"
+        if self.mode == "martingale":
+            return f"martingale ${self.amount:g} x{self.multiplier:g}/{self.max_levels}"
+        return f"flat ${self.amount:g}"
+
+
+def simulate(
+    outcomes: Outcomes,
+    sizing: Sizing,
+    bankroll: float = 100.0,
+    bets: int = 1000,
+    paths: int = 100_000,
+    bets_per_day: int | None = None,
+    min_bet: float | None = None,
+    max_daily_bets: int | None = None,
+    max_daily_loss: float | None = None,
+    seed: int | None = None,
+    chunk: int = 64,
+) -> dict:
+    """Simulate ``paths`` bankrolls over ``bets`` bet opportunities.
+
+    Args:
+        outcomes: Empirical outcomes to resample
+        sizing: Bet sizing rule
+        bankroll: Starting bankroll
+        bets: Bet opportunities per path
+        paths: Number of paths
+        bets_per_day: Opportunities per day (default: the history's rate),
+            capped at ``max_daily_bets``
+        min_bet / max_daily_bets / max_daily_loss: Limits (default Config)
+        seed: RNG seed
+        chunk: Bets whose samples are drawn at once
+
+    Returns:
+        Dict with ruin_probability, final/drawdown quantiles, growth rates
+        and bets placed per path
+    """
+    min_bet = Config.MIN_BET if min_bet is None else min_bet
+    max_daily_bets = Config.MAX_DAILY_BETS if max_daily_bets is None else max_daily_bets
+    max_daily_loss = Config.MAX_DAILY_LOSS if max_daily_loss is None else max_daily_loss
+    per_day = bets_per_day or round(outcomes.trades_per_day) or max_daily_bets
+    per_day = max(1, min(per_day, max_daily_bets))
+    amount = sizing.amount if sizing.amount is not None else Config.BET_AMOUNT
+
+    bitgen = np.random.PCG64(seed)
+    f32 = np.float32
+    slots = _slots(len(outcomes.returns))
+    returns = outcomes.returns.astype(f32)[slots]
+    kelly = (outcomes.full_kelly * sizing.fraction).astype(f32)[slots]
+    won = outcomes.won[slots]
+    # Martingale stake by consecutive-loss level
+    ladder = (amount * sizing.multiplier ** np.arange(sizing.max_levels)).astype(f32)
+
+    # float32 state: the loop is memory-bound, and cents on bankrolls into
+    # the millions fit in its 24-bit mantissa
+    equity = np.full(paths, bankroll, dtype=f32)
+    peak = equity.copy()
+    low = np.ones(paths, dtype=f32)  # lowest equity / running peak
+    ratio = np.empty(paths, dtype=f32)
+    daily = np.zeros(paths, dtype=f32)
+    stake = np.empty(paths, dtype=f32)
+    pnl = np.empty(paths, dtype=f32)
+    active = np.empty(paths, dtype=bool)
+    day_ok = np.empty(paths, dtype=bool)
+    placed = np.zeros(paths, dtype=np.int32)
+    level = np.zeros(paths, dtype=np.int8)
+
+    for start in range(0, bets, chunk):
+        idx = _draw(bitgen, (min(chunk, bets - start), paths))
+        chunk_returns = returns.take(idx)
+        if sizing.mode == "kelly":
+            chunk_kelly = kelly.take(idx)
+        elif sizing.mode == "martingale":
+            chunk_won = won.take(idx)
+
+        for offset in range(len(idx)):
+            if (start + offset) % per_day == 0:
+                daily.fill(0)
+
+            # Stake for this bet (ruined paths get < min_bet and sit out)
+            if sizing.mode == "kelly":
+                # kelly_size: max(1, round(bankroll * kelly, 2)), 0 without edge
+                k = chunk_kelly[offset]
+                np.multiply(equity, k, out=stake)
+                np.round(stake, 2, out=stake)
+                np.maximum(stake, 1, out=stake)
+                stake *= k > 0
+                if sizing.amount:
+                    np.minimum(stake, sizing.amount, out=stake)
+                np.maximum(stake, min_bet, out=stake)
+                np.minimum(stake, equity, out=stake)
+            elif sizing.mode == "martingale":
+                ladder.take(level, out=stake)
+                np.minimum(stake, equity, out=stake)
+            else:
+                np.minimum(equity, amount, out=stake)
+
+            np.greater_equal(stake, min_bet, out=active)
+            np.greater(daily, -max_daily_loss, out=day_ok)
+            active &= day_ok
+            np.multiply(stake, chunk_returns[offset], out=pnl)
+            pnl *= active
+            equity += pnl
+            daily += pnl
+            placed += active
+
+            if sizing.mode == "martingale":
+                w = chunk_won[offset]
+                level *= ~(active & w)
+                level += active & ~w
+                level *= level < sizing.max_levels
+
+            np.maximum(peak, equity, out=peak)
+            np.divide(equity, peak, out=ratio)
+            np.minimum(low, ratio, out=low)
+
+    equity = equity.astype(np.float64)
+    ruined = equity < min_bet
+    alive = ~ruined
+    with np.errstate(divide="ignore"):
+        log_growth = np.log(np.maximum(equity, 0) / bankroll)
+    max_dd = 1 - low.astype(np.float64)
+    quantiles = (0.05, 0.25, 0.5, 0.75, 0.95)
+    dd_quantiles = (0.5, 0.9, 0.95, 0.99)
+    return {
+        "sizing": sizing.label,
+        "paths": paths,
+        "bets": bets,
+        "bets_per_day": per_day,
+        "ruin_probability": float(ruined.mean()),
+        # Ruined paths stop betting, so bets placed = bets until ruin
+        "median_bets_to_ruin": float(np.median(placed[ruined]))
+        if ruined.any()
+        else None,
+        "final_quantiles": dict(
+            zip(quantiles, np.quantile(equity, quantiles).tolist())
+        ),
+        "mean_final": float(equity.mean()),
+        "drawdown_quantiles": dict(
+            zip(dd_quantiles, np.quantile(max_dd, dd_quantiles).tolist())
+        ),
+        # Median log growth of surviving paths, per bet placed
+        "growth_per_bet": float(
+            np.median(log_growth[alive] / np.maximum(placed[alive], 1))
+        )
+        if alive.any()
+        else None,
+        "median_log_growth": float(np.median(log_growth)),
+        "mean_bets_placed": float(placed.mean()),
+    }
+
+
+def _slots(n: int) -> np.ndarray:
+    """Map the 65,536 values of a 16-bit draw onto ``n`` outcomes.
+
+    Tables indexed by these slots are sampled with raw 16-bit words, which
+    is several times cheaper than ``Generator.integers``. Each outcome
+    gets ``floor`` or ``ceil`` of ``65536 / n`` slots; longer histories
+    are sampled at 65,536 evenly spaced trades.
+    """
+    return (np.arange(1 << 16, dtype=np.int64) * n) >> 16
+
+
+def _draw(bitgen, shape: tuple[int, int]) -> np.ndarray:
+    """Uniform 16-bit slot indices of ``shape`` from raw generator output."""
+    count = shape[0] * shape[1]
+    words = bitgen.random_raw(-(-count // 4)).view(np.uint16)[:count]
+    return words.astype(np.intp).reshape(shape)
@@ -0,0 +1,374 @@
+"""Parallel parameter sweep over copytrade filter and delay-model settings.
+
+Each configuration is replayed against settled copytrade history: every
+trade is re-priced with the configuration's ``DelayImpactModel``
+coefficients, passed through the ``SelectiveFilter`` checks, and the
+trades it would have taken are scored (PnL, drawdown, Sharpe).
+
+Provides:
+- export_copytrades: settled copytrade records -> one ``.npy`` column per
+  field, so worker processes memory-map the same pages instead of
+  receiving a pickled copy per task
+- evaluate: score one configuration against the loaded columns
+- run_sweep: fan a parameter grid out over a ``ProcessPoolExecutor``,
+  appending each result to a JSONL file as it completes; configurations
+  already in the file are skipped, so an interrupted sweep resumes
+- load_results / rank: read the results back, best risk-adjusted first
+
+Configurations use the ``SelectiveFilter`` config keys (``max_delay_ms``,
+``min_fill_price``, ``max_fill_price``, ``max_price_movement_pct``,
+``max_spread``, ``max_volatility_factor``, ``min_depth_at_best``) and the
+``DelayImpactModel`` fields (``base_coef``, ``max_impact``,
+``baseline_spread``); unset keys take their Config defaults.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from src.core.polymarket import DelayImpactModel
+from src.infra.persistence import atomic_write_json
+from src.strategies.selective_filter import SelectiveFilter
+
+FILTER_KEYS = (
+    "max_delay_ms",
+    "min_fill_price",
+    "max_fill_price",
+    "max_price_movement_pct",
+    "max_spread",
+    "max_volatility_factor",
+    "min_depth_at_best",
+)
+MODEL_KEYS = ("base_coef", "max_impact", "baseline_spread")
+
+# name -> dtype of the exported columns
+COLUMNS = {
+    "executed_at": np.int64,  # unix ms, ascending
+    "amount": np.float64,  # filled amount (USD)
+    "delay_ms": np.int64,  # copy delay
+    "book_price": np.float64,  # fill price before delay impact
+    "signal_price": np.float64,  # market price at signal
+    "spread": np.float64,
+    "depth_at_best": np.float64,
+    "fee_rate_bps": np.int32,
+    "won": np.int8,
+}
+
+
+# === DATASET ===
+
+
+def _column_values(trade) -> tuple | None:
+    """Column values of a settled copytrade (None if unusable)."""
+    if trade.strategy != "copytrade" or trade.won is None:
+        return None
+    price = trade.execution_price or trade.entry_price
+    if price <= 0:
+        return None
+    breakdown = trade.delay_model_breakdown or {}
+    return (
+        trade.executed_at or trade.timestamp * 1000,
+        trade.amount,
+        trade.copy_delay_ms or 0,
+        price / (1 + trade.delay_impact_pct / 100),
+        price / (1 + trade.price_movement_pct / 100),
+        trade.spread,
+        float(breakdown.get("depth_at_best") or 0),
+        trade.fee_rate_bps,
+        1 if trade.won else 0,
+    )
+
+
+def export_copytrades(records, path: str) -> dict:
+    """Write settled copytrade records as memory-mappable columns.
+
+    Args:
+        records: Nested trade records (``Trade.to_nested_json`` layout)
+        path: Output directory
+
+    Returns:
+        The dataset's meta dict (rows, fingerprint)
+    """
+    from src.core.trader import Trade
+
+    trades = (Trade.from_nested_json(r) for r in records)
+    rows = sorted(r for r in map(_column_values, trades) if r is not None)
+    os.makedirs(path, exist_ok=True)
+    digest = hashlib.sha1()
+    for i, (name, dtype) in enumerate(COLUMNS.items()):
+        values = np.array([row[i] for row in rows], dtype=dtype)
+        digest.update(values.tobytes())
+        tmp = os.path.join(path, f"{name}.tmp.npy")
+        np.save(tmp, values)
+        os.replace(tmp, os.path.join(path, f"{name}.npy"))
+    meta = {"rows": len(rows), "fingerprint": digest.hexdigest()[:16]}
+    atomic_write_json(os.path.join(path, "meta.json"), meta)
+    return meta
+
+
+def load_columns(path: str) -> dict[str, np.ndarray]:
+    """Memory-map the exported columns (read-only)."""
+    return {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in COLUMNS
+    }
+
+
+# === EVALUATION ===
+
+
+def _impact(data: dict, model: DelayImpactModel) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized ``DelayImpactModel.calculate_impact``: (impact %, vol factor)."""
+    delay_s = np.maximum(data["delay_ms"], 0) / 1000.0
+    size = data["amount"]
+    depth = data["depth_at_best"]
+    spread = data["spread"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        liq = np.where(
+            (depth > 0) & (size > 0), np.clip(size / (depth * 0.5), 0.5, 2.0), 1.0
+        )
+        if model.baseline_spread > 0:
+            vol = np.where(
+                spread > 0, np.clip(spread / model.baseline_spread, 0.5, 2.0), 1.0
+            )
+        else:
+            vol = np.ones_like(spread)
+    impact = np.minimum(
+        model.max_impact, np.sqrt(delay_s) * model.base_coef * liq * vol
+    )
+    impact = np.where(data["delay_ms"] > 0, impact, 0.0)
+    # The filter sees the breakdown's rounded factor (1.0 without a delay)
+    vol = np.where(data["delay_ms"] > 0, np.round(vol, 2), 1.0)
+    return impact, vol
+
+
+def _taken(data: dict, filt: SelectiveFilter, price, vol) -> np.ndarray:
+    """Vectorized ``SelectiveFilter.should_trade`` over all trades."""
+    signal = data["signal_price"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        movement = np.where(signal > 0, np.abs(price - signal) / signal * 100, 0.0)
+    return (
+        (data["delay_ms"] <= filt.max_delay_ms)
+        & ~((price > 0) & (price < filt.min_fill_price))
+        & (price <= filt.max_fill_price)
+        & (movement <= filt.max_price_movement_pct)
+        & (data["spread"] <= filt.max_spread)
+        & (vol < filt.max_volatility_factor)
+        & (data["depth_at_best"] >= filt.min_depth_at_best)
+    )
+
+
+def evaluate(data: dict, params: dict, impact_cache: dict | None = None) -> dict:
+    """Score one configuration against the copytrade columns.
+
+    Args:
+        data: Columns from ``load_columns``
+        params: Filter and model settings (unset keys use Config defaults)
+        impact_cache: Reused across calls that share model coefficients
+
+    Returns:
+        Dict with trades, wins, win_rate, pnl, roi, sharpe (mean / std of
+        per-trade PnL), max_drawdown and pnl_per_drawdown
+    """
+    filt = SelectiveFilter({k: params[k] for k in FILTER_KEYS if k in params})
+    model = DelayImpactModel(**{k: params[k] for k in MODEL_KEYS if k in params})
+
+    key = (model.base_coef, model.max_impact, model.baseline_spread)
+    cached = impact_cache.get(key) if impact_cache is not None else None
+    if cached is None:
+        impact, vol = _impact(data, model)
+        price = data["book_price"] * (1 + impact / 100)
+        fee = price * (1 - price) * data["fee_rate_bps"] / 10000
+        amount = data["amount"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gross = np.where(price > 0, amount / price - amount, 0.0)
+        # Same settlement as settle_trade: fee on winning profit only
+        pnl = np.where(
+            data["won"] == 1, gross - np.where(gross > 0, gross * fee, 0.0), -amount
+        )
+        cached = (price, vol, pnl)
+        if impact_cache is not None:
+            impact_cache[key] = cached
+    price, vol, pnl = cached
+
+    taken = _taken(data, filt, price, vol)
+    trade_pnl = pnl[taken]
+    n = len(trade_pnl)
+    staked = float(data["amount"][taken].sum())
+    total = float(trade_pnl.sum())
+    std = float(trade_pnl.std()) if n > 1 else 0.0
+    equity = np.cumsum(trade_pnl)
+    drawdown = (
+        float((np.maximum.accumulate(np.maximum(equity, 0)) - equity).max())
+        if n
+        else 0.0
+    )
+    wins = int(data["won"][taken].sum())
+    return {
+        "trades": n,
+        "wins": wins,
+        "win_rate": wins / n if n else 0.0,
+        "pnl": total,
+        "roi": total / staked if staked else 0.0,
+        "sharpe": total / n / std if std > 0 else 0.0,
+        "max_drawdown": drawdown,
+        "pnl_per_drawdown": total / drawdown if drawdown > 0 else 0.0,
+    }
+
+
+# === GRID ===
+
+
+def expand_grid(grid: dict[str, list]) -> list[dict]:
+    """Cartesian product of a ``{param: [values]}`` grid.
+
+    Model coefficients vary slowest, so consecutive configurations (and
+    therefore each batch) share the re-priced trades.
+    """
+    keys = sorted(grid, key=lambda k: (k not in MODEL_KEYS, k))
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(grid[k] for k in keys))
+    ]
+
+
+def config_id(params: dict, fingerprint: str) -> str:
+    """Stable ID of a configuration on a given dataset."""
+    payload = json.dumps([fingerprint, params], sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+# === PROCESS POOL ===
+
+_worker_data: dict | None = None
+_worker_fingerprint = ""
+
+
+def _init_worker(path: str, fingerprint: str):
+    global _worker_data, _worker_fingerprint
+    _worker_data = load_columns(path)
+    _worker_fingerprint = fingerprint
+
+
+def _run_batch(batch: list[tuple[str, dict]]) -> list[dict]:
+    impact_cache: dict = {}
+    return [
+        {
+            "id": cid,
+            "data": _worker_fingerprint,
+            "params": params,
+            **evaluate(_worker_data, params, impact_cache),
+        }
+        for cid, params in batch
+    ]
+
+
+def load_results(path: str, fingerprint: str | None = None) -> list[dict]:
+    """Result lines written so far (a torn final line is ignored).
+
+    Args:
+        path: Results file
+        fingerprint: Only results computed on this dataset
+    """
+    results = []
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue
+                if fingerprint is None or result.get("data") == fingerprint:
+                    results.append(result)
+    return results
+
+
+def run_sweep(
+    grid: dict[str, list],
+    data_path: str,
+    out_path: str,
+    workers: int | None = None,
+    batch_size: int | None = None,
+    progress: bool = True,
+) -> dict:
+    """Evaluate every configuration of ``grid`` across worker processes.
+
+    Args:
+        grid: ``{param: [values]}``
+        data_path: Directory written by ``export_copytrades``
+        out_path: JSONL results file (appended; resumes from its contents)
+        workers: Processes (default: all cores)
+        batch_size: Configurations per task (default: ~8 tasks per worker)
+        progress: Print progress lines
+
+    Returns:
+        Dict with configs, already_done, evaluated, seconds, per_second
+        and the dataset fingerprint
+    """
+    with open(os.path.join(data_path, "meta.json")) as f:
+        fingerprint = json.load(f)["fingerprint"]
+    workers = workers or os.cpu_count() or 1
+
+    configs = [(config_id(p, fingerprint), p) for p in expand_grid(grid)]
+    done = {r["id"] for r in load_results(out_path)}
+    todo = [(cid, p) for cid, p in configs if cid not in done]
+    if not batch_size:
+        batch_size = max(1, min(256, len(todo) // (workers * 8) or 1))
+    batches = [todo[i : i + batch_size] for i in range(0, len(todo), batch_size)]
+
+    started = time.time()
+    evaluated = 0
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with (
+        open(out_path, "a") as out,
+        ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(data_path, fingerprint),
+        ) as pool,
+    ):
+        pending = set()
+        queued = iter(batches)
+        while True:
+            # Bounded in-flight tasks: results stream out as they finish
+            for batch in itertools.islice(queued, workers * 2 - len(pending)):
+                pending.add(pool.submit(_run_batch, batch))
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results = future.result()
+                out.writelines(json.dumps(r) + "\n" for r in results)
+                evaluated += len(results)
+            out.flush()
+            if progress:
+                elapsed = time.time() - started
+                print(
+                    f"[sweep] {evaluated:,}/{len(todo):,} configs "
+                    f"({evaluated / elapsed if elapsed else 0:,.0f}/s)",
+                    end="\r",
+                )
+    if progress and todo:
+        print()
+
+    seconds = time.time() - started
+    return {
+        "configs": len(configs),
+        "already_done": len(configs) - len(todo),
+        "evaluated": evaluated,
+        "seconds": round(seconds, 2),
+        "per_second": round(evaluated / seconds, 1) if seconds else 0.0,
+        "fingerprint": fingerprint,
+    }
+
+
+def rank(results: list[dict], key: str = "sharpe", min_trades: int = 20) -> list[dict]:
+    """Results with at least ``min_trades`` trades, best ``key`` first."""
+    eligible = [r for r in results if r["trades"] >= min_trades]
+    return sorted(eligible, key=lambda r: (r[key], r["pnl"]), reverse=True)
@@ -0,0 +1,202 @@
+"""Adaptive wallet poll cadence keyed to the 5-minute window cycle.
+
+Copy trades on BTC 5-min markets cluster at particular seconds of the
+window (around the open, before the close), so polling every wallet at a
+flat rate wastes requests in dead phases and is slow in hot ones.
+``CadenceController`` keeps, per wallet, a histogram of its trade times
+within the 300s cycle - learned from trade history and updated with every
+detected trade - and turns it into an interval factor per phase bin.
+
+For a fixed request budget, the mean wait before a trade is seen,
+sum(p_b / 2r_b), is minimised with the poll rate r_b in bin b
+proportional to sqrt(p_b). The rates are normalised to a mean of 1 over
+the cycle (clamped to ``1/max_factor .. 1/min_factor``), so the cycle's
+request volume matches flat polling. On top of that:
+
+- a burst of ``last_trade_price`` events on the current market (the
+  market WebSocket) drops every wallet to ``min_factor`` for
+  ``burst_hold`` seconds
+- when the market WebSocket has been silent for ``idle_after`` seconds,
+  intervals are stretched by ``idle_factor`` (up to ``max_factor``)
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+from src.config import Config
+
+WINDOW_SECONDS = 300
+
+
+class CadenceController:
+    """Per-wallet, per-phase poll interval factors (< 1 = poll faster).
+
+    Usage:
+        cadence = CadenceController()
+        cadence.learn(get_history_store().recent(strategy="copytrade"))
+        monitor = HybridCopytradeMonitor(wallets, 1.5, cadence=cadence)
+        period = poll_interval * cadence.factor(wallet)
+    """
+
+    def __init__(
+        self,
+        bins: int = 30,
+        min_factor: float | None = None,
+        max_factor: float | None = None,
+        idle_after: float = 60.0,
+        idle_factor: float = 2.0,
+        burst_trades: int = 3,
+        burst_window: float = 2.0,
+        burst_hold: float = 10.0,
+    ):
+        """Initialize the controller.
+
+        Args:
+            bins: Phase bins per 300s cycle
+            min_factor: Fastest interval factor (default Config.CADENCE_MIN_FACTOR)
+            max_factor: Slowest interval factor (default Config.CADENCE_MAX_FACTOR)
+            idle_after: Seconds without market trades before backing off
+            idle_factor: Interval stretch while idle
+            burst_trades: Market trades within ``burst_window`` that make a burst
+            burst_window: Seconds
+            burst_hold: Seconds a burst keeps every wallet at ``min_factor``
+        """
+        self.bins = bins
+        self.min_factor = min_factor or Config.CADENCE_MIN_FACTOR
+        self.max_factor = max_factor or Config.CADENCE_MAX_FACTOR
+        self.idle_after = idle_after
+        self.idle_factor = idle_factor
+        self.burst_window = burst_window
+        self.burst_hold = burst_hold
+
+        self._lock = threading.Lock()
+        self._counts: dict[str, list[float]] = {}  # wallet -> trades per bin
+        self._factors: dict[str, list[float]] = {}  # cached from _counts
+        self._market_trades: deque[float] = deque(maxlen=burst_trades)
+        self._last_market_trade = 0.0
+        self._burst_until = 0.0
+
+        # Stats
+        self.learned = 0
+        self.observed = 0
+        self.bursts = 0
+
+    def _bin(self, ts: float) -> int:
+        return int(ts % WINDOW_SECONDS * self.bins / WINDOW_SECONDS)
+
+    def _add(self, wallet: str, ts: float):
+        counts = self._counts.setdefault(wallet.lower(), [0.0] * self.bins)
+        counts[self._bin(ts)] += 1
+        self._factors.pop(wallet.lower(), None)
+
+    def learn(self, records) -> int:
+        """Add copied trades' trader times from history records.
+
+        The trader's time is our execution time minus the copy delay.
+
+        Returns:
+            Number of trades learned
+        """
+        from src.core.trader import Trade
+
+        learned = 0
+        with self._lock:
+            for record in records:
+                trade = Trade.from_nested_json(record)
+                if not trade.copied_from or not trade.executed_at:
+                    continue
+                trader_ts = (trade.executed_at - (trade.copy_delay_ms or 0)) / 1000
+                self._add(trade.copied_from, trader_ts)
+                learned += 1
+            self.learned += learned
+        return learned
+
+    def observe(self, wallet: str, trade_ts: float):
+        """Add a newly detected trade."""
+        with self._lock:
+            self._add(wallet, trade_ts)
+            self.observed += 1
+
+    def note_market_trade(self, ts: float | None = None) -> bool:
+        """Record a ``last_trade_price`` event on the current market.
+
+        Returns:
+            True when this trade starts a burst (callers re-time pending polls)
+        """
+        now = time.time()
+        with self._lock:
+            self._market_trades.append(ts or now)
+            self._last_market_trade = now
+            full = len(self._market_trades) == self._market_trades.maxlen
+            if (
+                full
+                and self._market_trades[-1] - self._market_trades[0]
+                <= self.burst_window
+                and now >= self._burst_until
+            ):
+                self._burst_until = now + self.burst_hold
+                self.bursts += 1
+                return True
+            return False
+
+    def factor(self, wallet: str, now: float | None = None) -> float:
+        """Interval factor for ``wallet`` at ``now`` (1.0 = flat polling)."""
+        now = now or time.time()
+        with self._lock:
+            if now < self._burst_until:
+                return self.min_factor
+            factors = self._factors.get(wallet.lower())
+            if factors is None:
+                counts = self._counts.get(wallet.lower())
+                factors = self._bin_factors(counts) if counts else None
+                if factors:
+                    self._factors[wallet.lower()] = factors
+            factor = factors[self._bin(now)] if factors else 1.0
+            if (
+                self._last_market_trade
+                and now - self._last_market_trade > self.idle_after
+            ):
+                factor = min(self.max_factor, factor * self.idle_factor)
+            return factor
+
+    def _bin_factors(self, counts: list[float]) -> list[float]:
+        """Interval factor per bin: rate ~ sqrt(share), mean rate <= 1."""
+        # One pseudo-trade per bin keeps sparse histories close to flat
+        total = sum(counts) + self.bins
+        rates = [math.sqrt((c + 1) / total) for c in counts]
+        lo, hi = 1 / self.max_factor, 1 / self.min_factor
+        for _ in range(8):
+            mean = sum(rates) / len(rates)
+            rates = [min(hi, max(lo, r / mean)) for r in rates]
+        # Clamping can leave the mean a little above 1; never exceed flat volume
+        mean = sum(rates) / len(rates)
+        if mean > 1:
+            rates = [r / mean for r in rates]
+        return [1 / r for r in rates]
+
+    def profile(self, wallet: str) -> list[float]:
+        """Interval factor per phase bin for ``wallet`` (ignoring bursts/idle)."""
+        with self._lock:
+            counts = self._counts.get(wallet.lower())
+            return self._bin_factors(counts) if counts else [1.0] * self.bins
+
+    @property
+    def stats(self) -> dict:
+        """Get controller statistics."""
+        now = time.time()
+        with self._lock:
+            trades = {w: int(sum(c)) for w, c in self._counts.items()}
+            idle = bool(
+                self._last_market_trade
+                and now - self._last_market_trade > self.idle_after
+            )
+        return {
+            "learned": self.learned,
+            "observed": self.observed,
+            "wallet_trades": {f"{w[:10]}...": n for w, n in trades.items()},
+            "bursts": self.bursts,
+            "bursting": now < self._burst_until,
+            "idle": idle,
+        }
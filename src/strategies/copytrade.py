@@ -30,6 +30,9 @@ class CopySignal:
     tx_fee_matic: float | None = None
     on_chain_timestamp: int | None = None
 
+    # Local time the monitor first saw the trade (detection delay = this - trade_ts)
+    detected_at: float | None = None
+
 
 class CopytradeMonitor:
     """Monitor specific wallets for BTC 5-min trades."""
@@ -3,17 +3,14 @@
 Detects trades in ~100ms vs ~5-15s with REST polling.
 """
 
-import asyncio
-import json
 import re
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from typing import Callable
 
-import websockets
-from websockets.exceptions import ConnectionClosed
-
 from src.core.blockchain import PolygonscanClient
 from src.config import Config
 from src.strategies.copytrade import CopySignal
@@ -66,132 +63,100 @@ class CopytradeWebSocket:
         self._on_signal = on_signal
 
         self._running = False
-        self._loop: asyncio.AbstractEventLoop | None = None
-        self._thread: threading.Thread | None = None
-        self._connected = threading.Event()
+        self._feed = None  # shared market-channel feed (WSRuntime)
+        self._windows: dict[int, str] = {}  # window ts -> subscribed condition ID
         self._lock = threading.Lock()
 
         # Track seen trades to avoid duplicates
         self._seen_trades: set[str] = set()  # tx_hash or unique trade id
         self._last_poll_time: dict[str, int] = {w: int(time.time()) for w in wallets}
 
+        # Gamma client for resolving window token IDs (created on first use)
+        self._client = None
+
         # Stats
         self.signals_emitted = 0
         self.last_signal_time = 0.0
-        self.reconnect_count = 0
 
     def start(self):
-        """Start WebSocket monitoring in background thread."""
+        """Attach to the shared market feed and subscribe BTC windows.
+
+        Note: The user WebSocket channel requires authentication.
+        For copying other users' trades, we need to use the Data API polling
+        or listen to market-wide trades and filter by maker/taker address.
+        Since we're monitoring OTHER users, we use a hybrid approach:
+        1. Subscribe to market channels for BTC 5-min markets
+        2. Filter trades by taker/maker address matching our target wallets
+
+        The market channel is the process-wide shared connection, so this
+        adds subscriptions to it rather than opening another socket.
+        """
         if self._running:
             return
 
-        self._running = True
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        from src.core.ws_runtime import get_runtime
 
-        # Wait for connection
-        self._connected.wait(timeout=5.0)
+        self._running = True
+        self._feed = get_runtime().market_feed()
+        self._feed.add_trade_listener(self._handle_trade)
+        self.refresh_windows()
+        self._feed.start()
+        if self._feed.is_connected():
+            print("[copytrade-ws] Connected")
 
     def stop(self):
-        """Stop WebSocket monitoring."""
+        """Detach from the shared feed, releasing this monitor's windows."""
+        if not self._running:
+            return
         self._running = False
-        if self._loop:
-            self._loop.call_soon_threadsafe(self._loop.stop)
-        if self._thread:
-            self._thread.join(timeout=2.0)
-
-    def _run_loop(self):
-        """Run asyncio event loop."""
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-        try:
-            self._loop.run_until_complete(self._monitor_loop())
-        except Exception as e:
-            print(f"[copytrade-ws] Event loop error: {e}")
-        finally:
-            self._loop.close()
+        self._feed.remove_trade_listener(self._handle_trade)
+        with self._lock:
+            windows = list(self._windows.values())
+            self._windows.clear()
+        for condition_id in windows:
+            self._feed.unsubscribe_market(condition_id)
+        self._feed.stop()
+
+    def refresh_windows(self):
+        """Subscribe the current and next 3 BTC 5-min windows by asset ID.
+
+        The market channel is keyed by CLOB token ID, so each window's
+        tokens are looked up via Gamma first. Windows that have ended are
+        released. Call again at window boundaries to roll forward.
+        """
+        from src.core.polymarket import PolymarketClient
 
-    async def _monitor_loop(self):
-        """Main monitoring loop.
+        if self._client is None:
+            self._client = PolymarketClient()
 
-        Note: The user WebSocket channel requires authentication.
-        For copying other users' trades, we need to use the Data API polling
-        or listen to market-wide trades and filter by maker/taker address.
-        """
-        # Since user WS requires auth and we're monitoring OTHER users,
-        # we'll use a hybrid approach:
-        # 1. Subscribe to market channels for BTC 5-min markets
-        # 2. Filter trades by taker/maker address matching our target wallets
-
-        market_ws_url = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
-
-        while self._running:
-            try:
-                async with websockets.connect(
-                    market_ws_url,
-                    ping_interval=30,
-                    ping_timeout=10,
-                    close_timeout=5,
-                ) as ws:
-                    self._connected.set()
-                    print("[copytrade-ws] Connected")
-
-                    # Subscribe to BTC 5-min markets (current + next few windows)
-                    await self._subscribe_btc_markets(ws)
-
-                    # Handle messages
-                    async for message in ws:
-                        raw_message = (
-                            message.decode("utf-8", errors="ignore")
-                            if isinstance(message, bytes)
-                            else message
-                        )
-                        await self._handle_message(raw_message)
-
-            except ConnectionClosed as e:
-                print(f"[copytrade-ws] Connection closed: {e}")
-                self._connected.clear()
-            except Exception as e:
-                print(f"[copytrade-ws] Error: {e}")
-                self._connected.clear()
-
-            if self._running:
-                self.reconnect_count += 1
-                wait = min(30, 2 ** min(self.reconnect_count, 5))
-                print(f"[copytrade-ws] Reconnecting in {wait}s...")
-                await asyncio.sleep(wait)
-
-    async def _subscribe_btc_markets(self, ws):
-        """Subscribe to current and upcoming BTC 5-min markets."""
         now = int(time.time())
         current_window = (now // 300) * 300
+        wanted = {current_window + offset * 300 for offset in range(4)}
 
-        # Subscribe to current and next 3 windows
-        for offset in range(4):
-            ts = current_window + (offset * 300)
-            slug = f"btc-updown-5m-{ts}"
-            msg = {
-                "type": "subscribe",
-                "channel": "market",
-                "market": slug,
-            }
-            await ws.send(json.dumps(msg))
-
-    async def _handle_message(self, raw: str):
-        """Handle WebSocket message."""
-        try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
-            return
-
-        msg_type = data.get("type", data.get("event_type", ""))
+        with self._lock:
+            stale = {ts: c for ts, c in self._windows.items() if ts not in wanted}
+            for ts in stale:
+                del self._windows[ts]
+            missing = sorted(wanted - set(self._windows))
+        for condition_id in stale.values():
+            self._feed.unsubscribe_market(condition_id)
+
+        for ts in missing:
+            market = self._client.get_market(ts)
+            if not market or not market.token_ids:
+                continue
+            condition_id = market.condition_id or market.slug
+            with self._lock:
+                if ts in self._windows or not self._running:
+                    continue
+                self._windows[ts] = condition_id
+            self._feed.subscribe_market(condition_id, market.token_ids)
 
-        # Look for trade events
-        if msg_type == "last_trade_price":
-            await self._handle_trade(data)
+    def _handle_trade(self, trade):
+        """Handle a trade event, check if it's from a tracked wallet.
 
-    async def _handle_trade(self, data: dict):
-        """Handle a trade event, check if it's from a tracked wallet."""
+        Runs on the shared runtime loop, so it must not block.
+        """
         # The market WebSocket doesn't directly expose trader addresses
         # We need to correlate via the Data API or look at the trade details
 
@@ -224,7 +189,7 @@ class CopytradeWebSocket:
 
     def is_connected(self) -> bool:
         """Check if WebSocket is connected."""
-        return self._connected.is_set()
+        return self._feed is not None and self._feed.is_connected()
 
     @property
     def stats(self) -> dict:
@@ -233,7 +198,8 @@ class CopytradeWebSocket:
             "connected": self.is_connected(),
             "wallets_monitored": len(self.wallets),
             "signals_emitted": self.signals_emitted,
-            "reconnect_count": self.reconnect_count,
+            "subscribed_windows": len(self._windows),
+            "reconnect_count": self._feed.reconnect_count if self._feed else 0,
             "last_signal_age": time.time() - self.last_signal_time
             if self.last_signal_time
             else None,
@@ -248,6 +214,20 @@ class HybridCopytradeMonitor:
     - Fast REST polling (1-2s) for wallet activity detection
     - WebSocket-triggered immediate polls for ultra-low latency
     - On-chain data enrichment via Polygonscan
+
+    Wallets are polled concurrently on a thread pool sized to the HTTP
+    connection pool. Each wallet request has its own deadline, and its
+    signals go to the callbacks as soon as its response is parsed; a
+    wallet whose previous request is still in flight is skipped rather
+    than queued behind it.
+
+    Every activity request counts against ``rate_limiter`` (the Data API
+    host's budget) when one is given; ``submit`` polls a single wallet
+    without waiting, for schedulers that stagger wallets within the
+    interval (``poll_scheduler.py``). Detection delay, the first-seen time
+    minus the trade's ``trade_ts``, is recorded per wallet, and each
+    detected trade feeds the optional ``cadence`` controller
+    (``cadence.py``), which schedulers consult for per-wallet intervals.
     """
 
     BTC_5M_PATTERN = re.compile(r"^btc-updown-5m-(\d+)$")
@@ -256,13 +236,35 @@ class HybridCopytradeMonitor:
         self,
         wallets: list[str],
         poll_interval: float = 1.0,  # Much faster than default 5s
+        workers: int | None = None,
+        wallet_deadline: float | None = None,
+        rate_limiter=None,
+        cadence=None,
     ):
+        """Initialize the monitor.
+
+        Args:
+            wallets: Wallet addresses to poll
+            poll_interval: Seconds between poll cycles (used by callers)
+            workers: Concurrent wallet requests, also the HTTP pool size
+                (default Config.POLL_WORKERS)
+            wallet_deadline: Seconds a poll waits for each wallet; also
+                its read timeout (default Config.POLL_WALLET_DEADLINE)
+            rate_limiter: Optional ``RateLimiter`` every activity request
+                must pass (wallets over budget are skipped)
+            cadence: Optional ``CadenceController`` learning each wallet's
+                trade phases
+        """
         import requests
         from requests.adapters import HTTPAdapter
         from urllib3.util.retry import Retry
 
         self.wallets = wallets
         self.poll_interval = poll_interval
+        self.workers = workers or Config.POLL_WORKERS
+        self.wallet_deadline = wallet_deadline or Config.POLL_WALLET_DEADLINE
+        self.rate_limiter = rate_limiter
+        self.cadence = cadence
 
         # Fast HTTP session with connection pooling
         self.session = requests.Session()
@@ -273,9 +275,10 @@ class HybridCopytradeMonitor:
             backoff_factor=0.1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
+        # One connection per worker so concurrent polls never wait on the pool
         adapter = HTTPAdapter(
             pool_connections=10,
-            pool_maxsize=10,
+            pool_maxsize=self.workers,
             max_retries=retry_strategy,
         )
         self.session.mount("https://", adapter)
@@ -303,11 +306,23 @@ class HybridCopytradeMonitor:
         # Polygonscan client for on-chain data enrichment
         self._polygonscan = PolygonscanClient()
 
+        # Concurrent wallet polls
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="wallet-poll"
+        )
+        self._in_flight: set[str] = set()
+        self._late_signals: list[CopySignal] = []  # arrived after a deadline
+
         # Stats
         self.polls = 0
         self.signals_emitted = 0
+        self.deadline_misses = 0
+        self.skipped_in_flight = 0
+        self.over_budget = 0
         self.avg_poll_latency_ms = 0.0
-        self._poll_latencies: list[float] = []
+        self._poll_latencies: deque[float] = deque(maxlen=100)
+        self._wallet_latencies: dict[str, deque[float]] = {}
+        self._detection_delays: dict[str, deque[float]] = {}
 
     def on_signal(self, callback: Callable[[CopySignal], None]):
         """Register a signal callback."""
@@ -339,30 +354,97 @@ class HybridCopytradeMonitor:
         return self.poll(triggered=True)
 
     def poll(self, triggered: bool = False) -> list[CopySignal]:
-        """Poll all wallets for new BTC 5-min trades.
+        """Poll all wallets concurrently for new BTC 5-min trades.
+
+        Each wallet's signals are passed to the callbacks as soon as its
+        response arrives. The call returns once every wallet has answered
+        or its deadline passed; signals from wallets that answer later are
+        still emitted on arrival and returned by the next ``poll``.
 
         Args:
             triggered: True if this poll was triggered by WebSocket activity
 
         Returns list of new signals since last poll.
         """
+        with self._lock:
+            self.polls += 1
+            wallets = [w for w in self.wallets if w not in self._in_flight]
+            self.skipped_in_flight += len(self.wallets) - len(wallets)
+            if self.rate_limiter is not None:
+                allowed = [w for w in wallets if self.rate_limiter.allow_request()]
+                self.over_budget += len(wallets) - len(allowed)
+                wallets = allowed
+            self._in_flight.update(wallets)
+
+        futures = [
+            self._pool.submit(self._poll_and_emit, wallet, triggered)
+            for wallet in wallets
+        ]
+        done, not_done = wait(futures, timeout=self.wallet_deadline)
+
         signals = []
-        self.polls += 1
+        with self._lock:
+            self.deadline_misses += len(not_done)
+            signals.extend(self._late_signals)
+            self._late_signals.clear()
+        for future in done:
+            signals.extend(future.result())
+        for future in not_done:
+            future.add_done_callback(self._collect_late)
+        return signals
+
+    def submit(self, wallet: str, triggered: bool = False) -> str:
+        """Start polling one wallet on the pool without waiting for it.
 
-        for wallet in self.wallets:
-            wallet_signals = self._poll_wallet(wallet, triggered=triggered)
-            signals.extend(wallet_signals)
+        Its signals go to the callbacks when the response arrives.
 
+        Returns:
+            "submitted", "in_flight" (previous request still running) or
+            "over_budget" (the rate limiter refused the request)
+        """
+        with self._lock:
+            if wallet in self._in_flight:
+                self.skipped_in_flight += 1
+                return "in_flight"
+            if self.rate_limiter is not None and not self.rate_limiter.allow_request():
+                self.over_budget += 1
+                return "over_budget"
+            self._in_flight.add(wallet)
+        try:
+            self._pool.submit(self._poll_and_emit, wallet, triggered)
+        except RuntimeError:  # pool shut down
+            with self._lock:
+                self._in_flight.discard(wallet)
+            return "in_flight"
+        return "submitted"
+
+    def _poll_and_emit(self, wallet: str, triggered: bool) -> list[CopySignal]:
+        """Poll one wallet (worker thread) and emit its signals immediately."""
+        try:
+            signals = self._poll_wallet(wallet, triggered=triggered)
+        finally:
+            with self._lock:
+                self._in_flight.discard(wallet)
         for signal in signals:
-            self.signals_emitted += 1
+            with self._lock:
+                self.signals_emitted += 1
             for cb in self._callbacks:
                 try:
                     cb(signal)
                 except Exception as e:
                     print(f"[hybrid] Callback error: {e}")
-
         return signals
 
+    def _collect_late(self, future):
+        """Keep signals of a wallet that missed its deadline for the next poll."""
+        if not future.cancelled() and future.exception() is None:
+            with self._lock:
+                self._late_signals.extend(future.result())
+
+    def close(self):
+        """Stop the poll workers (in-flight requests finish)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
     def _poll_wallet(self, wallet: str, triggered: bool = False) -> list[CopySignal]:
         """Poll a single wallet for new trades.
 
@@ -376,7 +458,7 @@ class HybridCopytradeMonitor:
             resp = self.session.get(
                 f"{Config.DATA_API}/activity",
                 params={"user": wallet, "limit": 10, "offset": 0},
-                timeout=3,  # Short timeout for speed
+                timeout=self.wallet_deadline,
             )
             resp.raise_for_status()
             activity = resp.json()
@@ -387,11 +469,16 @@ class HybridCopytradeMonitor:
             return []
 
         # Track latency
-        latency_ms = (time.time() - start) * 1000
-        self._poll_latencies.append(latency_ms)
-        if len(self._poll_latencies) > 100:
-            self._poll_latencies.pop(0)
-        self.avg_poll_latency_ms = sum(self._poll_latencies) / len(self._poll_latencies)
+        seen_at = time.time()
+        latency_ms = (seen_at - start) * 1000
+        with self._lock:
+            self._poll_latencies.append(latency_ms)
+            self._wallet_latencies.setdefault(wallet, deque(maxlen=100)).append(
+                latency_ms
+            )
+            self.avg_poll_latency_ms = sum(self._poll_latencies) / len(
+                self._poll_latencies
+            )
 
         signals = []
         last_ts = self._last_seen.get(wallet, 0)
@@ -413,9 +500,12 @@ class HybridCopytradeMonitor:
             # Deduplicate by unique key
             tx_hash = trade.get("transactionHash", "")
             trade_key = f"{wallet}_{trade_ts}_{tx_hash}"
-            if trade_key in self._seen_trades:
-                continue
-            self._seen_trades.add(trade_key)
+            # Triggered polls run on dispatch workers concurrently with the
+            # main loop's poll, so check-and-add must be atomic
+            with self._lock:
+                if trade_key in self._seen_trades:
+                    continue
+                self._seen_trades.add(trade_key)
 
             # Create signal
             market_ts = self._extract_market_ts(slug)
@@ -448,9 +538,19 @@ class HybridCopytradeMonitor:
                     # Don't fail signal on Polygonscan errors
                     pass
 
+            signal.detected_at = seen_at
             signals.append(signal)
             new_last_ts = max(new_last_ts, trade_ts)
 
+        if signals:
+            # trade_ts has 1s resolution, so delays read up to 1s high
+            with self._lock:
+                delays = self._detection_delays.setdefault(wallet, deque(maxlen=100))
+                delays.extend(seen_at - s.trade_ts for s in signals)
+            if self.cadence is not None:
+                for s in signals:
+                    self.cadence.observe(wallet, s.trade_ts)
+
         self._last_seen[wallet] = new_last_ts
         return signals
 
@@ -507,16 +607,53 @@ class HybridCopytradeMonitor:
 
         return signals
 
+    @staticmethod
+    def _percentiles(samples) -> dict:
+        ordered = sorted(samples)
+        if not ordered:
+            return {}
+        return {
+            "p50": round(ordered[len(ordered) // 2], 1),
+            "p95": round(ordered[int(len(ordered) * 0.95)], 1),
+            "p99": round(ordered[int(len(ordered) * 0.99)], 1),
+            "max": round(ordered[-1], 1),
+        }
+
     @property
     def stats(self) -> dict:
         """Get monitor statistics."""
+        with self._lock:
+            overall = self._percentiles(self._poll_latencies)
+            per_wallet = {
+                f"{wallet[:10]}...": self._percentiles(samples)
+                for wallet, samples in self._wallet_latencies.items()
+            }
+            in_flight = len(self._in_flight)
+            detection = {
+                f"{wallet[:10]}...": {
+                    "mean": round(sum(delays) / len(delays), 2),
+                    **self._percentiles(delays),
+                    "n": len(delays),
+                }
+                for wallet, delays in self._detection_delays.items()
+            }
         return {
             "wallets": len(self.wallets),
             "poll_interval": self.poll_interval,
+            "workers": self.workers,
+            "wallet_deadline": self.wallet_deadline,
             "polls": self.polls,
             "triggered_polls": self._triggered_polls,
             "signals_emitted": self.signals_emitted,
             "avg_poll_latency_ms": round(self.avg_poll_latency_ms, 1),
+            "latency_ms": overall,
+            "wallet_latency_ms": per_wallet,
+            "in_flight": in_flight,
+            "skipped_in_flight": self.skipped_in_flight,
+            "deadline_misses": self.deadline_misses,
+            "over_budget": self.over_budget,
+            "detection_delay_s": detection,
+            "cadence": self.cadence.stats if self.cadence is not None else None,
             "seen_trades": len(self._seen_trades),
             "polygonscan_available": self._polygonscan.is_available(),
         }
@@ -0,0 +1,229 @@
+"""Phase-staggered wallet polling for the hybrid copytrade monitor.
+
+A trade lands at a uniformly random moment relative to a wallet's poll
+cycle, so with one poll per ``interval`` it waits ``interval / 2`` on
+average before it is seen. ``StaggeredPollScheduler`` gives each
+high-priority wallet K pollers whose slots are phase-offset by
+``interval / K`` - each slot still fires once per interval, so the
+per-poller cost is unchanged - which cuts the mean wait to
+``interval / (2K)``. Other wallets get a single slot, and all slots are
+spread across the interval rather than fired as one burst.
+
+Every request goes through the monitor's ``RateLimiter`` (the Data API
+host's budget). A slot the budget refuses is deferred until the limiter
+has room and then keeps its original phase; a slot whose wallet is still
+in flight is skipped. The measured detection delay per wallet is in
+``HybridCopytradeMonitor.stats["detection_delay_s"]``.
+
+When the monitor has a ``CadenceController`` (``cadence.py``), each
+slot's next period is ``interval`` times the wallet's current factor, so
+slots speed up in the wallet's hot phases of the window and back off in
+idle ones; ``retime`` re-lays every slot from now when a market burst
+starts.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from src.config import Config
+
+
+class StaggeredPollScheduler:
+    """Poll each wallet K times per interval at staggered phases.
+
+    Usage:
+        monitor = HybridCopytradeMonitor(wallets, 1.5, rate_limiter=limiter)
+        scheduler = StaggeredPollScheduler(monitor, priority=[wallet], pollers=3)
+        scheduler.start()   # signals arrive via monitor.on_signal callbacks
+        scheduler.stop()
+    """
+
+    def __init__(
+        self,
+        monitor,
+        interval: float | None = None,
+        priority: list[str] | None = None,
+        pollers: int | None = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            monitor: HybridCopytradeMonitor whose ``submit`` runs the polls
+            interval: Seconds between polls of one poller (default: the
+                monitor's poll_interval)
+            priority: Wallets polled by ``pollers`` staggered pollers
+                (default Config.POLL_PRIORITY_WALLETS)
+            pollers: Pollers per priority wallet, K (default Config.POLL_STAGGER)
+        """
+        self.monitor = monitor
+        self.interval = interval or monitor.poll_interval
+        if priority is None:
+            priority = Config.POLL_PRIORITY_WALLETS
+        priority_set = {w.lower() for w in priority}
+        k = max(1, pollers or Config.POLL_STAGGER)
+        self.pollers: dict[str, int] = {
+            w: k if w.lower() in priority_set else 1 for w in monitor.wallets
+        }
+
+        self._lock = threading.Lock()
+        self._heap: list[tuple[float, int, str, float]] = []
+        self._seq = itertools.count()
+        self._stopped = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        # Stats
+        self.fired = 0
+        self.deferred = 0
+        self.skipped_in_flight = 0
+        self.fell_behind = 0
+        self.retimed = 0
+        self.errors = 0
+
+    @property
+    def planned_rate(self) -> float:
+        """Requests per second the schedule issues when nothing is skipped."""
+        return sum(self.pollers.values()) / self.interval
+
+    def period(self, wallet: str, now: float | None = None) -> float:
+        """Seconds until a slot of ``wallet`` fires again."""
+        cadence = self.monitor.cadence
+        if cadence is None:
+            return self.interval
+        return self.interval * cadence.factor(wallet, now)
+
+    def phases(self, now: float | None = None) -> dict[str, list[float]]:
+        """Offsets (s) from now at which each wallet's slots fire next.
+
+        Wallet j of N starts ``j / N`` of the way into its own sub-interval
+        ``period / K``, so with equal K all slots are evenly spaced.
+        """
+        count = len(self.pollers)
+        plan = {}
+        for j, (wallet, k) in enumerate(self.pollers.items()):
+            step = self.period(wallet, now) / k
+            plan[wallet] = [(j / count + i) * step for i in range(k)]
+        return plan
+
+    def _lay_slots(self):
+        now = time.time()
+        with self._lock:
+            self._heap = []
+            for wallet, offsets in self.phases(now).items():
+                for offset in offsets:
+                    due = now + offset
+                    heapq.heappush(self._heap, (due, next(self._seq), wallet, due))
+
+    def retime(self):
+        """Re-lay every slot from now at the current periods (e.g. on a burst)."""
+        if self._thread is None:
+            return
+        self._lay_slots()
+        self.retimed += 1
+        self._wake.set()
+
+    def start(self):
+        """Fire the slots on a background thread."""
+        if self._thread is not None or not self.pollers:
+            return
+        limiter = self.monitor.rate_limiter
+        if limiter is not None:
+            budget = limiter.requests_per_minute / limiter.window_size
+            if self.planned_rate > budget:
+                print(
+                    f"[poll-scheduler] Schedule needs {self.planned_rate:.1f} req/s "
+                    f"but the budget is {budget:g}/s; slots will be deferred"
+                )
+        self._lay_slots()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="poll-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop firing slots (in-flight polls finish on the monitor's pool)."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            with self._lock:
+                if self._heap:
+                    fire_at, _, wallet, phase_due = self._heap[0]
+                    wait = fire_at - time.time()
+                    if wait <= 0:
+                        heapq.heappop(self._heap)
+                else:
+                    wait = self.interval
+            if wait > 0:
+                # Woken early by stop() or retime()
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+
+            try:
+                self._fire(wallet, phase_due)
+            except Exception as e:
+                # Keep the slot: retry it one interval later, same phase
+                self.errors += 1
+                print(f"[poll-scheduler] Poll of {wallet[:10]}... failed: {e}")
+                retry = time.time() + self.interval
+                with self._lock:
+                    heapq.heappush(
+                        self._heap, (retry, next(self._seq), wallet, phase_due)
+                    )
+
+    def _fire(self, wallet: str, phase_due: float):
+        """Submit one slot's poll and push the slot's next firing."""
+        status = self.monitor.submit(wallet)
+        now = time.time()
+        if status == "over_budget":
+            # Retry as soon as the limiter has room, keeping the phase
+            self.deferred += 1
+            retry = max(0.01, self.monitor.rate_limiter.time_until_allowed())
+            with self._lock:
+                heapq.heappush(
+                    self._heap, (now + retry, next(self._seq), wallet, phase_due)
+                )
+            return
+
+        if status == "submitted":
+            self.fired += 1
+        else:
+            self.skipped_in_flight += 1
+        period = self.period(wallet, now)
+        next_due = phase_due + period
+        if next_due <= now:
+            # Deferred past the next slot: skip ahead, same phase
+            self.fell_behind += 1
+            next_due += -(-(now - next_due) // period) * period
+        with self._lock:
+            heapq.heappush(self._heap, (next_due, next(self._seq), wallet, next_due))
+
+    @property
+    def stats(self) -> dict:
+        """Get scheduler statistics."""
+        priority = {w: k for w, k in self.pollers.items() if k > 1}
+        return {
+            "interval": self.interval,
+            "priority_wallets": len(priority),
+            "pollers": sum(self.pollers.values()),
+            "planned_rate_per_sec": round(self.planned_rate, 2),
+            # Mean wait before the next poll (plus request latency)
+            "expected_delay_s": {
+                f"{w[:10]}...": round(self.interval / (2 * k), 2)
+                for w, k in self.pollers.items()
+            },
+            "fired": self.fired,
+            "deferred": self.deferred,
+            "skipped_in_flight": self.skipped_in_flight,
+            "fell_behind": self.fell_behind,
+            "retimed": self.retimed,
+            "errors": self.errors,
+        }
@@ -30,6 +30,36 @@ print(f"Daily PnL: ${state.daily_pnl:+.2f}")
 print(f"Can Trade: {state.can_trade()[0]} ({state.can_trade()[1]})")
 print()
 
+# Lifetime statistics (persisted running aggregates, no history scan)
+stats = state.get_statistics(update_unrealized=False)
+print(
+    f"Trades: {stats['total_trades']} ({stats['wins']}W / {stats['losses']}L / "
+    f"{stats['pending_trades']}P) | Win Rate: {stats['win_rate']:.1f}%"
+)
+print(
+    f"Realized PnL: ${stats['realized_pnl']:+.2f} | Fees: ${stats['total_fees_paid']:.2f}"
+)
+print(
+    f"Max Drawdown: ${stats['max_drawdown']:.2f} (current ${stats['drawdown']:.2f}) | "
+    f"Losing Streak: {stats['losing_streak']} (longest {stats['longest_losing_streak']})"
+)
+print(
+    f"Avg Slippage: {stats['avg_slippage_pct']:.2f}% ± {stats['std_slippage_pct']:.2f} | "
+    f"Avg Delay Impact: {stats['avg_delay_impact_pct']:.2f}%"
+)
+for name, group in stats["by_strategy"].items():
+    print(
+        f"  {name}: {group['wins']}W/{group['losses']}L "
+        f"({group['win_rate']:.0f}%) ${group['pnl']:+.2f}"
+    )
+wallets = sorted(stats["by_wallet"].items(), key=lambda kv: kv[1]["pnl"])
+for wallet, group in wallets[-5:]:
+    print(
+        f"  {wallet[:10]}...: {group['wins']}W/{group['losses']}L "
+        f"({group['win_rate']:.0f}%) ${group['pnl']:+.2f}"
+    )
+print()
+
 # Check configuration
 from src.config import Config
 